@@ -0,0 +1,106 @@
+"""Synthetic inputs shared by the benchmarks of `benchmarks/run.py`.
+
+The inputs are generated with `rdetoolkit.testing.datagen` the first time a benchmark asks for them, and kept in a temporary
+directory until the runner exits, so that each size is generated once however many samples and benchmarks use it. The inputs
+are shared: a benchmark that modifies them works on a copy made by `copy_dataset`.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import shutil
+import tempfile
+from functools import cache
+from pathlib import Path
+from typing import Any, Literal
+
+from openpyxl import load_workbook
+from openpyxl.styles import Font
+
+from rdetoolkit.testing.datagen import DatasetMode, FileOptions, generate_dataset, write_image, write_invoice, write_tasksupport
+
+SIZES = (10, 1_000, 10_000)
+
+_CACHE_DIR = Path(tempfile.mkdtemp(prefix="rdetoolkit-bench-"))
+atexit.register(shutil.rmtree, _CACHE_DIR, ignore_errors=True)
+
+
+@cache
+def dataset(mode: DatasetMode, tiles: int, layout: Literal["file", "folder"] = "file", images: int = 0) -> Path:
+    """Return a `data` directory generated for the mode, with `tiles` data tiles of a small text file and `images` images each."""
+    data_dir = _CACHE_DIR / f"{mode}-{layout}-{tiles}-{images}" / "data"
+    options = FileOptions(files=1, file_size=256, images=images, image_size=(32, 32))
+    if mode == "invoice":
+        # There is always a single data tile: the size is the number of its input files
+        options = options.model_copy(update={"files": tiles})
+    return generate_dataset(data_dir, mode, tiles=tiles, layout=layout, options=options)
+
+
+@cache
+def untidy_excelinvoice(rows: int) -> Path:
+    """Return the ExcelInvoice of `dataset("excelinvoice", rows)` with an unrelated sheet and formatted empty rows added.
+
+    Workbooks edited by hand often have both: the unrelated sheet has `rows` rows, and the cells of `rows // 2` rows after the
+    data are formatted but empty.
+    """
+    path = _CACHE_DIR / f"untidy-{rows}" / "dataset_excel_invoice.xlsx"
+    path.parent.mkdir(parents=True)
+    wb = load_workbook(dataset("excelinvoice", rows) / "inputdata" / "dataset_excel_invoice.xlsx")
+    ws = wb["invoice_form"]
+    bold = Font(bold=True)
+    for row in range(ws.max_row + 5, ws.max_row + 5 + rows // 2):
+        for col in range(1, 30):
+            ws.cell(row=row, column=col).font = bold
+    ws_memo = wb.create_sheet("memo")
+    for idx in range(rows):
+        ws_memo.append([f"memo{idx}", idx, idx * 0.25, "unrelated sheet left in the workbook"])
+    wb.save(path)
+    return path
+
+
+@cache
+def tasksupport() -> Path:
+    """Return a tasksupport directory with the invoice schema and metadata-def.json of `rdetoolkit.testing.datagen`."""
+    return write_tasksupport(_CACHE_DIR / "tasksupport-only", "invoice")
+
+
+@cache
+def invoices(count: int) -> list[Path]:
+    """Return `count` invoice.json files, each with a distinct data name."""
+    return [write_invoice(_CACHE_DIR / f"invoices-{count}" / f"{idx:05d}", data_name=f"datagen-{idx:05d}") for idx in range(count)]
+
+
+@cache
+def images(count: int) -> Path:
+    """Return a directory of `count` PNG images of 64x64 pixels."""
+    directory = _CACHE_DIR / f"images-{count}"
+    for idx in range(count):
+        write_image(directory / f"image{idx:05d}.png", (64, 64), seed=idx)
+    return directory
+
+
+def write_json(path: Path, obj: Any) -> Path:
+    """Write an object as JSON."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(obj, ensure_ascii=False), encoding="utf_8")
+    return path
+
+
+class TempDirBenchmark:
+    """Base of the benchmarks that write files: `setup` creates an empty working directory and makes it current."""
+
+    def setup(self, size: int) -> None:
+        self._tmp = tempfile.TemporaryDirectory(prefix="rdetoolkit-bench-")
+        self.tmp_path = Path(self._tmp.name)
+        self._cwd = os.getcwd()
+        os.chdir(self.tmp_path)
+
+    def teardown(self, size: int) -> None:
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def copy_dataset(self, data_dir: Path) -> Path:
+        """Copy a generated `data` directory into the working directory."""
+        return Path(shutil.copytree(data_dir, self.tmp_path / "data"))
@@ -0,0 +1,31 @@
+"""Benchmarks of extracting the input zip of the ExcelInvoice mode with both layouts."""
+
+from __future__ import annotations
+
+from _fixtures import SIZES, TempDirBenchmark, dataset
+
+from rdetoolkit.impl.compressed_controller import CompressedFlatFileParser, CompressedFolderParser
+from rdetoolkit.invoicefile import ExcelInvoiceFile
+
+
+class TimeExtractArchive(TempDirBenchmark):
+    params = SIZES
+    param_names = ["rows"]
+
+    def setup(self, rows: int) -> None:
+        """Read the ExcelInvoice of both layouts of the input zip."""
+        super().setup(rows)
+        self.inputs = {}
+        for layout in ("file", "folder"):
+            inputdata = dataset("excelinvoice", rows, layout) / "inputdata"
+            self.inputs[layout] = (inputdata / "inputs.zip", ExcelInvoiceFile(inputdata / "dataset_excel_invoice.xlsx").dfexcelinvoice)
+
+    def time_flat_file_parser(self, rows: int) -> None:
+        """Extract a zip with an input file per row."""
+        zipfile, df = self.inputs["file"]
+        CompressedFlatFileParser(df).read(zipfile, self.tmp_path / "temp")
+
+    def time_folder_parser(self, rows: int) -> None:
+        """Extract a zip with an input folder per row."""
+        zipfile, df = self.inputs["folder"]
+        CompressedFolderParser(df).read(zipfile, self.tmp_path / "temp")
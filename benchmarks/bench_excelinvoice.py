@@ -0,0 +1,92 @@
+"""Benchmarks of reading an ExcelInvoice and generating the invoice of each of its rows."""
+
+from __future__ import annotations
+
+import pandas as pd
+from _fixtures import SIZES, TempDirBenchmark, dataset, untidy_excelinvoice
+
+from rdetoolkit.fileops import readf_json
+from rdetoolkit.invoicefile import ExcelInvoiceFile, read_excelinvoice, read_excelinvoice_sheets
+
+
+class TimeReadExcelInvoice:
+    params = SIZES
+    param_names = ["rows"]
+
+    def setup(self, rows: int) -> None:
+        """Generate the ExcelInvoice."""
+        self.path = dataset("excelinvoice", rows) / "inputdata" / "dataset_excel_invoice.xlsx"
+
+    def time_read_excelinvoice(self, rows: int) -> None:
+        """Read the invoice_form, generalTerm and specificTerm sheets."""
+        read_excelinvoice(self.path)
+
+
+class TimeReadExcelInvoiceSheets:
+    params = SIZES
+    param_names = ["rows"]
+
+    def setup(self, rows: int) -> None:
+        """Generate an ExcelInvoice with an unrelated sheet and formatted empty rows."""
+        self.path = untidy_excelinvoice(rows)
+
+    def time_read_excelinvoice_sheets(self, rows: int) -> None:
+        """Stream only the sheets used by the structuring process."""
+        read_excelinvoice_sheets(self.path)
+
+    def time_pandas_read_excel_all_sheets(self, rows: int) -> None:
+        """Parse every sheet, as the reader did before `read_excelinvoice_sheets`."""
+        pd.read_excel(self.path, sheet_name=None, dtype=str, header=None, index_col=None)
+
+
+class TimeCheckIntermittentEmptyRows:
+    params = SIZES
+    param_names = ["rows"]
+
+    def setup(self, rows: int) -> None:
+        """Read the invoice_form sheet."""
+        self.sheet = read_excelinvoice_sheets(dataset("excelinvoice", rows) / "inputdata" / "dataset_excel_invoice.xlsx")["invoice_form"]
+
+    def time_check_intermittent_empty_rows(self, rows: int) -> None:
+        """Check the invoice_form sheet for empty rows between data rows."""
+        ExcelInvoiceFile.check_intermittent_empty_rows(self.sheet)
+
+
+class TimeOverwriteExcelInvoice(TempDirBenchmark):
+    params = SIZES
+    param_names = ["rows"]
+
+    def setup(self, rows: int) -> None:
+        """Read the ExcelInvoice, the original invoice and the invoice schema once."""
+        super().setup(rows)
+        data_dir = dataset("excelinvoice", rows)
+        self.invoice_org = data_dir / "invoice" / "invoice.json"
+        self.schema_path = data_dir / "tasksupport" / "invoice.schema.json"
+        self.excel_invoice = ExcelInvoiceFile(data_dir / "inputdata" / "dataset_excel_invoice.xlsx")
+        self.invoice_org_obj = readf_json(self.invoice_org)
+        self.invoice_schema_obj = readf_json(self.schema_path)
+        self.dist_paths = [self.tmp_path / f"{idx:05d}" / "invoice.json" for idx in range(rows)]
+        for path in self.dist_paths:
+            path.parent.mkdir()
+
+    def time_overwrite(self, rows: int) -> None:
+        """Write the invoice of each row with a call to `overwrite` per row."""
+        for idx, dist_path in enumerate(self.dist_paths):
+            self.excel_invoice.overwrite(
+                self.invoice_org,
+                dist_path,
+                self.schema_path,
+                idx,
+                invoice_org_obj=self.invoice_org_obj,
+                invoice_schema_obj=self.invoice_schema_obj,
+            )
+
+    def time_overwrite_all(self, rows: int) -> None:
+        """Write the invoice of every row with a single call to `overwrite_all`."""
+        self.excel_invoice.overwrite_all(
+            self.invoice_org,
+            self.schema_path,
+            self.dist_paths,
+            invoice_org_obj=self.invoice_org_obj,
+            invoice_schema_obj=self.invoice_schema_obj,
+        )
@@ -0,0 +1,28 @@
+"""Benchmarks of copying the representative image to the thumbnail directory and of resizing images."""
+
+from __future__ import annotations
+
+from _fixtures import SIZES, TempDirBenchmark, images
+
+from rdetoolkit.img2thumb import copy_images_to_thumbnail, resize_image
+
+
+class TimeImages(TempDirBenchmark):
+    params = SIZES
+    param_names = ["images"]
+
+    def setup(self, count: int) -> None:
+        """Create an empty thumbnail directory."""
+        super().setup(count)
+        self.main_image = images(count)
+        self.thumbnail = self.tmp_path / "thumbnail"
+        self.thumbnail.mkdir()
+
+    def time_copy_images_to_thumbnail(self, count: int) -> None:
+        """Copy the representative image among the main images."""
+        copy_images_to_thumbnail(self.thumbnail, self.main_image)
+
+    def time_resize_image(self, count: int) -> None:
+        """Resize every image into the thumbnail directory."""
+        for path in sorted(self.main_image.iterdir()):
+            resize_image(path, 32, 32, self.thumbnail / path.name)
@@ -0,0 +1,57 @@
+"""Benchmarks of registering metadata with `Meta` and casting metadata values."""
+
+from __future__ import annotations
+
+from _fixtures import SIZES, TempDirBenchmark, write_json
+
+from rdetoolkit.rde2util import Meta, castval, castvals
+
+
+class TimeMeta(TempDirBenchmark):
+    params = SIZES
+    param_names = ["keys"]
+
+    def setup(self, keys: int) -> None:
+        """Write a metadata-def.json of constant and variable keys, and a value for each key."""
+        super().setup(keys)
+        metadef = {}
+        self.entries: dict[str, str | list[str]] = {}
+        for idx in range(keys):
+            name = f"key{idx:05d}"
+            metadef[name] = {"name": {"ja": f"キー{idx}", "en": f"key {idx}"}, "schema": {"type": "number"}, "unit": "K"}
+            if idx % 2:
+                metadef[name]["variable"] = 1
+                self.entries[name] = [str(idx), str(idx + 0.5), str(idx + 1)]
+            else:
+                self.entries[name] = str(idx * 0.5)
+        self.metadef_path = write_json(self.tmp_path / "metadata-def.json", metadef)
+
+    def time_assign_vals_writefile(self, keys: int) -> None:
+        """Register every value and write metadata.json."""
+        meta = Meta(self.metadef_path)
+        meta.assign_vals(self.entries)
+        meta.writefile(str(self.tmp_path / "metadata.json"))
+
+
+class TimeCastval:
+    params = SIZES
+    param_names = ["values"]
+
+    def setup(self, values: int) -> None:
+        """Create the numbers, integers and dates to cast."""
+        self.numbers = [f"{idx * 0.5}" for idx in range(values)]
+        self.integers = [str(idx) for idx in range(values)]
+        self.dates = [f"2024-01-{idx % 28 + 1:02d}" for idx in range(values)]
+
+    def time_castval(self, values: int) -> None:
+        """Cast each value with a call to `castval`."""
+        for number, integer, date in zip(self.numbers, self.integers, self.dates):
+            castval(number, "number", None)
+            castval(integer, "integer", None)
+            castval(date, "string", "date")
+
+    def time_castvals(self, values: int) -> None:
+        """Cast the values of each type with a single call to `castvals`."""
+        castvals(self.numbers, "number", None)
+        castvals(self.integers, "integer", None)
+        castvals(self.dates, "string", "date")
@@ -0,0 +1,41 @@
+"""Benchmarks of validating invoice.json and metadata.json."""
+
+from __future__ import annotations
+
+from _fixtures import SIZES, TempDirBenchmark, invoices, tasksupport, write_json
+
+from rdetoolkit.validation import InvoiceValidator, invoice_validate, metadata_validate
+
+
+class TimeInvoiceValidate:
+    params = SIZES
+    param_names = ["invoices"]
+
+    def setup(self, count: int) -> None:
+        """Generate the invoices."""
+        self.schema_path = tasksupport() / "invoice.schema.json"
+        self.invoices = invoices(count)
+
+    def time_invoice_validate(self, count: int) -> None:
+        """Validate every invoice with a shared validator."""
+        validator = InvoiceValidator(self.schema_path)
+        for path in self.invoices:
+            invoice_validate(path, self.schema_path, validator=validator)
+
+
+class TimeMetadataValidate(TempDirBenchmark):
+    params = SIZES
+    param_names = ["entries"]
+
+    def setup(self, entries: int) -> None:
+        """Write a metadata.json with as many constant and variable entries."""
+        super().setup(entries)
+        metadata = {
+            "constant": {f"constant{idx:05d}": {"value": idx * 0.5, "unit": "K"} for idx in range(entries)},
+            "variable": [{"temperature": {"value": 300.0 + idx, "unit": "K"}, "comment": {"value": f"row {idx}"}} for idx in range(entries)],
+        }
+        self.path = write_json(self.tmp_path / "metadata.json", metadata)
+
+    def time_metadata_validate(self, entries: int) -> None:
+        """Validate metadata.json."""
+        metadata_validate(self.path)
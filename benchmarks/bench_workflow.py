@@ -0,0 +1,77 @@
+"""Benchmarks of planning the output folders of the data tiles and of a complete structuring run in each input mode."""
+
+from __future__ import annotations
+
+import json
+from typing import Literal
+
+from _fixtures import SIZES, TempDirBenchmark, dataset
+
+from rdetoolkit import workflows
+from rdetoolkit.testing.datagen import DatasetMode
+
+
+class TimeGenerateFolderPaths(TempDirBenchmark):
+    params = SIZES
+    param_names = ["tiles"]
+
+    def setup(self, tiles: int) -> None:
+        """Copy a MultiDataTile dataset into the working directory."""
+        super().setup(tiles)
+        data_dir = self.copy_dataset(dataset("multidatatile", tiles))
+        self.raw_files_group = [(path,) for path in sorted(data_dir.joinpath("inputdata").iterdir())]
+        self.invoice_org = data_dir / "invoice" / "invoice.json"
+        self.schema_path = data_dir / "tasksupport" / "invoice.schema.json"
+
+    def time_generate_folder_paths_iterator(self, tiles: int) -> None:
+        """Create the output folders of every data tile."""
+        for _ in workflows.generate_folder_paths_iterator(self.raw_files_group, self.invoice_org, self.schema_path):
+            pass
+
+
+class _WorkflowRun(TempDirBenchmark):
+    params = SIZES
+    param_names = ["tiles"]
+    repeat = 1
+    mode: DatasetMode
+    layout: Literal["file", "folder"] = "file"
+
+    def setup(self, tiles: int) -> None:
+        """Copy the dataset of the mode into the working directory."""
+        super().setup(tiles)
+        self.copy_dataset(dataset(self.mode, tiles, self.layout))
+
+    def time_run(self, tiles: int) -> None:
+        """Run the structuring process."""
+        self.result = workflows.run()
+
+    def teardown(self, tiles: int) -> None:
+        """Fail the benchmark if a data tile failed."""
+        super().teardown(tiles)
+        if not hasattr(self, "result"):
+            return
+        failed = [status for status in json.loads(self.result)["statuses"] if status["status"] != "success"]
+        if failed:
+            emsg = f"{len(failed)} data tiles failed, the first one with: {failed[0]['error_message']}"
+            raise RuntimeError(emsg)
+
+
+class TimeRunInvoice(_WorkflowRun):
+    mode = "invoice"
+
+
+class TimeRunExcelInvoice(_WorkflowRun):
+    mode = "excelinvoice"
+
+
+class TimeRunExcelInvoiceFolder(_WorkflowRun):
+    mode = "excelinvoice"
+    layout = "folder"
+
+
+class TimeRunRDEFormat(_WorkflowRun):
+    mode = "rdeformat"
+
+
+class TimeRunMultiDataTile(_WorkflowRun):
+    mode = "multidatatile"
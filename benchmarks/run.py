@@ -0,0 +1,132 @@
+"""Run the benchmark suite and write machine-readable results.
+
+The benchmarks are defined in `benchmarks/bench_*.py` in the style of asv: each `Time*` class lists the sizes it is run with in
+`params`, prepares its inputs in `setup(size)` and cleans them up in `teardown(size)`, and each `time_*` method is a timed
+benchmark. `setup` and `teardown` are called around every timed sample, so a benchmark may modify the files it was given. A
+benchmark that cannot run, e.g. when an optional package is missing, is skipped by raising `NotImplementedError` in `setup`.
+
+Every sample calls the benchmark once and is timed with `time.perf_counter`. The results of every benchmark and size, with
+their samples, are written as JSON with the version of rdetoolkit, the commit, the Python version and the platform.
+
+Usage:
+    python benchmarks/run.py
+    python benchmarks/run.py --sizes 10 1000 --bench "excelinvoice|castval" --repeat 5 --output results.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib
+import inspect
+import json
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+import traceback
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import rdetoolkit
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+DEFAULT_REPEAT = 3
+
+
+def discover(pattern: str | None) -> list[tuple[str, type, str]]:
+    """Return the (name, class, method) of every benchmark whose name matches `pattern`."""
+    benchmarks = []
+    for path in sorted(BENCHMARK_DIR.glob("bench_*.py")):
+        module = importlib.import_module(path.stem)
+        for class_name, cls in inspect.getmembers(module, inspect.isclass):
+            if not class_name.startswith("Time") or cls.__module__ != module.__name__:
+                continue
+            for method in sorted(name for name in dir(cls) if name.startswith("time_")):
+                name = f"{path.stem}.{class_name}.{method}"
+                if pattern is None or re.search(pattern, name):
+                    benchmarks.append((name, cls, method))
+    return benchmarks
+
+
+def run_benchmark(cls: type, method: str, size: int, repeat: int) -> dict[str, Any]:
+    """Time `repeat` samples of a benchmark for a size, calling `setup` and `teardown` around each sample."""
+    samples = []
+    for _ in range(repeat):
+        bench = cls()
+        try:
+            if hasattr(bench, "setup"):
+                bench.setup(size)
+        except NotImplementedError as e:
+            return {"skipped": str(e) or "setup raised NotImplementedError"}
+        try:
+            start = time.perf_counter()
+            getattr(bench, method)(size)
+            samples.append(time.perf_counter() - start)
+        finally:
+            if hasattr(bench, "teardown"):
+                bench.teardown(size)
+    return {
+        "samples": samples,
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def environment() -> dict[str, Any]:
+    """Return the version of rdetoolkit, the commit and the platform the benchmarks are run on."""
+    commit = None
+    with contextlib.suppress(OSError, subprocess.CalledProcessError):
+        commit = subprocess.run(  # noqa: S603
+            ["git", "rev-parse", "HEAD"],  # noqa: S607
+            cwd=BENCHMARK_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    return {
+        "rdetoolkit": rdetoolkit.__version__,
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def main() -> None:
+    """Run the benchmarks and write the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-b", "--bench", help="regular expression selecting the benchmarks to run, e.g. 'workflow'")
+    parser.add_argument("--sizes", type=int, nargs="+", help="run only these sizes among the params of each benchmark")
+    parser.add_argument("--repeat", type=int, help=f"number of timed samples (default: the 'repeat' of the benchmark, or {DEFAULT_REPEAT})")
+    parser.add_argument("-o", "--output", type=Path, default=BENCHMARK_DIR / "results" / "results.json", help="the JSON results file")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(BENCHMARK_DIR))
+    results = []
+    for name, cls, method in discover(args.bench):
+        repeat = args.repeat or getattr(cls, "repeat", DEFAULT_REPEAT)
+        for size in getattr(cls, "params", [None]):
+            if args.sizes and size not in args.sizes:
+                continue
+            try:
+                result = run_benchmark(cls, method, size, repeat)
+            except Exception:
+                result = {"error": traceback.format_exc()}
+            results.append({"name": name, "params": {getattr(cls, "param_names", ["size"])[0]: size}, **result})
+            summary = f"{result['median']:10.4f} s" if "median" in result else ("skipped" if "skipped" in result else "failed")
+            print(f"{name:<72} {size!s:>6} {summary}")
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps({"environment": environment(), "results": results}, indent=2), encoding="utf_8")
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
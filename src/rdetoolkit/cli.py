@@ -7,7 +7,9 @@ import click
 import pytz
 
 from rdetoolkit.cmd.command import InitCommand, VersionCommand
+from rdetoolkit.cmd.gen_dataset import GenerateDatasetCommand
 from rdetoolkit.cmd.gen_excelinvoice import GenerateExcelInvoiceCommand
+from rdetoolkit.testing.datagen import DATASET_MODES, DatasetMode, FileOptions
 
 
 @click.group()
@@ -100,6 +102,66 @@ def make_excelinvoice(invoice_schema_json_path: pathlib.Path, output_path: pathl
     cmd.invoke()
 
 
+@click.command(help="Generate a synthetic RDE input data directory for the given mode, e.g. to load-test a structuring process.")
+@click.argument("mode", type=click.Choice(DATASET_MODES, case_sensitive=False))
+@click.option(
+    "-o",
+    "--output",
+    "output_dir",
+    type=click.Path(file_okay=False, resolve_path=True, path_type=pathlib.Path),
+    default=pathlib.Path.cwd() / "data",
+    metavar="<path to data directory output>",
+    help="Path to the data directory to generate. It must be empty or missing (default: ./data)",
+)
+@click.option("-n", "--tiles", type=click.IntRange(min=1), default=1, help="Number of data tiles (default: 1)")
+@click.option("--files", type=click.IntRange(min=0), default=1, help="Number of text files per data tile (default: 1)")
+@click.option("--file-size", type=click.IntRange(min=0), default=1024, help="Size of each text file in bytes (default: 1024)")
+@click.option("--encoding", default="utf_8", help="Encoding of the text files, e.g. shift_jis (default: utf_8)")
+@click.option("--images", type=click.IntRange(min=0), default=0, help="Number of PNG images per data tile (default: 0)")
+@click.option("--image-size", type=(int, int), default=(64, 64), help="Width and height of each image in pixels (default: 64 64)")
+@click.option(
+    "--layout",
+    type=click.Choice(["file", "folder"], case_sensitive=False),
+    default="file",
+    help="Layout of the zip in ExcelInvoice mode: 'file' or 'folder' (default: file)",
+)
+@click.option("--seed", type=int, default=0, help="Seed of the content of the files (default: 0)")
+def make_dataset(
+    *,
+    mode: DatasetMode,
+    output_dir: pathlib.Path,
+    tiles: int,
+    files: int,
+    file_size: int,
+    encoding: str,
+    images: int,
+    image_size: tuple[int, int],
+    layout: Literal["file", "folder"],
+    seed: int,
+) -> None:
+    """Generate a synthetic RDE input data directory for the given mode.
+
+    Args:
+        mode (DatasetMode): The input mode: "invoice", "excelinvoice", "rdeformat" or "multidatatile".
+        output_dir (pathlib.Path): The data directory to generate.
+        tiles (int): The number of data tiles.
+        files (int): The number of text files per data tile.
+        file_size (int): The size of each text file in bytes.
+        encoding (str): The encoding of the text files.
+        images (int): The number of images per data tile.
+        image_size (tuple[int, int]): The width and height of each image in pixels.
+        layout (Literal["file", "folder"]): The layout of the zip in ExcelInvoice mode.
+        seed (int): The seed of the content of the files.
+
+    Returns:
+        None
+    """
+    options = FileOptions(files=files, file_size=file_size, encoding=encoding, images=images, image_size=image_size)
+    cmd = GenerateDatasetCommand(output_dir, mode, tiles, options, layout=layout, seed=seed)
+    cmd.invoke()
+
+
 cli.add_command(init)
 cli.add_command(version)
 cli.add_command(make_excelinvoice)
+cli.add_command(make_dataset)
@@ -1,9 +1,12 @@
 import pathlib
 from rdetoolkit.cmd.command import InitCommand as InitCommand, VersionCommand as VersionCommand
+from rdetoolkit.cmd.gen_dataset import GenerateDatasetCommand as GenerateDatasetCommand
 from rdetoolkit.cmd.gen_excelinvoice import GenerateExcelInvoiceCommand as GenerateExcelInvoiceCommand
+from rdetoolkit.testing.datagen import DATASET_MODES as DATASET_MODES, DatasetMode as DatasetMode, FileOptions as FileOptions
 from typing import Literal
 
 def cli() -> None: ...
 def init() -> None: ...
 def version() -> None: ...
 def make_excelinvoice(invoice_schema_json_path: pathlib.Path, output_path: pathlib.Path, mode: Literal['file', 'folder']) -> None: ...
+def make_dataset(*, mode: DatasetMode, output_dir: pathlib.Path, tiles: int, files: int, file_size: int, encoding: str, images: int, image_size: tuple[int, int], layout: Literal['file', 'folder'], seed: int) -> None: ...
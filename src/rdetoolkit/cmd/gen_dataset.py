@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import pathlib
+from typing import Literal
+
+import click
+
+from rdetoolkit.rdelogger import get_logger
+from rdetoolkit.testing.datagen import DatasetMode, FileOptions, generate_dataset
+
+logger = get_logger(__name__)
+
+
+class GenerateDatasetCommand:
+
+    def __init__(
+        self,
+        output_dir: pathlib.Path,
+        mode: DatasetMode,
+        tiles: int,
+        options: FileOptions,
+        *,
+        layout: Literal["file", "folder"] = "file",
+        seed: int = 0,
+    ) -> None:
+        self.output_dir = output_dir
+        self.mode = mode
+        self.tiles = tiles
+        self.options = options
+        self.layout = layout
+        self.seed = seed
+
+    def invoke(self) -> None:
+        """Invokes the command and generates a synthetic `data` directory.
+
+        Returns:
+            None
+        """
+        click.echo("📦 Generating synthetic RDE dataset...")
+        click.echo(f"- Mode: {self.mode}")
+        click.echo(f"- Output: {self.output_dir}")
+        click.echo(f"- Data tiles: {self.tiles}")
+
+        if self.output_dir.exists() and any(self.output_dir.iterdir()):
+            click.echo(click.style(f"🔥 Warning: The output directory '{self.output_dir}' is not empty.", fg="yellow"))
+            raise click.Abort
+
+        try:
+            generate_dataset(self.output_dir, self.mode, tiles=self.tiles, layout=self.layout, options=self.options, seed=self.seed)
+            click.echo(click.style(f"✨ Dataset generated successfully! : {self.output_dir}", fg="green"))
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
+            click.echo(click.style(f"🔥 Error: An unexpected error occurred: {e}", fg="red"))
+            raise click.Abort from e
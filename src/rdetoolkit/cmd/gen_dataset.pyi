@@ -0,0 +1,17 @@
+import pathlib
+from _typeshed import Incomplete
+from rdetoolkit.rdelogger import get_logger as get_logger
+from rdetoolkit.testing.datagen import DatasetMode as DatasetMode, FileOptions as FileOptions, generate_dataset as generate_dataset
+from typing import Literal
+
+logger: Incomplete
+
+class GenerateDatasetCommand:
+    output_dir: Incomplete
+    mode: Incomplete
+    tiles: Incomplete
+    options: Incomplete
+    layout: Incomplete
+    seed: Incomplete
+    def __init__(self, output_dir: pathlib.Path, mode: DatasetMode, tiles: int, options: FileOptions, *, layout: Literal['file', 'folder'] = 'file', seed: int = 0) -> None: ...
+    def invoke(self) -> None: ...
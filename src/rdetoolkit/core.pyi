@@ -89,4 +89,4 @@ class DirectoryOps:
 
 def resize_image_aspect_ratio(input_path: str, output_path: str, width: int, height: int) -> None: ...
 def detect_encoding(path: str) -> str: ...
-def read_from_json_file(path: str) -> str: ...
+def read_file_with_encoding(file_path: str) -> str: ...
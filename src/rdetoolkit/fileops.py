@@ -1,19 +1,100 @@
 from __future__ import annotations
 
+import io
 import json
+import os
+import re
+import shutil
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable, Sequence
 from pathlib import Path
-from typing import Any
+from typing import IO, Any, Callable, Final, Generic, Optional, TypeVar, cast
 
-from rdetoolkit.core import detect_encoding
+import chardet
+from charset_normalizer import detect
+
+from rdetoolkit.core import read_file_with_encoding
 from rdetoolkit.exceptions import StructuredError
+from rdetoolkit.models.rde2types import EncodingDetectionResult
 from rdetoolkit.rdelogger import get_logger
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
 logger = get_logger(__name__)
 
+USUAL_ENCODINGS: Final = ("ascii", "shift_jis", "utf_8", "utf_8_sig", "euc_jp")
+# Longer BOMs first: the UTF-32 LE BOM starts with the UTF-16 LE BOM.
+ENCODING_BOMS: Final = (
+    (b"\x00\x00\xfe\xff", "utf_32"),
+    (b"\xff\xfe\x00\x00", "utf_32"),
+    (b"\xef\xbb\xbf", "utf_8_sig"),
+    (b"\xfe\xff", "utf_16"),
+    (b"\xff\xfe", "utf_16"),
+)
+DETECTION_SAMPLE_BYTES: Final = 256 * 1024
+DETECTION_SAMPLE_WINDOWS: Final = ("head", "middle", "tail")
+MIN_SAMPLE_CONFIDENCE: Final = 0.8
+# chardet is slow on multibyte text, so its fallback only looks at the start of the data.
+_CHARDET_SAMPLE_BYTES: Final = 64 * 1024
+_ENCODING_CACHE_MAXSIZE: Final = 1024
+
+MATERIALIZATION_STRATEGIES: Final = ("copy", "hardlink", "reflink", "symlink", "move")
+# ioctl request number of FICLONE on Linux (_IOW(0x94, 9, int)).
+_FICLONE: Final = 0x40049409
+
+_T = TypeVar("_T")
+
+
+class _FileIdentityCache(Generic[_T]):
+    """A thread-safe LRU cache of values derived from files, keyed by the identity, the size and the modification time of the file.
+
+    The identity is the device and inode numbers, so every path or link to the same file shares one entry, as with its
+    real path, without the cost of resolving it. A changed file has a new key, so its stale entry is never returned and
+    is eventually evicted.
+    """
+
+    def __init__(self, maxsize: int):
+        self._maxsize = maxsize
+        self._entries: OrderedDict[Hashable, _T] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(path: str | Path, *extra: Hashable) -> Hashable:
+        stat = os.stat(path)
+        return (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns, *extra)
+
+    def get(self, key: Hashable) -> _T | None:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: _T) -> None:
+        with self._lock:
+            self._entries[key] = value
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_encoding_cache: _FileIdentityCache[EncodingDetectionResult] = _FileIdentityCache(_ENCODING_CACHE_MAXSIZE)
+
 
 def readf_json(path: str | Path) -> dict[str, Any]:  # pragma: no cover
     """A function that reads a JSON file and returns the JSON object.
 
+    The file is read only once: `rdetoolkit.core.read_file_with_encoding` detects the encoding of the bytes it has read
+    and decodes them, and the resulting string is parsed without opening the file again. The content is never cached,
+    since JSON files such as invoice.json and metadata.json are rewritten while a data tile is processed.
+
     Args:
         path (str | Path): The path to the JSON file.
 
@@ -25,16 +106,157 @@ def readf_json(path: str | Path) -> dict[str, Any]:  # pragma: no cover
     """
     _path = str(path) if isinstance(path, Path) else path
     try:
-        enc = detect_encoding(_path)
-        normalize_enc = enc.lower().replace("-", "_") if enc else "utf_8"
-        with open(_path, encoding=normalize_enc) as f:
-            return json.load(f)
+        return json.loads(read_file_with_encoding(_path))
     except Exception as e:
         emsg = f"An error occurred while processing the file: {str(e)}"
         logger.error(emsg)
         raise StructuredError(emsg) from e
 
 
+def detect_bom_encoding(head: bytes) -> str:
+    """Return the encoding given by the byte order mark at the start of `head`, or an empty string if there is none.
+
+    Args:
+        head (bytes): The first bytes of the data. Four bytes are enough for every byte order mark.
+
+    Returns:
+        str: "utf_8_sig", "utf_16" or "utf_32", or an empty string.
+    """
+    for bom, enc in ENCODING_BOMS:
+        if head.startswith(bom):
+            return enc
+    return ""
+
+
+def detect_bytes_encoding(data: bytes) -> tuple[str, float]:
+    """Detect the encoding of the given bytes.
+
+    charset_normalizer is used first. If the encoding it finds is not one of the usual ones, chardet is used
+    on the start of the data instead. The encoding is returned as a Python codec name, with Shift_JIS reported as cp932.
+
+    Args:
+        data (bytes): The bytes to be analyzed.
+
+    Returns:
+        tuple[str, float]: The detected encoding, or an empty string if none was found, and its confidence.
+    """
+    ret = detect(data)
+    enc = _to_codec_name(cast(Optional[str], ret["encoding"]))
+    if enc in USUAL_ENCODINGS or enc == "cp932":
+        return enc, cast(Optional[float], ret["confidence"]) or 0.0
+
+    chardet_ret = chardet.detect(data[:_CHARDET_SAMPLE_BYTES])
+    return _to_codec_name(chardet_ret["encoding"]), chardet_ret["confidence"] or 0.0
+
+
+def resolve_file_encoding(
+    path: str | Path,
+    *,
+    data: bytes | None = None,
+    max_bytes: int = DETECTION_SAMPLE_BYTES,
+    windows: Sequence[str] = ("head",),
+    min_confidence: float = MIN_SAMPLE_CONFIDENCE,
+) -> EncodingDetectionResult:
+    """Resolve the encoding of a file, detecting it at most once per file identity and detection parameters.
+
+    Results are kept in a process-wide LRU cache keyed by the identity, the size and the modification time of the file,
+    and by the sampling parameters, so the same unchanged file is never detected twice in the same way. On a miss,
+    a byte order mark is checked first. Otherwise at most `max_bytes` bytes are sampled, split evenly between the
+    requested windows and cut at line boundaries, and the encoding is detected from them. If the sample is plain ASCII
+    while the file is larger, the window around the first non-ASCII byte is used instead. Only when the confidence
+    stays below `min_confidence` is the whole content scanned.
+
+    Args:
+        path (str | Path): The path to the file.
+        data (Optional[bytes]): The content of the file if it has already been read. Defaults to None.
+        max_bytes (int): The byte budget of the sample. Defaults to 256 KiB.
+        windows (Sequence[str]): The parts of the file to sample, any of "head", "middle" and "tail". Defaults to ("head",).
+        min_confidence (float): The confidence below which the whole content is scanned. Defaults to 0.8.
+
+    Returns:
+        EncodingDetectionResult: The encoding of the file, its confidence and how it was determined.
+
+    Raises:
+        ValueError: If `max_bytes` is not positive or `windows` is empty or contains an unknown window.
+    """
+    if max_bytes <= 0:
+        emsg = f"max_bytes must be a positive integer: {max_bytes}"
+        raise ValueError(emsg)
+    if not windows or any(w not in DETECTION_SAMPLE_WINDOWS for w in windows):
+        emsg = f"windows must be a non-empty sequence of {DETECTION_SAMPLE_WINDOWS}: {windows}"
+        raise ValueError(emsg)
+
+    key = _encoding_cache.key(path, max_bytes, tuple(windows), min_confidence)
+    result = _encoding_cache.get(key)
+    if result is None:
+        with io.BytesIO(data) if data is not None else open(path, "rb") as f:
+            result = _detect_stream_encoding(f, max_bytes=max_bytes, windows=windows, min_confidence=min_confidence)
+        _encoding_cache.put(key, result)
+    return result
+
+
+def clear_encoding_cache() -> None:
+    """Clear the encodings cached by `resolve_file_encoding`."""
+    _encoding_cache.clear()
+
+
+def _detect_stream_encoding(f: IO[bytes], *, max_bytes: int, windows: Sequence[str], min_confidence: float) -> EncodingDetectionResult:
+    bom_enc = detect_bom_encoding(f.read(4))
+    if bom_enc:
+        return EncodingDetectionResult(encoding=bom_enc, confidence=1.0, source="bom")
+    sample, source = _read_sample(f, max_bytes, windows)
+    if sample is None:
+        # The whole content was streamed and contains only ASCII characters.
+        return EncodingDetectionResult(encoding="ascii", confidence=1.0, source="full")
+    enc, confidence = detect_bytes_encoding(sample)
+    if source == "full" or (enc and confidence >= min_confidence):
+        return EncodingDetectionResult(encoding=enc or "utf_8", confidence=confidence, source=source)
+
+    f.seek(0)
+    enc, confidence = detect_bytes_encoding(f.read())
+    return EncodingDetectionResult(encoding=enc or "utf_8", confidence=confidence, source="full")
+
+
+def _read_sample(f: IO[bytes], max_bytes: int, windows: Sequence[str]) -> tuple[bytes | None, str]:
+    size = f.seek(0, os.SEEK_END)
+    f.seek(0)
+    if size <= max_bytes:
+        return f.read(), "full"
+
+    window_size = max_bytes // len(windows)
+    offsets = {"head": 0, "middle": (size - window_size) // 2, "tail": size - window_size}
+    sample = b"\n".join(_read_window(f, offsets[w], window_size, size) for w in windows)
+    if sample.isascii():
+        return _read_first_non_ascii_window(f, window_size, size), "sample"
+    return sample, "sample"
+
+
+def _read_window(f: IO[bytes], offset: int, window_size: int, size: int) -> bytes:
+    """Read a window and cut it at line boundaries, so that no multibyte character is split."""
+    f.seek(offset)
+    window = f.read(window_size)
+    start = window.find(b"\n") + 1 if offset > 0 else 0
+    end = window.rfind(b"\n") + 1 if offset + window_size < size else len(window)
+    return window[start:end] if end > start else window
+
+
+def _read_first_non_ascii_window(f: IO[bytes], window_size: int, size: int) -> bytes | None:
+    f.seek(0)
+    position = 0
+    while chunk := f.read(window_size):
+        if not chunk.isascii():
+            first = cast(re.Match, re.search(rb"[\x80-\xff]", chunk)).start()
+            line_start = position + chunk.rfind(b"\n", 0, first) + 1
+            return _read_window(f, line_start, window_size, size)
+        position += len(chunk)
+    return None
+
+
+def _to_codec_name(enc: str | None) -> str:
+    codec_name = enc.replace("-", "_").lower() if enc is not None else ""
+    return "cp932" if codec_name == "shift_jis" else codec_name
+
+
 def writef_json(path: str | Path, obj: dict[str, Any], *, enc: str = "utf_8") -> dict[str, Any]:
     """Writes an content to a JSON file.
 
@@ -49,3 +271,151 @@ def writef_json(path: str | Path, obj: dict[str, Any], *, enc: str = "utf_8") ->
     with open(path, "w", encoding=enc) as f:
         json.dump(obj, f, indent=4, ensure_ascii=False)
     return obj
+
+
+def materialize_file(src: str | Path, dst: str | Path, *, strategy: str = "copy", movable_root: str | Path | None = None) -> str:
+    """Place the file `src` at `dst` with the given strategy, falling back to a copy when the strategy cannot be applied.
+
+    The strategies are:
+
+    - "copy": copy the content and the permission bits, as `shutil.copy` does.
+    - "hardlink": link `dst` to the same inode as `src`. The two paths then share their content.
+    - "reflink": clone the content with FICLONE, or with `os.copy_file_range`, which lets copy-on-write file systems
+      share the blocks. Either way `dst` is an independent file.
+    - "symlink": make `dst` a symbolic link to the absolute path of `src`. `src` must therefore be kept.
+    - "move": rename `src` to `dst` if `src` is under `movable_root`, leaving a symbolic link at `src` so that
+      it can still be read. A source that has already been moved is hard-linked instead.
+
+    Hard links, renames and clones fail across file systems; in that case, and whenever the strategy is not supported
+    by the platform or the file system, the file is copied. An existing file at `dst` is replaced: the new file is created under
+    a temporary name and renamed over it, so that an existing `dst` that is a link to `src`, e.g. left by a previous run with
+    another strategy, is never written through.
+
+    Args:
+        src (str | Path): The source file.
+        dst (str | Path): The destination file path.
+        strategy (str): One of `MATERIALIZATION_STRATEGIES`. Defaults to "copy".
+        movable_root (Optional[str | Path]): The directory under which sources may be moved, typically the temporary directory
+            the input archive was extracted to. If None, "move" copies. Defaults to None.
+
+    Returns:
+        str: The strategy that was actually applied.
+
+    Raises:
+        ValueError: If `strategy` is not one of `MATERIALIZATION_STRATEGIES`.
+    """
+    if strategy not in MATERIALIZATION_STRATEGIES:
+        emsg = f"Invalid materialization strategy: {strategy}. Select one of {MATERIALIZATION_STRATEGIES}."
+        raise ValueError(emsg)
+    src, dst = Path(src), Path(dst)
+    if strategy != "copy":
+        try:
+            return _MATERIALIZERS[strategy](src, dst, movable_root)
+        except OSError as e:
+            logger.debug(f"Falling back to copy: failed to {strategy} {src} to {dst}: {e}")
+    _replace_with(dst, lambda tmp: shutil.copy(src, tmp))
+    return "copy"
+
+
+def _remove_existing(dst: Path) -> None:
+    if dst.is_symlink() or dst.is_file():
+        dst.unlink()
+
+
+def _replace_with(dst: Path, create: Callable[[Path], Any]) -> None:
+    """Create a file with `create` at a temporary path next to `dst`, then rename it to `dst`."""
+    tmp = dst.with_name(f".{dst.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        create(tmp)
+        os.replace(tmp, dst)
+    finally:
+        # The rename does nothing when `tmp` and `dst` are already hard links to the same file
+        if os.path.lexists(tmp):
+            os.unlink(tmp)
+
+
+def _hardlink(src: Path, dst: Path, movable_root: str | Path | None = None) -> str:
+    _replace_with(dst, lambda tmp: os.link(os.path.realpath(src), tmp))
+    return "hardlink"
+
+
+def _symlink(src: Path, dst: Path, movable_root: str | Path | None = None) -> str:
+    _replace_with(dst, lambda tmp: os.symlink(os.path.realpath(src), tmp))
+    return "symlink"
+
+
+def _reflink(src: Path, dst: Path, movable_root: str | Path | None = None) -> str:
+    _replace_with(dst, lambda tmp: _clone(src, tmp))
+    return "reflink"
+
+
+def _clone(src: Path, dst: Path) -> None:
+    with open(src, "rb") as fsrc, open(dst, "xb") as fdst:
+        try:
+            if fcntl is None:
+                emsg = "FICLONE is not available on this platform"
+                raise OSError(emsg)
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        except OSError:
+            _copy_file_range(fsrc.fileno(), fdst.fileno(), os.fstat(fsrc.fileno()).st_size)
+    shutil.copymode(src, dst)
+
+
+def _copy_file_range(src_fd: int, dst_fd: int, size: int) -> None:
+    if not hasattr(os, "copy_file_range"):
+        emsg = "os.copy_file_range is not available on this platform"
+        raise OSError(emsg)
+    copied = 0
+    while copied < size:
+        n = os.copy_file_range(src_fd, dst_fd, size - copied)
+        if n == 0:
+            break
+        copied += n
+
+
+def _move(src: Path, dst: Path, movable_root: str | Path | None = None) -> str:
+    if src.is_symlink():
+        # Already moved to another destination: link to the moved file.
+        return _hardlink(src, dst)
+    if movable_root is None or not Path(os.path.realpath(src)).is_relative_to(os.path.realpath(movable_root)):
+        emsg = f"{src} is not under the movable directory {movable_root}"
+        raise OSError(emsg)
+    _remove_existing(dst)
+    os.replace(src, dst)
+    try:
+        os.symlink(os.path.abspath(dst), src)
+    except OSError:
+        os.replace(dst, src)
+        raise
+    return "move"
+
+
+_MATERIALIZERS: Final[dict[str, Callable[[Path, Path, str | Path | None], str]]] = {
+    "hardlink": _hardlink,
+    "reflink": _reflink,
+    "symlink": _symlink,
+    "move": _move,
+}
+
+
+def remove_empty_dirs(dirs: Iterable[str | Path]) -> list[Path]:
+    """Remove the given directories that are empty.
+
+    The directories are removed deepest first, so a listed directory that only contained listed empty directories
+    is removed as well. Directories that do not exist or are not empty are left as they are.
+
+    Args:
+        dirs (Iterable[str | Path]): The candidate directories.
+
+    Returns:
+        list[Path]: The removed directories.
+    """
+    candidates = {os.path.abspath(d): Path(d) for d in dirs}
+    removed = []
+    for key in sorted(candidates, key=lambda d: d.count(os.sep), reverse=True):
+        try:
+            os.rmdir(key)
+        except OSError:
+            continue
+        removed.append(candidates[key])
+    return removed
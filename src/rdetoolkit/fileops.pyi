@@ -1,8 +1,22 @@
 from _typeshed import Incomplete as Incomplete
+from collections.abc import Iterable, Sequence
 from pathlib import Path
-from typing import Any
+from rdetoolkit.models.rde2types import EncodingDetectionResult as EncodingDetectionResult
+from typing import Any, Final
 
 logger: Incomplete
+USUAL_ENCODINGS: Final[tuple[str, ...]]
+ENCODING_BOMS: Final[tuple[tuple[bytes, str], ...]]
+DETECTION_SAMPLE_BYTES: Final[int]
+DETECTION_SAMPLE_WINDOWS: Final[tuple[str, ...]]
+MIN_SAMPLE_CONFIDENCE: Final[float]
+MATERIALIZATION_STRATEGIES: Final[tuple[str, ...]]
 
 def readf_json(path: str | Path) -> dict[str, Any]: ...
+def detect_bom_encoding(head: bytes) -> str: ...
+def detect_bytes_encoding(data: bytes) -> tuple[str, float]: ...
+def resolve_file_encoding(path: str | Path, *, data: bytes | None = None, max_bytes: int = ..., windows: Sequence[str] = ('head',), min_confidence: float = ...) -> EncodingDetectionResult: ...
+def clear_encoding_cache() -> None: ...
 def writef_json(path: str | Path, obj: dict[str, Any], *, enc: str = 'utf_8') -> dict[str, Any]: ...
+def materialize_file(src: str | Path, dst: str | Path, *, strategy: str = 'copy', movable_root: str | Path | None = None) -> str: ...
+def remove_empty_dirs(dirs: Iterable[str | Path]) -> list[Path]: ...
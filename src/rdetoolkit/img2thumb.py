@@ -11,7 +11,7 @@ from rdetoolkit.errors import catch_exception_with_message
 from rdetoolkit.exceptions import StructuredError
 
 
-def __copy_img_to_thumb(out_dir_thumb_img: str, source_img_paths: str | list[str]) -> None:
+def __copy_img_to_thumb(out_dir_thumb_img: str, source_img_paths: str | list[str]) -> int:
     """Copies the other images to the thumbnail directory.
 
     Args:
@@ -20,13 +20,18 @@ def __copy_img_to_thumb(out_dir_thumb_img: str, source_img_paths: str | list[str
 
     output_path (str | Path | None, optional): The path where the resized image will be saved. If None, the original image will be overwritten.
 
+    Returns:
+        int: The number of bytes copied.
     """
     if isinstance(source_img_paths, str):
         source_img_paths = [source_img_paths]
+    copied = 0
     for path in source_img_paths:
         basename = os.path.basename(path)
         thumb_img_path = os.path.join(out_dir_thumb_img, basename)
         shutil.copy(path, thumb_img_path)
+        copied += os.path.getsize(thumb_img_path)
+    return copied
 
 
 def __find_img_path(dirname: str, target_name: str) -> str:
@@ -44,7 +49,7 @@ def copy_images_to_thumbnail(
     *,
     target_image_name: str | None = None,
     img_ext: str | None = None,
-) -> None:
+) -> int:
     """Copy the image files in the other image folder and the main image folder to the thumbnail folder.
 
     Args:
@@ -52,6 +57,9 @@ def copy_images_to_thumbnail(
         out_dir_main_img (str): directory path where main image is saved
         target_image_name (str, optional): Specify the name of the image file to be copied to the thumbnail folder.
         img_ext (str, optional): image file extension.
+
+    Returns:
+        int: The number of bytes copied, 0 if there is no image to copy.
     """
     img_exts = [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".svg", ".webp"] if img_ext is None else [img_ext]
 
@@ -66,7 +74,8 @@ def copy_images_to_thumbnail(
         __main_img_path = img_path_main[0]
 
     if __main_img_path:
-        __copy_img_to_thumb(str(out_dir_thumb_img), __main_img_path)
+        return __copy_img_to_thumb(str(out_dir_thumb_img), __main_img_path)
+    return 0
 
 
 def resize_image(path: str | Path, width: int = 640, height: int = 480, output_path: str | Path | None = None) -> str:
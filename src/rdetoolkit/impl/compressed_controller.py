@@ -1,21 +1,198 @@
 from __future__ import annotations
 
+import functools
+import itertools
 import os
 import re
+import shutil
 import zipfile
-from pathlib import Path
-from typing import Final
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePath, PurePosixPath
+from typing import Callable, Final
 
-import charset_normalizer
 import pandas as pd
 
 from rdetoolkit.exceptions import StructuredError
+from rdetoolkit.fileops import detect_bytes_encoding
 from rdetoolkit.interfaces.filechecker import ICompressedFileStructParser
 from rdetoolkit.invoicefile import check_exist_rawfiles
 from rdetoolkit.rdelogger import get_logger
 
 logger = get_logger(__name__)
 
+ZIP_LANG_ENC_FLAG: Final = 0x800
+EXCLUDED_PATTERNS: Final = ("__MACOSX", ".DS_Store")
+EXCLUDED_REGEX: Final = re.compile(r"~\$.*\.(docx|xlsx|pptx)")
+
+
+def is_excluded_member(name: str | PurePath) -> bool:
+    """Checks whether an archive member or an extracted file should be excluded.
+
+    Args:
+        name (str | PurePath): The member name in the archive, or the path of the extracted file.
+
+    Returns:
+        bool: True if the path contains "__MACOSX" or ".DS_Store", or is an Office temporary file such as `~$data.xlsx`.
+    """
+    parts = PurePath(name).parts
+    return any(pattern in parts for pattern in EXCLUDED_PATTERNS) or bool(EXCLUDED_REGEX.search(str(name)))
+
+
+def detect_archive_filename_encoding(infolist: Sequence[zipfile.ZipInfo]) -> str:
+    """Detects the encoding of the member names of an archive with a single detection.
+
+    Names flagged as UTF-8 are left out. The raw bytes of all the other names are joined and detected at once,
+    which is both faster and more reliable than detecting each short name on its own, and gives every member
+    of the archive the same encoding.
+
+    Args:
+        infolist (Sequence[zipfile.ZipInfo]): The members of the archive, as returned by `ZipFile.infolist`.
+
+    Returns:
+        str: The detected encoding, or "cp437", the encoding defined by the ZIP specification, if the names are plain ASCII
+            or no encoding could be detected.
+    """
+    raw_names = b"\n".join(info.filename.encode("cp437") for info in infolist if not info.flag_bits & ZIP_LANG_ENC_FLAG)
+    if raw_names.isascii():
+        return "cp437"
+    enc, _ = detect_bytes_encoding(raw_names)
+    return enc or "cp437"
+
+
+def decode_member_name(info: zipfile.ZipInfo, encoding: str) -> str:
+    """Decodes the name of an archive member with the encoding resolved for its archive.
+
+    Args:
+        info (zipfile.ZipInfo): The archive member.
+        encoding (str): The filename encoding of the archive. It is not applied to names flagged as UTF-8.
+
+    Returns:
+        str: The decoded name. If it cannot be decoded with `encoding`, the name as read by `zipfile` (cp437) is returned.
+    """
+    if info.flag_bits & ZIP_LANG_ENC_FLAG:
+        return info.filename
+    try:
+        return info.filename.encode("cp437").decode(encoding)
+    except UnicodeDecodeError:
+        logger.warning(f"Failed to decode the archive member name with {encoding}: {info.filename}")
+        return info.filename
+
+
+class ZipExtractor:
+    """Extracts the members of a ZIP archive concurrently on a thread pool.
+
+    Member names are decoded with the filename encoding of the archive, detected once per archive unless
+    `filename_encoding` is given, excluded entries are skipped before they are decompressed,
+    and every member is streamed to disk in chunks, so the memory in use stays within `memory_budget`
+    however large the members are. The number of workers is capped so that each of them can hold one chunk in the budget.
+
+    Attributes:
+        chunk_size (int): The size of the buffer each worker streams a member through.
+        max_workers (int): The number of members decompressed at the same time.
+        filename_encoding (Optional[str]): The encoding of the member names not flagged as UTF-8. None detects it per archive.
+    """
+
+    DEFAULT_CHUNK_SIZE: Final = 1024 * 1024
+    DEFAULT_MEMORY_BUDGET: Final = 256 * 1024 * 1024
+
+    def __init__(
+        self,
+        *,
+        max_workers: int | None = None,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        filename_encoding: str | None = None,
+    ):
+        if memory_budget <= 0 or chunk_size <= 0:
+            emsg = f"memory_budget and chunk_size must be positive integers: {memory_budget}, {chunk_size}"
+            raise ValueError(emsg)
+        self.chunk_size = min(chunk_size, memory_budget)
+        workers = max_workers or min(8, os.cpu_count() or 1)
+        self.max_workers = max(1, min(workers, memory_budget // self.chunk_size))
+        self.filename_encoding = filename_encoding
+
+    def extract(
+        self,
+        zip_path: Path | str,
+        extract_dir: Path | str,
+        *,
+        validate: Callable[[list[PurePosixPath]], None] | None = None,
+        route: Callable[[list[PurePosixPath]], dict[PurePosixPath, Path]] | None = None,
+    ) -> list[Path]:
+        """Extracts the archive into `extract_dir` and returns the paths of the extracted files.
+
+        Args:
+            zip_path (Path | str): The path to the ZIP file to be extracted.
+            extract_dir (Path | str): The directory where the contents of the ZIP file will be extracted.
+            validate (Optional[Callable[[list[PurePosixPath]], None]]): A pre-flight check called with the relative paths of the
+                files to be extracted, as read from the central directory, before anything is written. It raises to abort
+                the extraction. Defaults to None.
+            route (Optional[Callable[[list[PurePosixPath]], dict[PurePosixPath, Path]]]): Called with the same relative paths,
+                it returns the destination of the files that should be written somewhere other than under `extract_dir`,
+                so that they are streamed straight to their final location. Defaults to None.
+
+        Returns:
+            list[Path]: The paths of the extracted files, in archive order. Directories and excluded entries are not included.
+        """
+        extract_dir = Path(extract_dir)
+        with zipfile.ZipFile(zip_path, "r") as zip_ref:
+            members = self._plan(zip_ref, extract_dir)
+            relpaths = {dest: PurePosixPath(dest.relative_to(extract_dir).as_posix()) for dest, info in members.items() if not info.is_dir()}
+            if validate is not None:
+                validate(list(relpaths.values()))
+            files = self._route(members, relpaths, route(list(relpaths.values())) if route is not None else {})
+            for directory in sorted({dest for dest, info in members.items() if info.is_dir()} | {dest.parent for dest, _ in files}):
+                directory.mkdir(parents=True, exist_ok=True)
+            self._extract_members(zip_ref, files)
+        return [dest for dest, _ in files]
+
+    @staticmethod
+    def _route(
+        members: dict[Path, zipfile.ZipInfo],
+        relpaths: dict[Path, PurePosixPath],
+        routes: dict[PurePosixPath, Path],
+    ) -> list[tuple[Path, zipfile.ZipInfo]]:
+        """Replace the destinations of the routed files. A later member with the same destination wins."""
+        files: dict[Path, zipfile.ZipInfo] = {}
+        for dest, relpath in relpaths.items():
+            final_dest = routes.get(relpath, dest)
+            files.pop(final_dest, None)
+            files[final_dest] = members[dest]
+        return list(files.items())
+
+    def _extract_members(self, zip_ref: zipfile.ZipFile, files: list[tuple[Path, zipfile.ZipInfo]]) -> None:
+        if self.max_workers == 1 or len(files) <= 1:
+            for member in files:
+                self._extract_member(zip_ref, member)
+            return
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(executor.map(functools.partial(self._extract_member, zip_ref), files))
+
+    def _plan(self, zip_ref: zipfile.ZipFile, extract_dir: Path) -> dict[Path, zipfile.ZipInfo]:
+        """Map each destination path to its member. A later member with the same destination wins, as in serial extraction."""
+        infolist = zip_ref.infolist()
+        encoding = self.filename_encoding or detect_archive_filename_encoding(infolist)
+        members: dict[Path, zipfile.ZipInfo] = {}
+        for info in infolist:
+            name = decode_member_name(info, encoding)
+            relpath = self._sanitize(name)
+            if relpath and not is_excluded_member(name):
+                members.pop(extract_dir / relpath, None)
+                members[extract_dir / relpath] = info
+        return members
+
+    def _extract_member(self, zip_ref: zipfile.ZipFile, member: tuple[Path, zipfile.ZipInfo]) -> None:
+        dest, info = member
+        with zip_ref.open(info) as src, open(dest, "wb") as dst:
+            shutil.copyfileobj(src, dst, self.chunk_size)
+
+    @staticmethod
+    def _sanitize(name: str) -> str:
+        """Drop drive letters, absolute roots and "." / ".." components, as `zipfile.ZipFile.extract` does."""
+        arcname = os.path.splitdrive(name.replace("\\", "/"))[1]
+        return "/".join(part for part in arcname.split("/") if part not in ("", os.path.curdir, os.path.pardir))
+
 
 class CompressedFlatFileParser(ICompressedFileStructParser):
     """Parser for compressed flat files, providing functionality to read and extract the contents.
@@ -26,10 +203,12 @@ class CompressedFlatFileParser(ICompressedFileStructParser):
     Attributes:
         xlsx_invoice (pd.DataFrame): DataFrame representing the expected structure or content description
             of the compressed files.
+        filename_encoding (Optional[str]): The encoding of the member names in the archive. None detects it.
     """
 
-    def __init__(self, xlsx_invoice: pd.DataFrame):
+    def __init__(self, xlsx_invoice: pd.DataFrame, *, filename_encoding: str | None = None):
         self.xlsx_invoice = xlsx_invoice
+        self.filename_encoding = filename_encoding
 
     def read(self, zipfile: Path, target_path: Path) -> list[tuple[Path, ...]]:
         """Extracts the contents of the zipfile to the target path and checks their existence against the Excelinvoice.
@@ -46,23 +225,37 @@ class CompressedFlatFileParser(ICompressedFileStructParser):
         return [(f,) for f in check_exist_rawfiles(self.xlsx_invoice, _extracted_files)]
 
     def _unpacked(self, zipfile: Path | str, target_dir: Path | str) -> list[Path]:
-        if isinstance(target_dir, str):
-            target_dir = Path(target_dir)
-        self._extract_zip_with_encoding(zipfile, target_dir)
-        return [f for f in target_dir.glob("**/*") if f.is_file() and not self._is_excluded(f)]
+        return self._extract_zip_with_encoding(zipfile, target_dir)
+
+    def _validate_members(self, members: list[PurePosixPath]) -> None:
+        """Checks, before extraction, that every raw file named in the ExcelInvoice is in the archive.
 
-    def _extract_zip_with_encoding(self, zip_path: Path | str, extract_path: Path | str) -> None:
+        Args:
+            members (list[PurePosixPath]): The relative paths of the files in the archive.
+
+        Raises:
+            StructuredError: If a file named in the ExcelInvoice is not in the archive.
+        """
+        if "data_file_names/name" not in self.xlsx_invoice.columns:
+            return
+        missing = set(self.xlsx_invoice["data_file_names/name"].dropna()) - {member.name for member in members}
+        if missing:
+            emsg = f"ERROR: raw file not found: {sorted(missing, key=str)[0]}"
+            raise StructuredError(emsg)
+
+    def _extract_zip_with_encoding(self, zip_path: Path | str, extract_path: Path | str) -> list[Path]:
         """Extracts a ZIP file, handling filenames with a specified encoding to prevent garbled text.
 
-        This function attempts to detect and correct the encoding of filenames within the ZIP file to ensure they are extracted with the correct filenames, avoiding issues with garbled text due to encoding mismatches.
+        This function detects the encoding of the filenames within the ZIP file once for the whole archive, unless `filename_encoding` is set,
+        to ensure they are extracted with the correct filenames, avoiding issues with garbled text due to encoding mismatches.
+        The members are extracted concurrently by `ZipExtractor`, and excluded entries are skipped before they are decompressed.
 
         Args:
             zip_path (Path | str): The path to the ZIP file to be extracted.
             extract_path (Path | str): The directory where the contents of the ZIP file will be extracted.
 
-        Raises:
-            ValueError: If encoding detection fails for any filename within the ZIP archive.
-            UnicodeDecodeError: If a filename cannot be decoded with the detected or specified encoding.
+        Returns:
+            list[Path]: The paths of the extracted files.
 
         Example:
             >>> zip_path = 'path/to/your/archive.zip'
@@ -70,20 +263,7 @@ class CompressedFlatFileParser(ICompressedFileStructParser):
             >>> encoding = 'utf-8'  # or 'cp932' for Japanese text, for example
             >>> self._extract_zip_with_encoding(zip_path, extract_path)
         """
-        lang_enc_flag: Final = 0x800
-        with zipfile.ZipFile(zip_path, "r") as zip_ref:
-            for zip_info in zip_ref.infolist():
-                old_filename = zip_info.filename
-                encoding = "utf-8" if zip_info.flag_bits & lang_enc_flag else "cp437"
-                enc = charset_normalizer.detect(zip_info.filename.encode(encoding))
-                if not enc.get("encoding"):
-                    enc["encoding"] = encoding
-
-                zip_info.filename = zip_info.filename.encode(encoding).decode(str(enc["encoding"]))
-                zip_ref.NameToInfo[zip_info.filename] = zip_info
-                del zip_ref.NameToInfo[old_filename]
-
-                zip_ref.extract(zip_info, extract_path)
+        return ZipExtractor(filename_encoding=self.filename_encoding).extract(zip_path, extract_path, validate=self._validate_members)
 
     def _is_excluded(self, file: Path) -> bool:
         """Checks a specific file pattern to determine whether it should be excluded.
@@ -104,9 +284,7 @@ class CompressedFlatFileParser(ICompressedFileStructParser):
             - Files containing "__MACOSX" or ".DS_Store" in their paths.
             - Files starting with "~$" and ending with ".docx", ".xlsx", or ".pptx".
         """
-        excluded_patterns = ["__MACOSX", ".DS_Store"]
-        excluded_regex = re.compile(r"~\$.*\.(docx|xlsx|pptx)")
-        return any(pattern in file.parts for pattern in excluded_patterns) or bool(excluded_regex.search(str(file)))
+        return is_excluded_member(file)
 
 
 class CompressedFolderParser(ICompressedFileStructParser):
@@ -118,10 +296,12 @@ class CompressedFolderParser(ICompressedFileStructParser):
     Attributes:
         xlsx_invoice (pd.DataFrame): DataFrame representing the expected structure or content description
             of the compressed folder contents.
+        filename_encoding (Optional[str]): The encoding of the member names in the archive. None detects it.
     """
 
-    def __init__(self, xlsx_invoice: pd.DataFrame):
+    def __init__(self, xlsx_invoice: pd.DataFrame, *, filename_encoding: str | None = None):
         self.xlsx_invoice = xlsx_invoice
+        self.filename_encoding = filename_encoding
 
     def read(self, zipfile: Path, target_path: Path) -> list[tuple[Path, ...]]:
         """Extracts the contents of the zipfile and returns validated file paths.
@@ -139,23 +319,53 @@ class CompressedFolderParser(ICompressedFileStructParser):
         return [tuple(f) for f in safe_verification_files.values()]
 
     def _unpacked(self, zipfile: Path | str, target_dir: Path | str) -> list[Path]:
-        if isinstance(target_dir, str):
-            target_dir = Path(target_dir)
-        self._extract_zip_with_encoding(zipfile, target_dir)
-        return [f for f in target_dir.glob("**/*") if f.is_file() and not self._is_excluded(f)]
+        return self._extract_zip_with_encoding(zipfile, target_dir)
+
+    def _validate_members(self, members: list[PurePosixPath]) -> None:
+        """Checks the folder structure of the archive before extraction, from the member paths alone.
+
+        The same checks as `validation_uniq_fspath` are made, and the folders holding files are compared with
+        the folders named in the first column of the ExcelInvoice, so that a mistake fails before anything is extracted.
 
-    def _extract_zip_with_encoding(self, zip_path: Path | str, extract_path: Path | str) -> None:
+        Args:
+            members (list[PurePosixPath]): The relative paths of the files in the archive.
+
+        Raises:
+            StructuredError: If two paths differ only in case, or, when the archive has more than one folder, if a folder
+                is not named in the ExcelInvoice or a folder named in the ExcelInvoice is not in the archive.
+        """
+        files = [member for member in members if member.name != "invoice_org.json"]
+        _check_unique_member_paths(files)
+        folders = {member.parent for member in files}
+        if self.xlsx_invoice.empty or len(folders) == 1:
+            # A single folder is registered for every tile.
+            return
+        self._check_folders_against_invoice(folders)
+
+    def _check_folders_against_invoice(self, folders: set[PurePosixPath]) -> None:
+        items = {str(item) for item in self.xlsx_invoice.iloc[:, 0].dropna()}
+        unused = [folder for folder in folders if items.isdisjoint(folder.parts)]
+        if unused:
+            emsg = f"ERROR: unused raw data: {sorted(unused)[0]}"
+            raise StructuredError(emsg)
+        missing = items.difference(*(folder.parts for folder in folders))
+        if missing:
+            emsg = f"ERROR: raw data not found: {sorted(missing)[0]}"
+            raise StructuredError(emsg)
+
+    def _extract_zip_with_encoding(self, zip_path: Path | str, extract_path: Path | str) -> list[Path]:
         """Extracts a ZIP file, handling filenames with a specified encoding to prevent garbled text.
 
-        This function attempts to detect and correct the encoding of filenames within the ZIP file to ensure they are extracted with the correct filenames, avoiding issues with garbled text due to encoding mismatches.
+        This function detects the encoding of the filenames within the ZIP file once for the whole archive, unless `filename_encoding` is set,
+        to ensure they are extracted with the correct filenames, avoiding issues with garbled text due to encoding mismatches.
+        The members are extracted concurrently by `ZipExtractor`, and excluded entries are skipped before they are decompressed.
 
         Args:
             zip_path (Path | str): The path to the ZIP file to be extracted.
             extract_path (Path | str): The directory where the contents of the ZIP file will be extracted.
 
-        Raises:
-            ValueError: If encoding detection fails for any filename within the ZIP archive.
-            UnicodeDecodeError: If a filename cannot be decoded with the detected or specified encoding.
+        Returns:
+            list[Path]: The paths of the extracted files.
 
         Example:
             >>> zip_path = 'path/to/your/archive.zip'
@@ -163,20 +373,7 @@ class CompressedFolderParser(ICompressedFileStructParser):
             >>> encoding = 'utf-8'  # or 'cp932' for Japanese text, for example
             >>> self._extract_zip_with_encoding(zip_path, extract_path)
         """
-        lang_enc_flag: Final = 0x800
-        with zipfile.ZipFile(zip_path, "r") as zip_ref:
-            for zip_info in zip_ref.infolist():
-                old_filename = zip_info.filename
-                encoding = "utf-8" if zip_info.flag_bits & lang_enc_flag else "cp437"
-                enc = charset_normalizer.detect(zip_info.filename.encode(encoding))
-                if not enc.get("encoding"):
-                    enc["encoding"] = encoding
-
-                zip_info.filename = zip_info.filename.encode(encoding).decode(str(enc["encoding"]))
-                zip_ref.NameToInfo[zip_info.filename] = zip_info
-                del zip_ref.NameToInfo[old_filename]
-
-                zip_ref.extract(zip_info, extract_path)
+        return ZipExtractor(filename_encoding=self.filename_encoding).extract(zip_path, extract_path, validate=self._validate_members)
 
     def _is_excluded(self, file: Path) -> bool:
         """Checks a specific file pattern to determine whether it should be excluded.
@@ -197,9 +394,7 @@ class CompressedFolderParser(ICompressedFileStructParser):
             - Files containing "__MACOSX" or ".DS_Store" in their paths.
             - Files starting with "~$" and ending with ".docx", ".xlsx", or ".pptx".
         """
-        excluded_patterns = ["__MACOSX", ".DS_Store"]
-        excluded_regex = re.compile(r"~\$.*\.(docx|xlsx|pptx)")
-        return any(pattern in file.parts for pattern in excluded_patterns) or bool(excluded_regex.search(str(file)))
+        return is_excluded_member(file)
 
     def validation_uniq_fspath(self, target_path: str | Path, exclude_names: list[str]) -> dict[str, list[Path]]:
         """Check if there are any non-unique directory names under the target directory.
@@ -246,18 +441,30 @@ class CompressedFolderParser(ICompressedFileStructParser):
         return verification_files
 
 
+def _check_unique_member_paths(files: list[PurePosixPath]) -> None:
+    """Raise if two file or folder paths in the archive differ only in case, as `validation_uniq_fspath` does after extraction."""
+    seen: dict[str, PurePosixPath] = {}
+    for path in itertools.chain(files, *(file.parents for file in files)):
+        if seen.setdefault(str(path).lower(), path) != path:
+            emsg = "ERROR: folder paths and file paths stored in a zip file must always have unique names."
+            raise StructuredError(emsg)
+
+
 def parse_compressedfile_mode(
     xlsx_invoice: pd.DataFrame,
+    *,
+    filename_encoding: str | None = None,
 ) -> ICompressedFileStructParser:
     """Parses the mode of a compressed file and returns the corresponding parser object.
 
     Args:
         xlsx_invoice (pandas.DataFrame): The invoice data in Excel format.
+        filename_encoding (Optional[str]): The encoding of the member names in the archive. None detects it per archive.
 
     Returns:
         ICompressedFileStructParser: An instance of the compressed file structure parser.
     """
     if "data_file_names/name" in xlsx_invoice.columns:
         # File Mode
-        return CompressedFlatFileParser(xlsx_invoice)
-    return CompressedFolderParser(xlsx_invoice)
+        return CompressedFlatFileParser(xlsx_invoice, filename_encoding=filename_encoding)
+    return CompressedFolderParser(xlsx_invoice, filename_encoding=filename_encoding)
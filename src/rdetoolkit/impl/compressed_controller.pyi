@@ -1,19 +1,41 @@
 import pandas as pd
+import re
+import zipfile
 from _typeshed import Incomplete as Incomplete
-from pathlib import Path
+from collections.abc import Sequence
+from pathlib import Path, PurePath, PurePosixPath
 from rdetoolkit.interfaces.filechecker import ICompressedFileStructParser as ICompressedFileStructParser
+from typing import Callable, Final
 
 logger: Incomplete
+ZIP_LANG_ENC_FLAG: Final[int]
+EXCLUDED_PATTERNS: Final[tuple[str, ...]]
+EXCLUDED_REGEX: Final[re.Pattern[str]]
+
+def is_excluded_member(name: str | PurePath) -> bool: ...
+def detect_archive_filename_encoding(infolist: Sequence[zipfile.ZipInfo]) -> str: ...
+def decode_member_name(info: zipfile.ZipInfo, encoding: str) -> str: ...
+
+class ZipExtractor:
+    DEFAULT_CHUNK_SIZE: Final[int]
+    DEFAULT_MEMORY_BUDGET: Final[int]
+    chunk_size: int
+    max_workers: int
+    filename_encoding: str | None
+    def __init__(self, *, max_workers: int | None = None, memory_budget: int = ..., chunk_size: int = ..., filename_encoding: str | None = None) -> None: ...
+    def extract(self, zip_path: Path | str, extract_dir: Path | str, *, validate: Callable[[list[PurePosixPath]], None] | None = None, route: Callable[[list[PurePosixPath]], dict[PurePosixPath, Path]] | None = None) -> list[Path]: ...
 
 class CompressedFlatFileParser(ICompressedFileStructParser):
     xlsx_invoice: Incomplete
-    def __init__(self, xlsx_invoice: pd.DataFrame) -> None: ...
+    filename_encoding: str | None
+    def __init__(self, xlsx_invoice: pd.DataFrame, *, filename_encoding: str | None = None) -> None: ...
     def read(self, zipfile: Path, target_path: Path) -> list[tuple[Path, ...]]: ...
 
 class CompressedFolderParser(ICompressedFileStructParser):
     xlsx_invoice: Incomplete
-    def __init__(self, xlsx_invoice: pd.DataFrame) -> None: ...
+    filename_encoding: str | None
+    def __init__(self, xlsx_invoice: pd.DataFrame, *, filename_encoding: str | None = None) -> None: ...
     def read(self, zipfile: Path, target_path: Path) -> list[tuple[Path, ...]]: ...
     def validation_uniq_fspath(self, target_path: str | Path, exclude_names: list[str]) -> dict[str, list[Path]]: ...
 
-def parse_compressedfile_mode(xlsx_invoice: pd.DataFrame) -> ICompressedFileStructParser: ...
+def parse_compressedfile_mode(xlsx_invoice: pd.DataFrame, *, filename_encoding: str | None = None) -> ICompressedFileStructParser: ...
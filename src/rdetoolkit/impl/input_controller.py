@@ -4,20 +4,40 @@ import re
 import shutil
 from collections import defaultdict
 from collections.abc import Sequence
-from pathlib import Path
+from pathlib import Path, PurePath, PurePosixPath
+from typing import Final
 
+from rdetoolkit.core import DirectoryOps
 from rdetoolkit.exceptions import StructuredError
 from rdetoolkit.impl import compressed_controller
 from rdetoolkit.interfaces.filechecker import IInputFileChecker
-from rdetoolkit.invoicefile import read_excelinvoice
+from rdetoolkit.invoicefile import ExcelInvoiceFile
 from rdetoolkit.models.rde2types import (
     ExcelInvoicePathList,
-    InputFilesGroup,
+    InputManifest,
     OtherFilesPathList,
     RawFiles,
     ZipFilesPathList,
 )
 
+# The output directories that members of an RDE Format archive are copied to, in order of precedence.
+RDEFORMAT_OUTPUT_DIRS: Final = ("raw", "main_image", "other_image", "meta", "structured", "logs", "nonshared_raw")
+
+
+def get_input_manifest(src_dir_input: Path, manifest: InputManifest | None = None) -> InputManifest:
+    """Return `manifest` if it was built for `src_dir_input`, or scan the directory.
+
+    Args:
+        src_dir_input (Path): The input directory.
+        manifest (Optional[InputManifest]): A manifest built beforehand, e.g. by `selected_input_checker`. Defaults to None.
+
+    Returns:
+        InputManifest: The manifest of `src_dir_input`.
+    """
+    if manifest is not None and manifest.directory == src_dir_input:
+        return manifest
+    return InputManifest.scan(src_dir_input)
+
 
 class InvoiceChecker(IInputFileChecker):
     """A checker class to determine and parse the invoice mode.
@@ -27,13 +47,15 @@ class InvoiceChecker(IInputFileChecker):
 
     Attributes:
         out_dir_temp (Path): Temporary directory for the unpacked content.
+        manifest (Optional[InputManifest]): The manifest of the input directory, if it has already been scanned.
 
     Note:
         For the purpose of this checker, notable files are primarily Excel invoices with a specific naming convention.
     """
 
-    def __init__(self, unpacked_dir_basename: Path):
+    def __init__(self, unpacked_dir_basename: Path, *, manifest: InputManifest | None = None):
         self.out_dir_temp = unpacked_dir_basename
+        self.manifest = manifest
 
     def parse(self, src_dir_input: Path) -> tuple[RawFiles, Path | None]:
         """Parses the source input directory, grouping files based on their type.
@@ -47,21 +69,10 @@ class InvoiceChecker(IInputFileChecker):
                 - RawFiles: A list of tuples where each tuple contains file paths grouped as 'other files'.
                 - Optional[Path]: This is always None for this implementation.
         """
-        input_files = list(src_dir_input.glob("*"))
-        zipfiles, _, other_files = self._get_group_by_files(input_files)
-        if not isinstance(other_files, list):
-            other_files = list(other_files)
-        if zipfiles:
-            other_files.extend(zipfiles)
-        rawfiles = [tuple(other_files)]
+        zipfiles, _, other_files = get_input_manifest(src_dir_input, self.manifest).group_by_files()
+        rawfiles = [(*other_files, *zipfiles)]
         return rawfiles, None
 
-    def _get_group_by_files(self, input_files: list[Path]) -> InputFilesGroup:
-        zipfiles = [f for f in input_files if f.suffix.lower() == ".zip"]
-        excel_invoice_files = [f for f in input_files if f.suffix.lower() in [".xls", "xlsx"] and f.stem.endswith("_excel_invoice")]
-        other_files = [f for f in input_files if f not in zipfiles and f not in excel_invoice_files]
-        return zipfiles, excel_invoice_files, other_files
-
 
 class ExcelInvoiceChecker(IInputFileChecker):
     """A checker class to determine and parse the ExcelInvoice mode.
@@ -71,14 +82,21 @@ class ExcelInvoiceChecker(IInputFileChecker):
 
     Attributes:
         out_dir_temp (Path): Temporary directory for unpacked content.
+        excel_invoice (Optional[ExcelInvoiceFile]): The Excel Invoice parsed by `parse`. It is kept so that the mode processor
+            can reuse it for every data tile instead of reading the workbook again. None until `parse` is called.
+        archive_filename_encoding (Optional[str]): The encoding of the filenames in the input ZIP file. None detects it.
+        manifest (Optional[InputManifest]): The manifest of the input directory, if it has already been scanned.
 
     Methods:
         parse(src_dir_input: Path) -> tuple[RawFiles, Optional[Path]]:
             Parse the source input directory, validate the file groups, and return the raw files and the Excel Invoice file.
     """
 
-    def __init__(self, unpacked_dir_basename: Path):
+    def __init__(self, unpacked_dir_basename: Path, *, archive_filename_encoding: str | None = None, manifest: InputManifest | None = None):
         self.out_dir_temp = unpacked_dir_basename
+        self.excel_invoice: ExcelInvoiceFile | None = None
+        self.archive_filename_encoding = archive_filename_encoding
+        self.manifest = manifest
 
     def parse(self, src_dir_input: Path) -> tuple[RawFiles, Path | None]:
         """Parse the source input directory, group files by their type, validate the groups, and return the raw files and Excel Invoice file.
@@ -92,27 +110,21 @@ class ExcelInvoiceChecker(IInputFileChecker):
                 - RawFiles: List of tuples containing paths of raw files.
                 - Optional[Path]: Path to the Excel Invoice file.
         """
-        input_files = list(src_dir_input.glob("*"))
-        zipfiles, excel_invoice_files, other_files = self._get_group_by_files(input_files)
+        zipfiles, excel_invoice_files, other_files = get_input_manifest(src_dir_input, self.manifest).group_by_files()
         self._validate_files(zipfiles, excel_invoice_files, other_files)
 
         rawfiles = self._get_rawfiles(zipfiles[0], excel_invoice_files[0]) if zipfiles else self._get_rawfiles(None, excel_invoice_files[0])
 
         return rawfiles, excel_invoice_files[0]
 
-    def _get_group_by_files(self, input_files: list[Path]) -> InputFilesGroup:
-        zipfiles = [f for f in input_files if f.suffix.lower() == ".zip"]
-        excel_invoice_files = [f for f in input_files if f.suffix.lower() in [".xls", ".xlsx"] and f.stem.endswith("_excel_invoice")]
-        other_files = [f for f in input_files if f not in zipfiles and f not in excel_invoice_files]
-        return zipfiles, excel_invoice_files, other_files
-
     def _get_rawfiles(self, zipfile: Path | None, excel_invoice_file: Path) -> list[tuple[Path, ...]]:
-        df_excel_invoice, _, _ = read_excelinvoice(excel_invoice_file)
+        self.excel_invoice = ExcelInvoiceFile(excel_invoice_file)
+        df_excel_invoice = self.excel_invoice.dfexcelinvoice
         original_sort_items = df_excel_invoice.iloc[:, 0].to_list()
         if zipfile is None:
             return [() for _ in range(len(df_excel_invoice["basic/dataName"]))]
 
-        archive_parser = compressed_controller.parse_compressedfile_mode(df_excel_invoice)
+        archive_parser = compressed_controller.parse_compressedfile_mode(df_excel_invoice, filename_encoding=self.archive_filename_encoding)
         _parse = archive_parser.read(zipfile, self.out_dir_temp)
 
         # When storing the same filename in all tiles, fill the values with
@@ -170,12 +182,32 @@ class RDEFormatChecker(IInputFileChecker):
     This class is designed to handle files in the RDE Format. It checks the presence of ZIP files,
     unpacks them, and retrieves raw files from the unpacked content.
 
+    When `output_dir` is given, the archive is not unpacked into the temporary directory first. The data tile and the
+    output directory of each member are computed from the central directory, and the members under one of
+    `RDEFORMAT_OUTPUT_DIRS` are streamed straight to that directory of their data tile. Only the other members,
+    e.g. those under `inputdata`, are extracted to the temporary directory.
+
     Attributes:
         out_dir_temp (Path): Temporary directory for unpacked content.
+        output_dir (Optional[Path]): The base directory of the data tile directories, e.g. `data`. None unpacks everything
+            into `out_dir_temp`.
+        archive_filename_encoding (Optional[str]): The encoding of the filenames in the input ZIP file, used when `output_dir` is given.
+            None detects it.
+        manifest (Optional[InputManifest]): The manifest of the input directory, if it has already been scanned.
     """
 
-    def __init__(self, unpacked_dir_basename: Path):
+    def __init__(
+        self,
+        unpacked_dir_basename: Path,
+        *,
+        output_dir: Path | None = None,
+        archive_filename_encoding: str | None = None,
+        manifest: InputManifest | None = None,
+    ):
         self.out_dir_temp = unpacked_dir_basename
+        self.output_dir = output_dir
+        self.archive_filename_encoding = archive_filename_encoding
+        self.manifest = manifest
 
     def parse(self, src_dir_input: Path) -> tuple[RawFiles, Path | None]:
         """Parse the source input directory, identify ZIP files, unpack the ZIP file, and return the raw files.
@@ -189,18 +221,16 @@ class RDEFormatChecker(IInputFileChecker):
                 - RawFiles: List of tuples containing paths of raw files.
                 - Optional[Path]: This will always return None for this implementation.
         """
-        input_files = list(src_dir_input.glob("*"))
-        zipfiles = self._get_zipfiles(input_files)
+        zipfiles, _, _ = get_input_manifest(src_dir_input, self.manifest).group_by_files()
         if len(zipfiles) != 1:
             emsg = "ERROR: no zipped input files"
             raise StructuredError(emsg)
+        if self.output_dir is not None:
+            return self._extract_to_tile_dirs(zipfiles[0], self.output_dir), None
         unpacked_files = self._unpacked(zipfiles[0], self.out_dir_temp)
         _rawfiles = self._get_rawfiles(unpacked_files)
         return _rawfiles, None
 
-    def _get_zipfiles(self, input_files: list[Path]) -> ZipFilesPathList:
-        return [f for f in input_files if f.suffix.lower() == ".zip"]
-
     def _unpacked(self, zipfile: Path, target_dir: Path) -> list[Path]:
         shutil.unpack_archive(zipfile, self.out_dir_temp)
         return [f for f in target_dir.glob("**/*") if f.is_file()]
@@ -208,17 +238,45 @@ class RDEFormatChecker(IInputFileChecker):
     def _get_rawfiles(self, unpacked_files: list[Path]) -> RawFiles:
         _rdefmt_file_groups = defaultdict(list)
         for f in unpacked_files:
-            match = re.search(r"/(\d{4})/", str(f))
-            if match:
-                idx_folder_num = int(match.group(1))
-                _rdefmt_file_groups[idx_folder_num].append(f)
-            else:
-                _rdefmt_file_groups[0].append(f)
+            _rdefmt_file_groups[_get_tile_folder_number(f)].append(f)
 
         if _rdefmt_file_groups:
             return [tuple(_rdefmt_file_groups[key]) for key in sorted(_rdefmt_file_groups.keys())]
         return [()]
 
+    def _extract_to_tile_dirs(self, zipfile: Path, output_dir: Path) -> RawFiles:
+        """Extract the archive with each member streamed to its final directory, and group the files by data tile."""
+        tile_folder_numbers: dict[Path, int] = {}
+
+        def route(members: list[PurePosixPath]) -> dict[PurePosixPath, Path]:
+            numbers = {member: _get_tile_folder_number(PurePosixPath("/", member)) for member in members}
+            # Data tiles are numbered in order of their folders, as `_get_rawfiles` does.
+            tile_indices = {number: idx for idx, number in enumerate(sorted(set(numbers.values())))}
+            dir_ops = DirectoryOps(str(output_dir))
+            routes = {}
+            for member, number in numbers.items():
+                dest = self.out_dir_temp / member
+                # The directory is chosen by precedence, not by position in the path, as `copy_input_to_rawfile_for_rdeformat` does.
+                dirname = next((name for name in RDEFORMAT_OUTPUT_DIRS if name in member.parts), None)
+                if dirname is not None:
+                    dest = Path(getattr(dir_ops, dirname)(tile_indices[number]).path, member.name)
+                    routes[member] = dest
+                tile_folder_numbers[dest] = number
+            return routes
+
+        extractor = compressed_controller.ZipExtractor(filename_encoding=self.archive_filename_encoding)
+        extracted_files = extractor.extract(zipfile, self.out_dir_temp, route=route)
+        groups: defaultdict[int, list[Path]] = defaultdict(list)
+        for f in extracted_files:
+            groups[tile_folder_numbers[f]].append(f)
+        return [tuple(groups[key]) for key in sorted(groups)] if groups else [()]
+
+
+def _get_tile_folder_number(path: PurePath) -> int:
+    """Return the number of the `divided/NNNN` folder a file of an RDE Format archive belongs to, or 0."""
+    match = re.search(r"/(\d{4})/", str(path))
+    return int(match.group(1)) if match else 0
+
 
 class MultiFileChecker(IInputFileChecker):
     """A checker class to identify and parse the MultiFile mode.
@@ -228,10 +286,12 @@ class MultiFileChecker(IInputFileChecker):
 
     Attributes:
         out_dir_temp (Path): Temporary directory used for certain operations.
+        manifest (Optional[InputManifest]): The manifest of the input directory, if it has already been scanned.
     """
 
-    def __init__(self, unpacked_dir_basename: Path):
+    def __init__(self, unpacked_dir_basename: Path, *, manifest: InputManifest | None = None):
         self.out_dir_temp = unpacked_dir_basename
+        self.manifest = manifest
 
     def parse(self, src_dir_input: Path) -> tuple[RawFiles, Path | None]:
         """Parse the source input directory, group ZIP files and other files, and return the raw files.
@@ -245,15 +305,10 @@ class MultiFileChecker(IInputFileChecker):
                 - RawFiles: List of tuples containing paths of raw files.
                 - Optional[Path]: This will always return None for this implementation.
         """
-        input_files = list(src_dir_input.glob("*"))
-        other_files = self._get_group_by_files(input_files)
-        _rawfiles: list[tuple[Path, ...]] = [(f,) for f in other_files]
+        manifest = get_input_manifest(src_dir_input, self.manifest)
+        _rawfiles: list[tuple[Path, ...]] = [(entry.path,) for entry in manifest.entries if not entry.is_excel_invoice]
         return sorted(_rawfiles, key=lambda path: str(path)), None
 
-    def _get_group_by_files(self, input_files: list[Path]) -> OtherFilesPathList:
-        excel_invoice_files = [f for f in input_files if f.suffix.lower() in [".xls", "xlsx"] and f.stem.endswith("_excel_invoice")]
-        return [f for f in input_files if f not in excel_invoice_files]
-
     def _unpacked(self, zipfile: Path, target_dir: Path) -> list[Path]:
         shutil.unpack_archive(zipfile, self.out_dir_temp)
         return [f for f in target_dir.glob("**/*") if f.is_file()]
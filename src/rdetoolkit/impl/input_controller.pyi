@@ -1,26 +1,39 @@
 from _typeshed import Incomplete as Incomplete
 from collections.abc import Sequence
 from pathlib import Path
+from typing import Final
 from rdetoolkit.interfaces.filechecker import IInputFileChecker as IInputFileChecker
-from rdetoolkit.models.rde2types import RawFiles as RawFiles
+from rdetoolkit.invoicefile import ExcelInvoiceFile as ExcelInvoiceFile
+from rdetoolkit.models.rde2types import InputManifest as InputManifest, RawFiles as RawFiles
+
+RDEFORMAT_OUTPUT_DIRS: Final[tuple[str, ...]]
+def get_input_manifest(src_dir_input: Path, manifest: InputManifest | None = None) -> InputManifest: ...
 
 class InvoiceChecker(IInputFileChecker):
     out_dir_temp: Incomplete
-    def __init__(self, unpacked_dir_basename: Path) -> None: ...
+    manifest: InputManifest | None
+    def __init__(self, unpacked_dir_basename: Path, *, manifest: InputManifest | None = None) -> None: ...
     def parse(self, src_dir_input: Path) -> tuple[RawFiles, Path | None]: ...
 
 class ExcelInvoiceChecker(IInputFileChecker):
     out_dir_temp: Incomplete
-    def __init__(self, unpacked_dir_basename: Path) -> None: ...
+    excel_invoice: ExcelInvoiceFile | None
+    archive_filename_encoding: str | None
+    manifest: InputManifest | None
+    def __init__(self, unpacked_dir_basename: Path, *, archive_filename_encoding: str | None = None, manifest: InputManifest | None = None) -> None: ...
     def parse(self, src_dir_input: Path) -> tuple[RawFiles, Path | None]: ...
     def get_index(self, paths: Path, sort_items: Sequence) -> int: ...
 
 class RDEFormatChecker(IInputFileChecker):
     out_dir_temp: Incomplete
-    def __init__(self, unpacked_dir_basename: Path) -> None: ...
+    output_dir: Path | None
+    archive_filename_encoding: str | None
+    manifest: InputManifest | None
+    def __init__(self, unpacked_dir_basename: Path, *, output_dir: Path | None = None, archive_filename_encoding: str | None = None, manifest: InputManifest | None = None) -> None: ...
     def parse(self, src_dir_input: Path) -> tuple[RawFiles, Path | None]: ...
 
 class MultiFileChecker(IInputFileChecker):
     out_dir_temp: Incomplete
-    def __init__(self, unpacked_dir_basename: Path) -> None: ...
+    manifest: InputManifest | None
+    def __init__(self, unpacked_dir_basename: Path, *, manifest: InputManifest | None = None) -> None: ...
     def parse(self, src_dir_input: Path) -> tuple[RawFiles, Path | None]: ...
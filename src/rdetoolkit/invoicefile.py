@@ -1,22 +1,27 @@
 from __future__ import annotations
 
 import copy
+import functools
 import json
 import os
 import shutil
 import sys
+from collections.abc import Sequence
 from pathlib import Path
 from typing import Any, Callable, Literal, Protocol, Union
 
-import chardet
+import numpy as np
+import openpyxl
 import pandas as pd
+from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
 from openpyxl.styles import Border, Font, Side
 from openpyxl.utils import get_column_letter
+from pandas.io.parsers import TextParser
 from pydantic import ValidationError
 
 from rdetoolkit import __version__, rde2util
 from rdetoolkit.exceptions import InvoiceSchemaValidationError, StructuredError
-from rdetoolkit.fileops import readf_json, writef_json
+from rdetoolkit.fileops import readf_json, resolve_file_encoding, writef_json
 from rdetoolkit.models.invoice import FixedHeaders, GeneralAttributeConfig, GeneralTermRegistry, SpecificAttributeConfig, SpecificTermRegistry, TemplateConfig
 from rdetoolkit.models.invoice_schema import InvoiceSchemaJson, SampleField, SpecificProperty
 from rdetoolkit.models.rde2types import RdeFsPath, RdeOutputResourcePath
@@ -27,6 +32,77 @@ EX_GENERALTERM = STATIC_DIR / "ex_generalterm.csv"
 EX_SPECIFICTERM = STATIC_DIR / "ex_specificterm.csv"
 
 
+def read_excelinvoice_sheets(excelinvoice_filepath: RdeFsPath) -> dict[str, pd.DataFrame]:
+    """Reads only the sheets of an ExcelInvoice that are used for the structuring process.
+
+    The sheets are streamed with the read-only mode of openpyxl. Other sheets left in the workbook are skipped after
+    reading their first cell, and formatted but empty cells after the last data row and column are not kept in memory.
+    The returned dataframes are the same as those of `pd.read_excel(path, sheet_name=None, dtype=str, header=None, index_col=None)`
+    for the sheets that are returned. Files that openpyxl cannot read (e.g. `.xls`) are read with `pd.read_excel`.
+
+    Args:
+        excelinvoice_filepath (RdeFsPath): The file path of the Excel invoice file.
+
+    Returns:
+        dict[str, pd.DataFrame]: The dataframes of the sheets containing 'invoiceList_format_id' in cell A1 and the 'generalTerm'
+        and 'specificTerm' sheets, keyed by sheet name in workbook order.
+    """
+    if Path(excelinvoice_filepath).suffix.lower() not in (".xlsx", ".xlsm"):
+        dct_sheets = pd.read_excel(excelinvoice_filepath, sheet_name=None, dtype=str, header=None, index_col=None)
+        return {sh_name: df for sh_name, df in dct_sheets.items() if __is_excelinvoice_sheet(sh_name, df)}
+
+    wb = openpyxl.load_workbook(excelinvoice_filepath, read_only=True, data_only=True, keep_links=False)
+    try:
+        dct_sheets = {}
+        for ws in wb.worksheets:
+            ws.reset_dimensions()
+            first_row = next(ws.iter_rows(min_row=1, max_row=1, max_col=1), ())
+            if (first_row and __convert_cell(first_row[0]) == "invoiceList_format_id") or ws.title in ("generalTerm", "specificTerm"):
+                dct_sheets[ws.title] = __read_sheet_as_dataframe(ws)
+        return dct_sheets
+    finally:
+        wb.close()
+
+
+def __is_excelinvoice_sheet(sh_name: str, df: pd.DataFrame) -> bool:
+    if sh_name in ("generalTerm", "specificTerm"):
+        return True
+    return not df.empty and df.iat[0, 0] == "invoiceList_format_id"
+
+
+def __read_sheet_as_dataframe(ws: Any) -> pd.DataFrame:
+    # Same conversion as the openpyxl reader of pandas, except that trailing empty rows are never buffered.
+    data: list[list[Any]] = []
+    num_pending_empty_rows = 0
+    for row in ws.iter_rows():
+        converted_row = [__convert_cell(cell) for cell in row]
+        while converted_row and converted_row[-1] == "":
+            converted_row.pop()
+        if not converted_row:
+            num_pending_empty_rows += 1
+            continue
+        data.extend([] for _ in range(num_pending_empty_rows))
+        num_pending_empty_rows = 0
+        data.append(converted_row)
+
+    if not data:
+        return pd.DataFrame()
+    max_width = max(len(data_row) for data_row in data)
+    data = [data_row + [""] * (max_width - len(data_row)) for data_row in data]
+    return TextParser(data, header=None, index_col=None, dtype=str, skip_blank_lines=False).read()
+
+
+def __convert_cell(cell: Any) -> Any:
+    if cell.value is None:
+        return ""
+    if cell.data_type == TYPE_ERROR:
+        return np.nan
+    if cell.data_type == TYPE_NUMERIC:
+        val = int(cell.value)
+        return val if val == cell.value else float(cell.value)
+    return cell.value
+
+
 def read_excelinvoice(excelinvoice_filepath: RdeFsPath) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
     """Reads an ExcelInvoice and processes each sheet into a dataframe.
 
@@ -44,7 +120,7 @@ def read_excelinvoice(excelinvoice_filepath: RdeFsPath) -> tuple[pd.DataFrame, p
     Raises:
         StructuredError: If there are multiple sheets with `invoiceList_format_id` in the ExcelInvoice, or if no sheets are present in the ExcelInvoice.
     """
-    dct_sheets = pd.read_excel(excelinvoice_filepath, sheet_name=None, dtype=str, header=None, index_col=None)
+    dct_sheets = read_excelinvoice_sheets(excelinvoice_filepath)
     dfexcelinvoice = None
     df_general = None
     df_specific = None
@@ -146,11 +222,9 @@ def overwrite_invoicefile_for_dpfterm(
         invoiceschema_filepath (RdeFsPath): The file path of invoice.schema.json.
         invoice_info (dict[str, Any]): Information about the invoice file.
     """
-    with open(invoiceschema_filepath, "rb") as f:
-        data = f.read()
-    enc = chardet.detect(data)["encoding"]
-    with open(invoiceschema_filepath, encoding=enc) as f:
-        invoiceschema_obj = json.load(f)
+    data = Path(invoiceschema_filepath).read_bytes()
+    enc = resolve_file_encoding(invoiceschema_filepath, data=data).encoding
+    invoiceschema_obj = json.loads(data.decode(enc))
     for k, v in invoice_info.items():
         _assign_invoice_val(invoiceobj, "custom", k, v, invoiceschema_obj)
     with open(invoice_dst_filepath, "w", encoding=enc) as fout:
@@ -540,7 +614,7 @@ class ExcelInvoiceFile:
             emsg = f"ERROR: excelinvoice not found {target_path}"
             raise StructuredError(emsg)
 
-        dct_sheets = pd.read_excel(target_path, sheet_name=None, dtype=str, header=None, index_col=None)
+        dct_sheets = read_excelinvoice_sheets(target_path)
 
         dfexcelinvoice, df_general, df_specific = None, None, None
         for sh_name, df in dct_sheets.items():
@@ -645,32 +719,176 @@ class ExcelInvoiceFile:
             emsg = "Failed to save the invoice file."
             raise StructuredError(emsg) from e
 
-    def overwrite(self, invoice_org: Path, dist_path: Path, invoice_schema_path: Path, idx: int) -> None:
+    def overwrite(
+        self,
+        invoice_org: Path,
+        dist_path: Path | None,
+        invoice_schema_path: Path,
+        idx: int,
+        *,
+        invoice_org_obj: dict[str, Any] | None = None,
+        invoice_schema_obj: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
         """Overwrites the content of the original invoice file based on the data from the Excel invoice and saves it as a new file.
 
         Args:
             invoice_org (Path): Path to the original invoice file.
-            dist_path (Path): Path to where the overwritten invoice file will be saved.
+            dist_path (Optional[Path]): Path to where the overwritten invoice file will be saved. If None, the invoice is only returned.
             invoice_schema_path (Path): Path to the invoice schema.
             idx (int): Index of the target row in the invoice dataframe.
+            invoice_org_obj (Optional[dict[str, Any]]): The already parsed original invoice. If specified, `invoice_org` is not read.
+                The object is copied before being modified. Defaults to None.
+            invoice_schema_obj (Optional[dict[str, Any]]): The already parsed invoice schema. If specified, `invoice_schema_path` is not read.
+                Defaults to None.
+
+        Returns:
+            dict[str, Any]: The overwritten invoice.
         """
-        invoice_schema_obj = readf_json(invoice_schema_path)
-        invoice_obj = readf_json(invoice_org)
+        if invoice_schema_obj is None:
+            invoice_schema_obj = readf_json(invoice_schema_path)
+        if invoice_org_obj is None:
+            invoice_org_obj = readf_json(invoice_org)
+
+        invoice_obj = self._build_invoice_objs([idx], invoice_org_obj, invoice_schema_obj)[0]
+        if dist_path is not None:
+            writef_json(dist_path, invoice_obj, enc="utf_8")
+        return invoice_obj
 
+    def overwrite_all(
+        self,
+        invoice_org: Path,
+        invoice_schema_path: Path,
+        dist_paths: Sequence[Path] | None = None,
+        *,
+        invoice_org_obj: dict[str, Any] | None = None,
+        invoice_schema_obj: dict[str, Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Generates the invoice of every row of the Excel invoice in a single pass.
+
+        The destination in invoice.json of each column of the Excel invoice, the term ID lookups of generalTerm/specificTerm
+        and the schema type and format of custom fields are resolved once per column, and the values of a custom column are
+        cast for all rows in one pass, instead of once per cell as when `overwrite` is called for each row.
+
+        Args:
+            invoice_org (Path): Path to the original invoice file.
+            invoice_schema_path (Path): Path to the invoice schema.
+            dist_paths (Optional[Sequence[Path]]): Paths to where the invoice of each row will be saved, in row order.
+                If not specified, the invoices are only returned. Defaults to None.
+            invoice_org_obj (Optional[dict[str, Any]]): The already parsed original invoice. If specified, `invoice_org` is not read. Defaults to None.
+            invoice_schema_obj (Optional[dict[str, Any]]): The already parsed invoice schema. If specified, `invoice_schema_path` is not read. Defaults to None.
+
+        Returns:
+            list[dict[str, Any]]: The invoice of each row of the Excel invoice, in row order.
+
+        Raises:
+            StructuredError: If the number of `dist_paths` does not match the number of rows, if a term of generalTerm/specificTerm
+                is not defined, or if a custom value cannot be cast.
+
+        Example:
+            ```python
+            excel_invoice = ExcelInvoiceFile(Path("data/inputdata/sample_excel_invoice.xlsx"))
+            dist_paths = [Path("data/divided", f"{idx:04d}", "invoice", "invoice.json") for idx in range(len(excel_invoice.dfexcelinvoice))]
+            excel_invoice.overwrite_all(Path("data/temp/invoice_org.json"), Path("data/tasksupport/invoice.schema.json"), dist_paths)
+            ```
+        """
+        num_rows = len(self.dfexcelinvoice)
+        if dist_paths is not None and len(dist_paths) != num_rows:
+            emsg = f"ERROR: the number of destination paths ({len(dist_paths)}) does not match the number of rows in the excelinvoice ({num_rows})"
+            raise StructuredError(emsg)
+        if invoice_schema_obj is None:
+            invoice_schema_obj = readf_json(invoice_schema_path)
+        if invoice_org_obj is None:
+            invoice_org_obj = readf_json(invoice_org)
+
+        invoice_objs = self._build_invoice_objs(range(num_rows), invoice_org_obj, invoice_schema_obj)
+        if dist_paths is not None:
+            for dist_path, invoice_obj in zip(dist_paths, invoice_objs):
+                writef_json(dist_path, invoice_obj, enc="utf_8")
+        return invoice_objs
+
+    def _build_invoice_objs(self, rows: Sequence[int], invoice_org_obj: dict[str, Any], invoice_schema_obj: dict[str, Any]) -> list[dict[str, Any]]:
+        template = self._initialize_invoice(invoice_org_obj)
+        invoice_objs = [copy.deepcopy(template) for _ in rows]
+        term_ids = {"sample.general": self._get_term_id_lookup(self.df_general), "sample.specific": self._get_term_id_lookup(self.df_specific)}
+        for col_pos, key in enumerate(self.dfexcelinvoice.columns):
+            values = self.dfexcelinvoice.iloc[list(rows), col_pos].tolist()
+            targets = [(obj, value) for obj, value in zip(invoice_objs, values) if not pd.isnull(value)]
+            assign = self._get_column_assigner(key, template, term_ids) if targets else None
+            if assign is None:
+                continue
+            column = self._cast_column(key, [value for _, value in targets], invoice_schema_obj)
+            for (obj, _), value in zip(targets, column):
+                assign(obj, value)
+
+        for obj in invoice_objs:
+            self._ensure_sample_id_order(obj)
+        return invoice_objs
+
+    def _initialize_invoice(self, invoice_org_obj: dict[str, Any]) -> dict[str, Any]:
         # Initialize to prevent original values from being retained when Excel invoice cells are empty.
         # Tags and related samples are not supported in this version of the Excel invoice.
-        for key, value in invoice_obj.items():
+        template = copy.deepcopy(invoice_org_obj)
+        for key, value in template.items():
             if key == "sample":
                 self._initialize_sample(value)
             else:
                 self._initialize_non_sample(key, value)
+        return template
+
+    def _get_column_assigner(
+        self,
+        key: str,
+        template: dict[str, Any],
+        term_ids: dict[str, dict[str, str]],
+    ) -> Callable[[dict[str, Any], Any], None] | None:
+        """Resolve, once per column, the function that assigns an already cast value of the column to an invoice object."""
+        section, _, cval = key.partition("/")
+        if section in ("basic", "custom", "sample"):
+            return functools.partial(self._assign_section_value, section, cval)
+        if section not in term_ids:
+            return None
+
+        key_name = f"{section}.{cval}"
+        if key_name not in term_ids[section]:
+            emsg = f"ERROR: {key_name} is not defined in the term sheet of the excelinvoice"
+            raise StructuredError(emsg)
+        attribute_name = "generalAttributes" if section == "sample.general" else "specificAttributes"
+        for attr_pos, dictobj in enumerate(template.get("sample", {}).get(attribute_name, [])):
+            if dictobj.get("termId") == term_ids[section][key_name]:
+                return functools.partial(self._assign_attribute_value, attribute_name, attr_pos)
+        return None
 
-        for k, valstr in self.dfexcelinvoice.iloc[idx, :].dropna().items():
-            self._assign_value_to_invoice(k, valstr, invoice_obj, invoice_schema_obj)
+    @staticmethod
+    def _cast_column(key: str, values: list[Any], invoice_schema_obj: dict[str, Any]) -> list[Any]:
+        """Cast the values of a column for all rows at once. Only custom values are cast, with the type and format of their schema."""
+        section, _, cval = key.partition("/")
+        if section == "sample" and cval == "names":
+            return [[value] for value in values]
+        if section != "custom":
+            return values
+        dct_schema = invoice_schema_obj["properties"][section]["properties"][cval]
+        try:
+            return rde2util.castvals(values, dct_schema["type"], dct_schema.get("format"))
+        except StructuredError as struct_err:
+            emsg = f"ERROR: failed to cast invoice value for key [{section}][{cval}]"
+            raise StructuredError(emsg) from struct_err
 
-        self._ensure_sample_id_order(invoice_obj)
+    @staticmethod
+    def _assign_section_value(section: str, key: str, invoice_obj: dict[str, Any], value: Any) -> None:
+        invoice_obj[section][key] = value
 
-        writef_json(dist_path, invoice_obj, enc="utf_8")
+    @staticmethod
+    def _assign_attribute_value(attribute_name: str, attr_pos: int, invoice_obj: dict[str, Any], value: Any) -> None:
+        invoice_obj["sample"][attribute_name][attr_pos]["value"] = value
+
+    @staticmethod
+    def _get_term_id_lookup(df_term: pd.DataFrame | None) -> dict[str, str]:
+        if df_term is None:
+            return {}
+        lookup: dict[str, str] = {}
+        for key_name, term_id in zip(df_term["key_name"], df_term["term_id"]):
+            lookup.setdefault(key_name, term_id)
+        return lookup
 
     @staticmethod
     def check_intermittent_empty_rows(df: pd.DataFrame) -> None:
@@ -695,51 +913,6 @@ class ExcelInvoiceFile:
     def __is_empty_row(row: pd.Series) -> bool:
         return all(cell == "" or pd.isnull(cell) for cell in row)
 
-    def _assign_value_to_invoice(self, key: str, value: str, invoice_obj: dict, schema_obj: dict) -> None:
-        assign_funcs: dict[str, Callable[[str, str, dict[Any, Any], dict[Any, Any]], None]] = {
-            "basic/": self._assign_basic,
-            "sample/": self._assign_sample,
-            "sample.general/": self._assign_sample_general,
-            "sample.specific/": self._assign_sample_specific,
-            "custom/": self._assign_custom,
-        }
-
-        for prefix, func in assign_funcs.items():
-            if key.startswith(prefix):
-                func(key, value, invoice_obj, schema_obj)
-                break
-
-    def _assign_basic(self, key: str, value: str, invoice_obj: dict, schema_obj: dict) -> None:
-        cval = key.replace("basic/", "")
-        _assign_invoice_val(invoice_obj, "basic", cval, value, schema_obj)
-
-    def _assign_sample(self, key: str, value: str, invoice_obj: dict, schema_obj: dict) -> None:
-        cval = key.replace("sample/", "")
-        if cval == "names":
-            _assign_invoice_val(invoice_obj, "sample", cval, [value], schema_obj)
-        else:
-            _assign_invoice_val(invoice_obj, "sample", cval, value, schema_obj)
-
-    def _assign_sample_general(self, key: str, value: str, invoice_obj: dict, schema_obj: dict) -> None:
-        cval = key.replace("sample.general/", "sample.general.")
-        term_id = self.df_general[self.df_general["key_name"] == cval]["term_id"].values[0]
-        for dictobj in invoice_obj["sample"]["generalAttributes"]:
-            if dictobj.get("termId") == term_id:
-                dictobj["value"] = value
-                break
-
-    def _assign_sample_specific(self, key: str, value: str, invoice_obj: dict, schema_obj: dict) -> None:
-        cval = key.replace("sample.specific/", "sample.specific.")
-        term_id = self.df_specific[self.df_specific["key_name"] == cval]["term_id"].values[0]
-        for dictobj in invoice_obj["sample"]["specificAttributes"]:
-            if dictobj.get("termId") == term_id:
-                dictobj["value"] = value
-                break
-
-    def _assign_custom(self, key: str, value: str, invoice_obj: dict, schema_obj: dict) -> None:
-        cval = key.replace("custom/", "")
-        _assign_invoice_val(invoice_obj, "custom", cval, value, schema_obj)
-
     def _ensure_sample_id_order(self, invoice_obj: dict) -> None:
         sample_info_value = invoice_obj.get("sample")
         if sample_info_value is None:
@@ -803,10 +976,40 @@ def __serch_key_from_constant_variable_obj(key: str, metadata_json_obj: dict) ->
     return None
 
 
+def __read_json_with_detected_encoding(path: RdeFsPath) -> dict[str, Any]:
+    data = Path(path).read_bytes()
+    return json.loads(data.decode(resolve_file_encoding(path, data=data).encoding))
+
+
+def __join_feature_description(description: str, metadata_def_obj: dict[str, Any], metadata_json_obj: dict[str, Any]) -> str:
+    for key, value in metadata_def_obj.items():
+        if not value.get("_feature"):
+            continue
+
+        dscheader = __serch_key_from_constant_variable_obj(key, metadata_json_obj)
+        if dscheader is None:
+            continue
+        if dscheader.get(key) is None:
+            continue
+
+        if value.get("unit"):
+            description += f"\n{metadata_def_obj[key]['name']['ja']}({metadata_def_obj[key]['unit']}):{dscheader[key]['value']}"
+        else:
+            description += f"\n{metadata_def_obj[key]['name']['ja']}:{dscheader[key]['value']}"
+
+        if description.startswith("\n"):
+            description = description[1:]
+    return description
+
+
 def update_description_with_features(
     rde_resource: RdeOutputResourcePath,
     dst_invoice_json: Path,
     metadata_def_json: Path,
+    *,
+    invoice_schema_obj: dict[str, Any] | None = None,
+    metadata_def_obj: dict[str, Any] | None = None,
+    invoice_obj: dict[str, Any] | None = None,
 ) -> None:
     """Writes the provided features to the description field RDE.
 
@@ -817,52 +1020,37 @@ def update_description_with_features(
         rde_resource (RdeOutputResourcePath): Path object containing resource paths needed for RDE processing.
         dst_invoice_json (Path): Path to the invoice.json file where the features will be written.
         metadata_def_json (Path): Path to the metadata list JSON file, which may include definitions or schema information.
+        invoice_schema_obj (Optional[dict[str, Any]]): The already parsed invoice.schema.json. If specified, the file is not read. Defaults to None.
+        metadata_def_obj (Optional[dict[str, Any]]): The already parsed metadata-def.json. If specified, the file is not read. Defaults to None.
+        invoice_obj (Optional[dict[str, Any]]): The invoice held in memory. If specified, the features are written to this object
+            in place, and `dst_invoice_json` is neither read nor written. Defaults to None.
 
     Returns:
         None: The function does not return a value but writes the features to the invoice.json file in the description field.
+            If the data tile has no metadata.json, there is no feature to write and nothing is read or written.
     """
-    with open(dst_invoice_json, "rb") as dst_invoice:
-        enc_dst_invoice_data = dst_invoice.read()
-    enc = chardet.detect(enc_dst_invoice_data)["encoding"]
-    with open(dst_invoice_json, encoding=enc) as f:
-        invoice_obj = json.load(f)
-
-    with open(rde_resource.invoice_schema_json, "rb") as rde_resource_invoice_schema:
-        enc_rde_invoice_schema_data = rde_resource_invoice_schema.read()
-    enc = chardet.detect(enc_rde_invoice_schema_data)["encoding"]
-    with open(rde_resource.invoice_schema_json, encoding=enc) as f:
-        invoice_schema_obj = json.load(f)
-
-    with open(metadata_def_json, "rb") as metadata_def_json_f:
-        enc_rde_invoice_schema_data = metadata_def_json_f.read()
-    enc = chardet.detect(enc_rde_invoice_schema_data)["encoding"]
-    with open(metadata_def_json, encoding=enc) as f:
-        metadata_def_obj = json.load(f)
-
-    with open(rde_resource.meta.joinpath("metadata.json"), encoding=enc) as f:
-        metadata_json_obj = json.load(f)
+    metadata_json = rde_resource.meta.joinpath("metadata.json")
+    if not metadata_json.exists():
+        return
 
-    description = invoice_obj["basic"]["description"] if invoice_obj["basic"]["description"] else ""
-    for key, value in metadata_def_obj.items():
-        if not value.get("_feature"):
-            continue
+    write_invoice = invoice_obj is None
+    if invoice_obj is None:
+        invoice_obj = __read_json_with_detected_encoding(dst_invoice_json)
 
-        dscheader = __serch_key_from_constant_variable_obj(key, metadata_json_obj)
-        if dscheader is None:
-            continue
-        if dscheader.get(key) is None:
-            continue
+    if invoice_schema_obj is None:
+        invoice_schema_obj = __read_json_with_detected_encoding(rde_resource.invoice_schema_json)
 
-        if value.get("unit"):
-            description += f"\n{metadata_def_obj[key]['name']['ja']}({metadata_def_obj[key]['unit']}):{dscheader[key]['value']}"
-        else:
-            description += f"\n{metadata_def_obj[key]['name']['ja']}:{dscheader[key]['value']}"
+    if metadata_def_obj is None:
+        metadata_def_obj = __read_json_with_detected_encoding(metadata_def_json)
 
-        if description.startswith("\n"):
-            description = description[1:]
+    metadata_json_obj = readf_json(metadata_json)
+
+    description = invoice_obj["basic"]["description"] if invoice_obj["basic"]["description"] else ""
+    description = __join_feature_description(description, metadata_def_obj, metadata_json_obj)
 
     _assign_invoice_val(invoice_obj, "basic", "description", description, invoice_schema_obj)
-    writef_json(dst_invoice_json, invoice_obj)
+    if write_invoice:
+        writef_json(dst_invoice_json, invoice_obj)
 
 
 class RuleBasedReplacer:
@@ -1080,3 +1268,24 @@ def apply_magic_variable(invoice_path: str | Path, rawfile_path: str | Path, *,
         contents = apply_default_filename_mapping_rule(replacement_rule, save_filepath)
 
     return contents
+
+
+def replace_magic_variable(invoice_obj: dict[str, Any], rawfile_path: str | Path) -> dict[str, Any]:
+    """Converts the magic variable ${filename} in an invoice held in memory.
+
+    This is the in-memory counterpart of `apply_magic_variable`. If ${filename} is present in basic.dataName of `invoice_obj`,
+    it is replaced in place with the filename of rawfile_path.
+
+    Args:
+        invoice_obj (dict[str, Any]): The content of invoice.json.
+        rawfile_path (Union[str, Path]): The file path of the input data.
+
+    Returns:
+        dict[str, Any]: The content of invoice.json after replacement, or an empty dictionary if nothing was replaced.
+    """
+    if invoice_obj.get("basic", {}).get("dataName") != "${filename}":
+        return {}
+
+    replacer = RuleBasedReplacer()
+    replacer.set_rule("basic.dataName", "${filename}")
+    return replacer.get_apply_rules_obj({"${filename}": Path(rawfile_path).name}, invoice_obj)
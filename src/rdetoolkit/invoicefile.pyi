@@ -1,5 +1,6 @@
 import pandas as pd
 from _typeshed import Incomplete
+from collections.abc import Sequence
 from pathlib import Path
 from rdetoolkit import __version__ as __version__, rde2util as rde2util
 from rdetoolkit.exceptions import InvoiceSchemaValidationError as InvoiceSchemaValidationError, StructuredError as StructuredError
@@ -14,6 +15,7 @@ STATIC_DIR: Incomplete
 EX_GENERALTERM: Incomplete
 EX_SPECIFICTERM: Incomplete
 
+def read_excelinvoice_sheets(excelinvoice_filepath: RdeFsPath) -> dict[str, pd.DataFrame]: ...
 def read_excelinvoice(excelinvoice_filepath: RdeFsPath) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]: ...
 def check_exist_rawfiles(dfexcelinvoice: pd.DataFrame, excel_rawfiles: list[Path]) -> list[Path]: ...
 def overwrite_invoicefile_for_dpfterm(invoiceobj: dict[str, Any], invoice_dst_filepath: RdeFsPath, invoiceschema_filepath: RdeFsPath, invoice_info: dict[str, Any]) -> None: ...
@@ -55,12 +57,13 @@ class ExcelInvoiceFile:
     @classmethod
     def generate_template(cls, invoice_schema_path: str | Path, save_path: str | Path, file_mode: Literal['file', 'folder'] = 'file') -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]: ...
     def save(self, save_path: str | Path, *, invoice: pd.DataFrame | None = None, sheet_name: str = 'invoice_form', index: list[str] | None = None, header: list[str] | None = None) -> None: ...
-    def overwrite(self, invoice_org: Path, dist_path: Path, invoice_schema_path: Path, idx: int) -> None: ...
+    def overwrite(self, invoice_org: Path, dist_path: Path | None, invoice_schema_path: Path, idx: int, *, invoice_org_obj: dict[str, Any] | None = None, invoice_schema_obj: dict[str, Any] | None = None) -> dict[str, Any]: ...
+    def overwrite_all(self, invoice_org: Path, invoice_schema_path: Path, dist_paths: Sequence[Path] | None = None, *, invoice_org_obj: dict[str, Any] | None = None, invoice_schema_obj: dict[str, Any] | None = None) -> list[dict[str, Any]]: ...
     @staticmethod
     def check_intermittent_empty_rows(df: pd.DataFrame) -> None: ...
 
 def backup_invoice_json_files(excel_invoice_file: Path | None, mode: str | None) -> Path: ...
-def update_description_with_features(rde_resource: RdeOutputResourcePath, dst_invoice_json: Path, metadata_def_json: Path) -> None: ...
+def update_description_with_features(rde_resource: RdeOutputResourcePath, dst_invoice_json: Path, metadata_def_json: Path, *, invoice_schema_obj: dict[str, Any] | None = None, metadata_def_obj: dict[str, Any] | None = None, invoice_obj: dict[str, Any] | None = None) -> None: ...
 
 class RuleBasedReplacer:
     rules: Incomplete
@@ -73,3 +76,4 @@ class RuleBasedReplacer:
 
 def apply_default_filename_mapping_rule(replacement_rule: dict[str, Any], save_file_path: str | Path) -> dict[str, Any]: ...
 def apply_magic_variable(invoice_path: str | Path, rawfile_path: str | Path, *, save_filepath: str | Path | None = None) -> dict[str, Any]: ...
+def replace_magic_variable(invoice_obj: dict[str, Any], rawfile_path: str | Path) -> dict[str, Any]: ...
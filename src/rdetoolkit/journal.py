@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from collections.abc import Container, Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import Final, Literal
+
+from pydantic import BaseModel, Field, ValidationError
+
+from rdetoolkit.models.rde2types import TILE_OUTPUT_DIRS, RawFiles, RdeOutputResourcePath
+from rdetoolkit.models.result import WorkflowExecutionStatus
+from rdetoolkit.rdelogger import get_logger
+
+logger = get_logger(__name__)
+
+RUN_JOURNAL_NAME: Final = "run_journal.ndjson"
+# The log and temporary directories of the first data tile are shared by the whole run, so they are not journaled.
+_UNJOURNALED_OUTPUT_FIELDS: Final = ("temp", "logs")
+
+
+class JournalPlan(BaseModel):
+    """The first record of a run journal: the inputs of the run and the raw files of each data tile."""
+
+    event: Literal["plan"] = "plan"
+    input_fingerprint: str
+    mode: str | None = Field(default=None)
+    raw_files_group: list[list[str]]
+    excel_invoice: str | None = Field(default=None)
+    invoice_org: str
+
+
+class JournalTile(BaseModel):
+    """A record of a completed data tile, with the fingerprint of its raw files and the size of each output file."""
+
+    event: Literal["tile"] = "tile"
+    index: int
+    input_fingerprint: str
+    outputs: dict[str, int]
+    status: WorkflowExecutionStatus
+
+
+class _JournalRecord(BaseModel):
+    record: JournalPlan | JournalTile = Field(discriminator="event")
+
+
+def fingerprint_files(paths: Iterable[str | Path]) -> str:
+    """Return a fingerprint of the given files from their paths, sizes and modification times.
+
+    The content is not read, so that the fingerprint is cheap to compute for large inputs. Missing files are part of the
+    fingerprint as such.
+
+    Args:
+        paths (Iterable[str | Path]): The files.
+
+    Returns:
+        str: The hexadecimal SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            digest.update(f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+        except OSError:
+            digest.update(f"{path}\0missing\n".encode())
+    return digest.hexdigest()
+
+
+def fingerprint_directories(directories: Iterable[str | Path]) -> str:
+    """Return a fingerprint of every file under the given directories, including those in nested folders.
+
+    Args:
+        directories (Iterable[str | Path]): The directories. Directories that do not exist have no files.
+
+    Returns:
+        str: The fingerprint of the files, in path order, see `fingerprint_files`.
+    """
+    paths: list[str] = []
+    for directory in directories:
+        for root, _, files in os.walk(directory):
+            paths.extend(os.path.join(root, name) for name in files)
+    return fingerprint_files(sorted(paths))
+
+
+def list_output_files(resource_paths: RdeOutputResourcePath) -> dict[str, int]:
+    """Return the size of each file in the output directories of a data tile, keyed by path.
+
+    Args:
+        resource_paths (RdeOutputResourcePath): The output paths of the data tile.
+
+    Returns:
+        dict[str, int]: The size of each output file.
+    """
+    return {path: os.path.getsize(path) for path in _iter_output_files(resource_paths)}
+
+
+def outputs_unchanged(outputs: dict[str, int]) -> bool:
+    """Return whether every output file listed by `list_output_files` still exists with the same size.
+
+    Args:
+        outputs (dict[str, int]): The size of each output file, keyed by path.
+
+    Returns:
+        bool: True if no output file was removed or resized.
+    """
+    return all(os.path.isfile(path) and os.path.getsize(path) == size for path, size in outputs.items())
+
+
+def clear_stale_outputs(tile_plan: Sequence[RdeOutputResourcePath], completed: Container[int], *, keep: Iterable[str | Path] = ()) -> list[Path]:
+    """Remove the files left in the output directories of the data tiles that are not completed, before they are processed again.
+
+    A data tile that was interrupted, or that failed, may have written only part of its outputs. Those files are removed so that
+    the tile is processed again from clean directories. The raw files of every data tile are never removed, since they may
+    have been extracted or moved into an output directory.
+
+    Args:
+        tile_plan (Sequence[RdeOutputResourcePath]): The output paths of every data tile.
+        completed (Container[int]): The indices of the completed data tiles, whose outputs are left as they are.
+        keep (Iterable[str | Path]): Other files and directories to leave as they are, e.g. the input directories. Defaults to ().
+
+    Returns:
+        list[Path]: The removed files.
+    """
+    kept = {os.path.abspath(path) for path in keep}
+    kept.update(os.path.abspath(f) for resource_paths in tile_plan for f in resource_paths.rawfiles)
+    removed = []
+    for idx, resource_paths in enumerate(tile_plan):
+        if idx in completed:
+            continue
+        for path in _iter_output_files(resource_paths, skip=kept):
+            if os.path.abspath(path) not in kept:
+                os.remove(path)
+                removed.append(Path(path))
+    return removed
+
+
+def _iter_output_files(resource_paths: RdeOutputResourcePath, *, skip: Container[str] = ()) -> Iterator[str]:
+    for field in TILE_OUTPUT_DIRS:
+        directory = getattr(resource_paths, field)
+        if field in _UNJOURNALED_OUTPUT_FIELDS or directory is None or os.path.abspath(directory) in skip:
+            continue
+        for root, _, files in os.walk(directory):
+            yield from (os.path.join(root, name) for name in files)
+
+
+class RunJournal:
+    """An append-only journal of a structuring run, stored as NDJSON in the logs directory.
+
+    `start` writes the plan of the run. Each data tile processed successfully is then recorded with `record_tile`, so that
+    a run that died can be resumed: the tiles whose raw files and outputs are unchanged are skipped, and the others,
+    including tiles that were partially written, are processed again after their stale outputs are removed with
+    `clear_stale_outputs`.
+
+    Args:
+        path (str | Path): The journal file.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.plan: JournalPlan | None = None
+        self.tiles: dict[int, JournalTile] = {}
+
+    def read(self) -> RunJournal:
+        """Load the records of an existing journal. A truncated or invalid line, e.g. the last line of a killed run, is ignored.
+
+        Returns:
+            RunJournal: This journal.
+        """
+        self.plan, self.tiles = None, {}
+        if not self.path.exists():
+            return self
+        with open(self.path, encoding="utf_8") as f:
+            for line in f:
+                self._load_record(line)
+        return self
+
+    def _load_record(self, line: str) -> None:
+        try:
+            record = _JournalRecord.model_validate_json(f'{{"record": {line}}}').record
+        except ValidationError:
+            logger.debug(f"Ignoring an invalid record of {self.path}: {line!r}")
+            return
+        if isinstance(record, JournalPlan):
+            self.plan, self.tiles = record, {}
+        else:
+            self.tiles[record.index] = record
+
+    def start(
+        self,
+        input_fingerprint: str,
+        raw_files_group: RawFiles,
+        invoice_org: Path,
+        *,
+        mode: str | None = None,
+        excel_invoice: Path | None = None,
+    ) -> None:
+        """Start a new journal, replacing any previous one, with the plan of the run.
+
+        Args:
+            input_fingerprint (str): The fingerprint of the input files, see `fingerprint_files`.
+            raw_files_group (RawFiles): The raw files of each data tile.
+            invoice_org (Path): Path to the backup of invoice.json.
+            mode (Optional[str]): The extended mode of the run. Defaults to None.
+            excel_invoice (Optional[Path]): Path to the Excel invoice, if any. Defaults to None.
+        """
+        self.plan = JournalPlan(
+            input_fingerprint=input_fingerprint,
+            mode=mode,
+            raw_files_group=[[str(f) for f in raw_files] for raw_files in raw_files_group],
+            excel_invoice=str(excel_invoice) if excel_invoice is not None else None,
+            invoice_org=str(invoice_org),
+        )
+        self.tiles = {}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(self.plan.model_dump_json() + "\n", encoding="utf_8")
+
+    def record_tile(self, idx: int, resource_paths: RdeOutputResourcePath, status: WorkflowExecutionStatus) -> None:
+        """Append the record of a processed data tile. Only successful tiles are recorded, so failed ones are retried on resume.
+
+        Args:
+            idx (int): The index of the data tile.
+            resource_paths (RdeOutputResourcePath): The output paths of the data tile.
+            status (WorkflowExecutionStatus): The execution status of the data tile.
+        """
+        if status.status != "success":
+            return
+        record = JournalTile(
+            index=idx,
+            input_fingerprint=fingerprint_files(resource_paths.rawfiles),
+            outputs=list_output_files(resource_paths),
+            status=status,
+        )
+        self.tiles[idx] = record
+        with open(self.path, "a", encoding="utf_8") as f:
+            f.write(record.model_dump_json() + "\n")
+
+    def resumable_plan(self, input_fingerprint: str, mode: str | None = None) -> JournalPlan | None:
+        """Return the plan of the journaled run if it had the same inputs and its raw files are still available.
+
+        Args:
+            input_fingerprint (str): The fingerprint of the current input files.
+            mode (Optional[str]): The extended mode of the current run. Defaults to None.
+
+        Returns:
+            Optional[JournalPlan]: The plan to resume, or None if the run has to start over.
+        """
+        plan = self.plan
+        if plan is None or plan.input_fingerprint != input_fingerprint or plan.mode != mode:
+            return None
+        files = [plan.invoice_org, *(f for raw_files in plan.raw_files_group for f in raw_files)]
+        return plan if all(os.path.exists(f) for f in files) else None
+
+    def intact_statuses(self, tile_plan: Sequence[RdeOutputResourcePath]) -> dict[int, WorkflowExecutionStatus]:
+        """Return the recorded status of each data tile whose raw files and outputs are unchanged since it was recorded.
+
+        Args:
+            tile_plan (Sequence[RdeOutputResourcePath]): The output paths of the data tiles of the resumed run, e.g. a `TilePlan`.
+
+        Returns:
+            dict[int, WorkflowExecutionStatus]: The statuses of the tiles that can be skipped, keyed by tile index.
+        """
+        return {
+            idx: record.status
+            for idx, record in self.tiles.items()
+            if idx < len(tile_plan) and self._is_intact(record, tile_plan[idx])
+        }
+
+    @staticmethod
+    def _is_intact(record: JournalTile, resource_paths: RdeOutputResourcePath) -> bool:
+        if record.input_fingerprint != fingerprint_files(resource_paths.rawfiles):
+            return False
+        return outputs_unchanged(record.outputs)
@@ -0,0 +1,42 @@
+from _typeshed import Incomplete as Incomplete
+from collections.abc import Container, Iterable, Sequence
+from pathlib import Path
+from pydantic import BaseModel
+from rdetoolkit.models.rde2types import RawFiles as RawFiles, RdeOutputResourcePath as RdeOutputResourcePath
+from rdetoolkit.models.result import WorkflowExecutionStatus as WorkflowExecutionStatus
+from typing import Final, Literal
+
+logger: Incomplete
+RUN_JOURNAL_NAME: Final[str]
+
+class JournalPlan(BaseModel):
+    event: Literal['plan']
+    input_fingerprint: str
+    mode: str | None
+    raw_files_group: list[list[str]]
+    excel_invoice: str | None
+    invoice_org: str
+
+class JournalTile(BaseModel):
+    event: Literal['tile']
+    index: int
+    input_fingerprint: str
+    outputs: dict[str, int]
+    status: WorkflowExecutionStatus
+
+def fingerprint_files(paths: Iterable[str | Path]) -> str: ...
+def fingerprint_directories(directories: Iterable[str | Path]) -> str: ...
+def list_output_files(resource_paths: RdeOutputResourcePath) -> dict[str, int]: ...
+def outputs_unchanged(outputs: dict[str, int]) -> bool: ...
+def clear_stale_outputs(tile_plan: Sequence[RdeOutputResourcePath], completed: Container[int], *, keep: Iterable[str | Path] = ()) -> list[Path]: ...
+
+class RunJournal:
+    path: Path
+    plan: JournalPlan | None
+    tiles: dict[int, JournalTile]
+    def __init__(self, path: str | Path) -> None: ...
+    def read(self) -> RunJournal: ...
+    def start(self, input_fingerprint: str, raw_files_group: RawFiles, invoice_org: Path, *, mode: str | None = None, excel_invoice: Path | None = None) -> None: ...
+    def record_tile(self, idx: int, resource_paths: RdeOutputResourcePath, status: WorkflowExecutionStatus) -> None: ...
+    def resumable_plan(self, input_fingerprint: str, mode: str | None = None) -> JournalPlan | None: ...
+    def intact_statuses(self, tile_plan: Sequence[RdeOutputResourcePath]) -> dict[int, WorkflowExecutionStatus]: ...
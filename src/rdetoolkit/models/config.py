@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
 
@@ -12,6 +14,24 @@ class SystemSettings(BaseModel):
         save_nonshared_raw (bool): Indicates whether to save nonshared raw data. If True, non-shared raw data will be saved. Default is True.
         save_thumbnail_image (bool): Indicates whether to automatically save the main image to the thumbnail directory. Default is False.
         magic_variable (bool): A feature where specifying '${filename}' as the data name results in the filename being transcribed as the data name. Default is False.
+        max_workers (int): The number of worker processes used to structure data tiles in parallel. 1 runs tiles sequentially, 0 uses every CPU available to the process (cgroup CPU quotas are honoured). Default is 1.
+        archive_filename_encoding (str | None): The encoding of the filenames in the input archive, e.g. 'cp932'. Names flagged as UTF-8 in the archive are not affected. If None, the encoding is detected once per archive. Default is None.
+        raw_materialization (str): How raw files are placed in the raw and nonshared_raw directories: 'copy', 'hardlink', 'reflink', 'symlink'
+            or 'move' (only for files extracted to the temporary directory). Falls back to copy when the strategy cannot be applied,
+            e.g. across file systems. Default is 'copy'.
+        rdeformat_direct_extraction (bool): In RDEformat mode, extract the members of the input archive directly into the output
+            directories of their data tiles instead of unpacking the archive into the temporary directory first. Default is False.
+        lazy_output_dirs (bool): Create the output directories of each data tile just before it is processed, in the process
+            running it, instead of creating those of every data tile up front. Default is False.
+        prune_empty_output_dirs (bool): Remove the output directories left empty after the structuring process. Default is False.
+        stream_results (bool): Append the execution status of each data tile to `data/logs/workflow_results.ndjson` as soon as
+            it is produced, instead of keeping every status in memory. Default is False.
+        run_journal (bool): Record the plan of the run and each successful data tile in `data/logs/run_journal.ndjson`, so that
+            an interrupted run can be resumed with `workflows.run(resume=True)`. Default is False.
+        tile_cache (bool): Skip the data tiles whose raw files, invoice, invoice schema, metadata-def.json and configuration
+            are unchanged since the previous run, and whose outputs are intact. Their status is reported as "cached". Default is False.
+        tile_cache_version (str | None): A version tag of the custom structuring function. Changing it invalidates the tile cache.
+            Default is None.
     """
 
     extended_mode: str | None = Field(default=None, description="The mode to run the RDEtoolkit in. select: rdeformat, MultiDataTile")
@@ -22,6 +42,29 @@ class SystemSettings(BaseModel):
         default=False,
         description="The feature where specifying '${filename}' as the data name results in the filename being transcribed as the data name.",
     )
+    max_workers: int = Field(
+        default=1,
+        ge=0,
+        description="The number of worker processes used to structure data tiles in parallel. 1 runs tiles sequentially, 0 uses every CPU available to the process.",
+    )
+    archive_filename_encoding: str | None = Field(
+        default=None,
+        description="The encoding of the filenames in the input archive, e.g. 'cp932'. If not specified, it is detected once per archive.",
+    )
+    raw_materialization: Literal["copy", "hardlink", "reflink", "symlink", "move"] = Field(
+        default="copy",
+        description="How raw files are placed in the raw and nonshared_raw directories. Falls back to copy when the strategy cannot be applied.",
+    )
+    rdeformat_direct_extraction: bool = Field(
+        default=False,
+        description="In RDEformat mode, extract the input archive directly into the output directories of the data tiles.",
+    )
+    lazy_output_dirs: bool = Field(default=False, description="Create the output directories of each data tile just before it is processed")
+    prune_empty_output_dirs: bool = Field(default=False, description="Remove the output directories left empty after the structuring process")
+    stream_results: bool = Field(default=False, description="Stream the execution status of each data tile to an NDJSON file in the logs directory")
+    run_journal: bool = Field(default=False, description="Record the run in a journal in the logs directory so that it can be resumed")
+    tile_cache: bool = Field(default=False, description="Skip the data tiles whose inputs and configuration are unchanged since the previous run")
+    tile_cache_version: str | None = Field(default=None, description="Version tag of the custom structuring function, part of the tile cache fingerprint")
 
 
 class MultiDataTileSettings(BaseModel):
@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from typing import Literal
 
 class SystemSettings(BaseModel):
     extended_mode: str | None
@@ -6,6 +7,16 @@ class SystemSettings(BaseModel):
     save_nonshared_raw: bool
     save_thumbnail_image: bool
     magic_variable: bool
+    max_workers: int
+    archive_filename_encoding: str | None
+    raw_materialization: Literal['copy', 'hardlink', 'reflink', 'symlink', 'move']
+    rdeformat_direct_extraction: bool
+    lazy_output_dirs: bool
+    prune_empty_output_dirs: bool
+    stream_results: bool
+    run_journal: bool
+    tile_cache: bool
+    tile_cache_version: str | None
 
 class MultiDataTileSettings(BaseModel):
     ignore_errors: bool
@@ -2,13 +2,18 @@ from __future__ import annotations
 
 import os
 import warnings
-from collections.abc import Sequence
+from array import array
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import TypedDict, Union
+from typing import TYPE_CHECKING, Any, Final, TypedDict, Union, overload
 
 from rdetoolkit.models.config import Config, MultiDataTileSettings, SystemSettings
 
+if TYPE_CHECKING:
+    from rdetoolkit.invoicefile import ExcelInvoiceFile
+    from rdetoolkit.validation import InvoiceValidator
+
 ZipFilesPathList = Sequence[Path]
 UnZipFilesPathList = Sequence[Path]
 ExcelInvoicePathList = Sequence[Path]
@@ -20,6 +25,23 @@ MetaType = dict[str, Union[str, int, float, list, bool]]
 RepeatedMetaType = dict[str, list[Union[str, int, float]]]
 MetaItem = dict[str, Union[str, int, float, bool]]
 RdeFsPath = Union[str, Path]
+EXCEL_INVOICE_SUFFIXES: Final = (".xls", ".xlsx")
+EXCEL_INVOICE_STEM_SUFFIX: Final = "_excel_invoice"
+# The output directories of a data tile, keyed by the fields of `RdeOutputResourcePath` holding them.
+TILE_OUTPUT_DIRS: Final = {
+    "raw": "raw",
+    "struct": "structured",
+    "main_image": "main_image",
+    "other_image": "other_image",
+    "thumbnail": "thumbnail",
+    "meta": "meta",
+    "logs": "logs",
+    "invoice": "invoice",
+    "temp": "temp",
+    "nonshared_raw": "nonshared_raw",
+    "invoice_patch": "invoice_patch",
+    "attachment": "attachment",
+}
 
 
 @dataclass
@@ -189,6 +211,127 @@ class RdeOutputResourcePath:
     attachment: Path | None = None
 
 
+class TilePlan(Sequence[RdeOutputResourcePath]):
+    """A compact plan of the data tiles, producing the `RdeOutputResourcePath` of each tile on access.
+
+    Instead of one `RdeOutputResourcePath` holding 15 `Path` objects per tile, the plan keeps the raw file names in a flat list
+    with their interned parent directories and the tile boundaries in arrays. The output directories are derived from the tile
+    index with the layout of `rdetoolkit.core.DirectoryOps`: `{base_dir}/{name}` for the first tile and
+    `{base_dir}/divided/{idx:04}/{name}` for the others. No directory is created.
+
+    Args:
+        raw_files_group (RawFiles): The raw files of each data tile.
+        invoice_org (Path): Path to the backup of invoice.json.
+        invoice_schema_json (Path): Path to invoice.schema.json.
+        base_dir (str | Path): The base directory of the output directories. Defaults to "data".
+
+    Example:
+        ```python
+        plan = TilePlan([(Path("data/temp/a.txt"),), (Path("data/temp/b.txt"),)], invoice_org, invoice_schema_json)
+        plan[1].raw  # Path("data/divided/0001/raw")
+        plan[1].rawfiles  # (Path("data/temp/b.txt"),)
+        ```
+    """
+
+    __slots__ = ("_base_dir", "_dirs", "_file_dirs", "_file_names", "_invoice_org", "_invoice_schema_json", "_offsets")
+
+    def __init__(self, raw_files_group: RawFiles, invoice_org: Path, invoice_schema_json: Path, *, base_dir: str | Path = "data"):
+        self._base_dir = Path(base_dir)
+        self._invoice_org = invoice_org
+        self._invoice_schema_json = invoice_schema_json
+        dir_indices: dict[str, int] = {}
+        self._file_dirs = array("q")
+        self._file_names: list[str] = []
+        self._offsets = array("q", [0])
+        for raw_files in raw_files_group:
+            for f in raw_files:
+                parent, name = os.path.split(f)
+                self._file_dirs.append(dir_indices.setdefault(parent, len(dir_indices)))
+                self._file_names.append(name)
+            self._offsets.append(len(self._file_names))
+        self._dirs = list(dir_indices)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    @overload
+    def __getitem__(self, idx: int) -> RdeOutputResourcePath: ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> list[RdeOutputResourcePath]: ...
+
+    def __getitem__(self, idx: int | slice) -> RdeOutputResourcePath | list[RdeOutputResourcePath]:
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            emsg = "TilePlan index out of range"
+            raise IndexError(emsg)
+        return RdeOutputResourcePath(
+            rawfiles=self.rawfiles(idx),
+            invoice_schema_json=self._invoice_schema_json,
+            invoice_org=self._invoice_org,
+            **self.output_dirs(idx),
+        )
+
+    def __iter__(self) -> Iterator[RdeOutputResourcePath]:
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def rawfiles(self, idx: int) -> tuple[Path, ...]:
+        """Return the raw files of the data tile `idx`.
+
+        Args:
+            idx (int): The index of the data tile.
+
+        Returns:
+            tuple[Path, ...]: The raw files of the data tile.
+        """
+        start, stop = self._offsets[idx], self._offsets[idx + 1]
+        return tuple(Path(self._dirs[self._file_dirs[i]], self._file_names[i]) for i in range(start, stop))
+
+    def output_dirs(self, idx: int) -> dict[str, Path]:
+        """Return the output directories of the data tile `idx`, keyed by the fields of `RdeOutputResourcePath`.
+
+        Args:
+            idx (int): The index of the data tile.
+
+        Returns:
+            dict[str, Path]: The output directories of the data tile.
+        """
+        tile_dir = self._base_dir if idx == 0 else self._base_dir / "divided" / f"{idx:04}"
+        return {field: tile_dir / dirname for field, dirname in TILE_OUTPUT_DIRS.items()}
+
+
+@dataclass(frozen=True)
+class RunContext:
+    """A data class that holds the run-scoped resources shared by every data tile.
+
+    The files under `tasksupport` and the backup of invoice.json do not change while the structuring process runs,
+    so they are read and parsed once in `workflows.run` and handed to the mode processors instead of being re-read for each tile.
+    The parsed objects are shared between tiles and must not be modified; copy them before making changes.
+
+    Attributes:
+        config (Config): The configuration object.
+        invoice_schema (dict[str, Any] | None): The parsed invoice.schema.json, or None if the file does not exist.
+        metadata_def (dict[str, Any] | None): The parsed metadata-def.json, or None if the file does not exist.
+        invoice_org (dict[str, Any] | None): The parsed backup of invoice.json (invoice_org.json), or None if the file does not exist.
+        invoice_validator (InvoiceValidator | None): The validator compiled from invoice.schema.json, or None if it could not be built.
+        excel_invoice (ExcelInvoiceFile | None): The parsed ExcelInvoice in ExcelInvoice mode, otherwise None. Each data tile reads its own row by index.
+        unpacked_dir (Path | None): The temporary directory the input archive is extracted to. Raw files under it may be moved
+            instead of copied. None if unknown.
+    """
+
+    config: Config
+    invoice_schema: dict[str, Any] | None = None
+    metadata_def: dict[str, Any] | None = None
+    invoice_org: dict[str, Any] | None = None
+    invoice_validator: InvoiceValidator | None = None
+    excel_invoice: ExcelInvoiceFile | None = None
+    unpacked_dir: Path | None = None
+
+
 class Name(TypedDict):
     """Represents a name structure as a Typed Dictionary.
 
@@ -267,3 +410,131 @@ class ValueUnitPair:
 
     value: str
     unit: str
+
+
+@dataclass(frozen=True)
+class EncodingDetectionResult:
+    """Result of a character encoding detection.
+
+    Attributes:
+        encoding (str): The detected encoding, normalized to a Python codec name (e.g. "utf_8", "cp932").
+        confidence (float): The confidence of the detection, from 0.0 to 1.0.
+        source (str): How the encoding was determined: "bom" from a byte order mark, "sample" from the sampled windows,
+            or "full" from the whole file.
+    """
+
+    encoding: str
+    confidence: float
+    source: str
+
+
+@dataclass(frozen=True)
+class InputFileEntry:
+    """An entry of the input directory, classified when the directory is scanned.
+
+    Attributes:
+        path (Path): The path of the entry.
+        suffix (str): The lower-cased suffix of the entry.
+        is_dir (bool): Whether the entry is a directory.
+        is_zip (bool): Whether the entry is a ZIP file.
+        is_excel_invoice (bool): Whether the entry is an Excel invoice, i.e. `*_excel_invoice.xls(x)`.
+        size (int): The size in bytes.
+        mtime_ns (int): The modification time in nanoseconds.
+    """
+
+    path: Path
+    suffix: str
+    is_dir: bool
+    is_zip: bool
+    is_excel_invoice: bool
+    size: int
+    mtime_ns: int
+
+    @classmethod
+    def from_dir_entry(cls, entry: os.DirEntry[str]) -> InputFileEntry:
+        """Classify an entry returned by `os.scandir`.
+
+        Args:
+            entry (os.DirEntry[str]): The entry.
+
+        Returns:
+            InputFileEntry: The classified entry.
+        """
+        path = Path(entry.path)
+        suffix = path.suffix.lower()
+        try:
+            stat = entry.stat()
+        except OSError:
+            # e.g. a dangling symbolic link
+            stat = entry.stat(follow_symlinks=False)
+        is_dir = entry.is_dir()
+        return cls(
+            path=path,
+            suffix=suffix,
+            is_dir=is_dir,
+            is_zip=not is_dir and suffix == ".zip",
+            is_excel_invoice=not is_dir and suffix in EXCEL_INVOICE_SUFFIXES and path.stem.endswith(EXCEL_INVOICE_STEM_SUFFIX),
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+        )
+
+
+@dataclass(frozen=True)
+class InputManifest:
+    """The entries of the input directory, read with a single `os.scandir` pass.
+
+    `selected_input_checker` builds the manifest once and hands it to the selected checker, so that the input directory
+    is not listed again and the files are grouped in a single pass instead of with membership tests on lists.
+
+    Attributes:
+        directory (Path): The scanned directory.
+        entries (tuple[InputFileEntry, ...]): The entries of the directory, in the order returned by `os.scandir`.
+    """
+
+    directory: Path
+    entries: tuple[InputFileEntry, ...]
+
+    @classmethod
+    def scan(cls, directory: Path) -> InputManifest:
+        """Scan the direct entries of `directory`. A directory that does not exist is treated as empty.
+
+        Args:
+            directory (Path): The input directory.
+
+        Returns:
+            InputManifest: The manifest of the directory.
+        """
+        try:
+            with os.scandir(directory) as it:
+                entries = tuple(InputFileEntry.from_dir_entry(entry) for entry in it)
+        except FileNotFoundError:
+            entries = ()
+        return cls(directory=directory, entries=entries)
+
+    @property
+    def paths(self) -> list[Path]:
+        """The paths of all entries."""
+        return [entry.path for entry in self.entries]
+
+    @property
+    def excel_invoice_files(self) -> ExcelInvoicePathList:
+        """The paths of the Excel invoices."""
+        return [entry.path for entry in self.entries if entry.is_excel_invoice]
+
+    def group_by_files(self) -> InputFilesGroup:
+        """Group the entries into ZIP files, Excel invoices and the other files in one pass.
+
+        Returns:
+            InputFilesGroup: The ZIP files, the Excel invoices and the other entries, each in scan order.
+        """
+        zipfiles: list[Path] = []
+        excel_invoice_files: list[Path] = []
+        other_files: list[Path] = []
+        for entry in self.entries:
+            if entry.is_zip:
+                zipfiles.append(entry.path)
+            elif entry.is_excel_invoice:
+                excel_invoice_files.append(entry.path)
+            else:
+                other_files.append(entry.path)
+        return zipfiles, excel_invoice_files, other_files
@@ -1,8 +1,11 @@
-from collections.abc import Sequence
+import os
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass
 from pathlib import Path
+from rdetoolkit.invoicefile import ExcelInvoiceFile as ExcelInvoiceFile
 from rdetoolkit.models.config import Config as Config
-from typing import TypedDict
+from rdetoolkit.validation import InvoiceValidator as InvoiceValidator
+from typing import Any, Final, TypedDict, overload
 
 ZipFilesPathList = Sequence[Path]
 UnZipFilesPathList = Sequence[Path]
@@ -15,6 +18,9 @@ MetaType = dict[str, str | int | float | list | bool]
 RepeatedMetaType = dict[str, list[str | int | float]]
 MetaItem = dict[str, str | int | float | bool]
 RdeFsPath = str | Path
+EXCEL_INVOICE_SUFFIXES: Final[tuple[str, ...]]
+EXCEL_INVOICE_STEM_SUFFIX: Final[str]
+TILE_OUTPUT_DIRS: Final[dict[str, str]]
 
 @dataclass
 class RdeFormatFlags:
@@ -60,6 +66,28 @@ class RdeOutputResourcePath:
     attachment: Path | None = ...
     def __init__(self, raw, nonshared_raw, rawfiles, struct, main_image, other_image, meta, thumbnail, logs, invoice, invoice_schema_json, invoice_org, temp=..., invoice_patch=..., attachment=...) -> None: ...
 
+class TilePlan(Sequence[RdeOutputResourcePath]):
+    def __init__(self, raw_files_group: RawFiles, invoice_org: Path, invoice_schema_json: Path, *, base_dir: str | Path = 'data') -> None: ...
+    def __len__(self) -> int: ...
+    @overload
+    def __getitem__(self, idx: int) -> RdeOutputResourcePath: ...
+    @overload
+    def __getitem__(self, idx: slice) -> list[RdeOutputResourcePath]: ...
+    def __iter__(self) -> Iterator[RdeOutputResourcePath]: ...
+    def rawfiles(self, idx: int) -> tuple[Path, ...]: ...
+    def output_dirs(self, idx: int) -> dict[str, Path]: ...
+
+@dataclass(frozen=True)
+class RunContext:
+    config: Config
+    invoice_schema: dict[str, Any] | None = ...
+    metadata_def: dict[str, Any] | None = ...
+    invoice_org: dict[str, Any] | None = ...
+    invoice_validator: InvoiceValidator | None = ...
+    excel_invoice: ExcelInvoiceFile | None = ...
+    unpacked_dir: Path | None = ...
+    def __init__(self, config, invoice_schema=..., metadata_def=..., invoice_org=..., invoice_validator=..., excel_invoice=..., unpacked_dir=...) -> None: ...
+
 class Name(TypedDict):
     ja: str
     en: str
@@ -86,3 +114,36 @@ class ValueUnitPair:
     value: str
     unit: str
     def __init__(self, value, unit) -> None: ...
+
+@dataclass(frozen=True)
+class EncodingDetectionResult:
+    encoding: str
+    confidence: float
+    source: str
+    def __init__(self, encoding, confidence, source) -> None: ...
+
+@dataclass(frozen=True)
+class InputFileEntry:
+    path: Path
+    suffix: str
+    is_dir: bool
+    is_zip: bool
+    is_excel_invoice: bool
+    size: int
+    mtime_ns: int
+    def __init__(self, path, suffix, is_dir, is_zip, is_excel_invoice, size, mtime_ns) -> None: ...
+    @classmethod
+    def from_dir_entry(cls, entry: os.DirEntry[str]) -> InputFileEntry: ...
+
+@dataclass(frozen=True)
+class InputManifest:
+    directory: Path
+    entries: tuple[InputFileEntry, ...]
+    def __init__(self, directory, entries) -> None: ...
+    @classmethod
+    def scan(cls, directory: Path) -> InputManifest: ...
+    @property
+    def paths(self) -> list[Path]: ...
+    @property
+    def excel_invoice_files(self) -> ExcelInvoicePathList: ...
+    def group_by_files(self) -> InputFilesGroup: ...
@@ -1,8 +1,20 @@
 from __future__ import annotations
 
-from collections.abc import Iterator
+import math
+from collections import Counter, defaultdict
+from collections.abc import Iterator, Sequence
+from itertools import islice
+from pathlib import Path
+from typing import Any, Final
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, SerializerFunctionWrapHandler, field_validator, model_serializer
+
+# Fields left out of the serialized statuses and results when they are not set, so that their JSON stays as it was before
+_OPTIONAL_METRICS: Final = ("timings", "bytes_copied", "stages")
+
+
+def _drop_unset_metrics(data: dict[str, Any]) -> dict[str, Any]:
+    return {key: value for key, value in data.items() if key not in _OPTIONAL_METRICS or value is not None}
 
 
 class WorkflowExecutionStatus(BaseModel):
@@ -14,21 +26,95 @@ class WorkflowExecutionStatus(BaseModel):
     error_message: str | None = Field(default=None)
     target: str | None
     stacktrace: str | None = Field(default=None)
+    timings: dict[str, float] | None = Field(default=None, repr=False, description="Duration of each processing stage of the data tile in seconds")
+    bytes_copied: int | None = Field(default=None, repr=False, description="Bytes copied to the output directories of the data tile")
 
     @field_validator("run_id")
     @classmethod
     def format_run_id(cls, v: str) -> str:  # noqa: D102
         return f"{int(v):04d}"
 
+    @model_serializer(mode="wrap")
+    def _serialize(self, handler: SerializerFunctionWrapHandler) -> dict[str, Any]:
+        return _drop_unset_metrics(handler(self))
+
+
+class StageStatistics(BaseModel):
+    """The durations of a processing stage over the data tiles that went through it, in seconds."""
+
+    count: int
+    sum: float
+    p50: float
+    p95: float
+
+    @classmethod
+    def from_durations(cls, durations: Sequence[float]) -> StageStatistics:
+        """Aggregate the durations of a stage. The percentiles are interpolated linearly between the closest ranks.
+
+        Args:
+            durations (Sequence[float]): The duration of the stage for each data tile. Must not be empty.
+
+        Returns:
+            StageStatistics: The aggregated durations.
+        """
+        ordered = sorted(durations)
+        return cls(count=len(ordered), sum=math.fsum(ordered), p50=_percentile(ordered, 0.5), p95=_percentile(ordered, 0.95))
+
+
+def _percentile(ordered: Sequence[float], q: float) -> float:
+    position = (len(ordered) - 1) * q
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
 
 class WorkflowExecutionResults(BaseModel):
     statuses: list[WorkflowExecutionStatus]
+    stages: dict[str, StageStatistics] | None = Field(default=None, repr=False)
+    bytes_copied: int | None = Field(default=None, repr=False)
+
+    @model_serializer(mode="wrap")
+    def _serialize(self, handler: SerializerFunctionWrapHandler) -> dict[str, Any]:
+        return _drop_unset_metrics(handler(self))
+
+
+class WorkflowExecutionSummary(BaseModel):
+    total: int
+    counts: dict[str, int]
+    statuses_file: str | None = Field(default=None)
+    stages: dict[str, StageStatistics] | None = Field(default=None, repr=False)
+    bytes_copied: int | None = Field(default=None, repr=False)
+
+    @model_serializer(mode="wrap")
+    def _serialize(self, handler: SerializerFunctionWrapHandler) -> dict[str, Any]:
+        return _drop_unset_metrics(handler(self))
 
 
 class WorkflowResultManager:
+    """Collects the execution status of each data tile.
+
+    By default the statuses are kept in memory, in `statuses`. When `ndjson_path` is given, each status is appended to that
+    file as one JSON line as soon as it is added, and only the counts per status are kept in memory: `statuses` stays empty,
+    and iterating, indexing and `to_json` read the statuses back from the file. Either way, `len()` is the number of statuses
+    that iteration yields, and `summary` gives the total and the counts per status.
 
-    def __init__(self) -> None:
+    The durations of the processing stages and the bytes copied reported by the statuses are kept in both modes, and
+    aggregated per stage by `stage_statistics`, `summary` and `to_json`. They are left out when no status reports them.
+
+    Args:
+        ndjson_path (Optional[str | Path]): The NDJSON file the statuses are streamed to. The file is truncated. Defaults to None.
+    """
+
+    def __init__(self, *, ndjson_path: str | Path | None = None) -> None:
         self.statuses = WorkflowExecutionResults(statuses=[])
+        self.ndjson_path = Path(ndjson_path) if ndjson_path is not None else None
+        self.counts: Counter[str] = Counter()
+        self._num_streamed = 0
+        self._stage_durations: defaultdict[str, list[float]] = defaultdict(list)
+        self._bytes_copied: int | None = None
+        if self.ndjson_path is not None:
+            self.ndjson_path.parent.mkdir(parents=True, exist_ok=True)
+            self.ndjson_path.write_text("", encoding="utf_8")
 
     def add(self, run_id: str, title: str, status: str, mode: str, error_code: int | None = None, error_message: str | None = None, target: str | None = None, stacktrace: str | None = None) -> None:
         """Adds a new workflow execution status to the statuses list.
@@ -57,7 +143,7 @@ class WorkflowResultManager:
             target=target,
             stacktrace=stacktrace,
         )
-        self.statuses.statuses.append(execution_status)
+        self.add_status(execution_status)
 
     def add_status(self, status: WorkflowExecutionStatus) -> None:
         """Adds an existing WorkflowExecutionStatus object to the statuses list.
@@ -68,20 +154,70 @@ class WorkflowResultManager:
         Returns:
             None
         """
-        self.statuses.statuses.append(status)
+        self.counts[status.status] += 1
+        for stage, seconds in (status.timings or {}).items():
+            self._stage_durations[stage].append(seconds)
+        if status.bytes_copied is not None:
+            self._bytes_copied = (self._bytes_copied or 0) + status.bytes_copied
+        if self.ndjson_path is None:
+            self.statuses.statuses.append(status)
+            return
+        with open(self.ndjson_path, "a", encoding="utf_8") as f:
+            f.write(status.model_dump_json() + "\n")
+        self._num_streamed += 1
 
     def __iter__(self) -> Iterator[WorkflowExecutionStatus]:
-        return iter(self.statuses.statuses)
+        if self.ndjson_path is None:
+            return iter(self.statuses.statuses)
+        return self._read_ndjson(self.ndjson_path)
 
     def __len__(self) -> int:
-        return len(self.statuses.statuses)
+        if self.ndjson_path is None:
+            return len(self.statuses.statuses)
+        return self._num_streamed
 
     def __getitem__(self, index: int) -> WorkflowExecutionStatus:
-        return self.statuses.statuses[index]
+        if self.ndjson_path is None:
+            return self.statuses.statuses[index]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            emsg = "WorkflowResultManager index out of range"
+            raise IndexError(emsg)
+        return next(islice(iter(self), index, None))
 
     def __repr__(self) -> str:
+        if self.ndjson_path is not None:
+            return f"WorkflowResultManager({self.summary()})"
         return f"WorkflowResultManager({self.statuses})"
 
+    def stage_statistics(self) -> dict[str, StageStatistics]:
+        """Return the count, sum, p50 and p95 of the durations of each processing stage, keyed by stage name."""
+        return {stage: StageStatistics.from_durations(durations) for stage, durations in self._stage_durations.items()}
+
+    def summary(self) -> WorkflowExecutionSummary:
+        """Return the number of statuses in total and per status, e.g. "success" and "failed", with the statistics of each stage."""
+        counts = self.counts if self.ndjson_path is not None else Counter(status.status for status in self.statuses.statuses)
+        return WorkflowExecutionSummary(
+            total=sum(counts.values()),
+            counts=dict(counts),
+            statuses_file=str(self.ndjson_path) if self.ndjson_path is not None else None,
+            stages=self.stage_statistics() or None,
+            bytes_copied=self._bytes_copied,
+        )
+
     def to_json(self) -> str:
-        """Return the JSON representation of the workflow execution results."""
-        return self.statuses.model_dump_json(indent=2)
+        """Return the JSON representation of the workflow execution results, with the statistics of each stage.
+
+        In streaming mode every status is read back from the NDJSON file, so this is meant for small runs.
+        """
+        statuses = self.statuses.statuses if self.ndjson_path is None else list(self)
+        results = WorkflowExecutionResults(statuses=statuses, stages=self.stage_statistics() or None, bytes_copied=self._bytes_copied)
+        return results.model_dump_json(indent=2)
+
+    @staticmethod
+    def _read_ndjson(path: Path) -> Iterator[WorkflowExecutionStatus]:
+        with open(path, encoding="utf_8") as f:
+            for line in f:
+                if line.strip():
+                    yield WorkflowExecutionStatus.model_validate_json(line)
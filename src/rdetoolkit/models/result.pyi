@@ -1,5 +1,7 @@
 from _typeshed import Incomplete as Incomplete
-from collections.abc import Iterator
+from collections import Counter
+from collections.abc import Iterator, Sequence
+from pathlib import Path
 from pydantic import BaseModel
 
 class WorkflowExecutionStatus(BaseModel):
@@ -11,18 +13,41 @@ class WorkflowExecutionStatus(BaseModel):
     error_message: str | None
     target: str | None
     stacktrace: str | None
+    timings: dict[str, float] | None
+    bytes_copied: int | None
     @classmethod
     def format_run_id(cls, v: str) -> str: ...
 
+class StageStatistics(BaseModel):
+    count: int
+    sum: float
+    p50: float
+    p95: float
+    @classmethod
+    def from_durations(cls, durations: Sequence[float]) -> StageStatistics: ...
+
 class WorkflowExecutionResults(BaseModel):
     statuses: list[WorkflowExecutionStatus]
+    stages: dict[str, StageStatistics] | None
+    bytes_copied: int | None
+
+class WorkflowExecutionSummary(BaseModel):
+    total: int
+    counts: dict[str, int]
+    statuses_file: str | None
+    stages: dict[str, StageStatistics] | None
+    bytes_copied: int | None
 
 class WorkflowResultManager:
     statuses: Incomplete
-    def __init__(self) -> None: ...
+    ndjson_path: Path | None
+    counts: Counter[str]
+    def __init__(self, *, ndjson_path: str | Path | None = None) -> None: ...
     def add(self, run_id: str, title: str, status: str, mode: str, error_code: int | None = None, error_message: str | None = None, target: str | None = None, stacktrace: str | None = None) -> None: ...
     def add_status(self, status: WorkflowExecutionStatus) -> None: ...
     def __iter__(self) -> Iterator[WorkflowExecutionStatus]: ...
     def __len__(self) -> int: ...
     def __getitem__(self, index: int) -> WorkflowExecutionStatus: ...
+    def stage_statistics(self) -> dict[str, StageStatistics]: ...
+    def summary(self) -> WorkflowExecutionSummary: ...
     def to_json(self) -> str: ...
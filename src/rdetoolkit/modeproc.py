@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import contextlib
+import copy
 import os
-import shutil
+import time
+from collections.abc import Iterator
 from pathlib import Path
-from typing import Callable
+from typing import Any, Callable
 
 from rdetoolkit import img2thumb
 from rdetoolkit.exceptions import StructuredError
+from rdetoolkit.fileops import materialize_file, readf_json, writef_json
 from rdetoolkit.impl.input_controller import (
     ExcelInvoiceChecker,
     InvoiceChecker,
@@ -15,8 +18,8 @@ from rdetoolkit.impl.input_controller import (
     RDEFormatChecker,
 )
 from rdetoolkit.interfaces.filechecker import IInputFileChecker
-from rdetoolkit.invoicefile import ExcelInvoiceFile, InvoiceFile, apply_magic_variable, update_description_with_features
-from rdetoolkit.models.rde2types import RdeInputDirPaths, RdeOutputResourcePath
+from rdetoolkit.invoicefile import ExcelInvoiceFile, replace_magic_variable, update_description_with_features
+from rdetoolkit.models.rde2types import InputManifest, RdeInputDirPaths, RdeOutputResourcePath, RunContext
 from rdetoolkit.models.result import WorkflowExecutionStatus
 from rdetoolkit.rdelogger import get_logger
 from rdetoolkit.validation import invoice_validate, metadata_validate
@@ -27,11 +30,44 @@ _CallbackType = Callable[[RdeInputDirPaths, RdeOutputResourcePath], None]
 logger = get_logger(__name__, file_path="data/logs/rdesys.log")
 
 
+class StageTimer:
+    """Measures the duration of each processing stage of a data tile with a monotonic clock, and counts the bytes copied.
+
+    The stages of the mode processors are "invoice_overwrite", "raw_copy", "custom_function", "thumbnail_copy",
+    "description_update", "metadata_validation", "invoice_validation" and "invoice_write". A stage that is skipped, e.g.
+    "thumbnail_copy" when `save_thumbnail_image` is disabled, has no duration.
+
+    Attributes:
+        timings (dict[str, float]): The duration of each stage in seconds, in the order the stages ran.
+        bytes_copied (int): The bytes copied to the output directories: raw files placed by copy and thumbnails.
+    """
+
+    def __init__(self) -> None:
+        self.timings: dict[str, float] = {}
+        self.bytes_copied = 0
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Measure the duration of a stage. The duration is recorded even if the stage raises.
+
+        Args:
+            name (str): The name of the stage. The durations of a stage that runs several times are added up.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+
+
 def rdeformat_mode_process(
     index: str,
     srcpaths: RdeInputDirPaths,
     resource_paths: RdeOutputResourcePath,
     datasets_process_function: _CallbackType | None = None,
+    *,
+    context: RunContext | None = None,
+    timer: StageTimer | None = None,
 ) -> WorkflowExecutionStatus:
     """Process the source data and apply specific transformations using the provided callback function.
 
@@ -51,6 +87,10 @@ def rdeformat_mode_process(
         resource_paths (RdeOutputResourcePath): Paths to the resources where data will be written or read from.
         datasets_process_function (_CallbackType, optional): A callback function that processes datasets. Defaults to None.
         config (Config, optional): Configuration instance for structured processing execution. Defaults to None.
+        context (RunContext, optional): Run-scoped resources parsed once by `workflows.run`. If specified, the invoice schema,
+            metadata-def.json and the original invoice are taken from it instead of being re-read. Defaults to None.
+        timer (StageTimer, optional): Records the duration of each stage and the bytes copied. The durations are also reported
+            by the returned status. Defaults to None.
 
     Raises:
         Any exceptions raised by `datasets_process_function` or during the validation steps will propagate upwards. Exceptions during the `update_description_with_features` step are caught and silently ignored.
@@ -64,45 +104,43 @@ def rdeformat_mode_process(
             - error_code (int | None): The error code if an error occurred, otherwise None.
             - error_message (str | None): The error message if an error occurred, otherwise None.
             - target (str): The target directory or file path related to the workflow execution.
+            - timings (dict[str, float]): The duration of each stage in seconds, see `StageTimer`.
+            - bytes_copied (int): The bytes copied to the output directories.
     """
+    context = _get_run_context(srcpaths, context)
+    timer = timer if timer is not None else StageTimer()
     basedir = resource_paths.rawfiles[0].parent if len(resource_paths.rawfiles) > 0 else ""
 
     # rewriting the invoice
-    invoice_dst_filepath = resource_paths.invoice.joinpath("invoice.json")
-    InvoiceFile.copy_original_invoice(resource_paths.invoice_org, invoice_dst_filepath)
-    copy_input_to_rawfile_for_rdeformat(resource_paths)
-    invoice = InvoiceFile(invoice_dst_filepath)
+    with timer.stage("invoice_overwrite"):
+        invoice_obj = _load_original_invoice(resource_paths, context)
+    title = invoice_obj.get("basic", {}).get("dataName", "RDEFormat Mode Process")
+    with timer.stage("raw_copy"):
+        timer.bytes_copied += copy_input_to_rawfile_for_rdeformat(
+            resource_paths,
+            strategy=srcpaths.config.system.raw_materialization,
+            movable_root=context.unpacked_dir,
+        )
 
     # run custom dataset process
-    if datasets_process_function is not None:
-        datasets_process_function(srcpaths, resource_paths)
+    invoice_obj = _run_dataset_process(srcpaths, resource_paths, datasets_process_function, invoice_obj, timer)
 
     if srcpaths.config.system.save_thumbnail_image:
-        img2thumb.copy_images_to_thumbnail(
-            resource_paths.thumbnail,
-            resource_paths.main_image,
-        )
-
-    with contextlib.suppress(Exception):
-        update_description_with_features(resource_paths, invoice_dst_filepath, srcpaths.tasksupport.joinpath("metadata-def.json"))
-
-    # validate metadata.json
-    if resource_paths.meta.joinpath("metadata.json").exists():
-        metadata_validate(resource_paths.meta.joinpath("metadata.json"))
+        _copy_thumbnail(resource_paths, timer)
 
-    # validate invoice.schema.json / invoice.json
-    schema_path = srcpaths.tasksupport.joinpath("invoice.schema.json")
-    invoice_validate(invoice_dst_filepath, schema_path)
+    _validate_and_write_invoice(srcpaths, resource_paths, invoice_obj, context, timer)
 
     return WorkflowExecutionStatus(
         run_id=index,
-        title=invoice.invoice_obj.get("basic", {}).get("dataName", "RDEFormat Mode Process"),
+        title=title,
         status="success",
         mode="rdeformat",
         error_code=None,
         error_message=None,
         target=str(basedir),
         stacktrace=None,
+        timings=timer.timings,
+        bytes_copied=timer.bytes_copied,
     )
 
 
@@ -111,6 +149,9 @@ def multifile_mode_process(
     srcpaths: RdeInputDirPaths,
     resource_paths: RdeOutputResourcePath,
     datasets_process_function: _CallbackType | None = None,
+    *,
+    context: RunContext | None = None,
+    timer: StageTimer | None = None,
 ) -> WorkflowExecutionStatus:
     """Processes multiple source files and applies transformations using the provided callback function.
 
@@ -131,6 +172,10 @@ def multifile_mode_process(
         resource_paths (RdeOutputResourcePath): Paths to the resources where data will be written or read from.
         datasets_process_function (_CallbackType, optional): A callback function that processes datasets. Defaults to None.
         config (Config, optional): Configuration instance for structured processing execution. Defaults to None.
+        context (RunContext, optional): Run-scoped resources parsed once by `workflows.run`. If specified, the invoice schema,
+            metadata-def.json and the original invoice are taken from it instead of being re-read. Defaults to None.
+        timer (StageTimer, optional): Records the duration of each stage and the bytes copied. The durations are also reported
+            by the returned status. Defaults to None.
 
     Raises:
         Any exceptions raised by `datasets_process_function` or during the validation steps will propagate upwards. Exceptions during the `update_description_with_features` step are caught and silently ignored.
@@ -144,49 +189,41 @@ def multifile_mode_process(
             - error_code (int | None): The error code if an error occurred, otherwise None.
             - error_message (str | None): The error message if an error occurred, otherwise None.
             - target (str): The target directory or file path related to the workflow execution.
+            - timings (dict[str, float]): The duration of each stage in seconds, see `StageTimer`.
+            - bytes_copied (int): The bytes copied to the output directories.
     """
+    context = _get_run_context(srcpaths, context)
+    timer = timer if timer is not None else StageTimer()
     basedir = resource_paths.rawfiles[0].parent if len(resource_paths.rawfiles) > 0 else ""
-    invoice_dst_filepath = resource_paths.invoice.joinpath("invoice.json")
-    InvoiceFile.copy_original_invoice(resource_paths.invoice_org, invoice_dst_filepath)
-    invoice = InvoiceFile(invoice_dst_filepath)
+    with timer.stage("invoice_overwrite"):
+        invoice_obj = _load_original_invoice(resource_paths, context)
+    title = invoice_obj.get("basic", {}).get("dataName", "MultiDataTile Mode Process")
 
-    if srcpaths.config.system.save_raw:
-        copy_input_to_rawfile(resource_paths.raw, resource_paths.rawfiles)
-
-    if srcpaths.config.system.save_nonshared_raw:
-        copy_input_to_rawfile(resource_paths.nonshared_raw, resource_paths.rawfiles)
+    _materialize_rawfiles(srcpaths, resource_paths, context, timer)
 
     # run custom dataset process
-    if datasets_process_function is not None:
-        datasets_process_function(srcpaths, resource_paths)
+    invoice_obj = _run_dataset_process(srcpaths, resource_paths, datasets_process_function, invoice_obj, timer)
 
     # rewriting support for ${filename} by default
     if srcpaths.config.system.magic_variable:
-        apply_magic_variable(resource_paths.invoice.joinpath("invoice.json"), resource_paths.rawfiles[0])
+        replace_magic_variable(invoice_obj, resource_paths.rawfiles[0])
 
     if srcpaths.config.system.save_thumbnail_image:
-        img2thumb.copy_images_to_thumbnail(resource_paths.thumbnail, resource_paths.main_image)
+        _copy_thumbnail(resource_paths, timer)
 
-    with contextlib.suppress(Exception):
-        update_description_with_features(resource_paths, invoice_dst_filepath, srcpaths.tasksupport.joinpath("metadata-def.json"))
-
-    # validate metadata.json
-    if resource_paths.meta.joinpath("metadata.json").exists():
-        metadata_validate(resource_paths.meta.joinpath("metadata.json"))
-
-    # validate invoice.schema.json / invoice.json
-    schema_path = srcpaths.tasksupport.joinpath("invoice.schema.json")
-    invoice_validate(invoice_dst_filepath, schema_path)
+    _validate_and_write_invoice(srcpaths, resource_paths, invoice_obj, context, timer)
 
     return WorkflowExecutionStatus(
         run_id=index,
-        title=invoice.invoice_obj.get("basic", {}).get("dataName", "MultiDataTile Mode Process"),
+        title=title,
         status="success",
         mode="MultiDataTile",
         error_code=None,
         error_message=None,
         target=str(basedir),
         stacktrace=None,
+        timings=timer.timings,
+        bytes_copied=timer.bytes_copied,
     )
 
 
@@ -196,6 +233,9 @@ def excel_invoice_mode_process(
     excel_invoice_file: Path,
     idx: int,
     datasets_process_function: _CallbackType | None = None,
+    *,
+    context: RunContext | None = None,
+    timer: StageTimer | None = None,
 ) -> WorkflowExecutionStatus:
     """Processes invoice data from an Excel file and applies dataset transformations using the provided callback function.
 
@@ -217,6 +257,10 @@ def excel_invoice_mode_process(
         idx (int): Index or identifier for the data being processed.
         datasets_process_function (_CallbackType, optional): A callback function that processes datasets. Defaults to None.
         config (Config, optional): Configuration instance for structured processing execution. Defaults to None.
+        context (RunContext, optional): Run-scoped resources parsed once by `workflows.run`. If specified, the invoice schema,
+            metadata-def.json and the original invoice are taken from it instead of being re-read. Defaults to None.
+        timer (StageTimer, optional): Records the duration of each stage and the bytes copied. The durations are also reported
+            by the returned status. Defaults to None.
 
     Raises:
         StructuredError: When encountering issues related to Excel invoice overwriting or during the validation steps.
@@ -231,16 +275,24 @@ def excel_invoice_mode_process(
             - error_code (int | None): The error code if an error occurred, otherwise None.
             - error_message (str | None): The error message if an error occurred, otherwise None.
             - target (str): The target directory or file path related to the workflow execution.
+            - timings (dict[str, float]): The duration of each stage in seconds, see `StageTimer`.
+            - bytes_copied (int): The bytes copied to the output directories.
     """
+    context = _get_run_context(srcpaths, context)
+    timer = timer if timer is not None else StageTimer()
+
     # rewriting the invoice
-    excel_invoice = ExcelInvoiceFile(excel_invoice_file)
+    excel_invoice = _get_excel_invoice(excel_invoice_file, context)
     try:
-        excel_invoice.overwrite(
-            resource_paths.invoice_org,
-            resource_paths.invoice.joinpath("invoice.json"),
-            resource_paths.invoice_schema_json,
-            idx,
-        )
+        with timer.stage("invoice_overwrite"):
+            invoice_obj = excel_invoice.overwrite(
+                resource_paths.invoice_org,
+                None,
+                resource_paths.invoice_schema_json,
+                idx,
+                invoice_org_obj=context.invoice_org,
+                invoice_schema_obj=context.invoice_schema,
+            )
     except StructuredError:
         raise
     except Exception as e:
@@ -250,51 +302,34 @@ def excel_invoice_mode_process(
             eobj=e,
         ) from e
 
-    if srcpaths.config.system.save_raw:
-        copy_input_to_rawfile(resource_paths.raw, resource_paths.rawfiles)
-
-    if srcpaths.config.system.save_nonshared_raw:
-        copy_input_to_rawfile(resource_paths.nonshared_raw, resource_paths.rawfiles)
+    _materialize_rawfiles(srcpaths, resource_paths, context, timer)
 
     # run custom dataset process
-    if datasets_process_function is not None:
-        datasets_process_function(srcpaths, resource_paths)
+    invoice_obj = _run_dataset_process(srcpaths, resource_paths, datasets_process_function, invoice_obj, timer)
 
     # rewriting support for ${filename} by default
     # Excelinvoice applies to file mode only, folder mode is not supported.
     # FileMode has only one element in resource_paths.rawfiles.
     if srcpaths.config.system.magic_variable:
-        apply_magic_variable(resource_paths.invoice.joinpath("invoice.json"), resource_paths.rawfiles[0])
+        replace_magic_variable(invoice_obj, resource_paths.rawfiles[0])
 
     if srcpaths.config.system.save_thumbnail_image:
-        img2thumb.copy_images_to_thumbnail(resource_paths.thumbnail, resource_paths.main_image)
-
-    with contextlib.suppress(Exception):
-        update_description_with_features(
-            resource_paths,
-            resource_paths.invoice.joinpath("invoice.json"),
-            srcpaths.tasksupport.joinpath("metadata-def.json"),
-        )
-
-    # validate metadata.json
-    if resource_paths.meta.joinpath("metadata.json").exists():
-        metadata_validate(resource_paths.meta.joinpath("metadata.json"))
+        _copy_thumbnail(resource_paths, timer)
 
-    # validate invoice.schema.json / invoice.json
-    schema_path = srcpaths.tasksupport.joinpath("invoice.schema.json")
-    invoice_validate(resource_paths.invoice.joinpath("invoice.json"), schema_path)
+    _validate_and_write_invoice(srcpaths, resource_paths, invoice_obj, context, timer)
 
-    invoice = InvoiceFile(resource_paths.invoice.joinpath("invoice.json"))
     basedir = resource_paths.rawfiles[0].parent if len(resource_paths.rawfiles) > 0 else ""
     return WorkflowExecutionStatus(
         run_id=str(idx),
-        title=invoice.invoice_obj.get("basic", {}).get("dataName", "Excelinvoice Mode Process"),
+        title=invoice_obj.get("basic", {}).get("dataName", "Excelinvoice Mode Process"),
         status="success",
         mode="Excelinvoice",
         error_code=None,
         error_message=None,
         target=str(basedir),
         stacktrace=None,
+        timings=timer.timings,
+        bytes_copied=timer.bytes_copied,
     )
 
 
@@ -303,6 +338,9 @@ def invoice_mode_process(
     srcpaths: RdeInputDirPaths,
     resource_paths: RdeOutputResourcePath,
     datasets_process_function: _CallbackType | None = None,
+    *,
+    context: RunContext | None = None,
+    timer: StageTimer | None = None,
 ) -> WorkflowExecutionStatus:
     """Processes invoice-related data, applies dataset transformations using the provided callback function, and updates descriptions.
 
@@ -322,6 +360,10 @@ def invoice_mode_process(
         resource_paths (RdeOutputResourcePath): Paths to the resources where data will be written or read from.
         datasets_process_function (_CallbackType, optional): A callback function that processes datasets. Defaults to None.
         config (Config, optional): Configuration instance for structured processing execution. Defaults to None.
+        context (RunContext, optional): Run-scoped resources parsed once by `workflows.run`. If specified, the invoice schema,
+            metadata-def.json and the original invoice are taken from it instead of being re-read. Defaults to None.
+        timer (StageTimer, optional): Records the duration of each stage and the bytes copied. The durations are also reported
+            by the returned status. Defaults to None.
 
     Raises:
         Any exceptions raised by `datasets_process_function` will propagate upwards. Exceptions during the `update_description_with_features` step are caught and silently ignored.
@@ -335,65 +377,143 @@ def invoice_mode_process(
             - error_code (int | None): The error code if an error occurred, otherwise None.
             - error_message (str | None): The error message if an error occurred, otherwise None.
             - target (str): The target directory or file path related to the workflow execution.
+            - timings (dict[str, float]): The duration of each stage in seconds, see `StageTimer`.
+            - bytes_copied (int): The bytes copied to the output directories.
     """
-    if srcpaths.config.system.save_raw:
-        copy_input_to_rawfile(resource_paths.raw, resource_paths.rawfiles)
-
-    if srcpaths.config.system.save_nonshared_raw:
-        copy_input_to_rawfile(resource_paths.nonshared_raw, resource_paths.rawfiles)
+    context = _get_run_context(srcpaths, context)
+    timer = timer if timer is not None else StageTimer()
+    _materialize_rawfiles(srcpaths, resource_paths, context, timer)
 
     # run custom dataset process
     if datasets_process_function is not None:
-        datasets_process_function(srcpaths, resource_paths)
+        with timer.stage("custom_function"):
+            datasets_process_function(srcpaths, resource_paths)
+    # invoice.json is read once, after the custom dataset process has had its chance to modify it
+    invoice_obj = readf_json(resource_paths.invoice.joinpath("invoice.json"))
 
     if srcpaths.config.system.save_thumbnail_image:
-        img2thumb.copy_images_to_thumbnail(resource_paths.thumbnail, resource_paths.main_image)
+        _copy_thumbnail(resource_paths, timer)
 
     # rewriting support for ${filename} by default
     if srcpaths.config.system.magic_variable:
-        apply_magic_variable(resource_paths.invoice.joinpath("invoice.json"), resource_paths.rawfiles[0])
+        replace_magic_variable(invoice_obj, resource_paths.rawfiles[0])
 
-    with contextlib.suppress(Exception):
-        update_description_with_features(
-            resource_paths,
-            resource_paths.invoice.joinpath("invoice.json"),
-            srcpaths.tasksupport.joinpath("metadata-def.json"),
-        )
-
-    # validate metadata.json
-    if resource_paths.meta.joinpath("metadata.json").exists():
-        metadata_validate(resource_paths.meta.joinpath("metadata.json"))
+    _validate_and_write_invoice(srcpaths, resource_paths, invoice_obj, context, timer)
 
-    # validate invoice.schema.json / invoice.json
-    schema_path = srcpaths.tasksupport.joinpath("invoice.schema.json")
-    invoice_validate(resource_paths.invoice.joinpath("invoice.json"), schema_path)
-
-    invoice = InvoiceFile(resource_paths.invoice.joinpath("invoice.json"))
     basedir = resource_paths.rawfiles[0].parent if len(resource_paths.rawfiles) > 0 else ""
     return WorkflowExecutionStatus(
         run_id=index,
-        title=invoice.invoice_obj.get("basic", {}).get("dataName", "Invoice Mode Process"),
+        title=invoice_obj.get("basic", {}).get("dataName", "Invoice Mode Process"),
         status="success",
         mode="invoice",
         error_code=None,
         error_message=None,
         target=str(basedir),
         stacktrace=None,
+        timings=timer.timings,
+        bytes_copied=timer.bytes_copied,
     )
 
 
-def copy_input_to_rawfile_for_rdeformat(resource_paths: RdeOutputResourcePath) -> None:
+def _get_run_context(srcpaths: RdeInputDirPaths, context: RunContext | None) -> RunContext:
+    """Return the run-scoped context, or an empty one so that every step reads its files by itself."""
+    return context if context is not None else RunContext(config=srcpaths.config)
+
+
+def _get_excel_invoice(excel_invoice_file: Path, context: RunContext) -> ExcelInvoiceFile:
+    """Return the ExcelInvoice parsed once for the run, or read it from `excel_invoice_file`."""
+    return context.excel_invoice if context.excel_invoice is not None else ExcelInvoiceFile(excel_invoice_file)
+
+
+def _load_original_invoice(resource_paths: RdeOutputResourcePath, context: RunContext) -> dict[str, Any]:
+    """Return a copy of the original invoice, held in memory for the rest of the data tile's pipeline."""
+    if context.invoice_org is not None:
+        return copy.deepcopy(context.invoice_org)
+    if not resource_paths.invoice_org.exists():
+        emsg = f"File Not Found: {resource_paths.invoice_org}"
+        raise StructuredError(emsg)
+    return readf_json(resource_paths.invoice_org)
+
+
+def _run_dataset_process(
+    srcpaths: RdeInputDirPaths,
+    resource_paths: RdeOutputResourcePath,
+    datasets_process_function: _CallbackType | None,
+    invoice_obj: dict[str, Any],
+    timer: StageTimer,
+) -> dict[str, Any]:
+    """Run the custom dataset process and return the invoice to continue with.
+
+    invoice.json is the hand-off point to the custom dataset process only: it is written just before the function is called,
+    and read back once afterwards so that any change made by the function is kept. Without a function, nothing is written.
+    """
+    if datasets_process_function is None:
+        return invoice_obj
+
+    invoice_dst_filepath = resource_paths.invoice.joinpath("invoice.json")
+    writef_json(invoice_dst_filepath, invoice_obj)
+    with timer.stage("custom_function"):
+        datasets_process_function(srcpaths, resource_paths)
+    return readf_json(invoice_dst_filepath)
+
+
+def _copy_thumbnail(resource_paths: RdeOutputResourcePath, timer: StageTimer) -> None:
+    """Copy the main image to the thumbnail directory, timing the "thumbnail_copy" stage."""
+    with timer.stage("thumbnail_copy"):
+        timer.bytes_copied += img2thumb.copy_images_to_thumbnail(resource_paths.thumbnail, resource_paths.main_image)
+
+
+def _validate_and_write_invoice(
+    srcpaths: RdeInputDirPaths,
+    resource_paths: RdeOutputResourcePath,
+    invoice_obj: dict[str, Any],
+    context: RunContext,
+    timer: StageTimer,
+) -> None:
+    """Complete the invoice held in memory, validate the outputs and write invoice.json once.
+
+    Features are added to the description (ignoring any error, as before), metadata.json and the invoice are validated,
+    and only then is the invoice serialized to invoice.json.
+    """
+    invoice_dst_filepath = resource_paths.invoice.joinpath("invoice.json")
+    with timer.stage("description_update"), contextlib.suppress(Exception):
+        update_description_with_features(
+            resource_paths,
+            invoice_dst_filepath,
+            srcpaths.tasksupport.joinpath("metadata-def.json"),
+            invoice_schema_obj=context.invoice_schema,
+            metadata_def_obj=context.metadata_def,
+            invoice_obj=invoice_obj,
+        )
+
+    # validate metadata.json
+    if resource_paths.meta.joinpath("metadata.json").exists():
+        with timer.stage("metadata_validation"):
+            metadata_validate(resource_paths.meta.joinpath("metadata.json"))
+
+    # validate invoice.schema.json / invoice.json
+    schema_path = srcpaths.tasksupport.joinpath("invoice.schema.json")
+    with timer.stage("invoice_validation"):
+        invoice_validate(invoice_dst_filepath, schema_path, validator=context.invoice_validator, invoice_obj=invoice_obj)
+
+    with timer.stage("invoice_write"):
+        writef_json(invoice_dst_filepath, invoice_obj)
+
+
+def copy_input_to_rawfile_for_rdeformat(resource_paths: RdeOutputResourcePath, *, strategy: str = "copy", movable_root: Path | None = None) -> int:
     """Copy the input raw files to their respective directories based on the file's part names.
 
     This function scans through the parts of each file's path in `resource_paths.rawfiles`. If the file path
     contains a directory name listed in the `directories` dict, the file will be copied to the corresponding
-    directory.
+    directory. With another `strategy`, the files are hard-linked, cloned, symlinked or moved instead.
 
     Args:
         resource_paths (RdeOutputResourcePath): Paths to the resources where data will be written or read from.
+        strategy (str): How the files are placed: "copy", "hardlink", "reflink", "symlink" or "move". Defaults to "copy".
+        movable_root (Optional[Path]): The directory under which raw files may be moved. Defaults to None.
 
     Returns:
-        None
+        int: The number of bytes copied. Files that are linked, cloned or moved are not counted.
     """
     directories = {
         "raw": resource_paths.raw,
@@ -404,34 +524,69 @@ def copy_input_to_rawfile_for_rdeformat(resource_paths: RdeOutputResourcePath) -
         "logs": resource_paths.logs,
         "nonshared_raw": resource_paths.nonshared_raw,
     }
+    output_dirs = {os.path.abspath(directory) for directory in directories.values()}
+    copied = 0
     for f in resource_paths.rawfiles:
+        if os.path.abspath(f.parent) in output_dirs:
+            # Already extracted into its directory, see `SystemSettings.rdeformat_direct_extraction`.
+            continue
         for dir_name, directory in directories.items():
             if dir_name in f.parts:
-                shutil.copy(f, os.path.join(str(directory), f.name))
+                copied += _materialize_counted(f, os.path.join(str(directory), f.name), strategy, movable_root)
                 break
+    return copied
 
 
-def copy_input_to_rawfile(raw_dir_path: Path, raw_files: tuple[Path, ...]) -> None:
+def copy_input_to_rawfile(raw_dir_path: Path, raw_files: tuple[Path, ...], *, strategy: str = "copy", movable_root: Path | None = None) -> int:
     """Copy the input raw files to the specified directory.
 
     This function takes a list of raw file paths and copies each file to the given `raw_dir_path`.
+    With another `strategy`, the files are hard-linked, cloned, symlinked or moved instead, see `rdetoolkit.fileops.materialize_file`.
 
     Args:
         raw_dir_path (Path): The directory path where the raw files will be copied to.
         raw_files (tuple[Path, ...]): A tuple of file paths that need to be copied.
+        strategy (str): How the files are placed: "copy", "hardlink", "reflink", "symlink" or "move". Defaults to "copy".
+        movable_root (Optional[Path]): The directory under which raw files may be moved. Defaults to None.
 
     Returns:
-        None
+        int: The number of bytes copied. Files that are linked, cloned or moved are not counted.
     """
-    for f in raw_files:
-        shutil.copy(f, os.path.join(raw_dir_path, f.name))
+    return sum(_materialize_counted(f, os.path.join(raw_dir_path, f.name), strategy, movable_root) for f in raw_files)
+
+
+def _materialize_counted(src: Path, dst: str, strategy: str, movable_root: Path | None) -> int:
+    """Materialize a raw file and return the bytes copied: its size if it was copied, otherwise 0."""
+    applied = materialize_file(src, dst, strategy=strategy, movable_root=movable_root)
+    return os.path.getsize(dst) if applied == "copy" else 0
+
+
+def _materialize_rawfiles(srcpaths: RdeInputDirPaths, resource_paths: RdeOutputResourcePath, context: RunContext, timer: StageTimer) -> None:
+    """Place the raw files of a data tile in the raw and nonshared_raw directories, as configured, timing the "raw_copy" stage."""
+    system = srcpaths.config.system
+    with timer.stage("raw_copy"):
+        if system.save_raw:
+            timer.bytes_copied += copy_input_to_rawfile(
+                resource_paths.raw,
+                resource_paths.rawfiles,
+                strategy=system.raw_materialization,
+                movable_root=context.unpacked_dir,
+            )
+
+        if system.save_nonshared_raw:
+            timer.bytes_copied += copy_input_to_rawfile(
+                resource_paths.nonshared_raw,
+                resource_paths.rawfiles,
+                strategy=system.raw_materialization,
+                movable_root=context.unpacked_dir,
+            )
 
 
 def selected_input_checker(src_paths: RdeInputDirPaths, unpacked_dir_path: Path, mode: str | None) -> IInputFileChecker:
     """Determine the appropriate input file checker based on the provided format flags and source paths.
 
-    The function scans the source paths to identify the type of input files present. Based on the file type
-    and format flags provided, it instantiates and returns the appropriate checker.
+    The function scans the source paths once to identify the type of input files present. Based on the file type
+    and format flags provided, it instantiates and returns the appropriate checker, which reuses the scanned `InputManifest`.
 
     Args:
         src_paths (RdeInputDirPaths): Paths for the source input files.
@@ -444,13 +599,19 @@ def selected_input_checker(src_paths: RdeInputDirPaths, unpacked_dir_path: Path,
     Raises:
         None, but callers should be aware that downstream exceptions can be raised by individual checker initializations.
     """
-    input_files = list(src_paths.inputdata.glob("*"))
-    excel_invoice_files = [f for f in input_files if f.suffix.lower() in [".xls", ".xlsx"] and f.stem.endswith("_excel_invoice")]
+    manifest = InputManifest.scan(src_paths.inputdata)
     mode = mode.lower() if mode is not None else ""
     if mode == "rdeformat":
-        return RDEFormatChecker(unpacked_dir_path)
+        if src_paths.config.system.rdeformat_direct_extraction:
+            return RDEFormatChecker(
+                unpacked_dir_path,
+                output_dir=unpacked_dir_path.parent,
+                archive_filename_encoding=src_paths.config.system.archive_filename_encoding,
+                manifest=manifest,
+            )
+        return RDEFormatChecker(unpacked_dir_path, manifest=manifest)
     if mode == "multidatatile":
-        return MultiFileChecker(unpacked_dir_path)
-    if excel_invoice_files:
-        return ExcelInvoiceChecker(unpacked_dir_path)
-    return InvoiceChecker(unpacked_dir_path)
+        return MultiFileChecker(unpacked_dir_path, manifest=manifest)
+    if manifest.excel_invoice_files:
+        return ExcelInvoiceChecker(unpacked_dir_path, archive_filename_encoding=src_paths.config.system.archive_filename_encoding, manifest=manifest)
+    return InvoiceChecker(unpacked_dir_path, manifest=manifest)
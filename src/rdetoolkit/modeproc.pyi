@@ -1,15 +1,22 @@
 from _typeshed import Incomplete as Incomplete
+from collections.abc import Iterator
 from pathlib import Path
 from rdetoolkit.interfaces.filechecker import IInputFileChecker as IInputFileChecker
-from rdetoolkit.models.rde2types import RdeInputDirPaths as RdeInputDirPaths, RdeOutputResourcePath as RdeOutputResourcePath
+from rdetoolkit.models.rde2types import RdeInputDirPaths as RdeInputDirPaths, RdeOutputResourcePath as RdeOutputResourcePath, RunContext as RunContext
 from rdetoolkit.models.result import WorkflowExecutionStatus as WorkflowExecutionStatus
 
 logger: Incomplete
 
-def rdeformat_mode_process(index: str, srcpaths: RdeInputDirPaths, resource_paths: RdeOutputResourcePath, datasets_process_function: _CallbackType | None = None) -> WorkflowExecutionStatus: ...
-def multifile_mode_process(index: str, srcpaths: RdeInputDirPaths, resource_paths: RdeOutputResourcePath, datasets_process_function: _CallbackType | None = None) -> WorkflowExecutionStatus: ...
-def excel_invoice_mode_process(srcpaths: RdeInputDirPaths, resource_paths: RdeOutputResourcePath, excel_invoice_file: Path, idx: int, datasets_process_function: _CallbackType | None = None) -> WorkflowExecutionStatus: ...
-def invoice_mode_process(index: str, srcpaths: RdeInputDirPaths, resource_paths: RdeOutputResourcePath, datasets_process_function: _CallbackType | None = None) -> WorkflowExecutionStatus: ...
-def copy_input_to_rawfile_for_rdeformat(resource_paths: RdeOutputResourcePath) -> None: ...
-def copy_input_to_rawfile(raw_dir_path: Path, raw_files: tuple[Path, ...]) -> None: ...
+class StageTimer:
+    timings: dict[str, float]
+    bytes_copied: int
+    def __init__(self) -> None: ...
+    def stage(self, name: str) -> Iterator[None]: ...
+
+def rdeformat_mode_process(index: str, srcpaths: RdeInputDirPaths, resource_paths: RdeOutputResourcePath, datasets_process_function: _CallbackType | None = None, *, context: RunContext | None = None, timer: StageTimer | None = None) -> WorkflowExecutionStatus: ...
+def multifile_mode_process(index: str, srcpaths: RdeInputDirPaths, resource_paths: RdeOutputResourcePath, datasets_process_function: _CallbackType | None = None, *, context: RunContext | None = None, timer: StageTimer | None = None) -> WorkflowExecutionStatus: ...
+def excel_invoice_mode_process(srcpaths: RdeInputDirPaths, resource_paths: RdeOutputResourcePath, excel_invoice_file: Path, idx: int, datasets_process_function: _CallbackType | None = None, *, context: RunContext | None = None, timer: StageTimer | None = None) -> WorkflowExecutionStatus: ...
+def invoice_mode_process(index: str, srcpaths: RdeInputDirPaths, resource_paths: RdeOutputResourcePath, datasets_process_function: _CallbackType | None = None, *, context: RunContext | None = None, timer: StageTimer | None = None) -> WorkflowExecutionStatus: ...
+def copy_input_to_rawfile_for_rdeformat(resource_paths: RdeOutputResourcePath, *, strategy: str = 'copy', movable_root: Path | None = None) -> int: ...
+def copy_input_to_rawfile(raw_dir_path: Path, raw_files: tuple[Path, ...], *, strategy: str = 'copy', movable_root: Path | None = None) -> int: ...
 def selected_input_checker(src_paths: RdeInputDirPaths, unpacked_dir_path: Path, mode: str | None) -> IInputFileChecker: ...
@@ -1,31 +1,34 @@
 from __future__ import annotations
 
 import csv
+import functools
 import json
 import os
 import pathlib
 import re
 import warnings
 import zipfile
+from collections.abc import Sequence
 from copy import deepcopy
-from typing import Any, Callable, Final, TypedDict, cast
+from typing import Any, Callable, Final
 
-import chardet  # for following failure cases
 import dateutil.parser
-from chardet.universaldetector import UniversalDetector
-from charset_normalizer import detect
 
 from rdetoolkit.exceptions import StructuredError
-from rdetoolkit.fileops import readf_json, writef_json
-from rdetoolkit.models.rde2types import MetadataDefJson, MetaItem, MetaType, RdeFsPath, RepeatedMetaType, ValueUnitPair
+from rdetoolkit.fileops import (
+    DETECTION_SAMPLE_BYTES,
+    DETECTION_SAMPLE_WINDOWS,
+    ENCODING_BOMS,
+    MIN_SAMPLE_CONFIDENCE,
+    USUAL_ENCODINGS,
+    readf_json,
+    resolve_file_encoding,
+    writef_json,
+)
+from rdetoolkit.models.rde2types import EncodingDetectionResult, MetadataDefJson, MetaItem, MetaType, RdeFsPath, RepeatedMetaType, ValueUnitPair
 
 LANG_ENC_FLAG: Final[int] = 0x800
-
-
-class _ChardetType(TypedDict):
-    encoding: str
-    language: str
-    confidence: float
+_CAST_ERROR_MESSAGE: Final = "ERROR: failed to cast metaDef value"
 
 
 def get_default_values(default_values_filepath: RdeFsPath) -> dict[str, Any]:
@@ -42,9 +45,7 @@ def get_default_values(default_values_filepath: RdeFsPath) -> dict[str, Any]:
         dict: A dictionary containing the keys and their corresponding default values.
     """
     dct_default_values = {}
-    with open(default_values_filepath, "rb") as rf:
-        enc_default_values_data = rf.read()
-    enc = chardet.detect(enc_default_values_data)["encoding"]
+    enc = resolve_file_encoding(default_values_filepath).encoding
     with open(default_values_filepath, encoding=enc) as fin:
         for row in csv.DictReader(fin):
             dct_default_values[row["key"]] = row["value"]
@@ -54,7 +55,10 @@ def get_default_values(default_values_filepath: RdeFsPath) -> dict[str, Any]:
 class CharDecEncoding:
     """A class to handle character encoding detection and conversion for text files."""
 
-    USUAL_ENCs = ("ascii", "shift_jis", "utf_8", "utf_8_sig", "euc_jp")
+    USUAL_ENCs = USUAL_ENCODINGS
+    DEFAULT_SAMPLE_BYTES = DETECTION_SAMPLE_BYTES
+    SAMPLE_WINDOWS = DETECTION_SAMPLE_WINDOWS
+    BOMS = ENCODING_BOMS
 
     @classmethod
     def detect_text_file_encoding(cls, text_filepath: RdeFsPath) -> str:
@@ -62,6 +66,7 @@ class CharDecEncoding:
 
         This function attempts to detect the encoding of a text file. If the initially
         detected encoding isn't one of the usual ones, it uses chardet for a more thorough detection.
+        The result is cached by `rdetoolkit.fileops.resolve_file_encoding`, so an unchanged file is detected only once.
 
         Args:
             text_filepath (RdeFsPath): Path to the text file to be analyzed.
@@ -75,45 +80,40 @@ class CharDecEncoding:
         if isinstance(text_filepath, pathlib.Path):
             text_filepath = str(text_filepath)
 
-        with open(text_filepath, "rb") as tf:
-            bcontents = tf.read()
-        _cast_detect_ret: _ChardetType = cast(_ChardetType, detect(bcontents))
-        enc = _cast_detect_ret["encoding"].replace("-", "_").lower() if _cast_detect_ret["encoding"] is not None else ""
-
-        if enc not in cls.USUAL_ENCs:
-            enc = cls.__detect(text_filepath)
-        if enc == "shift_jis":
-            enc = "cp932"
-        return enc
+        return resolve_file_encoding(text_filepath).encoding
 
     @classmethod
-    def __detect(cls, text_filepath: str) -> str:
-        """Detect the encoding of a given text file using chardet.
+    def detect_sampled_encoding(
+        cls,
+        text_filepath: RdeFsPath,
+        *,
+        max_bytes: int = DEFAULT_SAMPLE_BYTES,
+        windows: Sequence[str] = ("head",),
+        min_confidence: float = MIN_SAMPLE_CONFIDENCE,
+    ) -> EncodingDetectionResult:
+        """Detect the encoding of a text file from a bounded sample of its bytes.
+
+        A byte order mark is checked first. Otherwise at most `max_bytes` bytes are read, split evenly between the
+        requested windows and cut at line boundaries, and the encoding is detected from them. If the sample is plain
+        ASCII while the file is larger, the file is streamed until its first non-ASCII byte and the window around it
+        is used instead. Only when the confidence stays below `min_confidence` is the whole file scanned, as
+        `detect_text_file_encoding` does. The detection is done by `rdetoolkit.fileops.resolve_file_encoding`, which caches
+        the result for the unchanged file and the same sampling parameters.
 
         Args:
-            text_filepath (str): Path to the text file to be analyzed.
+            text_filepath (RdeFsPath): Path to the text file to be analyzed.
+            max_bytes (int): The byte budget of the sample. Defaults to 256 KiB.
+            windows (Sequence[str]): The parts of the file to sample, any of "head", "middle" and "tail". Defaults to ("head",).
+            min_confidence (float): The confidence below which the whole file is scanned. Defaults to 0.8.
 
         Returns:
-            str: The detected encoding of the text file.
-        """
-        detector = UniversalDetector()
+            EncodingDetectionResult: The detected encoding, its confidence and how it was determined.
 
-        try:
-            with open(text_filepath, mode="rb") as f:
-                while True:
-                    binary = f.readline()
-                    if binary == b"":
-                        break
-                    detector.feed(binary)
-                    if detector.done:
-                        break
-        finally:
-            detector.close()
-
-        ret = detector.result["encoding"]
-        if ret:
-            return ret.replace("-", "_").lower()
-        return ""
+        Raises:
+            FileNotFoundError: If the given file path does not exist.
+            ValueError: If `max_bytes` is not positive or `windows` is empty or contains an unknown window.
+        """
+        return resolve_file_encoding(text_filepath, max_bytes=max_bytes, windows=windows, min_confidence=min_confidence)
 
 
 def _split_value_unit(target_char: str) -> ValueUnitPair:  # pragma: no cover
@@ -727,29 +727,64 @@ def castval(valstr: Any, outtype: str | None, outfmt: str | None) -> bool | int
         outtype (str): Type information at output
         outfmt (str): Formatting at output (related to date data)
     """
-    if outtype == "boolean":
-        if ValueCaster.trycast(valstr, bool) is not None:
-            return bool(valstr)
+    return _get_caster(outtype, outfmt)(valstr)
 
-    elif outtype in ("integer", "number"):
-        # Even if a string with units is passed, the assignment of units is not handled in this function. Assign units separately as necessary.
-        val_unit_pair = _split_value_unit(valstr)
-        if ValueCaster.trycast(val_unit_pair.value, int) is not None:
-            return int(val_unit_pair.value)
-        if outtype == "number" and ValueCaster.trycast(val_unit_pair.value, float) is not None:
-            return float(val_unit_pair.value)
 
-    elif outtype == "string":
-        return valstr if not outfmt else ValueCaster.convert_to_date_format(valstr, outfmt)
+def castvals(values: Sequence[Any], outtype: str | None, outfmt: str | None) -> list[bool | int | float | str]:
+    """Cast every value of a column with `castval`, resolving the conversion for `outtype` and `outfmt` only once.
+
+    Args:
+        values (Sequence[Any]): Values to be converted, e.g. the cells of a column.
+        outtype (str): Type information at output
+        outfmt (str): Formatting at output (related to date data)
+
+    Returns:
+        list[bool | int | float | str]: The converted values, in the order of `values`.
+    """
+    caster = _get_caster(outtype, outfmt)
+    return [caster(valstr) for valstr in values]
 
-    else:
-        emsg = "ERROR: unknown value type in metaDef"
-        raise StructuredError(emsg)
 
-    emsg = "ERROR: failed to cast metaDef value"
+def _get_caster(outtype: str | None, outfmt: str | None) -> Callable[[Any], bool | int | float | str]:
+    if outtype == "boolean":
+        return _cast_boolean
+    if outtype == "integer":
+        return _cast_integer
+    if outtype == "number":
+        return _cast_number
+    if outtype == "string":
+        return functools.partial(_cast_string, outfmt=outfmt)
+    emsg = "ERROR: unknown value type in metaDef"
     raise StructuredError(emsg)
 
 
+def _cast_boolean(valstr: Any) -> bool:
+    if ValueCaster.trycast(valstr, bool) is not None:
+        return bool(valstr)
+    raise StructuredError(_CAST_ERROR_MESSAGE)
+
+
+def _cast_integer(valstr: Any) -> int:
+    # Even if a string with units is passed, the assignment of units is not handled in this function. Assign units separately as necessary.
+    value = _split_value_unit(valstr).value
+    if ValueCaster.trycast(value, int) is not None:
+        return int(value)
+    raise StructuredError(_CAST_ERROR_MESSAGE)
+
+
+def _cast_number(valstr: Any) -> int | float:
+    value = _split_value_unit(valstr).value
+    if ValueCaster.trycast(value, int) is not None:
+        return int(value)
+    if ValueCaster.trycast(value, float) is not None:
+        return float(value)
+    raise StructuredError(_CAST_ERROR_MESSAGE)
+
+
+def _cast_string(valstr: Any, outfmt: str | None) -> str:
+    return valstr if not outfmt else ValueCaster.convert_to_date_format(valstr, outfmt)
+
+
 def dict2meta(metadef_filepath: pathlib.Path, metaout_filepath: pathlib.Path, const_info: MetaType, val_info: MetaType) -> dict[str, set[Any]]:
     """Converts dictionary data into metadata and writes it to a specified file.
 
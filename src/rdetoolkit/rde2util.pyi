@@ -1,21 +1,22 @@
 import pathlib
 from _typeshed import Incomplete as Incomplete
-from rdetoolkit.models.rde2types import MetaType as MetaType, RdeFsPath as RdeFsPath, RepeatedMetaType as RepeatedMetaType
-from typing import Any, Callable, Final, TypedDict
+from collections.abc import Sequence
+from rdetoolkit.models.rde2types import EncodingDetectionResult as EncodingDetectionResult, MetaType as MetaType, RdeFsPath as RdeFsPath, RepeatedMetaType as RepeatedMetaType
+from typing import Any, Callable, Final
 
 LANG_ENC_FLAG: Final[int]
 
-class _ChardetType(TypedDict):
-    encoding: str
-    language: str
-    confidence: float
-
 def get_default_values(default_values_filepath: RdeFsPath) -> dict[str, Any]: ...
 
 class CharDecEncoding:
     USUAL_ENCs: Incomplete
+    DEFAULT_SAMPLE_BYTES: Incomplete
+    SAMPLE_WINDOWS: Incomplete
+    BOMS: Incomplete
     @classmethod
     def detect_text_file_encoding(cls, text_filepath: RdeFsPath) -> str: ...
+    @classmethod
+    def detect_sampled_encoding(cls, text_filepath: RdeFsPath, *, max_bytes: int = ..., windows: Sequence[str] = ('head',), min_confidence: float = 0.8) -> EncodingDetectionResult: ...
 
 def unzip_japanese_zip(src_zipfilepath: str, dst_dirpath: str) -> None: ...
 def read_from_json_file(invoice_file_path: RdeFsPath) -> dict[str, Any]: ...
@@ -44,4 +45,5 @@ class ValueCaster:
     def convert_to_date_format(value: str, fmt: str) -> str: ...
 
 def castval(valstr: Any, outtype: str | None, outfmt: str | None) -> bool | int | float | str: ...
+def castvals(values: Sequence[Any], outtype: str | None, outfmt: str | None) -> list[bool | int | float | str]: ...
 def dict2meta(metadef_filepath: pathlib.Path, metaout_filepath: pathlib.Path, const_info: MetaType, val_info: MetaType) -> dict[str, set[Any]]: ...
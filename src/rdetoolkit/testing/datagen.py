@@ -0,0 +1,455 @@
+from __future__ import annotations
+
+import copy
+import json
+import random
+import shutil
+import tempfile
+import zipfile
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, Final, Literal
+
+import pandas as pd
+import yaml
+from PIL import Image
+from pydantic import BaseModel, Field
+
+from rdetoolkit.invoicefile import EX_GENERALTERM, EX_SPECIFICTERM, ExcelInvoiceTemplateGenerator
+from rdetoolkit.models.invoice import FixedHeaders, TemplateConfig
+
+DatasetMode = Literal["invoice", "excelinvoice", "rdeformat", "multidatatile"]
+DATASET_MODES: Final = ("invoice", "excelinvoice", "rdeformat", "multidatatile")
+
+DATA_OWNER_ID: Final = "0c233ef274f28e611de4074638b4dc43e737ab993132343532343430"
+_EXTENDED_MODES: Final[dict[str, str | None]] = {
+    "invoice": None,
+    "excelinvoice": None,
+    "rdeformat": "rdeformat",
+    "multidatatile": "MultiDataTile",
+}
+_RDEFORMAT_DIRS: Final = ("inputdata", "invoice", "raw", "main_image", "other_image", "thumbnail", "structured", "meta")
+_CHUNK_SIZE: Final = 64 * 1024
+_INVOICE_SCHEMA: Final[dict[str, Any]] = {
+    "$schema": "https://json-schema.org/draft/2020-12/schema",
+    "$id": "https://rde.nims.go.jp/rde/dataset-templates/dataset_template_datagen/invoice.schema.json",
+    "description": "Synthetic dataset template generated by rdetoolkit.testing.datagen",
+    "type": "object",
+    "required": ["custom", "sample"],
+    "properties": {
+        "custom": {
+            "type": "object",
+            "label": {"ja": "固有情報", "en": "Custom Information"},
+            "required": ["temperature"],
+            "properties": {
+                "temperature": {"label": {"ja": "温度", "en": "Temperature"}, "type": "number", "options": {"unit": "K"}},
+                "comment": {"label": {"ja": "コメント", "en": "Comment"}, "type": "string"},
+            },
+        },
+        "sample": {
+            "type": "object",
+            "label": {"ja": "試料情報", "en": "Sample Information"},
+            "properties": {
+                "generalAttributes": {
+                    "type": "array",
+                    "items": [
+                        {"type": "object", "required": ["termId"], "properties": {"termId": {"const": "3adf9874-7bcb-e5f8-99cb-3d6fd9d7b55e"}}},
+                    ],
+                },
+            },
+        },
+    },
+}
+_INVOICE: Final[dict[str, Any]] = {
+    "datasetId": "a1b2c3d4-0000-4000-8000-000000000000",
+    "basic": {
+        "dateSubmitted": "",
+        "dataOwnerId": DATA_OWNER_ID,
+        "dataName": "datagen",
+        "instrumentId": None,
+        "experimentId": None,
+        "description": None,
+    },
+    "custom": {"temperature": 300.0, "comment": "synthetic"},
+    "sample": {
+        "sampleId": "",
+        "names": ["datagen-sample"],
+        "composition": None,
+        "referenceUrl": None,
+        "description": None,
+        "generalAttributes": [{"termId": "3adf9874-7bcb-e5f8-99cb-3d6fd9d7b55e", "value": None}],
+        "specificAttributes": [],
+        "ownerId": DATA_OWNER_ID,
+    },
+}
+_METADATA_DEF: Final[dict[str, Any]] = {
+    "temperature": {"name": {"ja": "温度", "en": "Temperature"}, "schema": {"type": "number"}, "unit": "K", "_feature": True},
+    "line_count": {"name": {"ja": "行数", "en": "Line count"}, "schema": {"type": "integer"}},
+}
+
+
+class FileOptions(BaseModel):
+    """The input files generated for each data tile.
+
+    Text files are CSV files of `file_size` bytes written in `encoding`. Their labels are Japanese when the encoding can
+    represent them, e.g. 'shift_jis' or 'cp932', so that encoding detection is exercised. Images are PNG files.
+    """
+
+    files: int = Field(default=1, ge=0, description="The number of text files per data tile.")
+    file_size: int = Field(default=1024, ge=0, description="The size of each text file in bytes.")
+    encoding: str = Field(default="utf_8", description="The encoding of the text files, e.g. 'shift_jis'.")
+    images: int = Field(default=0, ge=0, description="The number of images per data tile.")
+    image_size: tuple[int, int] = Field(default=(64, 64), description="The width and height of each image in pixels.")
+
+
+def write_text_file(path: str | Path, size: int, *, encoding: str = "utf_8", seed: int = 0) -> Path:
+    """Write a CSV file of exactly `size` bytes, with reproducible content.
+
+    Args:
+        path (str | Path): The file to write.
+        size (int): The size of the file in bytes.
+        encoding (str): The encoding of the file. Defaults to "utf_8".
+        seed (int): The seed of the values written to the file. Defaults to 0.
+
+    Returns:
+        Path: The written file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    chunk = _text_chunk(encoding, seed, size)
+    with open(path, "wb") as f:
+        for _ in range(size // len(chunk)):
+            f.write(chunk)
+        remainder = size % len(chunk)
+        if remainder:
+            # Cut the chunk at the end of a line, so that no multi-byte character is split, and pad with newlines
+            tail = chunk[: chunk.rfind(b"\n", 0, remainder) + 1]
+            f.write(tail + b"\n" * (remainder - len(tail)))
+    return path
+
+
+def _text_chunk(encoding: str, seed: int, size: int) -> bytes:
+    rng = random.Random(seed)  # noqa: S311 - reproducible test data, not for security
+    label = "試料"
+    try:
+        label.encode(encoding)
+    except UnicodeEncodeError:
+        label = "sample"
+    lines = [f"{label}{i},{rng.uniform(0, 1000):.6f},{rng.randint(0, 10**6)}\n" for i in range(min(_CHUNK_SIZE, size) // 16 + 1)]
+    return f"index,value,count\n{''.join(lines)}".encode(encoding)
+
+
+def write_image(path: str | Path, size: tuple[int, int] = (64, 64), *, seed: int = 0) -> Path:
+    """Write a PNG image with a reproducible gradient.
+
+    Args:
+        path (str | Path): The image to write.
+        size (tuple[int, int]): The width and height of the image in pixels. Defaults to (64, 64).
+        seed (int): The seed of the colors of the image. Defaults to 0.
+
+    Returns:
+        Path: The written image.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)  # noqa: S311 - reproducible test data, not for security
+    gradient = Image.linear_gradient("L").resize(size)
+    color = Image.new("RGB", size, (rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+    Image.composite(color, Image.new("RGB", size), gradient).save(path, format="PNG")
+    return path
+
+
+def write_tile_files(directory: str | Path, prefix: str, options: FileOptions, *, seed: int = 0) -> list[Path]:
+    """Write the input files of a data tile: `options.files` text files followed by `options.images` images.
+
+    Args:
+        directory (str | Path): The directory the files are written to.
+        prefix (str): The prefix of the file names, e.g. the name of the data tile.
+        options (FileOptions): The files to write.
+        seed (int): The seed of the content of the files. Defaults to 0.
+
+    Returns:
+        list[Path]: The written files.
+    """
+    directory = Path(directory)
+    paths = [
+        write_text_file(directory / f"{prefix}_data{idx:02d}.csv", options.file_size, encoding=options.encoding, seed=seed + idx)
+        for idx in range(options.files)
+    ]
+    paths.extend(write_image(directory / f"{prefix}_image{idx:02d}.png", options.image_size, seed=seed + idx) for idx in range(options.images))
+    return paths
+
+
+def write_tasksupport(data_dir: str | Path, mode: DatasetMode, *, save_thumbnail_image: bool = False) -> Path:
+    """Write invoice.schema.json, metadata-def.json and rdeconfig.yaml to the tasksupport directory.
+
+    Args:
+        data_dir (str | Path): The `data` directory.
+        mode (DatasetMode): The input mode of the dataset.
+        save_thumbnail_image (bool): The `system.save_thumbnail_image` setting. Defaults to False.
+
+    Returns:
+        Path: The tasksupport directory.
+    """
+    tasksupport = Path(data_dir, "tasksupport")
+    tasksupport.mkdir(parents=True, exist_ok=True)
+    _write_json(tasksupport / "invoice.schema.json", _INVOICE_SCHEMA)
+    _write_json(tasksupport / "metadata-def.json", _METADATA_DEF)
+    system = {"extended_mode": _EXTENDED_MODES[mode], "save_raw": True, "save_thumbnail_image": save_thumbnail_image, "magic_variable": False}
+    with open(tasksupport / "rdeconfig.yaml", "w", encoding="utf_8") as f:
+        yaml.dump({"system": system}, f, default_flow_style=False, allow_unicode=True)
+    return tasksupport
+
+
+def write_invoice(data_dir: str | Path, *, data_name: str = "datagen") -> Path:
+    """Write invoice.json, valid against the invoice.schema.json written by `write_tasksupport`, to the invoice directory.
+
+    Args:
+        data_dir (str | Path): The `data` directory.
+        data_name (str): The data name of the invoice. Defaults to "datagen".
+
+    Returns:
+        Path: The written invoice.json.
+    """
+    invoice = copy.deepcopy(_INVOICE)
+    invoice["basic"]["dataName"] = data_name
+    return _write_json(Path(data_dir, "invoice", "invoice.json"), invoice)
+
+
+def _write_json(path: Path, obj: dict[str, Any]) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(obj, ensure_ascii=False, indent=4), encoding="utf_8")
+    return path
+
+
+def generate_invoice_dataset(data_dir: str | Path, *, options: FileOptions | None = None, seed: int = 0) -> Path:
+    """Generate the input of the Invoice mode: the files of a single data tile in inputdata, with invoice.json.
+
+    Args:
+        data_dir (str | Path): The `data` directory to generate.
+        options (Optional[FileOptions]): The input files. Defaults to None, i.e. `FileOptions()`.
+        seed (int): The seed of the content of the files. Defaults to 0.
+
+    Returns:
+        Path: The `data` directory.
+    """
+    options = options or FileOptions()
+    _prepare(data_dir, "invoice", options)
+    write_tile_files(Path(data_dir, "inputdata"), "tile0000", options, seed=seed)
+    return Path(data_dir)
+
+
+def generate_excelinvoice_dataset(
+    data_dir: str | Path,
+    rows: int,
+    *,
+    layout: Literal["file", "folder"] = "file",
+    options: FileOptions | None = None,
+    seed: int = 0,
+) -> Path:
+    """Generate the input of the ExcelInvoice mode: an ExcelInvoice of `rows` rows and a zip of the input files of each row.
+
+    The ExcelInvoice `dataset_excel_invoice.xlsx` is generated by `ExcelInvoiceTemplateGenerator` from the invoice schema of
+    `write_tasksupport`, and a row is appended for each data tile. With the "file" layout, each row is a single input file at the
+    root of the zip, the first of the files described by `options`. With the "folder" layout, each row is a folder of the zip
+    with every file described by `options`.
+
+    Args:
+        data_dir (str | Path): The `data` directory to generate.
+        rows (int): The number of rows, i.e. data tiles.
+        layout (Literal["file", "folder"]): The layout of the zip. Defaults to "file".
+        options (Optional[FileOptions]): The input files of each row. Defaults to None, i.e. `FileOptions()`.
+        seed (int): The seed of the content of the files. Defaults to 0.
+
+    Returns:
+        Path: The `data` directory.
+    """
+    options = options or FileOptions()
+    if layout == "file":
+        text_file = 1 if options.files or not options.images else 0
+        options = options.model_copy(update={"files": text_file, "images": 1 - text_file})
+    _prepare(data_dir, "excelinvoice", options)
+    inputdata = Path(data_dir, "inputdata")
+    names = []
+    with tempfile.TemporaryDirectory() as staging:
+        for idx in range(rows):
+            directory = Path(staging, f"tile{idx:04d}") if layout == "folder" else Path(staging)
+            files = write_tile_files(directory, f"tile{idx:04d}", options, seed=seed + idx)
+            names.append(directory.name if layout == "folder" else files[0].name)
+        _zip_directory(Path(staging), inputdata / "inputs.zip")
+    write_excelinvoice(inputdata / "dataset_excel_invoice.xlsx", Path(data_dir, "tasksupport", "invoice.schema.json"), names, layout=layout)
+    return Path(data_dir)
+
+
+def write_excelinvoice(
+    path: str | Path,
+    invoice_schema_path: str | Path,
+    names: Sequence[str],
+    *,
+    layout: Literal["file", "folder"] = "file",
+) -> Path:
+    """Write an ExcelInvoice generated by `ExcelInvoiceTemplateGenerator`, with a row for each file or folder name.
+
+    Each row has a distinct data name and sample name, and the custom fields of the invoice schema of `write_tasksupport`.
+
+    Args:
+        path (str | Path): The ExcelInvoice to write. Its name must end with '_excel_invoice.xlsx'.
+        invoice_schema_path (str | Path): The invoice schema the template is generated from.
+        names (Sequence[str]): The input file name, or folder name with the "folder" layout, of each row.
+        layout (Literal["file", "folder"]): The layout of the input zip. Defaults to "file".
+
+    Returns:
+        Path: The written ExcelInvoice.
+    """
+    generator = ExcelInvoiceTemplateGenerator(FixedHeaders())
+    config = TemplateConfig(
+        schema_path=invoice_schema_path,
+        general_term_path=EX_GENERALTERM,
+        specific_term_path=EX_SPECIFICTERM,
+        inputfile_mode=layout,
+    )
+    template_df, df_general, df_specific, df_version = generator.generate(config)
+    columns = {f"{template_df.at[1, col]}/{template_df.at[2, col]}": col for col in template_df.columns}
+    rows = []
+    for idx, name in enumerate(names):
+        values = {
+            "basic/dataOwnerId": DATA_OWNER_ID,
+            "basic/dataName": f"datagen-{idx:04d}",
+            "sample/names": f"datagen-sample-{idx:04d}",
+            "sample/ownerId": DATA_OWNER_ID,
+            "custom/temperature": 300.0 + idx,
+            "custom/comment": f"row {idx}",
+        }
+        row: dict[str, Any] = {col: values.get(key) for key, col in columns.items()}
+        row[template_df.columns[0]] = name
+        rows.append(row)
+    invoice_df = pd.concat([template_df, pd.DataFrame(rows, columns=template_df.columns)], ignore_index=True)
+    dataframes = {"invoice_form": invoice_df, "generalTerm": df_general, "specificTerm": df_specific, "_version": df_version}
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    generator.save(dataframes, str(path))
+    return Path(path)
+
+
+def generate_rdeformat_dataset(data_dir: str | Path, tiles: int, *, options: FileOptions | None = None, seed: int = 0) -> Path:
+    """Generate the input of the RDEformat mode: a zip of the outputs of `tiles` data tiles.
+
+    The first data tile is at the root of the zip and the others are in `divided/NNNN`, as written by a structuring process.
+    Each data tile has its input files in `inputdata` and `raw`, a copy of its first image, if any, in `main_image`, and a
+    CSV file in `structured`.
+
+    Args:
+        data_dir (str | Path): The `data` directory to generate.
+        tiles (int): The number of data tiles.
+        options (Optional[FileOptions]): The input files of each data tile. Defaults to None, i.e. `FileOptions()`.
+        seed (int): The seed of the content of the files. Defaults to 0.
+
+    Returns:
+        Path: The `data` directory.
+    """
+    options = options or FileOptions()
+    _prepare(data_dir, "rdeformat", options)
+    with tempfile.TemporaryDirectory() as staging:
+        for idx in range(tiles):
+            _write_rdeformat_tile(Path(staging) if idx == 0 else Path(staging, "divided", f"{idx:04d}"), idx, options, seed=seed + idx)
+        _zip_directory(Path(staging), Path(data_dir, "inputdata", "rdeformat.zip"))
+    return Path(data_dir)
+
+
+def _write_rdeformat_tile(tile_dir: Path, idx: int, options: FileOptions, *, seed: int) -> None:
+    for name in _RDEFORMAT_DIRS:
+        tile_dir.joinpath(name).mkdir(parents=True, exist_ok=True)
+    files = write_tile_files(tile_dir / "inputdata", f"tile{idx:04d}", options, seed=seed)
+    for path in files:
+        shutil.copyfile(path, tile_dir / "raw" / path.name)
+    images = [path for path in files if path.suffix == ".png"]
+    if images:
+        shutil.copyfile(images[0], tile_dir / "main_image" / images[0].name)
+    write_text_file(tile_dir / "structured" / f"tile{idx:04d}.csv", options.file_size, seed=seed)
+
+
+def generate_multidatatile_dataset(data_dir: str | Path, tiles: int, *, options: FileOptions | None = None, seed: int = 0) -> Path:
+    """Generate the input of the MultiDataTile mode: `tiles` input files in inputdata, each of which is a data tile.
+
+    Every input file is either a text file or an image: `options.files` and `options.images` set the ratio of text files to
+    images, and `options.file_size`, `options.encoding` and `options.image_size` their content.
+
+    Args:
+        data_dir (str | Path): The `data` directory to generate.
+        tiles (int): The number of input files, i.e. data tiles.
+        options (Optional[FileOptions]): The input files. Defaults to None, i.e. `FileOptions()`.
+        seed (int): The seed of the content of the files. Defaults to 0.
+
+    Returns:
+        Path: The `data` directory.
+    """
+    options = options or FileOptions()
+    _prepare(data_dir, "multidatatile", options)
+    inputdata = Path(data_dir, "inputdata")
+    period = max(1, options.files + options.images)
+    for idx in range(tiles):
+        if idx % period < options.files or not options.images:
+            write_text_file(inputdata / f"tile{idx:04d}.csv", options.file_size, encoding=options.encoding, seed=seed + idx)
+        else:
+            write_image(inputdata / f"tile{idx:04d}.png", options.image_size, seed=seed + idx)
+    return Path(data_dir)
+
+
+def generate_dataset(
+    data_dir: str | Path,
+    mode: DatasetMode,
+    *,
+    tiles: int = 1,
+    layout: Literal["file", "folder"] = "file",
+    options: FileOptions | None = None,
+    seed: int = 0,
+) -> Path:
+    """Generate a complete `data` directory for the given input mode, to test or benchmark a structuring process.
+
+    The directory contains the inputdata, invoice and tasksupport directories. The generated files are reproducible for a given
+    seed. Files already in the directory are left as they are, so an empty or missing directory should be given.
+
+    Args:
+        data_dir (str | Path): The `data` directory to generate.
+        mode (DatasetMode): The input mode: "invoice", "excelinvoice", "rdeformat" or "multidatatile".
+        tiles (int): The number of data tiles. It is always 1 in the Invoice mode. Defaults to 1.
+        layout (Literal["file", "folder"]): The layout of the zip of the ExcelInvoice mode. Defaults to "file".
+        options (Optional[FileOptions]): The input files of each data tile. Defaults to None, i.e. `FileOptions()`.
+        seed (int): The seed of the content of the files. Defaults to 0.
+
+    Returns:
+        Path: The `data` directory.
+
+    Raises:
+        ValueError: If the mode is not supported.
+
+    Example:
+        ```python
+        from rdetoolkit.testing.datagen import FileOptions, generate_dataset
+
+        generate_dataset("data", "excelinvoice", tiles=1000, layout="folder", options=FileOptions(files=2, encoding="shift_jis", images=1))
+        ```
+    """
+    if mode == "invoice":
+        return generate_invoice_dataset(data_dir, options=options, seed=seed)
+    if mode == "excelinvoice":
+        return generate_excelinvoice_dataset(data_dir, tiles, layout=layout, options=options, seed=seed)
+    if mode == "rdeformat":
+        return generate_rdeformat_dataset(data_dir, tiles, options=options, seed=seed)
+    if mode == "multidatatile":
+        return generate_multidatatile_dataset(data_dir, tiles, options=options, seed=seed)
+    emsg = f"Unsupported mode: {mode}. Choose one of {', '.join(DATASET_MODES)}."
+    raise ValueError(emsg)
+
+
+def _prepare(data_dir: str | Path, mode: DatasetMode, options: FileOptions) -> None:
+    Path(data_dir, "inputdata").mkdir(parents=True, exist_ok=True)
+    write_tasksupport(data_dir, mode, save_thumbnail_image=options.images > 0)
+    write_invoice(data_dir)
+
+
+def _zip_directory(directory: Path, zip_path: Path) -> Path:
+    zip_path.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for path in sorted(directory.rglob("*")):
+            zf.write(path, path.relative_to(directory).as_posix())
+    return zip_path
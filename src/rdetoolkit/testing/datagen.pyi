@@ -0,0 +1,27 @@
+from collections.abc import Sequence
+from pathlib import Path
+from pydantic import BaseModel
+from typing import Final, Literal
+
+DatasetMode = Literal['invoice', 'excelinvoice', 'rdeformat', 'multidatatile']
+DATASET_MODES: Final[tuple[str, ...]]
+DATA_OWNER_ID: Final[str]
+
+class FileOptions(BaseModel):
+    files: int
+    file_size: int
+    encoding: str
+    images: int
+    image_size: tuple[int, int]
+
+def write_text_file(path: str | Path, size: int, *, encoding: str = 'utf_8', seed: int = 0) -> Path: ...
+def write_image(path: str | Path, size: tuple[int, int] = (64, 64), *, seed: int = 0) -> Path: ...
+def write_tile_files(directory: str | Path, prefix: str, options: FileOptions, *, seed: int = 0) -> list[Path]: ...
+def write_tasksupport(data_dir: str | Path, mode: DatasetMode, *, save_thumbnail_image: bool = False) -> Path: ...
+def write_invoice(data_dir: str | Path, *, data_name: str = 'datagen') -> Path: ...
+def generate_invoice_dataset(data_dir: str | Path, *, options: FileOptions | None = None, seed: int = 0) -> Path: ...
+def generate_excelinvoice_dataset(data_dir: str | Path, rows: int, *, layout: Literal['file', 'folder'] = 'file', options: FileOptions | None = None, seed: int = 0) -> Path: ...
+def write_excelinvoice(path: str | Path, invoice_schema_path: str | Path, names: Sequence[str], *, layout: Literal['file', 'folder'] = 'file') -> Path: ...
+def generate_rdeformat_dataset(data_dir: str | Path, tiles: int, *, options: FileOptions | None = None, seed: int = 0) -> Path: ...
+def generate_multidatatile_dataset(data_dir: str | Path, tiles: int, *, options: FileOptions | None = None, seed: int = 0) -> Path: ...
+def generate_dataset(data_dir: str | Path, mode: DatasetMode, *, tiles: int = 1, layout: Literal['file', 'folder'] = 'file', options: FileOptions | None = None, seed: int = 0) -> Path: ...
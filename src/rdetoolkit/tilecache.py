@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, Callable, Final
+
+from pydantic import BaseModel, ValidationError
+
+from rdetoolkit.journal import list_output_files, outputs_unchanged
+from rdetoolkit.models.config import Config
+from rdetoolkit.models.rde2types import RdeOutputResourcePath
+from rdetoolkit.models.result import WorkflowExecutionStatus
+from rdetoolkit.rdelogger import get_logger
+
+logger = get_logger(__name__)
+
+TILE_CACHE_NAME: Final = "tile_cache.json"
+CACHED_STATUS: Final = "cached"
+# Settings that change how the run is executed or reported, but not the outputs of a data tile
+_EXECUTION_SETTINGS: Final = frozenset({
+    "max_workers",
+    "lazy_output_dirs",
+    "prune_empty_output_dirs",
+    "stream_results",
+    "run_journal",
+    "tile_cache",
+})
+_CHUNK_SIZE: Final = 1024 * 1024
+
+
+class TileCacheEntry(BaseModel):
+    """The fingerprint of the inputs of a data tile, with the size of each output file and the status it was processed with."""
+
+    fingerprint: str
+    outputs: dict[str, int]
+    status: WorkflowExecutionStatus
+
+
+class _TileCacheFile(BaseModel):
+    run_fingerprint: str
+    tiles: dict[int, TileCacheEntry]
+
+
+def hash_json(obj: Any) -> str:
+    """Return the hexadecimal SHA-256 digest of the canonical JSON representation of an object.
+
+    Args:
+        obj (Any): A JSON serializable object. Other values, e.g. dates, are serialized with `str`.
+
+    Returns:
+        str: The hexadecimal SHA-256 digest.
+    """
+    text = json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(text.encode("utf_8")).hexdigest()
+
+
+def hash_files(paths: Iterable[str | Path]) -> str:
+    """Return the hexadecimal SHA-256 digest of the names and the contents of the given files.
+
+    Unlike `rdetoolkit.journal.fingerprint_files`, the content of each file is read, so that the digest does not depend on
+    where the files are or when they were written, e.g. when they are extracted again from the same archive.
+
+    Args:
+        paths (Iterable[str | Path]): The files.
+
+    Returns:
+        str: The hexadecimal SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(f"{os.path.basename(path)}\0".encode())
+        try:
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+        except OSError:
+            digest.update(b"\0missing")
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def fingerprint_run(
+    config: Config,
+    *,
+    invoice_schema: dict[str, Any] | None = None,
+    metadata_def: dict[str, Any] | None = None,
+    custom_dataset_function: Callable[..., Any] | None = None,
+) -> str:
+    """Return the fingerprint of the inputs shared by every data tile of a run.
+
+    The fingerprint covers the configuration, except the settings that do not change the outputs of a data tile such as
+    `system.max_workers`, the invoice schema, metadata-def.json and the name of the custom structuring function. The
+    `system.tile_cache_version` setting is part of the configuration: change it when the custom structuring function changes.
+
+    Args:
+        config (Config): The configuration of the run.
+        invoice_schema (Optional[dict[str, Any]]): The parsed invoice.schema.json. Defaults to None.
+        metadata_def (Optional[dict[str, Any]]): The parsed metadata-def.json. Defaults to None.
+        custom_dataset_function (Optional[Callable[..., Any]]): The custom structuring function. Defaults to None.
+
+    Returns:
+        str: The hexadecimal SHA-256 digest.
+    """
+    function_name = None
+    if custom_dataset_function is not None:
+        module = getattr(custom_dataset_function, "__module__", None)
+        function_name = f"{module}.{getattr(custom_dataset_function, '__qualname__', repr(custom_dataset_function))}"
+    return hash_json({
+        "config": config.model_dump(mode="json", exclude={"system": set(_EXECUTION_SETTINGS)}),
+        "invoice_schema": invoice_schema,
+        "metadata_def": metadata_def,
+        "custom_dataset_function": function_name,
+    })
+
+
+class TileCache:
+    """A cache of the data tiles processed by the previous run, stored as JSON in the logs directory.
+
+    A data tile whose fingerprint is unchanged since the previous run, and whose output files are still there with the same
+    size, does not need to be processed again: `lookup` returns its recorded status, marked as "cached". The fingerprint of a
+    data tile covers the fingerprint of the run, see `fingerprint_run`, the names and contents of its raw files and the invoice
+    the data tile starts from, e.g. the row of the ExcelInvoice.
+
+    Args:
+        path (str | Path): The cache file.
+        run_fingerprint (str): The fingerprint of the current run, see `fingerprint_run`.
+    """
+
+    def __init__(self, path: str | Path, run_fingerprint: str):
+        self.path = Path(path)
+        self.run_fingerprint = run_fingerprint
+        self.entries: dict[int, TileCacheEntry] = {}
+        self._fingerprints: dict[int, str] = {}
+        self._current: dict[int, TileCacheEntry] = {}
+
+    def read(self) -> TileCache:
+        """Load the entries of the previous run. An invalid cache file, or one written by a different run, is ignored.
+
+        Returns:
+            TileCache: This cache.
+        """
+        self.entries = {}
+        if not self.path.exists():
+            return self
+        try:
+            cache_file = _TileCacheFile.model_validate_json(self.path.read_bytes())
+        except ValidationError:
+            logger.debug(f"Ignoring the invalid tile cache {self.path}")
+            return self
+        if cache_file.run_fingerprint == self.run_fingerprint:
+            self.entries = cache_file.tiles
+        return self
+
+    def fingerprint(self, idx: int, resource_paths: RdeOutputResourcePath, invoice: dict[str, Any] | None = None) -> str:
+        """Return the fingerprint of the inputs of a data tile. It is computed once per data tile, before the tile is processed.
+
+        Args:
+            idx (int): The index of the data tile.
+            resource_paths (RdeOutputResourcePath): The output paths of the data tile.
+            invoice (Optional[dict[str, Any]]): The invoice the data tile starts from. Defaults to None.
+
+        Returns:
+            str: The hexadecimal SHA-256 digest.
+        """
+        if idx not in self._fingerprints:
+            self._fingerprints[idx] = hash_json([self.run_fingerprint, hash_files(resource_paths.rawfiles), invoice])
+        return self._fingerprints[idx]
+
+    def lookup(self, idx: int, resource_paths: RdeOutputResourcePath, invoice: dict[str, Any] | None = None) -> WorkflowExecutionStatus | None:
+        """Return the status of a data tile that does not need to be processed again, marked as "cached".
+
+        Args:
+            idx (int): The index of the data tile.
+            resource_paths (RdeOutputResourcePath): The output paths of the data tile.
+            invoice (Optional[dict[str, Any]]): The invoice the data tile starts from. Defaults to None.
+
+        Returns:
+            Optional[WorkflowExecutionStatus]: The cached status, without the stage timings of the previous run, or None if the
+                data tile has to be processed.
+        """
+        fingerprint = self.fingerprint(idx, resource_paths, invoice)
+        entry = self.entries.get(idx)
+        if entry is None or entry.fingerprint != fingerprint or not outputs_unchanged(entry.outputs):
+            return None
+        self._current[idx] = entry
+        return entry.status.model_copy(update={"status": CACHED_STATUS, "timings": None, "bytes_copied": None})
+
+    def record(self, idx: int, resource_paths: RdeOutputResourcePath, status: WorkflowExecutionStatus) -> None:
+        """Record a processed data tile. Only successful tiles whose fingerprint was computed before processing are recorded.
+
+        Args:
+            idx (int): The index of the data tile.
+            resource_paths (RdeOutputResourcePath): The output paths of the data tile.
+            status (WorkflowExecutionStatus): The execution status of the data tile.
+        """
+        fingerprint = self._fingerprints.get(idx)
+        if status.status != "success" or fingerprint is None:
+            return
+        self._current[idx] = TileCacheEntry(fingerprint=fingerprint, outputs=list_output_files(resource_paths), status=status)
+
+    def save(self) -> None:
+        """Replace the cache file with the entries of the current run: the recorded tiles and the cached ones."""
+        cache_file = _TileCacheFile(run_fingerprint=self.run_fingerprint, tiles=self._current)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(cache_file.model_dump_json(), encoding="utf_8")
+        os.replace(tmp_path, self.path)
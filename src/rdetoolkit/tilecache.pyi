@@ -0,0 +1,32 @@
+from _typeshed import Incomplete as Incomplete
+from collections.abc import Iterable
+from pathlib import Path
+from pydantic import BaseModel
+from rdetoolkit.models.config import Config as Config
+from rdetoolkit.models.rde2types import RdeOutputResourcePath as RdeOutputResourcePath
+from rdetoolkit.models.result import WorkflowExecutionStatus as WorkflowExecutionStatus
+from typing import Any, Callable, Final
+
+logger: Incomplete
+TILE_CACHE_NAME: Final[str]
+CACHED_STATUS: Final[str]
+
+class TileCacheEntry(BaseModel):
+    fingerprint: str
+    outputs: dict[str, int]
+    status: WorkflowExecutionStatus
+
+def hash_json(obj: Any) -> str: ...
+def hash_files(paths: Iterable[str | Path]) -> str: ...
+def fingerprint_run(config: Config, *, invoice_schema: dict[str, Any] | None = None, metadata_def: dict[str, Any] | None = None, custom_dataset_function: Callable[..., Any] | None = None) -> str: ...
+
+class TileCache:
+    path: Path
+    run_fingerprint: str
+    entries: dict[int, TileCacheEntry]
+    def __init__(self, path: str | Path, run_fingerprint: str) -> None: ...
+    def read(self) -> TileCache: ...
+    def fingerprint(self, idx: int, resource_paths: RdeOutputResourcePath, invoice: dict[str, Any] | None = None) -> str: ...
+    def lookup(self, idx: int, resource_paths: RdeOutputResourcePath, invoice: dict[str, Any] | None = None) -> WorkflowExecutionStatus | None: ...
+    def record(self, idx: int, resource_paths: RdeOutputResourcePath, status: WorkflowExecutionStatus) -> None: ...
+    def save(self) -> None: ...
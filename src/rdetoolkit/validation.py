@@ -1,12 +1,18 @@
 from __future__ import annotations
 
 import copy
+import functools
+import hashlib
 import os
+import threading
 from pathlib import Path
 from typing import Any, cast
 
-from jsonschema import Draft202012Validator, FormatChecker, validate
+from jsonschema import Draft202012Validator, FormatChecker
 from jsonschema import ValidationError as SchemaValidationError
+from jsonschema.exceptions import best_match
+from jsonschema.protocols import Validator
+from jsonschema.validators import validator_for
 from pydantic import ValidationError
 
 from rdetoolkit.exceptions import InvoiceSchemaValidationError, MetadataValidationError
@@ -93,13 +99,21 @@ class InvoiceValidator:
         self.schema_path = schema_path
         self.schema = self.__pre_validate()
         self.__temporarily_modify_json_schema()
+        self.__validator: Validator | None = None
 
-    def validate(self, *, path: str | Path | None = None, obj: dict[str, Any] | None = None) -> dict[str, Any]:
+    def __getstate__(self) -> dict[str, Any]:
+        # The compiled validator holds local functions and cannot be pickled; it is compiled again on first use.
+        state = self.__dict__.copy()
+        state["_InvoiceValidator__validator"] = None
+        return state
+
+    def validate(self, *, path: str | Path | None = None, obj: dict[str, Any] | None = None, fail_fast: bool = False) -> dict[str, Any]:
         """Validate the provided JSON data against the schema.
 
         Args:
             path (Optional[Union[str, Path]]): The path to the JSON file to validate.
             obj (Optional[dict[str, Any]]): The JSON object to validate.
+            fail_fast (bool): If True, stop at the first error found instead of collecting and sorting all errors. Defaults to False.
 
         Raises:
             ValueError: If neither 'path' nor 'obj' is provided.
@@ -120,20 +134,16 @@ class InvoiceValidator:
             emsg = "Expected a dictionary, but got a different type."
             raise ValueError(emsg)
 
-        basic_info = readf_json(self.pre_basic_info_schema)
-        # with open(self.pre_basic_info_schema, encoding="utf-8") as f:
-        #     basic_info = json.load(f)
-        try:
-            validate(instance=data, schema=basic_info)
-        except SchemaValidationError as schema_error:
+        basic_info_validator = _get_basic_info_validator(self.pre_basic_info_schema)
+        schema_error = best_match(basic_info_validator.iter_errors(data))
+        if schema_error is not None:
             emsg = "Error in validating system standard field.\nPlease correct the following fields in invoice.json\n"
             emsg += f"Field: {'.'.join(list(map(str, schema_error.path)))}\n"
             emsg += f"Type: {schema_error.validator}\n"
             emsg += f"Context: {schema_error.message}\n"
             raise InvoiceSchemaValidationError(emsg) from schema_error
 
-        validator = Draft202012Validator(self.schema, format_checker=FormatChecker())
-        errors = sorted(validator.iter_errors(data), key=lambda e: e.path)
+        errors = self.__collect_errors(data, fail_fast=fail_fast)
         emsg = "Error in validating invoice.json:\n"
         for idx, error in enumerate(errors, start=1):
             emsg += f"{idx}. Field: {'.'.join(list(map(str, error.path)))}\n"
@@ -144,6 +154,14 @@ class InvoiceValidator:
 
         return data
 
+    def __collect_errors(self, data: dict[str, Any], *, fail_fast: bool) -> list[SchemaValidationError]:
+        if self.__validator is None:
+            self.__validator = Draft202012Validator(self.schema, format_checker=FormatChecker())
+        if fail_fast:
+            first_error = next(self.__validator.iter_errors(data), None)
+            return [first_error] if first_error is not None else []
+        return sorted(self.__validator.iter_errors(data), key=lambda e: e.path)
+
     def __get_data(self, path: str | Path | None, obj: dict[str, Any] | None) -> dict[str, Any]:
         if path is None and obj is None:
             emsg = "At least one of 'path' or 'obj' must be provided"
@@ -245,12 +263,60 @@ class InvoiceValidator:
         return data
 
 
-def invoice_validate(path: str | Path, schema: str | Path) -> None:
+@functools.cache
+def _get_basic_info_validator(basic_info_schema_path: str) -> Validator:
+    """Return the compiled validator for the static basic/sample schema, loaded once per process."""
+    basic_info = readf_json(basic_info_schema_path)
+    cls = validator_for(basic_info)
+    cls.check_schema(basic_info)
+    return cls(basic_info)
+
+
+_invoice_validator_cache: dict[tuple[str, int, str], InvoiceValidator] = {}
+_invoice_validator_cache_lock = threading.Lock()
+
+
+def get_invoice_validator(schema_path: str | Path) -> InvoiceValidator:
+    """Return a compiled InvoiceValidator for invoice.schema.json, shared within the process.
+
+    Validators are cached by the resolved schema path, its modification time and a hash of its content,
+    so an edited schema is compiled again while an unchanged one is read, checked and compiled only once.
+
+    Args:
+        schema_path (Union[str, Path]): invoice.schema.json file path
+
+    Returns:
+        InvoiceValidator: The cached validator for the schema.
+    """
+    __path = Path(schema_path).resolve()
+    content = __path.read_bytes()
+    key = (str(__path), __path.stat().st_mtime_ns, hashlib.sha256(content).hexdigest())
+    with _invoice_validator_cache_lock:
+        validator = _invoice_validator_cache.get(key)
+        if validator is None:
+            validator = InvoiceValidator(schema_path)
+            _invoice_validator_cache[key] = validator
+    return validator
+
+
+def invoice_validate(
+    path: str | Path,
+    schema: str | Path,
+    *,
+    validator: InvoiceValidator | None = None,
+    invoice_obj: dict[str, Any] | None = None,
+    fail_fast: bool = False,
+) -> None:
     """invoice.json validation function.
 
     Args:
         path (Union[str, Path]): invoice.json file path
         schema (Union[str, Path]): invoice.schema.json file path
+        validator (Optional[InvoiceValidator]): A validator already built from `schema`. If not specified, the validator
+            cached for `schema` by `get_invoice_validator` is used. Defaults to None.
+        invoice_obj (Optional[dict[str, Any]]): The invoice held in memory. If specified, it is validated instead of
+            the file at `path`, which does not have to exist yet. Defaults to None.
+        fail_fast (bool): If True, report only the first error found in invoice.json. Defaults to False.
 
     Raises:
         FileNotFoundError: If the provided schema file does not exist.
@@ -265,12 +331,16 @@ def invoice_validate(path: str | Path, schema: str | Path) -> None:
     if not schema.exists():
         emsg = f"The schema and path do not exist: {schema.name}"
         raise FileNotFoundError(emsg)
-    if not path.exists():
+    if invoice_obj is None and not path.exists():
         emsg = f"The schema and path do not exist: {path.name}"
         raise FileNotFoundError(emsg)
 
-    validator = InvoiceValidator(schema)
+    if validator is None:
+        validator = get_invoice_validator(schema)
     try:
-        validator.validate(path=path)
+        if invoice_obj is None:
+            validator.validate(path=path, fail_fast=fail_fast)
+        else:
+            validator.validate(obj=invoice_obj, fail_fast=fail_fast)
     except ValidationError as validation_error:
         raise InvoiceSchemaValidationError from validation_error
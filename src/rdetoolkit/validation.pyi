@@ -14,6 +14,7 @@ class InvoiceValidator:
     schema_path: Incomplete
     schema: Incomplete
     def __init__(self, schema_path: str | Path) -> None: ...
-    def validate(self, *, path: str | Path | None = None, obj: dict[str, Any] | None = None) -> dict[str, Any]: ...
+    def validate(self, *, path: str | Path | None = None, obj: dict[str, Any] | None = None, fail_fast: bool = False) -> dict[str, Any]: ...
 
-def invoice_validate(path: str | Path, schema: str | Path) -> None: ...
+def get_invoice_validator(schema_path: str | Path) -> InvoiceValidator: ...
+def invoice_validate(path: str | Path, schema: str | Path, *, validator: InvoiceValidator | None = None, invoice_obj: dict[str, Any] | None = None, fail_fast: bool = False) -> None: ...
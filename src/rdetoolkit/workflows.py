@@ -1,19 +1,37 @@
 from __future__ import annotations
 
+import asyncio
 import contextlib
-from collections.abc import Generator
+import functools
+import inspect
+import math
+import os
+from collections.abc import Awaitable, Generator, Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Callable, NamedTuple, Optional
 
 from tqdm import tqdm
 
 from rdetoolkit.config import load_config
 from rdetoolkit.errors import handle_and_exit_on_structured_error, handle_generic_error, skip_exception_context
-from rdetoolkit.exceptions import StructuredError
-from rdetoolkit.invoicefile import backup_invoice_json_files
+from rdetoolkit.exceptions import InvoiceSchemaValidationError, StructuredError
+from rdetoolkit.fileops import readf_json, remove_empty_dirs
+from rdetoolkit.impl.input_controller import ExcelInvoiceChecker
+from rdetoolkit.invoicefile import ExcelInvoiceFile, backup_invoice_json_files
+from rdetoolkit.journal import RUN_JOURNAL_NAME, JournalPlan, RunJournal, clear_stale_outputs, fingerprint_directories
 from rdetoolkit.models.config import Config
-from rdetoolkit.models.rde2types import RawFiles, RdeInputDirPaths, RdeOutputResourcePath
+from rdetoolkit.models.rde2types import (
+    TILE_OUTPUT_DIRS,
+    RawFiles,
+    RdeInputDirPaths,
+    RdeOutputResourcePath,
+    RunContext,
+    TilePlan,
+)
 from rdetoolkit.models.result import WorkflowExecutionStatus, WorkflowResultManager
 from rdetoolkit.modeproc import (
+    StageTimer,
     _CallbackType,
     excel_invoice_mode_process,
     invoice_mode_process,
@@ -23,7 +41,14 @@ from rdetoolkit.modeproc import (
 )
 from rdetoolkit.rde2util import StorageDir
 from rdetoolkit.rdelogger import get_logger
-from rdetoolkit.core import DirectoryOps
+from rdetoolkit.tilecache import TILE_CACHE_NAME, TileCache, fingerprint_run
+from rdetoolkit.validation import get_invoice_validator
+
+_CGROUP_V2_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+_CGROUP_V1_CPU_QUOTA = "/sys/fs/cgroup/cpu/cpu.cfs_quota_us"
+_CGROUP_V1_CPU_PERIOD = "/sys/fs/cgroup/cpu/cpu.cfs_period_us"
+_RESULTS_NDJSON = "workflow_results.ndjson"
+_AsyncCallbackType = Callable[[RdeInputDirPaths, RdeOutputResourcePath], Optional[Awaitable[None]]]
 
 
 def check_files(srcpaths: RdeInputDirPaths, *, mode: str | None) -> tuple[RawFiles, Path | None]:
@@ -89,6 +114,8 @@ def generate_folder_paths_iterator(
     raw_files_group: RawFiles,
     invoice_org_filepath: Path,
     invoice_schema_filepath: Path,
+    *,
+    create_dirs: bool = True,
 ) -> Generator[RdeOutputResourcePath, None, None]:
     """Generates iterator for RDE output folder paths.
 
@@ -99,6 +126,8 @@ def generate_folder_paths_iterator(
         raw_files_group (List[Tuple[pathlib.Path, ...]]): A list of tuples containing raw file paths.
         invoice_org_filepath (pathlib.Path): invoice_org.json file path
         invoice_schema_filepath (Path): invoice.schema.json file path
+        create_dirs (bool): If False, only the paths are computed and the folders are left to be created with
+            `create_output_dirs` when the data tile is processed. Defaults to True.
 
     Yields:
         RdeOutputResourcePath: A named tuple of output folder paths for RDE resources
@@ -115,29 +144,79 @@ def generate_folder_paths_iterator(
         create_folders(raw_files_group, excel_invoice_files)
         ```
     """
-    dir_ops = DirectoryOps("data")
-    for idx, raw_files in enumerate(raw_files_group):
-        rdeoutput_resource_path = RdeOutputResourcePath(
-            raw=Path(dir_ops.raw(idx).path),
-            rawfiles=raw_files,
-            struct=Path(dir_ops.structured(idx).path),
-            main_image=Path(dir_ops.main_image(idx).path),
-            other_image=Path(dir_ops.other_image(idx).path),
-            thumbnail=Path(dir_ops.thumbnail(idx).path),
-            meta=Path(dir_ops.meta(idx).path),
-            logs=Path(dir_ops.logs(idx).path),
-            invoice=Path(dir_ops.invoice(idx).path),
-            invoice_schema_json=invoice_schema_filepath,
-            invoice_org=invoice_org_filepath,
-            temp=Path(dir_ops.temp(idx).path),
-            nonshared_raw=Path(dir_ops.nonshared_raw(idx).path),
-            invoice_patch=Path(dir_ops.invoice_patch(idx).path),
-            attachment=Path(dir_ops.attachment(idx).path),
-        )
+    for rdeoutput_resource_path in TilePlan(raw_files_group, invoice_org_filepath, invoice_schema_filepath):
+        if create_dirs:
+            create_output_dirs(rdeoutput_resource_path)
         yield rdeoutput_resource_path
 
 
-def run(*, custom_dataset_function: _CallbackType | None = None, config: Config | None = None) -> str:  # pragma: no cover
+def plan_data_tiles(
+    raw_files_group: RawFiles,
+    invoice_org_filepath: Path,
+    invoice_schema_filepath: Path,
+    *,
+    create_dirs: bool = True,
+) -> TilePlan:
+    """Build the compact plan of the data tiles, creating the output folders of every tile unless `create_dirs` is False.
+
+    Unlike `generate_folder_paths_iterator`, the `RdeOutputResourcePath` of each tile is only produced when it is accessed,
+    so that the plan stays small for a large number of data tiles.
+
+    Args:
+        raw_files_group (RawFiles): The raw files of each data tile.
+        invoice_org_filepath (Path): invoice_org.json file path
+        invoice_schema_filepath (Path): invoice.schema.json file path
+        create_dirs (bool): If False, the folders are left to be created with `create_output_dirs` when the data tile is processed.
+            Defaults to True.
+
+    Returns:
+        TilePlan: The plan of the data tiles.
+    """
+    plan = TilePlan(raw_files_group, invoice_org_filepath, invoice_schema_filepath)
+    if create_dirs:
+        for idx in range(len(plan)):
+            _makedirs(plan.output_dirs(idx).values())
+    return plan
+
+
+def create_output_dirs(resource_paths: RdeOutputResourcePath) -> None:
+    """Create the output folders of a data tile whose paths were generated with `create_dirs=False`.
+
+    Args:
+        resource_paths (RdeOutputResourcePath): The output paths of the data tile.
+    """
+    _makedirs(getattr(resource_paths, field) for field in TILE_OUTPUT_DIRS)
+
+
+def _makedirs(paths: Iterable[Path | None]) -> None:
+    for path in paths:
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+
+def prune_empty_output_dirs(rde_data_tiles: Iterable[RdeOutputResourcePath], *, keep: Iterable[Path] = ()) -> list[Path]:
+    """Remove the output folders left empty by the structuring process, as well as `divided/NNNN` folders emptied this way.
+
+    Args:
+        rde_data_tiles (Iterable[RdeOutputResourcePath]): The output paths of the data tiles.
+        keep (Iterable[Path]): Folders that are never removed, e.g. the input folders. Defaults to ().
+
+    Returns:
+        list[Path]: The removed folders.
+    """
+    kept = {os.path.abspath(path) for path in keep}
+    dirs = [getattr(tile, field) for tile in rde_data_tiles for field in TILE_OUTPUT_DIRS]
+    tile_dirs = {path.parent for path in dirs if path is not None and "divided" in path.parts}
+    candidates = [*dirs, *tile_dirs, *{path.parent for path in tile_dirs}]
+    return remove_empty_dirs(path for path in candidates if path is not None and os.path.abspath(path) not in kept)
+
+
+def run(  # pragma: no cover
+    *,
+    custom_dataset_function: _CallbackType | None = None,
+    config: Config | None = None,
+    resume: bool = False,
+) -> str:
     """RDE Structuring Processing Function.
 
     This function executes the structuring process for RDE data. If you want to implement custom processing for the input data,
@@ -147,9 +226,11 @@ def run(*, custom_dataset_function: _CallbackType | None = None, config: Config
     Args:
         custom_dataset_function (Optional[_CallbackType], optional): User-defined structuring function. Defaults to None.
         config (Optional[Config], optional): Configuration class for the structuring process. If not specified, default values are loaded automatically. Defaults to None.
+        resume (bool, optional): Resume the previous run from its journal `data/logs/run_journal.ndjson`. Defaults to False.
 
     Returns:
-        str: The JSON representation of the workflow execution results.
+        str: The JSON representation of the workflow execution results. If `system.stream_results` is enabled, the statuses are
+            streamed to `data/logs/workflow_results.ndjson` instead, and the JSON representation of their summary is returned.
 
     Raises:
         StructuredError: If a structured error occurs during the process.
@@ -159,6 +240,19 @@ def run(*, custom_dataset_function: _CallbackType | None = None, config: Config
         If `extended_mode` is specified, the evaluation of the execution mode is performed in the order of `extended_mode -> excelinvoice -> invoice`,
         and the structuring process is executed.
 
+        If `system.max_workers` is other than 1, the data tiles are dispatched to a process pool and the results are returned in tile order.
+        In that case, `custom_dataset_function` must be a module-level function so that it can be pickled and sent to the worker processes.
+
+        If `system.run_journal` is enabled, or with `resume=True`, every successful data tile is recorded in the run journal with the
+        fingerprint of its raw files and the size of its outputs. With `resume=True`, if the input files are unchanged since the journaled run,
+        the input files are not parsed or extracted again, and the data tiles whose raw files and outputs are intact are skipped with their
+        recorded status. The outputs left by the other data tiles, including failed or partially written ones, are removed and those
+        data tiles are processed again.
+
+        If `system.tile_cache` is enabled, the data tiles whose raw files, invoice, invoice schema, metadata-def.json, configuration
+        and `system.tile_cache_version` are unchanged since the previous run, and whose outputs are intact, are skipped. Their status
+        is reported as "cached".
+
     Example:
         ```python
         ### custom.py
@@ -190,67 +284,710 @@ def run(*, custom_dataset_function: _CallbackType | None = None, config: Config
     """
     logger = get_logger(__name__, file_path=StorageDir.get_specific_outputdir(True, "logs").joinpath("rdesys.log"))
     wf_manager = WorkflowResultManager()
-    error_info = None
 
     try:
-        # Enabling mode flag and validating input file
-        srcpaths = RdeInputDirPaths(
-            inputdata=StorageDir.get_specific_outputdir(False, "inputdata"),
-            invoice=StorageDir.get_specific_outputdir(False, "invoice"),
-            tasksupport=StorageDir.get_specific_outputdir(False, "tasksupport"),
+        prepared = _prepare_run(config, custom_dataset_function, resume=resume)
+        wf_manager = _result_manager(prepared.config)
+
+        # Execution of data set structuring process based on various modes
+        statuses = _run_tiles(
+            _bind_process_datatile(prepared, custom_dataset_function),
+            prepared.rde_data_tiles,
+            prepared.journal,
+            max_workers=prepared.config.system.max_workers,
+            completed=prepared.completed,
+            cache=prepared.cache,
         )
+        for status in tqdm(statuses, total=len(prepared.rde_data_tiles)):
+            wf_manager.add_status(status)
+        _finish_run(prepared)
 
-        # Loading configuration file
-        __config = load_config(str(srcpaths.tasksupport), config=config)
-        srcpaths.config = __config
+    except StructuredError as e:
+        handle_and_exit_on_structured_error(e, logger)
+    except Exception as e:
+        handle_generic_error(e, logger)
 
-        raw_files_group, excel_invoice_files = check_files(srcpaths, mode=__config.system.extended_mode)
+    if wf_manager.ndjson_path is not None:
+        return wf_manager.summary().model_dump_json(indent=2)
+    return wf_manager.to_json()
 
-        # Backup of invoice.json
-        invoice_org_filepath = backup_invoice_json_files(excel_invoice_files, __config.system.extended_mode)
-        invoice_schema_filepath = srcpaths.tasksupport.joinpath("invoice.schema.json")
 
-        # Execution of data set structuring process based on various modes
-        rde_data_tiles = list(generate_folder_paths_iterator(raw_files_group, invoice_org_filepath, invoice_schema_filepath))
-        for idx, rdeoutput_resource in enumerate(tqdm(rde_data_tiles)):
-            if __config.system.extended_mode is not None and __config.system.extended_mode.lower() == "rdeformat":
-                mode = "rdeformat"
-                status = rdeformat_mode_process(str(idx), srcpaths, rdeoutput_resource, custom_dataset_function)
-            elif __config.system.extended_mode is not None and __config.system.extended_mode.lower() == "multidatatile":
-                mode = "MultiDataTile"
-                ignore_error = __config.multidata_tile.ignore_errors if __config.multidata_tile else False
-                with skip_exception_context(Exception, logger=logger, enabled=ignore_error) as error_info:
-                    status = multifile_mode_process(str(idx), srcpaths, rdeoutput_resource, custom_dataset_function)
-            elif excel_invoice_files is not None:
-                mode = "Excelinvoice"
-                status = excel_invoice_mode_process(srcpaths, rdeoutput_resource, excel_invoice_files, idx, custom_dataset_function)
-            else:
-                mode = "Invoice"
-                status = invoice_mode_process(str(idx), srcpaths, rdeoutput_resource, custom_dataset_function)
-
-            if error_info and any(value is not None for value in error_info.values()):
-                _code = error_info.get("code")
-                code = 999
-                if isinstance(_code, int):
-                    code = _code
-                elif isinstance(_code, str):
-                    with contextlib.suppress(ValueError):
-                        code = int(_code)
-                status = WorkflowExecutionStatus(
-                    run_id=str(idx),
-                    title=f"Structured Process Faild: {mode}",
-                    status="failed",
-                    mode=mode,
-                    error_code=code,
-                    error_message=error_info.get("message"),
-                    stacktrace=error_info.get("stacktrace"),
-                    target=",".join(str(file) for file in rdeoutput_resource.rawfiles),
-                )
+async def arun(
+    *,
+    custom_dataset_function: _AsyncCallbackType | None = None,
+    config: Config | None = None,
+    resume: bool = False,
+    concurrency: int | None = None,
+) -> str:
+    """RDE Structuring Processing Function for asyncio.
+
+    This coroutine executes the same structuring process as `run`, but processes up to `concurrency` data tiles at the same
+    time on the running event loop. The custom structuring function may be a coroutine function, e.g. one that calls an
+    asynchronous HTTP client, or a plain function.
+
+    Args:
+        custom_dataset_function (Optional[_AsyncCallbackType], optional): User-defined structuring function, either a coroutine
+            function or a plain function. Defaults to None.
+        config (Optional[Config], optional): Configuration class for the structuring process. If not specified, default values are loaded automatically. Defaults to None.
+        resume (bool, optional): Resume the previous run from its journal `data/logs/run_journal.ndjson`. Defaults to False.
+        concurrency (Optional[int], optional): Maximum number of data tiles processed at the same time. Defaults to None,
+            which means the number of available CPUs plus 4, at most 32.
+
+    Returns:
+        str: The JSON representation of the workflow execution results, see `run`.
+
+    Raises:
+        ValueError: If `concurrency` is less than 1.
+        StructuredError: If a structured error occurs during the process.
+        Exception: If a generic error occurs during the process.
+
+    Note:
+        The blocking steps of the library, i.e. parsing and extracting the input files, copying the raw files and the images,
+        validating and writing invoice.json and metadata.json, run in a thread pool of `concurrency` threads, so that the event
+        loop is never blocked by them. A plain custom structuring function is run in that thread pool as well, while a coroutine
+        function is awaited on the event loop. `system.max_workers` is not used: the data tiles are not dispatched to a process pool.
+
+        The modules and functions the data tiles share must therefore be thread-safe.
+
+    Example:
+        ```python
+        import asyncio
+        from rdetoolkit import workflows
+
+        async def custom_dataset(srcpaths: RdeInputDirPaths, resource_paths: RdeOutputResourcePath) -> None:
+            ...(original asynchronous process)...
+
+        asyncio.run(workflows.arun(custom_dataset_function=custom_dataset, concurrency=8))
+        ```
+    """
+    if concurrency is not None and concurrency < 1:
+        emsg = f"concurrency must be 1 or more: {concurrency}"
+        raise ValueError(emsg)
+    logger = get_logger(__name__, file_path=StorageDir.get_specific_outputdir(True, "logs").joinpath("rdesys.log"))
+    wf_manager = WorkflowResultManager()
+
+    try:
+        prepared = await asyncio.to_thread(_prepare_run, config, custom_dataset_function, resume=resume)
+        wf_manager = _result_manager(prepared.config)
+
+        blocking_function = _blocking_callback(custom_dataset_function, asyncio.get_running_loop())
+        statuses = await _arun_tiles(
+            _bind_process_datatile(prepared, blocking_function),
+            prepared.rde_data_tiles,
+            prepared.journal,
+            concurrency=concurrency or min(32, _get_available_cpus() + 4),
+            completed=prepared.completed,
+            cache=prepared.cache,
+        )
+        for status in statuses:
             wf_manager.add_status(status)
+        await asyncio.to_thread(_finish_run, prepared)
 
     except StructuredError as e:
         handle_and_exit_on_structured_error(e, logger)
     except Exception as e:
         handle_generic_error(e, logger)
 
+    if wf_manager.ndjson_path is not None:
+        return wf_manager.summary().model_dump_json(indent=2)
     return wf_manager.to_json()
+
+
+class _PreparedRun(NamedTuple):
+    """The inputs of a structuring run, parsed and planned before any data tile is processed."""
+
+    config: Config
+    srcpaths: RdeInputDirPaths
+    excel_invoice_files: Path | None
+    context: RunContext
+    rde_data_tiles: TilePlan
+    journal: RunJournal | None
+    cache: TileCache | None
+    completed: dict[int, WorkflowExecutionStatus]
+
+
+def _prepare_run(config: Config | None, custom_dataset_function: Callable[..., Any] | None, *, resume: bool = False) -> _PreparedRun:
+    """Load the configuration, parse the input files and plan the data tiles, skipping those completed or cached.
+
+    Args:
+        config (Optional[Config]): Configuration class for the structuring process, or None to load it from tasksupport.
+        custom_dataset_function (Optional[Callable[..., Any]]): User-defined structuring function, part of the tile cache fingerprint.
+        resume (bool): Whether to resume the journaled run. Defaults to False.
+
+    Returns:
+        _PreparedRun: The prepared run.
+    """
+    # Enabling mode flag and validating input file
+    srcpaths = RdeInputDirPaths(
+        inputdata=StorageDir.get_specific_outputdir(False, "inputdata"),
+        invoice=StorageDir.get_specific_outputdir(False, "invoice"),
+        tasksupport=StorageDir.get_specific_outputdir(False, "tasksupport"),
+    )
+
+    # Loading configuration file
+    __config = load_config(str(srcpaths.tasksupport), config=config)
+    srcpaths.config = __config
+
+    unpacked_dir = StorageDir.get_specific_outputdir(True, "temp")
+    journal = _open_journal(__config, resume=resume)
+    raw_files_group, excel_invoice_files, excel_invoice, invoice_org_filepath = _prepare_tiles(
+        srcpaths,
+        unpacked_dir,
+        journal,
+        resume=resume,
+    )
+    invoice_schema_filepath = srcpaths.tasksupport.joinpath("invoice.schema.json")
+
+    # Files shared by every data tile are parsed only once
+    context = _build_run_context(
+        __config,
+        invoice_org_filepath,
+        invoice_schema_filepath,
+        srcpaths.tasksupport.joinpath("metadata-def.json"),
+        excel_invoice=excel_invoice,
+        unpacked_dir=unpacked_dir,
+    )
+    rde_data_tiles = plan_data_tiles(
+        raw_files_group,
+        invoice_org_filepath,
+        invoice_schema_filepath,
+        create_dirs=not __config.system.lazy_output_dirs,
+    )
+    cache = _open_tile_cache(__config, context, custom_dataset_function)
+    completed = _cached_statuses(cache, rde_data_tiles, context) if cache is not None else {}
+    if resume and journal is not None:
+        completed.update(_resume_tiles(journal, rde_data_tiles, srcpaths, cached=completed))
+    return _PreparedRun(__config, srcpaths, excel_invoice_files, context, rde_data_tiles, journal, cache, completed)
+
+
+def _result_manager(config: Config) -> WorkflowResultManager:
+    """Return the result manager of the run, streaming the statuses to NDJSON if `system.stream_results` is enabled."""
+    if config.system.stream_results:
+        return WorkflowResultManager(ndjson_path=StorageDir.get_specific_outputdir(True, "logs").joinpath(_RESULTS_NDJSON))
+    return WorkflowResultManager()
+
+
+def _bind_process_datatile(
+    prepared: _PreparedRun,
+    custom_dataset_function: _CallbackType | None,
+) -> Callable[[int, RdeOutputResourcePath], WorkflowExecutionStatus]:
+    """Return the picklable function processing a single data tile of the prepared run, see `_process_datatile`."""
+    return functools.partial(
+        _process_datatile,
+        srcpaths=prepared.srcpaths,
+        excel_invoice_file=prepared.excel_invoice_files,
+        custom_dataset_function=custom_dataset_function,
+        context=prepared.context,
+    )
+
+
+def _finish_run(prepared: _PreparedRun) -> None:
+    """Save the tile cache and prune the empty output directories, once every data tile is processed."""
+    if prepared.cache is not None:
+        prepared.cache.save()
+    if prepared.config.system.prune_empty_output_dirs:
+        srcpaths = prepared.srcpaths
+        prune_empty_output_dirs(prepared.rde_data_tiles, keep=[srcpaths.inputdata, srcpaths.invoice, srcpaths.tasksupport])
+
+
+def _open_journal(config: Config, *, resume: bool = False) -> RunJournal | None:
+    """Return the run journal, or None if the run is neither journaled nor resumed."""
+    if not (resume or config.system.run_journal):
+        return None
+    return RunJournal(StorageDir.get_specific_outputdir(True, "logs").joinpath(RUN_JOURNAL_NAME))
+
+
+def _prepare_tiles(
+    srcpaths: RdeInputDirPaths,
+    unpacked_dir: Path,
+    journal: RunJournal | None,
+    *,
+    resume: bool = False,
+) -> tuple[RawFiles, Path | None, ExcelInvoiceFile | None, Path]:
+    """Parse the input files into the raw files of each data tile, or reuse them from the run journal when resuming.
+
+    When the run starts over, invoice.json is backed up and a new journal is started. When it is resumed, the backup and the
+    files extracted by the journaled run are reused as they are.
+
+    Args:
+        srcpaths (RdeInputDirPaths): Input paths, including the loaded configuration.
+        unpacked_dir (Path): The temporary directory the input archive is extracted to.
+        journal (Optional[RunJournal]): The run journal, or None if the run is not journaled.
+        resume (bool): Whether to resume the journaled run. Defaults to False.
+
+    Returns:
+        tuple[RawFiles, Optional[Path], Optional[ExcelInvoiceFile], Path]: The raw files of each data tile, the path to the
+            ExcelInvoice and its parsed content if any, and the path to the backup of invoice.json.
+    """
+    mode = srcpaths.config.system.extended_mode
+    if journal is None:
+        return _parse_inputs(srcpaths, unpacked_dir)
+    input_fingerprint = _fingerprint_inputs(srcpaths)
+    plan = journal.read().resumable_plan(input_fingerprint, mode) if resume else None
+    if plan is not None:
+        return _resume_plan(plan)
+
+    raw_files_group, excel_invoice_files, excel_invoice, invoice_org_filepath = _parse_inputs(srcpaths, unpacked_dir)
+    journal.start(input_fingerprint, raw_files_group, invoice_org_filepath, mode=mode, excel_invoice=excel_invoice_files)
+    return raw_files_group, excel_invoice_files, excel_invoice, invoice_org_filepath
+
+
+def _parse_inputs(srcpaths: RdeInputDirPaths, unpacked_dir: Path) -> tuple[RawFiles, Path | None, ExcelInvoiceFile | None, Path]:
+    mode = srcpaths.config.system.extended_mode
+    input_checker = selected_input_checker(srcpaths, unpacked_dir, mode)
+    raw_files_group, excel_invoice_files = input_checker.parse(srcpaths.inputdata)
+    excel_invoice = input_checker.excel_invoice if isinstance(input_checker, ExcelInvoiceChecker) else None
+
+    # Backup of invoice.json
+    invoice_org_filepath = backup_invoice_json_files(excel_invoice_files, mode)
+    return raw_files_group, excel_invoice_files, excel_invoice, invoice_org_filepath
+
+
+def _resume_plan(plan: JournalPlan) -> tuple[RawFiles, Path | None, ExcelInvoiceFile | None, Path]:
+    raw_files_group = [tuple(Path(f) for f in raw_files) for raw_files in plan.raw_files_group]
+    excel_invoice_files = Path(plan.excel_invoice) if plan.excel_invoice is not None else None
+    excel_invoice = ExcelInvoiceFile(excel_invoice_files) if excel_invoice_files is not None else None
+    return raw_files_group, excel_invoice_files, excel_invoice, Path(plan.invoice_org)
+
+
+def _fingerprint_inputs(srcpaths: RdeInputDirPaths) -> str:
+    """Return the fingerprint of the input files and the task support files of the run, including those in nested folders.
+
+    The invoice directory is not part of it, because invoice.json is overwritten by the first data tile.
+
+    Args:
+        srcpaths (RdeInputDirPaths): Input paths.
+
+    Returns:
+        str: The fingerprint, see `fingerprint_directories`.
+    """
+    return fingerprint_directories([srcpaths.inputdata, srcpaths.tasksupport])
+
+
+def _resume_tiles(
+    journal: RunJournal,
+    rde_data_tiles: Sequence[RdeOutputResourcePath],
+    srcpaths: RdeInputDirPaths,
+    *,
+    cached: dict[int, WorkflowExecutionStatus] | None = None,
+) -> dict[int, WorkflowExecutionStatus]:
+    """Return the recorded statuses of the completed data tiles, and remove the outputs left by the other data tiles.
+
+    Args:
+        journal (RunJournal): The run journal, read by `_prepare_tiles`.
+        rde_data_tiles (Sequence[RdeOutputResourcePath]): Output paths of all data tiles.
+        srcpaths (RdeInputDirPaths): Input paths, which are never removed.
+        cached (Optional[dict[int, WorkflowExecutionStatus]]): Statuses of the data tiles skipped by the tile cache, whose outputs
+            are kept. Defaults to None.
+
+    Returns:
+        dict[int, WorkflowExecutionStatus]: The statuses of the data tiles to skip, keyed by tile index.
+    """
+    logger = get_logger(__name__, file_path=StorageDir.get_specific_outputdir(True, "logs").joinpath("rdesys.log"))
+    completed = journal.intact_statuses(rde_data_tiles)
+    # The backup of invoice.json is either in the invoice directory or in the temporary directory, which are both kept
+    skipped = completed.keys() | (cached or {}).keys()
+    removed = clear_stale_outputs(rde_data_tiles, skipped, keep=[srcpaths.inputdata, srcpaths.invoice, srcpaths.tasksupport])
+    if completed or removed:
+        logger.info(
+            f"Resuming the run: {len(completed)} of {len(rde_data_tiles)} data tiles are already completed, "
+            f"{len(removed)} stale output files are removed",
+        )
+    return completed
+
+
+def _open_tile_cache(config: Config, context: RunContext, custom_dataset_function: Callable[..., Any] | None) -> TileCache | None:
+    """Return the tile cache of the previous run, or None if `system.tile_cache` is disabled."""
+    if not config.system.tile_cache:
+        return None
+    run_fingerprint = fingerprint_run(
+        config,
+        invoice_schema=context.invoice_schema,
+        metadata_def=context.metadata_def,
+        custom_dataset_function=custom_dataset_function,
+    )
+    return TileCache(StorageDir.get_specific_outputdir(True, "logs").joinpath(TILE_CACHE_NAME), run_fingerprint).read()
+
+
+def _cached_statuses(cache: TileCache, rde_data_tiles: Sequence[RdeOutputResourcePath], context: RunContext) -> dict[int, WorkflowExecutionStatus]:
+    """Return the statuses of the data tiles that are unchanged since the previous run, marked as "cached".
+
+    The fingerprint of each data tile is computed here, before any data tile is processed, since the raw files may be moved
+    into the output directories while processing.
+
+    Args:
+        cache (TileCache): The tile cache of the previous run.
+        rde_data_tiles (Sequence[RdeOutputResourcePath]): Output paths of all data tiles.
+        context (RunContext): Run-scoped resources, including the original invoice and the ExcelInvoice.
+
+    Returns:
+        dict[int, WorkflowExecutionStatus]: The statuses of the data tiles to skip, keyed by tile index.
+    """
+    logger = get_logger(__name__, file_path=StorageDir.get_specific_outputdir(True, "logs").joinpath("rdesys.log"))
+    invoices = _tile_invoices(context, rde_data_tiles)
+    if invoices is None:
+        return {}
+    cached = {}
+    for idx, resource_paths in enumerate(rde_data_tiles):
+        status = cache.lookup(idx, resource_paths, invoices[idx] if idx < len(invoices) else None)
+        if status is not None:
+            cached[idx] = status
+    if cached:
+        logger.info(f"{len(cached)} of {len(rde_data_tiles)} data tiles are unchanged since the previous run and are skipped")
+    return cached
+
+
+def _tile_invoices(context: RunContext, rde_data_tiles: Sequence[RdeOutputResourcePath]) -> Sequence[dict[str, Any] | None] | None:
+    """Return the invoice each data tile starts from, or None if the invoices of the ExcelInvoice cannot be generated."""
+    if context.excel_invoice is None or context.invoice_org is None or context.invoice_schema is None or not rde_data_tiles:
+        return [context.invoice_org] * len(rde_data_tiles)
+    try:
+        return context.excel_invoice.overwrite_all(
+            rde_data_tiles[0].invoice_org,
+            rde_data_tiles[0].invoice_schema_json,
+            invoice_org_obj=context.invoice_org,
+            invoice_schema_obj=context.invoice_schema,
+        )
+    except StructuredError:
+        # The data tiles report the error themselves; without their invoices, they are not cached
+        return None
+
+
+def _run_tiles(
+    process_datatile: Callable[[int, RdeOutputResourcePath], WorkflowExecutionStatus],
+    rde_data_tiles: Sequence[RdeOutputResourcePath],
+    journal: RunJournal | None,
+    *,
+    max_workers: int,
+    completed: dict[int, WorkflowExecutionStatus] | None = None,
+    cache: TileCache | None = None,
+) -> Iterator[WorkflowExecutionStatus]:
+    """Process the data tiles that are not completed yet and yield the status of every data tile in tile order.
+
+    Each processed data tile is recorded in the run journal, if any, as soon as its status is available. Every data tile is
+    recorded in the tile cache, if any.
+
+    Args:
+        process_datatile (Callable[[int, RdeOutputResourcePath], WorkflowExecutionStatus]): Picklable function processing a single data tile.
+        rde_data_tiles (Sequence[RdeOutputResourcePath]): Output paths of all data tiles.
+        journal (Optional[RunJournal]): The run journal, or None if the run is not journaled.
+        max_workers (int): Configured number of workers, see `_resolve_max_workers`.
+        completed (Optional[dict[int, WorkflowExecutionStatus]]): Recorded statuses of the data tiles to skip. Defaults to None.
+        cache (Optional[TileCache]): The tile cache, or None if it is disabled. Defaults to None.
+
+    Yields:
+        WorkflowExecutionStatus: The execution status of each data tile, in tile order.
+    """
+    completed = completed or {}
+    pending = [idx for idx in range(len(rde_data_tiles)) if idx not in completed]
+    workers = _resolve_max_workers(max_workers, len(pending))
+    statuses: Iterator[WorkflowExecutionStatus] = (
+        (process_datatile(idx, rde_data_tiles[idx]) for idx in pending)
+        if workers <= 1
+        else _parallel_map(process_datatile, pending, rde_data_tiles, workers)
+    )
+    for idx in range(len(rde_data_tiles)):
+        status = completed.get(idx)
+        if status is None:
+            status = next(statuses)
+            if journal is not None:
+                journal.record_tile(idx, rde_data_tiles[idx], status)
+        if cache is not None:
+            cache.record(idx, rde_data_tiles[idx], status)
+        yield status
+
+
+async def _arun_tiles(
+    process_datatile: Callable[[int, RdeOutputResourcePath], WorkflowExecutionStatus],
+    rde_data_tiles: Sequence[RdeOutputResourcePath],
+    journal: RunJournal | None,
+    *,
+    concurrency: int,
+    completed: dict[int, WorkflowExecutionStatus] | None = None,
+    cache: TileCache | None = None,
+) -> list[WorkflowExecutionStatus]:
+    """Process the data tiles that are not completed yet, up to `concurrency` at a time, and return every status in tile order.
+
+    Each data tile is processed in a thread pool of `concurrency` threads, and is recorded in the run journal, if any, as soon
+    as its status is available. If a data tile raises, the data tiles that have not started yet are cancelled, the running ones
+    are awaited, and the exception is re-raised.
+
+    Args:
+        process_datatile (Callable[[int, RdeOutputResourcePath], WorkflowExecutionStatus]): Function processing a single data tile.
+        rde_data_tiles (Sequence[RdeOutputResourcePath]): Output paths of all data tiles.
+        journal (Optional[RunJournal]): The run journal, or None if the run is not journaled.
+        concurrency (int): Maximum number of data tiles processed at the same time.
+        completed (Optional[dict[int, WorkflowExecutionStatus]]): Recorded statuses of the data tiles to skip. Defaults to None.
+        cache (Optional[TileCache]): The tile cache, or None if it is disabled. Defaults to None.
+
+    Returns:
+        list[WorkflowExecutionStatus]: The execution status of each data tile, in tile order.
+    """
+    completed = completed or {}
+    pending = [idx for idx in range(len(rde_data_tiles)) if idx not in completed]
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    executor = ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(pending))), thread_name_prefix="rdetoolkit-tile")
+
+    async def process(idx: int) -> WorkflowExecutionStatus:
+        async with semaphore:
+            status = await loop.run_in_executor(executor, process_datatile, idx, rde_data_tiles[idx])
+            if journal is not None:
+                await loop.run_in_executor(executor, journal.record_tile, idx, rde_data_tiles[idx], status)
+        return status
+
+    tasks = [asyncio.ensure_future(process(idx)) for idx in pending]
+    try:
+        processed = dict(zip(pending, await asyncio.gather(*tasks)))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    finally:
+        # The running data tiles may still await coroutines on this loop, so the loop must not be blocked while they finish
+        await loop.run_in_executor(None, functools.partial(executor.shutdown, wait=True, cancel_futures=True))
+
+    statuses = []
+    for idx in range(len(rde_data_tiles)):
+        status = completed.get(idx) or processed[idx]
+        if cache is not None:
+            cache.record(idx, rde_data_tiles[idx], status)
+        statuses.append(status)
+    return statuses
+
+
+def _blocking_callback(custom_dataset_function: _AsyncCallbackType | None, loop: asyncio.AbstractEventLoop) -> _CallbackType | None:
+    """Return the custom structuring function as a plain function, to be called from a thread of the thread pool.
+
+    If the function returns an awaitable, e.g. it is a coroutine function, the awaitable is run on the event loop and the
+    calling thread waits for it. Any exception it raises is raised in the calling thread.
+
+    Args:
+        custom_dataset_function (Optional[_AsyncCallbackType]): User-defined structuring function, either a coroutine function
+            or a plain function.
+        loop (asyncio.AbstractEventLoop): The running event loop.
+
+    Returns:
+        Optional[_CallbackType]: The plain function, or None if no function is given.
+    """
+    if custom_dataset_function is None:
+        return None
+    function = custom_dataset_function
+
+    async def wait_for(awaitable: Awaitable[None]) -> None:
+        await awaitable
+
+    @functools.wraps(function)
+    def call(srcpaths: RdeInputDirPaths, resource_paths: RdeOutputResourcePath) -> None:
+        result = function(srcpaths, resource_paths)
+        if inspect.isawaitable(result):
+            asyncio.run_coroutine_threadsafe(wait_for(result), loop).result()
+
+    return call
+
+
+def _process_datatile(
+    idx: int,
+    rdeoutput_resource: RdeOutputResourcePath,
+    *,
+    srcpaths: RdeInputDirPaths,
+    excel_invoice_file: Path | None,
+    custom_dataset_function: _CallbackType | None,
+    context: RunContext | None = None,
+) -> WorkflowExecutionStatus:
+    """Run the mode processor matching the configuration for a single data tile.
+
+    This function is executed either in the main process or in a worker process of the process pool,
+    so every argument must be picklable.
+
+    Args:
+        idx (int): Index of the data tile.
+        rdeoutput_resource (RdeOutputResourcePath): Output paths of the data tile.
+        srcpaths (RdeInputDirPaths): Input paths, including the loaded configuration.
+        excel_invoice_file (Optional[Path]): Path to the ExcelInvoice, if any.
+        custom_dataset_function (Optional[_CallbackType]): User-defined structuring function.
+        context (Optional[RunContext]): Run-scoped resources shared by every data tile. Defaults to None.
+
+    Returns:
+        WorkflowExecutionStatus: The execution status of the data tile.
+    """
+    logger = get_logger(__name__, file_path=StorageDir.get_specific_outputdir(True, "logs").joinpath("rdesys.log"))
+    extended_mode = srcpaths.config.system.extended_mode
+    error_info = None
+    timer = StageTimer()
+    if srcpaths.config.system.lazy_output_dirs:
+        create_output_dirs(rdeoutput_resource)
+
+    if extended_mode is not None and extended_mode.lower() == "rdeformat":
+        mode = "rdeformat"
+        status = rdeformat_mode_process(str(idx), srcpaths, rdeoutput_resource, custom_dataset_function, context=context, timer=timer)
+    elif extended_mode is not None and extended_mode.lower() == "multidatatile":
+        mode = "MultiDataTile"
+        ignore_error = srcpaths.config.multidata_tile.ignore_errors if srcpaths.config.multidata_tile else False
+        with skip_exception_context(Exception, logger=logger, enabled=ignore_error) as error_info:
+            status = multifile_mode_process(str(idx), srcpaths, rdeoutput_resource, custom_dataset_function, context=context, timer=timer)
+    elif excel_invoice_file is not None:
+        mode = "Excelinvoice"
+        status = excel_invoice_mode_process(
+            srcpaths,
+            rdeoutput_resource,
+            excel_invoice_file,
+            idx,
+            custom_dataset_function,
+            context=context,
+            timer=timer,
+        )
+    else:
+        mode = "Invoice"
+        status = invoice_mode_process(str(idx), srcpaths, rdeoutput_resource, custom_dataset_function, context=context, timer=timer)
+
+    if error_info and any(value is not None for value in error_info.values()):
+        _code = error_info.get("code")
+        code = 999
+        if isinstance(_code, int):
+            code = _code
+        elif isinstance(_code, str):
+            with contextlib.suppress(ValueError):
+                code = int(_code)
+        status = WorkflowExecutionStatus(
+            run_id=str(idx),
+            title=f"Structured Process Faild: {mode}",
+            status="failed",
+            mode=mode,
+            error_code=code,
+            error_message=error_info.get("message"),
+            stacktrace=error_info.get("stacktrace"),
+            target=",".join(str(file) for file in rdeoutput_resource.rawfiles),
+            timings=timer.timings,
+            bytes_copied=timer.bytes_copied,
+        )
+    return status
+
+
+def _build_run_context(
+    config: Config,
+    invoice_org_filepath: Path,
+    invoice_schema_filepath: Path,
+    metadata_def_filepath: Path,
+    *,
+    excel_invoice: ExcelInvoiceFile | None = None,
+    unpacked_dir: Path | None = None,
+) -> RunContext:
+    """Read and parse the files shared by every data tile.
+
+    Files that are missing or cannot be parsed are left as None, so that the mode processors fall back to reading them
+    and any error is reported for each data tile as before. The same applies to the validator when invoice.schema.json
+    cannot be compiled.
+
+    Args:
+        config (Config): The loaded configuration.
+        invoice_org_filepath (Path): Path to the backup of invoice.json.
+        invoice_schema_filepath (Path): Path to invoice.schema.json.
+        metadata_def_filepath (Path): Path to metadata-def.json.
+        excel_invoice (Optional[ExcelInvoiceFile]): The ExcelInvoice already parsed by the input checker. Defaults to None.
+        unpacked_dir (Optional[Path]): The temporary directory the input archive is extracted to. Defaults to None.
+
+    Returns:
+        RunContext: The run-scoped resources.
+    """
+    invoice_schema = _read_shared_json(invoice_schema_filepath)
+    invoice_validator = None
+    if invoice_schema is not None:
+        with contextlib.suppress(InvoiceSchemaValidationError, ValueError):
+            invoice_validator = get_invoice_validator(invoice_schema_filepath)
+    return RunContext(
+        config=config,
+        invoice_schema=invoice_schema,
+        metadata_def=_read_shared_json(metadata_def_filepath),
+        invoice_org=_read_shared_json(invoice_org_filepath),
+        invoice_validator=invoice_validator,
+        excel_invoice=excel_invoice,
+        unpacked_dir=unpacked_dir,
+    )
+
+
+def _read_shared_json(path: Path) -> dict[str, Any] | None:
+    if not path.exists():
+        return None
+    with contextlib.suppress(StructuredError):
+        return readf_json(path)
+    return None
+
+
+def _parallel_map(
+    process_datatile: Callable[[int, RdeOutputResourcePath], WorkflowExecutionStatus],
+    indices: Sequence[int],
+    rde_data_tiles: Sequence[RdeOutputResourcePath],
+    max_workers: int,
+) -> Iterator[WorkflowExecutionStatus]:
+    """Dispatch data tiles to a process pool in chunks and yield their statuses in order.
+
+    The first exception raised by a worker is re-raised here, and the tiles that have not started yet are cancelled.
+
+    Args:
+        process_datatile (Callable[[int, RdeOutputResourcePath], WorkflowExecutionStatus]): Picklable function processing a single data tile.
+        indices (Sequence[int]): Indices of the data tiles to process.
+        rde_data_tiles (Sequence[RdeOutputResourcePath]): Output paths of all data tiles.
+        max_workers (int): Number of worker processes.
+
+    Yields:
+        WorkflowExecutionStatus: The execution status of each processed data tile, in the order of `indices`.
+    """
+    chunksize = max(1, len(indices) // (max_workers * 4))
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        yield from executor.map(process_datatile, indices, (rde_data_tiles[idx] for idx in indices), chunksize=chunksize)
+    except BaseException:
+        executor.shutdown(wait=True, cancel_futures=True)
+        raise
+    executor.shutdown(wait=True)
+
+
+def _resolve_max_workers(max_workers: int, num_tiles: int) -> int:
+    """Resolve the number of worker processes from the configured value and the number of data tiles.
+
+    Args:
+        max_workers (int): Configured number of workers. 0 means every available CPU.
+        num_tiles (int): Number of data tiles to be processed.
+
+    Returns:
+        int: The number of worker processes. Values of 1 or less mean sequential execution.
+    """
+    workers = _get_available_cpus() if max_workers == 0 else max_workers
+    return max(1, min(workers, num_tiles))
+
+
+def _get_available_cpus() -> int:
+    """Return the number of CPUs this process may use, honouring CPU affinity and cgroup CPU quotas.
+
+    Returns:
+        int: The number of usable CPUs (at least 1).
+    """
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    quota = _read_cgroup_cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, quota)
+    return max(1, cpus)
+
+
+def _read_cgroup_cpu_quota() -> int | None:
+    """Read the CPU quota of the current cgroup (v2 first, then v1).
+
+    Returns:
+        Optional[int]: The quota rounded up to whole CPUs, or None when no quota is set or cgroups are unavailable.
+    """
+    with contextlib.suppress(OSError, ValueError):
+        with open(_CGROUP_V2_CPU_MAX, encoding="utf-8") as f:
+            quota, period = f.read().split()[:2]
+        if quota == "max":
+            return None
+        return math.ceil(int(quota) / int(period))
+
+    with contextlib.suppress(OSError, ValueError):
+        with open(_CGROUP_V1_CPU_QUOTA, encoding="utf-8") as fq, open(_CGROUP_V1_CPU_PERIOD, encoding="utf-8") as fp:
+            quota_us, period_us = int(fq.read()), int(fp.read())
+        if quota_us <= 0 or period_us <= 0:
+            return None
+        return math.ceil(quota_us / period_us)
+    return None
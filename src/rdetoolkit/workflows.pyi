@@ -1,9 +1,16 @@
-from collections.abc import Generator
+from collections.abc import Awaitable, Generator, Iterable
 from pathlib import Path
 from rdetoolkit.models.config import Config as Config
-from rdetoolkit.models.rde2types import RawFiles as RawFiles, RdeInputDirPaths as RdeInputDirPaths, RdeOutputResourcePath as RdeOutputResourcePath
+from rdetoolkit.models.rde2types import RawFiles as RawFiles, RdeInputDirPaths as RdeInputDirPaths, RdeOutputResourcePath as RdeOutputResourcePath, TilePlan as TilePlan
 from rdetoolkit.modeproc import _CallbackType
+from typing import Callable
+
+_AsyncCallbackType = Callable[[RdeInputDirPaths, RdeOutputResourcePath], Awaitable[None] | None]
 
 def check_files(srcpaths: RdeInputDirPaths, *, mode: str | None) -> tuple[RawFiles, Path | None]: ...
-def generate_folder_paths_iterator(raw_files_group: RawFiles, invoice_org_filepath: Path, invoice_schema_filepath: Path) -> Generator[RdeOutputResourcePath, None, None]: ...
-def run(*, custom_dataset_function: _CallbackType | None = None, config: Config | None = None) -> str: ...
+def generate_folder_paths_iterator(raw_files_group: RawFiles, invoice_org_filepath: Path, invoice_schema_filepath: Path, *, create_dirs: bool = True) -> Generator[RdeOutputResourcePath, None, None]: ...
+def plan_data_tiles(raw_files_group: RawFiles, invoice_org_filepath: Path, invoice_schema_filepath: Path, *, create_dirs: bool = True) -> TilePlan: ...
+def create_output_dirs(resource_paths: RdeOutputResourcePath) -> None: ...
+def prune_empty_output_dirs(rde_data_tiles: Iterable[RdeOutputResourcePath], *, keep: Iterable[Path] = ()) -> list[Path]: ...
+def run(*, custom_dataset_function: _CallbackType | None = None, config: Config | None = None, resume: bool = False) -> str: ...
+async def arun(*, custom_dataset_function: _AsyncCallbackType | None = None, config: Config | None = None, resume: bool = False, concurrency: int | None = None) -> str: ...
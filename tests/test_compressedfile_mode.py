@@ -2,14 +2,21 @@ import os
 import pathlib
 import platform
 import shutil
+import zipfile
 from unittest import mock
 
 import pandas as pd
 import pytest
 from rdetoolkit.exceptions import StructuredError
+from rdetoolkit.impl import compressed_controller
 from rdetoolkit.impl.compressed_controller import (
     CompressedFlatFileParser,
     CompressedFolderParser,
+    ZipExtractor,
+    decode_member_name,
+    detect_archive_filename_encoding,
+    is_excluded_member,
+    parse_compressedfile_mode,
 )
 
 
@@ -155,3 +162,201 @@ class TestCompressedFolderParser:
 
             assert len(verification_files) == 1
             assert "test1.txt" in [p.name for p in verification_files["tests/temp/sample"]]
+
+
+def _make_zip(path, members):
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, content in members.items():
+            zf.writestr(name, content)
+    return path
+
+
+class TestZipExtractor:
+    def test_extract_concurrently(self, tmp_path):
+        """並列展開で全メンバーが展開され, 展開したパスが返されることを確認"""
+        members = {f"dir{i % 3}/file{i}.txt": f"content{i}" * 1000 for i in range(50)}
+        zip_path = _make_zip(tmp_path / "archive.zip", members)
+
+        files = ZipExtractor(max_workers=4).extract(zip_path, tmp_path / "out")
+
+        assert files == [tmp_path / "out" / name for name in members]
+        for name, content in members.items():
+            assert (tmp_path / "out" / name).read_text() == content
+
+    def test_excluded_members_are_not_decompressed(self, tmp_path):
+        """除外対象のメンバーは展開前にスキップされることを確認"""
+        members = {
+            "data/sample.txt": "sample",
+            "__MACOSX/data/._sample.txt": "mac",
+            "data/.DS_Store": "mac",
+            "data/~$invoice.xlsx": "temp",
+        }
+        zip_path = _make_zip(tmp_path / "archive.zip", members)
+        opened = []
+        original_open = zipfile.ZipFile.open
+
+        def spy_open(self, name, *args, **kwargs):
+            opened.append(name.filename if isinstance(name, zipfile.ZipInfo) else name)
+            return original_open(self, name, *args, **kwargs)
+
+        with mock.patch.object(zipfile.ZipFile, "open", spy_open):
+            files = ZipExtractor().extract(zip_path, tmp_path / "out")
+
+        assert files == [tmp_path / "out" / "data" / "sample.txt"]
+        assert opened == ["data/sample.txt"]
+        assert not (tmp_path / "out" / "__MACOSX").exists()
+
+    def test_extract_sanitizes_member_names(self, tmp_path):
+        zip_path = _make_zip(tmp_path / "archive.zip", {"../../evil.txt": "evil", "/abs/file.txt": "abs", "empty/": ""})
+
+        files = ZipExtractor().extract(zip_path, tmp_path / "out")
+
+        assert files == [tmp_path / "out" / "evil.txt", tmp_path / "out" / "abs" / "file.txt"]
+        assert (tmp_path / "out" / "empty").is_dir()
+        assert not (tmp_path / "evil.txt").exists()
+
+    def test_memory_budget_limits_workers(self):
+        extractor = ZipExtractor(max_workers=16, memory_budget=4 * 1024 * 1024, chunk_size=1024 * 1024)
+
+        assert extractor.max_workers == 4
+        assert ZipExtractor(memory_budget=1024, chunk_size=4096).chunk_size == 1024
+
+    def test_invalid_memory_budget(self):
+        with pytest.raises(ValueError):
+            ZipExtractor(memory_budget=0)
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("data/sample.txt", False),
+        ("__MACOSX/data/._sample.txt", True),
+        ("data/.DS_Store", True),
+        ("data/~$invoice.xlsx", True),
+        ("data/invoice.xlsx", False),
+    ],
+)
+def test_is_excluded_member(name, expected):
+    assert is_excluded_member(name) is expected
+
+
+def _make_legacy_zip(path, members, encoding):
+    """UTF-8フラグを立てずに, 指定した文字コードのファイル名でzipを作成する"""
+    with mock.patch.object(zipfile.ZipInfo, "_encodeFilenameFlags", lambda self: (self.filename.encode("cp437"), self.flag_bits)):
+        with zipfile.ZipFile(path, "w") as zf:
+            for name, content in members.items():
+                zf.writestr(name.encode(encoding).decode("cp437"), content)
+    return path
+
+
+class TestArchiveFilenameEncoding:
+    names = ["テストファイル名１.txt", "漢字ファイル名.txt", "かなファイル名.txt", "括弧（カッコ）.txt", "ファイル名_令和３年.txt"]
+
+    def test_detect_archive_filename_encoding_once(self, tmp_path):
+        """アーカイブ全体で1回だけ文字コードを判定し, 全メンバーに同じ文字コードを適用することを確認"""
+        zip_path = _make_legacy_zip(tmp_path / "archive.zip", {f"compdir/{n}": "content" for n in self.names}, "cp932")
+
+        with mock.patch(
+            "rdetoolkit.impl.compressed_controller.detect_bytes_encoding",
+            wraps=compressed_controller.detect_bytes_encoding,
+        ) as mock_detect:
+            files = ZipExtractor().extract(zip_path, tmp_path / "out")
+
+        assert mock_detect.call_count == 1
+        assert [f.name for f in files] == self.names
+
+    def test_ascii_names_skip_detection(self):
+        infolist = [zipfile.ZipInfo("compdir/sample.txt"), zipfile.ZipInfo("compdir/data.csv")]
+
+        with mock.patch("rdetoolkit.impl.compressed_controller.detect_bytes_encoding") as mock_detect:
+            assert detect_archive_filename_encoding(infolist) == "cp437"
+
+        mock_detect.assert_not_called()
+
+    def test_filename_encoding_override(self, tmp_path):
+        """設定で指定した文字コードが判定より優先されることを確認"""
+        zip_path = _make_legacy_zip(tmp_path / "archive.zip", {"漢字.txt": "content"}, "euc_jp")
+
+        with mock.patch("rdetoolkit.impl.compressed_controller.detect_bytes_encoding") as mock_detect:
+            files = ZipExtractor(filename_encoding="euc_jp").extract(zip_path, tmp_path / "out")
+
+        mock_detect.assert_not_called()
+        assert files == [tmp_path / "out" / "漢字.txt"]
+
+    def test_utf8_flagged_names_are_kept(self, tmp_path):
+        zip_path = _make_zip(tmp_path / "archive.zip", {"漢字ファイル名.txt": "content"})
+
+        files = ZipExtractor(filename_encoding="cp932").extract(zip_path, tmp_path / "out")
+
+        assert files == [tmp_path / "out" / "漢字ファイル名.txt"]
+
+    def test_undecodable_name_falls_back_to_cp437(self):
+        info = zipfile.ZipInfo("ÿÿ.txt")
+
+        assert decode_member_name(info, "utf_8") == "ÿÿ.txt"
+
+    def test_parse_compressedfile_mode_passes_filename_encoding(self):
+        parser = parse_compressedfile_mode(pd.DataFrame(), filename_encoding="cp932")
+
+        assert isinstance(parser, CompressedFolderParser)
+        assert parser.filename_encoding == "cp932"
+
+
+class TestPreflightValidation:
+    def test_extract_calls_validate_before_writing(self, tmp_path):
+        zip_path = _make_zip(tmp_path / "archive.zip", {"dir/a.txt": "a", "b.txt": "b", "empty/": ""})
+        received = []
+
+        def validate(members):
+            received.extend(members)
+            assert not (tmp_path / "out").exists()
+
+        ZipExtractor().extract(zip_path, tmp_path / "out", validate=validate)
+
+        assert received == [pathlib.PurePosixPath("dir/a.txt"), pathlib.PurePosixPath("b.txt")]
+
+    def test_flat_missing_file_fails_before_extraction(self, tmp_path):
+        """ExcelInvoiceに記載されたファイルがzipに無い場合, 展開前にエラーになることを確認"""
+        zip_path = _make_zip(tmp_path / "archive.zip", {"test_child1.txt": "a", "test_child2.txt": "b"})
+        xlsx_invoice = pd.DataFrame({"data_file_names/name": ["test_child1.txt", "test_chlid2.txt"]})
+        parser = CompressedFlatFileParser(xlsx_invoice)
+
+        with pytest.raises(StructuredError, match="ERROR: raw file not found: test_chlid2.txt"):
+            parser.read(zip_path, tmp_path / "out")
+
+        assert not (tmp_path / "out").exists()
+
+    def test_folder_case_insensitive_duplicates_fail_before_extraction(self, tmp_path):
+        zip_path = _make_zip(tmp_path / "archive.zip", {"data1/a.txt": "a", "Data1/b.txt": "b"})
+        parser = CompressedFolderParser(pd.DataFrame())
+
+        with pytest.raises(StructuredError, match="must always have unique names"):
+            parser.read(zip_path, tmp_path / "out")
+
+        assert not (tmp_path / "out").exists()
+
+    @pytest.mark.parametrize(
+        "folders, expected",
+        [
+            (["data1", "data2", "data3"], "ERROR: unused raw data: compdir/data3"),
+            (["data1"], None),
+            (["data1", "data3"], "ERROR: unused raw data: compdir/data3"),
+        ],
+    )
+    def test_folder_unused_folder(self, tmp_path, folders, expected):
+        zip_path = _make_zip(tmp_path / "archive.zip", {f"compdir/{d}/a.txt": "a" for d in folders})
+        parser = CompressedFolderParser(pd.DataFrame({"data_folder_names/name": ["data1", "data2"]}))
+
+        if expected is None:
+            assert len(parser.read(zip_path, tmp_path / "out")) == 1
+        else:
+            with pytest.raises(StructuredError, match=expected):
+                parser.read(zip_path, tmp_path / "out")
+            assert not (tmp_path / "out").exists()
+
+    def test_folder_missing_folder(self, tmp_path):
+        zip_path = _make_zip(tmp_path / "archive.zip", {"compdir/data1/a.txt": "a", "compdir/data2/a.txt": "a"})
+        parser = CompressedFolderParser(pd.DataFrame({"data_folder_names/name": ["data1", "data2", "data3"]}))
+
+        with pytest.raises(StructuredError, match="ERROR: raw data not found: data3"):
+            parser.read(zip_path, tmp_path / "out")
@@ -3,6 +3,7 @@ from pathlib import Path
 import shutil
 
 import pytest
+from pydantic import ValidationError
 import yaml
 from rdetoolkit.config import is_toml, is_yaml, parse_config_file, get_config, load_config
 from rdetoolkit.models.config import Config, SystemSettings, MultiDataTileSettings
@@ -324,3 +325,40 @@ def test_load_config_with_none_config_and_none_get_config():
     config = Config(system=system, multidata_tile=multi)
     result = load_config(dummpy_path)
     assert result == config
+
+
+@pytest.mark.parametrize("strategy", ["copy", "hardlink", "reflink", "symlink", "move"])
+def test_raw_materialization(strategy):
+    assert SystemSettings(raw_materialization=strategy).raw_materialization == strategy
+
+
+def test_rdeformat_direct_extraction():
+    assert SystemSettings().rdeformat_direct_extraction is False
+    assert SystemSettings(rdeformat_direct_extraction=True).rdeformat_direct_extraction is True
+
+
+def test_output_dir_settings():
+    assert SystemSettings().lazy_output_dirs is False
+    assert SystemSettings().prune_empty_output_dirs is False
+    settings = SystemSettings(lazy_output_dirs=True, prune_empty_output_dirs=True)
+    assert settings.lazy_output_dirs is True
+    assert settings.prune_empty_output_dirs is True
+
+
+def test_run_journal():
+    assert SystemSettings().run_journal is False
+    assert SystemSettings(run_journal=True).run_journal is True
+
+
+def test_tile_cache():
+    assert SystemSettings().tile_cache is False
+    assert SystemSettings().tile_cache_version is None
+    settings = SystemSettings(tile_cache=True, tile_cache_version="1.0.0")
+    assert settings.tile_cache is True
+    assert settings.tile_cache_version == "1.0.0"
+
+
+def test_invalid_raw_materialization():
+    assert SystemSettings().raw_materialization == "copy"
+    with pytest.raises(ValidationError):
+        SystemSettings(raw_materialization="rsync")
@@ -0,0 +1,89 @@
+import json
+import zipfile
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+from PIL import Image
+
+from rdetoolkit import workflows
+from rdetoolkit.cli import make_dataset
+from rdetoolkit.invoicefile import read_excelinvoice
+from rdetoolkit.testing.datagen import FileOptions, generate_dataset, write_image, write_text_file
+
+
+@pytest.mark.parametrize("encoding, label", [("utf_8", "試料"), ("shift_jis", "試料"), ("ascii", "sample")])
+def test_write_text_file(tmp_path, encoding, label):
+    path = write_text_file(tmp_path / "a.csv", 100_000, encoding=encoding)
+
+    assert path.stat().st_size == 100_000
+    text = path.read_bytes().decode(encoding)
+    assert text.startswith(f"index,value,count\n{label}0,")
+    assert write_text_file(tmp_path / "b.csv", 100_000, encoding=encoding).read_bytes() == path.read_bytes()
+    assert write_text_file(tmp_path / "c.csv", 0).stat().st_size == 0
+
+
+def test_write_image(tmp_path):
+    path = write_image(tmp_path / "a.png", (32, 16), seed=1)
+
+    with Image.open(path) as img:
+        assert img.size == (32, 16)
+        assert img.format == "PNG"
+
+
+@pytest.mark.parametrize(
+    "mode, layout, expected_tiles",
+    [("invoice", "file", 1), ("excelinvoice", "file", 3), ("excelinvoice", "folder", 3), ("rdeformat", "file", 3), ("multidatatile", "file", 3)],
+)
+def test_generate_dataset_runs_workflow(tmp_path, monkeypatch, mode, layout, expected_tiles):
+    """生成したdataディレクトリは、各モードの構造化処理をそのまま実行できる"""
+    monkeypatch.chdir(tmp_path)
+    options = FileOptions(files=2, file_size=2048, encoding="shift_jis", images=1)
+    generate_dataset("data", mode, tiles=3, layout=layout, options=options)
+
+    result = json.loads(workflows.run())
+
+    assert [status["status"] for status in result["statuses"]] == ["success"] * expected_tiles
+    assert Path("data/raw").is_dir()
+
+
+def test_generate_excelinvoice_dataset_folder_layout(tmp_path):
+    generate_dataset(tmp_path / "data", "excelinvoice", tiles=4, layout="folder", options=FileOptions(files=2, images=1))
+
+    inputdata = tmp_path / "data" / "inputdata"
+    with zipfile.ZipFile(inputdata / "inputs.zip") as zf:
+        names = [name for name in zf.namelist() if not name.endswith("/")]
+    assert len(names) == 12
+    assert "tile0003/tile0003_image00.png" in names
+    df_invoice, _, _ = read_excelinvoice(inputdata / "dataset_excel_invoice.xlsx")
+    assert df_invoice.iloc[:, 0].tolist() == ["tile0000", "tile0001", "tile0002", "tile0003"]
+    assert df_invoice["basic/dataName"].tolist() == ["datagen-0000", "datagen-0001", "datagen-0002", "datagen-0003"]
+
+
+def test_generate_rdeformat_dataset_layout(tmp_path):
+    generate_dataset(tmp_path / "data", "rdeformat", tiles=3)
+
+    with zipfile.ZipFile(tmp_path / "data" / "inputdata" / "rdeformat.zip") as zf:
+        names = zf.namelist()
+    assert "raw/tile0000_data00.csv" in names
+    assert "divided/0002/raw/tile0002_data00.csv" in names
+    assert "divided/0002/structured/tile0002.csv" in names
+
+
+def test_generate_dataset_unsupported_mode(tmp_path):
+    with pytest.raises(ValueError, match="Unsupported mode"):
+        generate_dataset(tmp_path / "data", "unknown")
+
+
+def test_make_dataset_command(tmp_path):
+    runner = CliRunner()
+    output_dir = tmp_path / "data"
+    result = runner.invoke(make_dataset, ["multidatatile", "-o", str(output_dir), "-n", "5", "--file-size", "10", "--encoding", "cp932"])
+
+    assert result.exit_code == 0
+    assert "Dataset generated successfully" in result.output
+    assert len(list(output_dir.joinpath("inputdata").iterdir())) == 5
+
+    result = runner.invoke(make_dataset, ["multidatatile", "-o", str(output_dir)])
+    assert result.exit_code == 1
+    assert "is not empty" in result.output
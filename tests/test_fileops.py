@@ -1,9 +1,21 @@
 from pathlib import Path
-from rdetoolkit.fileops import readf_json, writef_json
+from rdetoolkit.core import read_file_with_encoding
+from rdetoolkit.fileops import (
+    clear_encoding_cache,
+    detect_bom_encoding,
+    detect_bytes_encoding,
+    materialize_file,
+    readf_json,
+    remove_empty_dirs,
+    resolve_file_encoding,
+    writef_json,
+)
+from rdetoolkit.models.rde2types import EncodingDetectionResult
+import errno
 import json
-from unittest.mock import mock_open, patch, MagicMock
+import os
+from unittest.mock import patch
 from rdetoolkit.exceptions import StructuredError
-from rdetoolkit.core import detect_encoding
 import pytest
 
 
@@ -19,80 +31,95 @@ def test_json():
         Path(test_path).unlink()
 
 
-def test_readf_json_success():
-    test_path = "test.json"
-    mock_encoding = "utf_8"
-    mock_json_content = '{"key": "value"}'
+@pytest.fixture(autouse=True)
+def clear_cache():
+    clear_encoding_cache()
+    yield
+    clear_encoding_cache()
+
+
+def test_readf_json_success(tmp_path):
+    test_path = tmp_path / "test.json"
+    test_path.write_text('{"key": "value"}', encoding="utf_8")
     expected_result = {"key": "value"}
 
-    with patch('rdetoolkit.fileops.detect_encoding', return_value=mock_encoding) as mock_detect:
-        with patch('builtins.open', mock_open(read_data=mock_json_content)) as mock_file:
-            result = readf_json(test_path)
+    result = readf_json(str(test_path))
 
-            mock_detect.assert_called_once_with(test_path)
-            mock_file.assert_called_once_with(test_path, encoding='utf_8')
-            assert result == expected_result
+    assert result == expected_result
 
 
-def test_readf_json_with_path_object():
-    test_path = Path('test.json')
-    mock_encoding = 'UTF-8'
-    mock_json_content = '{"number": 123}'
+def test_readf_json_with_path_object(tmp_path):
+    test_path = tmp_path / "test.json"
+    test_path.write_text('{"number": 123}', encoding="utf_8")
     expected_result = {"number": 123}
 
-    with patch('rdetoolkit.fileops.detect_encoding', return_value=mock_encoding) as mock_detect:
-        with patch('builtins.open', mock_open(read_data=mock_json_content)) as mock_file:
-            result = readf_json(test_path)
+    with patch("rdetoolkit.fileops.read_file_with_encoding", wraps=read_file_with_encoding) as mock_read:
+        result = readf_json(test_path)
+
+    mock_read.assert_called_once_with(str(test_path))
+    assert result == expected_result
+
+
+def test_readf_json_rereads_rewritten_file(tmp_path):
+    """同じサイズ・更新時刻で書き換えられたファイルも、毎回読み直すことを確認"""
+    test_path = tmp_path / "test.json"
+    test_path.write_text('{"key": "value1"}', encoding="utf_8")
+    mtime_ns = test_path.stat().st_mtime_ns
 
-            mock_detect.assert_called_once_with(str(test_path))
-            mock_file.assert_called_once_with(str(test_path), encoding="utf_8")
-            assert result == expected_result
+    first = readf_json(test_path)
+    test_path.write_text('{"key": "value2"}', encoding="utf_8")
+    os.utime(test_path, ns=(mtime_ns, mtime_ns))
+    second = readf_json(test_path)
 
+    assert first == {"key": "value1"}
+    assert second == {"key": "value2"}
 
-def test_readf_json_with_different_encoding():
-    test_path = 'test_shift_jis.json'
-    mock_encoding = 'Shift-JIS'
-    mock_json_content = '{"japanese": "テスト"}'
-    expected_result = {"japanese": "テスト"}
 
-    with patch('rdetoolkit.fileops.detect_encoding', return_value=mock_encoding) as mock_detect:
-        with patch('builtins.open', mock_open(read_data=mock_json_content)) as mock_file:
-            result = readf_json(test_path)
+@pytest.mark.parametrize(
+    "encoding, content",
+    [
+        ("utf_8", '{"japanese": "テスト"}'),
+        ("utf_8_sig", '{"japanese": "テスト"}'),
+        ("shift_jis", '{"japanese": "これはShift_JISエンコーディングのテキストです。"}'),
+    ],
+)
+def test_readf_json_with_different_encoding(tmp_path, encoding, content):
+    test_path = tmp_path / f"test_{encoding}.json"
+    test_path.write_bytes(content.encode(encoding))
 
-            mock_detect.assert_called_once_with(test_path)
-            mock_file.assert_called_once_with(test_path, encoding='shift_jis')
-            assert result == expected_result
+    result = readf_json(test_path)
 
+    assert result == json.loads(content)
 
-def test_readf_json_with_default_encoding():
-    test_path = 'default_encoding.json'
-    mock_encoding = None
-    mock_json_content = '{"default": true}'
-    expected_result = {"default": True}
 
-    with patch('rdetoolkit.fileops.detect_encoding', return_value=mock_encoding) as mock_detect:
-        with patch('builtins.open', mock_open(read_data=mock_json_content)) as mock_file:
-            result = readf_json(test_path)
+def test_readf_json_raise_structured_error_on_exception(tmp_path):
+    test_path = tmp_path / "test.json"
+    test_path.write_text("{}", encoding="utf_8")
 
-            mock_detect.assert_called_once_with(test_path)
-            mock_file.assert_called_once_with(test_path, encoding='utf_8')
-            assert result == expected_result
+    with patch('rdetoolkit.fileops.read_file_with_encoding') as mock_read:
+        mock_read.side_effect = IOError('File not found')
+        with pytest.raises(StructuredError) as exc_info:
+            readf_json(test_path)
 
+        assert "An error occurred while processing the file: File not found" in str(exc_info.value)
+        mock_read.assert_called_once_with(str(test_path))
 
-def test_readf_json_raise_structured_error_on_exception():
-    test_path = 'invalid.json'
-    mock_encoding = 'utf-8'
 
-    with patch('rdetoolkit.fileops.detect_encoding', return_value=mock_encoding) as mock_detect:
-        with patch('builtins.open', mock_open()) as mock_file:
-            mock_file.side_effect = IOError('File not found')
+def test_readf_json_raise_structured_error_on_missing_file(tmp_path):
+    with pytest.raises(StructuredError) as exc_info:
+        readf_json(tmp_path / "missing.json")
 
-            with pytest.raises(StructuredError) as exc_info:
-                readf_json(test_path)
+    assert "An error occurred while processing the file" in str(exc_info.value)
 
-            assert "An error occurred while processing the file: File not found" in str(exc_info.value)
-            mock_detect.assert_called_once_with(test_path)
-            mock_file.assert_called_once_with(test_path, encoding='utf_8')
+
+def test_readf_json_raise_structured_error_on_invalid_json(tmp_path):
+    test_path = tmp_path / "invalid.json"
+    test_path.write_text("", encoding="utf_8")
+
+    with pytest.raises(StructuredError) as exc_info:
+        readf_json(test_path)
+
+    assert "An error occurred while processing the file" in str(exc_info.value)
 
 
 def test_writef_json_basic(tmp_path):
@@ -186,3 +213,215 @@ def test_writef_json_invalid_path(tmp_path):
 
     # ファイルが作成されていないことを確認
     assert not file_path.exists()
+
+
+@pytest.mark.parametrize(
+    "head, expected",
+    [
+        (b"\xef\xbb\xbf{}", "utf_8_sig"),
+        (b"\xff\xfe\x00\x00", "utf_32"),
+        (b"\xff\xfe{\x00", "utf_16"),
+        (b"{}", ""),
+    ],
+)
+def test_detect_bom_encoding(head, expected):
+    assert detect_bom_encoding(head) == expected
+
+
+def test_detect_bytes_encoding_reports_shift_jis_as_cp932():
+    data = "これはShift_JISエンコーディングのテキストです。".encode("shift_jis")
+
+    enc, confidence = detect_bytes_encoding(data)
+
+    assert enc == "cp932"
+    assert confidence > 0
+
+
+def test_resolve_file_encoding_detects_once(tmp_path):
+    """変更されていないファイルのエンコーディング判定は1回だけ行われることを確認"""
+    test_path = tmp_path / "test.json"
+    test_path.write_text('{"japanese": "テスト"}', encoding="utf_8")
+
+    with patch("rdetoolkit.fileops.detect_bytes_encoding", wraps=detect_bytes_encoding) as mock_detect:
+        first = resolve_file_encoding(test_path)
+        second = resolve_file_encoding(str(test_path))
+
+    assert mock_detect.call_count == 1
+    assert first == second
+    assert first.encoding == "utf_8"
+    assert first.source == "full"
+
+
+def test_resolve_file_encoding_invalidated_on_change(tmp_path):
+    """サイズや更新時刻が変わったファイルは再判定されることを確認"""
+    test_path = tmp_path / "test.json"
+    test_path.write_text('{"japanese": "テスト"}', encoding="utf_8")
+    assert resolve_file_encoding(test_path).encoding == "utf_8"
+
+    test_path.write_bytes('{"japanese": "これはShift_JISエンコーディングのテキストです。"}'.encode("shift_jis"))
+    stat = test_path.stat()
+    os.utime(test_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert resolve_file_encoding(test_path).encoding == "cp932"
+
+
+def test_resolve_file_encoding_bom(tmp_path):
+    test_path = tmp_path / "test.json"
+    test_path.write_bytes('{"japanese": "テスト"}'.encode("utf_8_sig"))
+
+    result = resolve_file_encoding(test_path)
+
+    assert result == EncodingDetectionResult(encoding="utf_8_sig", confidence=1.0, source="bom")
+
+
+def test_resolve_file_encoding_cached_per_sampling_parameters(tmp_path):
+    """サンプリングのパラメータが異なる場合は、キャッシュされた結果を使わずに判定されることを確認"""
+    test_path = tmp_path / "test.txt"
+    test_path.write_text("これはテストです。\n" * 1000, encoding="utf_8")
+
+    with patch("rdetoolkit.fileops.detect_bytes_encoding", wraps=detect_bytes_encoding) as mock_detect:
+        sampled = resolve_file_encoding(test_path, max_bytes=4096)
+        full = resolve_file_encoding(test_path)
+        assert resolve_file_encoding(test_path, max_bytes=4096) == sampled
+
+    assert mock_detect.call_count == 2
+    assert sampled.source == "sample"
+    assert full.source == "full"
+    assert sampled.encoding == full.encoding == "utf_8"
+
+
+def test_resolve_file_encoding_with_data(tmp_path):
+    test_path = tmp_path / "test.txt"
+    test_path.write_text("abc", encoding="utf_8")
+    data = "これはShift_JISエンコーディングのテキストです。".encode("shift_jis")
+
+    result = resolve_file_encoding(test_path, data=data)
+
+    assert result.encoding == "cp932"
+
+
+@pytest.mark.parametrize("kwargs", [{"max_bytes": 0}, {"windows": ()}, {"windows": ("body",)}])
+def test_resolve_file_encoding_invalid_args(tmp_path, kwargs):
+    test_path = tmp_path / "test.txt"
+    test_path.write_text("abc", encoding="utf_8")
+
+    with pytest.raises(ValueError):
+        resolve_file_encoding(test_path, **kwargs)
+
+
+def test_clear_encoding_cache(tmp_path):
+    test_path = tmp_path / "test.json"
+    test_path.write_text('{"key": "value"}', encoding="utf_8")
+
+    with patch("rdetoolkit.fileops.detect_bytes_encoding", wraps=detect_bytes_encoding) as mock_detect:
+        resolve_file_encoding(test_path)
+        clear_encoding_cache()
+        resolve_file_encoding(test_path)
+
+    assert mock_detect.call_count == 2
+
+
+@pytest.fixture
+def raw_source(tmp_path):
+    temp_dir = tmp_path / "temp"
+    temp_dir.mkdir()
+    src = temp_dir / "sample.txt"
+    src.write_text("raw data", encoding="utf_8")
+    (tmp_path / "raw").mkdir()
+    return src
+
+
+@pytest.mark.parametrize("strategy", ["copy", "hardlink", "reflink", "symlink"])
+def test_materialize_file(raw_source, strategy):
+    dst = raw_source.parent.parent / "raw" / raw_source.name
+
+    applied = materialize_file(raw_source, dst, strategy=strategy)
+
+    assert applied in (strategy, "copy")
+    assert dst.read_text(encoding="utf_8") == "raw data"
+    assert raw_source.read_text(encoding="utf_8") == "raw data"
+    assert dst.is_symlink() is (applied == "symlink")
+    assert os.path.samefile(raw_source, dst) is (applied in ("hardlink", "symlink"))
+
+
+def test_materialize_file_replaces_existing(raw_source):
+    dst = raw_source.parent.parent / "raw" / raw_source.name
+    dst.write_text("old", encoding="utf_8")
+
+    materialize_file(raw_source, dst, strategy="hardlink")
+
+    assert dst.read_text(encoding="utf_8") == "raw data"
+
+
+@pytest.mark.parametrize("previous", ["copy", "hardlink", "reflink", "symlink"])
+@pytest.mark.parametrize("strategy", ["copy", "hardlink", "reflink", "symlink"])
+def test_materialize_file_switches_strategy_over_existing(raw_source, previous, strategy):
+    """前回の実行で作成したリンクを上書きしても, 元ファイルが壊れないことを確認"""
+    dst = raw_source.parent.parent / "raw" / raw_source.name
+    materialize_file(raw_source, dst, strategy=previous)
+
+    applied = materialize_file(raw_source, dst, strategy=strategy)
+
+    assert applied in (strategy, "copy")
+    assert raw_source.read_text(encoding="utf_8") == "raw data"
+    assert dst.read_text(encoding="utf_8") == "raw data"
+    assert dst.is_symlink() is (applied == "symlink")
+    assert sorted(p.name for p in dst.parent.iterdir()) == [raw_source.name]
+
+
+def test_materialize_file_move(raw_source):
+    """temp配下のファイルは移動され, 元のパスからも読み込めることを確認"""
+    raw = raw_source.parent.parent / "raw" / raw_source.name
+    nonshared_raw = raw_source.parent.parent / "nonshared_raw.txt"
+
+    assert materialize_file(raw_source, raw, strategy="move", movable_root=raw_source.parent) == "move"
+    assert not raw.is_symlink()
+    assert raw_source.is_symlink()
+    assert raw_source.read_text(encoding="utf_8") == "raw data"
+
+    # 移動済みのファイルは, 移動先からハードリンクする
+    assert materialize_file(raw_source, nonshared_raw, strategy="move", movable_root=raw_source.parent) in ("hardlink", "copy")
+    assert nonshared_raw.read_text(encoding="utf_8") == "raw data"
+
+
+def test_materialize_file_move_outside_movable_root(raw_source, tmp_path):
+    dst = tmp_path / "raw" / raw_source.name
+
+    assert materialize_file(raw_source, dst, strategy="move", movable_root=tmp_path / "other") == "copy"
+    assert materialize_file(raw_source, dst, strategy="move") == "copy"
+    assert not raw_source.is_symlink()
+
+
+def test_materialize_file_falls_back_to_copy_across_filesystems(raw_source):
+    dst = raw_source.parent.parent / "raw" / raw_source.name
+
+    with patch("rdetoolkit.fileops.os.link", side_effect=OSError(errno.EXDEV, "Invalid cross-device link")):
+        applied = materialize_file(raw_source, dst, strategy="hardlink")
+
+    assert applied == "copy"
+    assert not os.path.samefile(raw_source, dst)
+    assert dst.read_text(encoding="utf_8") == "raw data"
+
+
+def test_materialize_file_invalid_strategy(raw_source):
+    with pytest.raises(ValueError, match="Invalid materialization strategy"):
+        materialize_file(raw_source, raw_source.parent / "dst.txt", strategy="rsync")
+
+
+def test_remove_empty_dirs(tmp_path):
+    (tmp_path / "divided" / "0001" / "raw").mkdir(parents=True)
+    (tmp_path / "divided" / "0002" / "raw").mkdir(parents=True)
+    (tmp_path / "divided" / "0002" / "raw" / "sample.txt").touch()
+    candidates = [
+        tmp_path / "divided",
+        tmp_path / "divided" / "0001",
+        tmp_path / "divided" / "0001" / "raw",
+        tmp_path / "divided" / "0002",
+        tmp_path / "divided" / "0002" / "raw",
+        tmp_path / "not_exist",
+    ]
+
+    removed = remove_empty_dirs(candidates)
+
+    assert removed == [tmp_path / "divided" / "0001" / "raw", tmp_path / "divided" / "0001"]
+    assert (tmp_path / "divided" / "0002" / "raw" / "sample.txt").exists()
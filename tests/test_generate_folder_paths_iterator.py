@@ -12,8 +12,10 @@ Note:
 import os
 from pathlib import Path
 
-from rdetoolkit.models.rde2types import RdeOutputResourcePath
-from rdetoolkit.workflows import generate_folder_paths_iterator
+import pytest
+
+from rdetoolkit.models.rde2types import RdeOutputResourcePath, TilePlan
+from rdetoolkit.workflows import create_output_dirs, generate_folder_paths_iterator, plan_data_tiles, prune_empty_output_dirs
 
 
 def test_standard_output_dir_structured(ivnoice_json_with_sample_info, inputfile_single):
@@ -109,3 +111,71 @@ def test_rdeformat_output_dir_structured(inputfile_rdeformat_divived):
 
     for name in expect_dir_names:
         assert os.path.exists(Path("data", name))
+
+
+def test_lazy_output_dir(inputfile_rdeformat_divived):
+    """4 フォルダを作成せずにパスのみ生成し, タイル処理時に作成する"""
+    input_files = [(Path(f"data/temp/test_child{idx}.txt"),) for idx in range(3)]
+    invoice_org_json = Path("data", "temp", "invoice_org.json")
+    input_invoice_schema_json = Path("data", "tasksupport", "invoice.schema.json")
+
+    lazy_outputs = list(generate_folder_paths_iterator(input_files, invoice_org_json, input_invoice_schema_json, create_dirs=False))
+
+    assert not Path("data", "raw").exists()
+    assert not Path("data", "divided").exists()
+
+    create_output_dirs(lazy_outputs[2])
+
+    assert Path("data", "divided", "0002", "structured").is_dir()
+    assert not Path("data", "divided", "0001").exists()
+    assert lazy_outputs == list(generate_folder_paths_iterator(input_files, invoice_org_json, input_invoice_schema_json))
+
+
+def test_prune_empty_output_dirs(inputfile_rdeformat_divived):
+    """5 空のまま残った出力フォルダを削除する. 入力フォルダは削除しない"""
+    input_files = [(Path(f"data/temp/test_child{idx}.txt"),) for idx in range(3)]
+    invoice_org_json = Path("data", "temp", "invoice_org.json")
+    input_invoice_schema_json = Path("data", "tasksupport", "invoice.schema.json")
+    outputs = list(generate_folder_paths_iterator(input_files, invoice_org_json, input_invoice_schema_json))
+    Path("data", "invoice", "invoice.json").unlink(missing_ok=True)
+    Path("data", "divided", "0001", "raw", "test_child1.txt").touch()
+
+    removed = prune_empty_output_dirs(outputs, keep=[Path("data", "invoice")])
+
+    assert Path("data", "invoice").is_dir()
+    assert Path("data", "divided", "0001", "raw", "test_child1.txt").exists()
+    assert not Path("data", "divided", "0001", "structured").exists()
+    assert not Path("data", "divided", "0002").exists()
+    assert not Path("data", "structured").exists()
+    assert Path("data", "divided", "0002") in removed
+
+
+def test_tile_plan():
+    """6 タイル計画からRdeOutputResourcePathを必要な時に生成する. フォルダは作成しない"""
+    input_files = [
+        (Path("data/temp/a.txt"), Path("data/temp/raw/b.txt")),
+        (),
+        (Path("c.txt"),),
+    ]
+    plan = TilePlan(input_files, Path("data/temp/invoice_org.json"), Path("data/tasksupport/invoice.schema.json"))
+
+    assert len(plan) == 3
+    assert [tile.rawfiles for tile in plan] == input_files
+    assert plan[-1].raw == Path("data/divided/0002/raw")
+    assert plan[0].struct == Path("data/structured")
+    assert plan[1].invoice_org == Path("data/temp/invoice_org.json")
+    assert [tile.rawfiles for tile in plan[1:]] == input_files[1:]
+    with pytest.raises(IndexError):
+        plan[3]
+
+
+def test_plan_data_tiles(inputfile_rdeformat_divived):
+    """7 タイル計画の作成時にすべてのタイルのフォルダを作成する"""
+    input_files = [(Path(f"data/temp/test_child{idx}.txt"),) for idx in range(3)]
+    invoice_org_json = Path("data", "temp", "invoice_org.json")
+    input_invoice_schema_json = Path("data", "tasksupport", "invoice.schema.json")
+
+    plan = plan_data_tiles(input_files, invoice_org_json, input_invoice_schema_json)
+
+    assert list(plan) == list(generate_folder_paths_iterator(input_files, invoice_org_json, input_invoice_schema_json))
+    assert Path("data", "divided", "0002", "attachment").is_dir()
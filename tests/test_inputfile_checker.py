@@ -16,8 +16,10 @@ main::checkFiles()の入力パターンとその出力をテストする
     3-1 dividedなし
     3-2 dividedあり
 4 マルチモード(ex: sample1.txt, sample2.txt, sample3.txt)
+5 入力ディレクトリの走査
 """
 
+import zipfile
 from pathlib import Path
 
 from rdetoolkit.impl.input_controller import (
@@ -26,9 +28,9 @@ from rdetoolkit.impl.input_controller import (
     MultiFileChecker,
     RDEFormatChecker,
 )
-from rdetoolkit.models.rde2types import RdeInputDirPaths
+from rdetoolkit.models.rde2types import InputManifest, RdeInputDirPaths
 from rdetoolkit.modeproc import selected_input_checker
-from rdetoolkit.models.config import Config
+from rdetoolkit.models.config import Config, SystemSettings
 
 
 class TestInvoiceChecker:
@@ -107,6 +109,17 @@ class TestExcelInvoiceChecker:
         assert isinstance(rawfiles[0], tuple)
         assert all(isinstance(file, Path) for file in rawfiles[0])
 
+    def test_parse_keeps_parsed_excel_invoice(self, inputfile_zip_with_folder, inputfile_multi_excelinvoice):
+        """解析済みのExcelInvoiceを保持し、モード処理で再利用できることを確認する"""
+        checker = ExcelInvoiceChecker(Path("data/temp"))
+        assert checker.excel_invoice is None
+
+        rawfiles, excelinvoice = checker.parse(Path("data/inputdata"))
+
+        assert checker.excel_invoice is not None
+        assert checker.excel_invoice.invoice_path == excelinvoice
+        assert len(checker.excel_invoice.dfexcelinvoice) == len(rawfiles)
+
     def test_parse_multi_folder(self, inputfile_zip_with_folder_multi, inputfile_multi_folder_excelinvoice):
         """sortを考慮したテスト"""
         unpacked_dir_basename = Path("data/temp")
@@ -203,6 +216,48 @@ class TestRDEFormatChecker:
         assert set(rawfiles[2]) == set(expect_rawfiles_2)
         assert all(isinstance(file, Path) for file in rawfiles[0])
 
+    def test_parse_rdeformat_divided_direct_extraction(self, inputfile_rdeformat_divived):
+        """出力ディレクトリへ直接展開するテスト: inputdata以外はtempを経由しない"""
+        expect_rawfiles = [
+            {
+                Path("data/temp/inputdata/test_file0.txt"),
+                Path("data/raw/test_file0.txt"),
+                Path("data/structured/test.csv"),
+            },
+            *(
+                {
+                    Path(f"data/temp/divided/{idx:04}/inputdata/test_file{idx}.txt"),
+                    Path(f"data/divided/{idx:04}/raw/test_file{idx}.txt"),
+                    Path(f"data/divided/{idx:04}/structured/test_file{idx}.csv"),
+                }
+                for idx in range(1, 3)
+            ),
+        ]
+
+        checker = RDEFormatChecker(Path("data/temp"), output_dir=Path("data"))
+        rawfiles, excelinvoice = checker.parse(Path("data/inputdata"))
+
+        assert excelinvoice is None
+        assert [set(group) for group in rawfiles] == expect_rawfiles
+        assert all(file.is_file() for group in rawfiles for file in group)
+        assert {f.parent.name for f in Path("data/temp").glob("**/*") if f.is_file()} == {"inputdata"}
+
+
+    def test_parse_rdeformat_direct_extraction_nested_output_dirs(self, tmp_path):
+        """複数の出力ディレクトリ名を含むパスは、RDEFORMAT_OUTPUT_DIRSの優先順位で展開先が決まる"""
+        inputdata = tmp_path / "inputdata"
+        inputdata.mkdir()
+        with zipfile.ZipFile(inputdata / "rdeformat.zip", "w") as zf:
+            zf.writestr("structured/raw/test_file0.txt", "raw")
+            zf.writestr("divided/0001/structured/meta/test_file1.json", "{}")
+
+        checker = RDEFormatChecker(tmp_path / "temp", output_dir=tmp_path / "data")
+        rawfiles, _ = checker.parse(inputdata)
+
+        assert rawfiles == [
+            (tmp_path / "data" / "raw" / "test_file0.txt",),
+            (tmp_path / "data" / "divided" / "0001" / "meta" / "test_file1.json",),
+        ]
 
 class TestMultiFileChecker:
     """4 テストスイート: Multifileモード登録を想定したファイルチェックテスト
@@ -234,6 +289,20 @@ def test_selected_input_checker_rde_format():
     assert isinstance(selected_input_checker(src_paths, unpacked_dir_path, fmtflags.extended_mode), RDEFormatChecker)
 
 
+def test_selected_input_checker_rde_format_direct_extraction():
+    fmtflags = Config(system=SystemSettings(extended_mode="rdeformat", rdeformat_direct_extraction=True))
+    src_paths = RdeInputDirPaths(
+        inputdata=Path("data/inputdata"),
+        invoice=Path("data/invoice"),
+        tasksupport=Path("data/tasksupport"),
+        config=fmtflags,
+    )
+    checker = selected_input_checker(src_paths, Path("data/temp"), fmtflags.system.extended_mode)
+
+    assert isinstance(checker, RDEFormatChecker)
+    assert checker.output_dir == Path("data")
+
+
 def test_selected_input_checker_multi_file():
     fmtflags = Config(extended_mode="MultiDataTile", save_raw=True, save_thumbnail_image=False)
     src_paths = RdeInputDirPaths(
@@ -261,6 +330,20 @@ def test_selected_input_checker_excelinvoice(inputfile_zip_with_file, inputfile_
     )
 
 
+def test_selected_input_checker_excelinvoice_archive_filename_encoding(inputfile_zip_with_file, inputfile_single_excelinvoice):
+    config = Config(system=SystemSettings(archive_filename_encoding="cp932"))
+    src_paths = RdeInputDirPaths(
+        inputdata=Path("data/inputdata"),
+        invoice=Path("data/invoice"),
+        tasksupport=Path("data/tasksupport"),
+        config=config,
+    )
+    checker = selected_input_checker(src_paths, Path("data/temp"), config.system.extended_mode)
+
+    assert isinstance(checker, ExcelInvoiceChecker)
+    assert checker.archive_filename_encoding == "cp932"
+
+
 def test_selected_input_checker_invoice(inputfile_single):
     fmtflags = Config(extended_mode=None, save_raw=True, save_thumbnail_image=False)
     src_paths = RdeInputDirPaths(
@@ -271,3 +354,44 @@ def test_selected_input_checker_invoice(inputfile_single):
     )
     unpacked_dir_path = Path("data/temp")
     assert isinstance(selected_input_checker(src_paths, unpacked_dir_path, fmtflags.extended_mode), InvoiceChecker)
+
+
+class TestInputManifest:
+    """5 テストスイート: 入力ディレクトリの走査結果(InputManifest)のテスト"""
+
+    def test_scan(self, tmp_path):
+        for name in ("sample.txt", "data.ZIP", "sample_excel_invoice.xlsx", "old_excel_invoice.xls", "other.xlsx"):
+            (tmp_path / name).write_bytes(b"abc")
+        (tmp_path / "folder").mkdir()
+
+        manifest = InputManifest.scan(tmp_path)
+        zipfiles, excel_invoice_files, other_files = manifest.group_by_files()
+
+        assert zipfiles == [tmp_path / "data.ZIP"]
+        assert set(excel_invoice_files) == {tmp_path / "sample_excel_invoice.xlsx", tmp_path / "old_excel_invoice.xls"}
+        assert set(other_files) == {tmp_path / "sample.txt", tmp_path / "other.xlsx", tmp_path / "folder"}
+        assert set(manifest.paths) == set(tmp_path.glob("*"))
+        entry = next(entry for entry in manifest.entries if entry.path.name == "data.ZIP")
+        assert (entry.suffix, entry.size, entry.is_dir) == (".zip", 3, False)
+
+    def test_scan_missing_directory(self, tmp_path):
+        assert InputManifest.scan(tmp_path / "not_exist").entries == ()
+
+    def test_checker_reuses_manifest(self, inputfile_multi, inputfile_multimode, mocker):
+        """selected_input_checkerで走査した結果を再利用し、入力ディレクトリを再走査しないことを確認"""
+        config = Config(system=SystemSettings(extended_mode="MultiDataTile"))
+        src_paths = RdeInputDirPaths(
+            inputdata=Path("data/inputdata"),
+            invoice=Path("data/invoice"),
+            tasksupport=Path("data/tasksupport"),
+            config=config,
+        )
+        Path("data/inputdata/dataset_excel_invoice.xlsx").touch()
+        checker = selected_input_checker(src_paths, Path("data/temp"), config.system.extended_mode)
+        scan = mocker.spy(InputManifest, "scan")
+
+        rawfiles, _ = checker.parse(Path("data/inputdata"))
+
+        scan.assert_not_called()
+        assert len(rawfiles) == 2
+        assert all(files[0].suffix != ".xlsx" for files in rawfiles)
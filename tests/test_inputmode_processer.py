@@ -4,9 +4,12 @@ import shutil
 from pathlib import Path
 
 import pytest
-from rdetoolkit.models.rde2types import RdeInputDirPaths, RdeOutputResourcePath
+import rdetoolkit.modeproc
+from rdetoolkit.invoicefile import ExcelInvoiceFile
+from rdetoolkit.models.rde2types import RdeInputDirPaths, RdeOutputResourcePath, RunContext
 from rdetoolkit.modeproc import (
     copy_input_to_rawfile,
+    StageTimer,
     copy_input_to_rawfile_for_rdeformat,
     excel_invoice_mode_process,
     invoice_mode_process,
@@ -81,6 +84,22 @@ def test_copy_input_to_rawfile(dummy_files_tuple):
         shutil.rmtree(Path("tests", "raws"))
 
 
+def test_copy_input_to_rawfile_hardlink(tmp_path):
+    src_dir = tmp_path / "temp"
+    src_dir.mkdir()
+    raw_files = (src_dir / "a.txt", src_dir / "b.txt")
+    for f in raw_files:
+        f.write_text(f.name)
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+
+    assert copy_input_to_rawfile(raw_dir, raw_files, strategy="hardlink") == 0
+
+    for f in raw_files:
+        assert (raw_dir / f.name).read_text() == f.name
+        assert os.path.samefile(raw_dir / f.name, f)
+
+
 def test_copy_input_to_rawfile_rdeformat(dummy_files_rdeformat):
     """Test the `copy_input_to_rawfile_for_rdeformat` function.
 
@@ -133,6 +152,34 @@ def test_copy_input_to_rawfile_rdeformat(dummy_files_rdeformat):
         shutil.rmtree(Path("tests", "result"))
 
 
+def test_copy_input_to_rawfile_rdeformat_skips_files_in_place(mocker, tmp_path):
+    """出力ディレクトリへ直接展開済みのファイルはコピーしないことを確認"""
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    raw_file = raw_dir / "test.txt"
+    raw_file.write_text("raw data")
+    paths = RdeOutputResourcePath(
+        rawfiles=(raw_file,),
+        raw=raw_dir,
+        main_image=tmp_path / "main_image",
+        other_image=tmp_path / "other_image",
+        meta=tmp_path / "meta",
+        struct=tmp_path / "structured",
+        logs=tmp_path / "logs",
+        thumbnail=Path(),
+        invoice=Path(),
+        invoice_org=Path(),
+        invoice_schema_json=Path(),
+        nonshared_raw=tmp_path / "nonshared_raw",
+    )
+
+    mock_materialize = mocker.patch("rdetoolkit.modeproc.materialize_file")
+    copy_input_to_rawfile_for_rdeformat(paths)
+
+    mock_materialize.assert_not_called()
+    assert raw_file.read_text() == "raw data"
+
+
 def test_invoice_mode_process_calls_functions(
     mocker,
     inputfile_single,
@@ -487,6 +534,154 @@ def test_excel_invoice_mode_process_calls_functions(
     assert len(list(Path("data", "nonshared_raw").glob("*"))) >= 1
 
 
+def test_excel_invoice_mode_process_reuses_parsed_excel_invoice(
+    mocker,
+    inputfile_single_dummy_header_excelinvoice,
+    inputfile_zip_with_file,
+    ivnoice_json_with_sample_info,
+    tasksupport,
+    metadata_def_json_with_feature,
+    metadata_json,
+    ivnoice_schema_json_none_specificAttributes,
+):
+    """excelinvoice mode processテスト
+    テスト対象: RunContextに解析済みのExcelInvoiceがある場合、ワークブックを再度読み込まないことを確認
+    """
+    for dirname in ["raw", "nonshared_raw", "main_image", "other_image", "meta", "structured", "logs", "temp"]:
+        Path("data", dirname).mkdir(parents=True, exist_ok=True)
+    shutil.copy(
+        Path("data", "invoice").joinpath("invoice.json"),
+        Path("data", "temp", "invoice_org.json"),
+    )
+    shutil.unpack_archive(Path("data", "inputdata", "test_input_multi.zip"), Path("data", "temp"))
+
+    config = Config(system=SystemSettings(extended_mode=None, save_raw=False, save_nonshared_raw=True, magic_variable=True, save_thumbnail_image=True), multidata_tile=MultiDataTileSettings(ignore_errors=False))
+    srcpaths = RdeInputDirPaths(
+        inputdata=Path("data", "inputdata"),
+        invoice=Path("data", "invoice"),
+        tasksupport=Path("data", "tasksupport"),
+        config=config,
+    )
+    resource_paths = RdeOutputResourcePath(
+        rawfiles=(Path("data", "temp", "test_child1.txt"),),
+        raw=Path("data", "raw"),
+        main_image=Path("data", "main_image"),
+        other_image=Path("data", "other_image"),
+        meta=Path("data", "meta"),
+        struct=Path("data", "structured"),
+        logs=Path("data", "logs"),
+        thumbnail=Path(),
+        invoice=Path("data", "invoice"),
+        invoice_org=Path("data", "temp", "invoice_org.json"),
+        invoice_schema_json=Path(ivnoice_schema_json_none_specificAttributes),
+        nonshared_raw=Path("data", "nonshared_raw"),
+    )
+    context = RunContext(config=config, excel_invoice=ExcelInvoiceFile(Path(inputfile_single_dummy_header_excelinvoice)))
+    mock_read_excel = mocker.patch("rdetoolkit.invoicefile.read_excelinvoice_sheets")
+
+    status = excel_invoice_mode_process(srcpaths, resource_paths, inputfile_single_dummy_header_excelinvoice, 0, context=context)
+
+    mock_read_excel.assert_not_called()
+    assert status.status == "success"
+    with open(os.path.join("data", "invoice", "invoice.json"), encoding="utf-8") as f:
+        content = json.load(f)
+    assert content["basic"]["description"] == "desc1\n特徴量1:test-value1\n特徴量2(V):test-value2\n特徴量3(V):test-value3"
+
+
+def _excel_invoice_mode_paths(config, excel_invoice_schema):
+    for dirname in ["raw", "nonshared_raw", "main_image", "other_image", "meta", "structured", "logs", "temp"]:
+        Path("data", dirname).mkdir(parents=True, exist_ok=True)
+    shutil.copy(
+        Path("data", "invoice").joinpath("invoice.json"),
+        Path("data", "temp", "invoice_org.json"),
+    )
+    shutil.unpack_archive(Path("data", "inputdata", "test_input_multi.zip"), Path("data", "temp"))
+    srcpaths = RdeInputDirPaths(
+        inputdata=Path("data", "inputdata"),
+        invoice=Path("data", "invoice"),
+        tasksupport=Path("data", "tasksupport"),
+        config=config,
+    )
+    resource_paths = RdeOutputResourcePath(
+        rawfiles=(Path("data", "temp", "test_child1.txt"),),
+        raw=Path("data", "raw"),
+        main_image=Path("data", "main_image"),
+        other_image=Path("data", "other_image"),
+        meta=Path("data", "meta"),
+        struct=Path("data", "structured"),
+        logs=Path("data", "logs"),
+        thumbnail=Path(),
+        invoice=Path("data", "invoice"),
+        invoice_org=Path("data", "temp", "invoice_org.json"),
+        invoice_schema_json=Path(excel_invoice_schema),
+        nonshared_raw=Path("data", "nonshared_raw"),
+    )
+    return srcpaths, resource_paths
+
+
+def test_excel_invoice_mode_process_writes_invoice_once(
+    mocker,
+    inputfile_single_dummy_header_excelinvoice,
+    inputfile_zip_with_file,
+    ivnoice_json_with_sample_info,
+    tasksupport,
+    metadata_def_json_with_feature,
+    metadata_json,
+    ivnoice_schema_json_none_specificAttributes,
+):
+    """excelinvoice mode processテスト
+    テスト対象: 独自の構造化処理がない場合、invoice.jsonはメモリ上で更新され、検証後に一度だけ書き込まれることを確認
+    """
+    config = Config(system=SystemSettings(extended_mode=None, save_raw=False, save_nonshared_raw=True, magic_variable=True, save_thumbnail_image=False), multidata_tile=MultiDataTileSettings(ignore_errors=False))
+    srcpaths, resource_paths = _excel_invoice_mode_paths(config, ivnoice_schema_json_none_specificAttributes)
+    spy_write = mocker.spy(rdetoolkit.modeproc, "writef_json")
+    spy_read = mocker.spy(rdetoolkit.modeproc, "readf_json")
+
+    status = excel_invoice_mode_process(srcpaths, resource_paths, inputfile_single_dummy_header_excelinvoice, 0)
+
+    assert status.status == "success"
+    spy_write.assert_called_once()
+    assert spy_write.call_args.args[0] == Path("data", "invoice", "invoice.json")
+    spy_read.assert_not_called()
+    with open(os.path.join("data", "invoice", "invoice.json"), encoding="utf-8") as f:
+        content = json.load(f)
+    assert content["basic"]["description"] == "desc1\n特徴量1:test-value1\n特徴量2(V):test-value2\n特徴量3(V):test-value3"
+
+
+def test_excel_invoice_mode_process_keeps_changes_by_custom_function(
+    inputfile_single_dummy_header_excelinvoice,
+    inputfile_zip_with_file,
+    ivnoice_json_with_sample_info,
+    tasksupport,
+    metadata_def_json_with_feature,
+    metadata_json,
+    ivnoice_schema_json_none_specificAttributes,
+):
+    """excelinvoice mode processテスト
+    テスト対象: 独自の構造化処理にはinvoice.jsonが渡され、その変更が後続の処理に引き継がれることを確認
+    """
+    config = Config(system=SystemSettings(extended_mode=None, save_raw=False, save_nonshared_raw=True, magic_variable=True, save_thumbnail_image=False), multidata_tile=MultiDataTileSettings(ignore_errors=False))
+    srcpaths, resource_paths = _excel_invoice_mode_paths(config, ivnoice_schema_json_none_specificAttributes)
+
+    def custom_dataset_function(srcpaths, resource_paths):
+        invoice_path = resource_paths.invoice.joinpath("invoice.json")
+        with open(invoice_path, encoding="utf-8") as f:
+            invoice = json.load(f)
+        invoice["basic"]["dataName"] = "${filename}"
+        invoice["basic"]["description"] = "custom"
+        with open(invoice_path, "w", encoding="utf-8") as f:
+            json.dump(invoice, f)
+
+    status = excel_invoice_mode_process(srcpaths, resource_paths, inputfile_single_dummy_header_excelinvoice, 0, custom_dataset_function)
+
+    assert status.status == "success"
+    assert status.title == "test_child1.txt"
+    with open(os.path.join("data", "invoice", "invoice.json"), encoding="utf-8") as f:
+        content = json.load(f)
+    assert content["basic"]["dataName"] == "test_child1.txt"
+    assert content["basic"]["description"] == "custom\n特徴量1:test-value1\n特徴量2(V):test-value2\n特徴量3(V):test-value3"
+
+
 def test_excel_invoice_save_raw(
     mocker,
     inputfile_single_dummy_header_excelinvoice,
@@ -907,6 +1102,67 @@ def test_multifile_save_raw(
     assert len(list(Path("data", "nonshared_raw").glob("*"))) == 0
 
 
+def test_multifile_mode_process_records_stage_timings(
+    mocker,
+    inputfile_multi,
+    ivnoice_json_magic_filename_variable,
+    tasksupport,
+    metadata_def_json_with_feature,
+    metadata_json,
+    ivnoice_schema_json,
+):
+    """各処理ステージの所要時間とコピーしたバイト数が実行ステータスに記録される"""
+    for name in ("raw", "nonshared_raw", "main_image", "other_image", "meta", "structured", "logs", "temp"):
+        Path("data", name).mkdir(parents=True, exist_ok=True)
+    shutil.copy(Path("data", "invoice").joinpath("invoice.json"), Path("data", "temp", "invoice_org.json"))
+    for f in inputfile_multi:
+        f.write_text("12345", encoding="utf-8")
+
+    config = Config(system=SystemSettings(extended_mode="MultiDataTile", save_raw=True, save_nonshared_raw=True, magic_variable=True))
+    srcpaths = RdeInputDirPaths(inputdata=Path("data", "inputdata"), invoice=Path("data", "invoice"), tasksupport=Path("data", "tasksupport"), config=config)
+    resource_paths = RdeOutputResourcePath(
+        rawfiles=tuple(inputfile_multi),
+        raw=Path("data", "raw"),
+        main_image=Path("data", "main_image"),
+        other_image=Path("data", "other_image"),
+        meta=Path("data", "meta"),
+        struct=Path("data", "structured"),
+        logs=Path("data", "logs"),
+        thumbnail=Path(),
+        invoice=Path("data", "invoice"),
+        invoice_org=Path("data", "temp", "invoice_org.json"),
+        invoice_schema_json=Path(ivnoice_schema_json),
+        nonshared_raw=Path("data", "nonshared_raw"),
+    )
+    timer = StageTimer()
+
+    status = multifile_mode_process("1", srcpaths, resource_paths, mocker.Mock(), timer=timer)
+
+    assert list(status.timings) == [
+        "invoice_overwrite",
+        "raw_copy",
+        "custom_function",
+        "description_update",
+        "metadata_validation",
+        "invoice_validation",
+        "invoice_write",
+    ]
+    assert all(seconds >= 0 for seconds in status.timings.values())
+    assert status.timings == timer.timings
+    assert status.bytes_copied == 5 * len(inputfile_multi) * 2
+
+
+def test_stage_timer_records_failed_stage():
+    timer = StageTimer()
+    with pytest.raises(ValueError), timer.stage("custom_function"):
+        raise ValueError
+    with timer.stage("custom_function"):
+        pass
+
+    assert list(timer.timings) == ["custom_function"]
+    assert timer.bytes_copied == 0
+
+
 def test_multifile_mode_process_calls_functions_none_metadata_json(
     mocker,
     inputfile_multi,
@@ -1,4 +1,5 @@
 import json
+import logging
 import os
 from pathlib import Path
 import pathlib
@@ -9,14 +10,17 @@ from openpyxl.utils import get_column_letter
 import pandas as pd
 import pytest
 from pandas.testing import assert_frame_equal
+from rdetoolkit import rde2util
 from rdetoolkit.exceptions import StructuredError
 from rdetoolkit.invoicefile import (
     ExcelInvoiceFile,
     InvoiceFile,
     check_exist_rawfiles,
     read_excelinvoice,
+    read_excelinvoice_sheets,
     update_description_with_features,
     apply_magic_variable,
+    replace_magic_variable,
 )
 from rdetoolkit.models.rde2types import RdeOutputResourcePath
 from rdetoolkit.invoicefile import ExcelInvoiceTemplateGenerator
@@ -248,6 +252,81 @@ def test_excelinvoice_overwrite_none_sample(excelinvoice_non_sampleinfo, ivnoice
     assert contents["custom"]["key2"] == "CCC"
 
 
+def test_excelinvoice_overwrite_with_parsed_objects(inputfile_multi_excelinvoice, ivnoice_json_with_sample_info, ivnoice_schema_json_none_specificAttributes):
+    """読み込み済みのinvoice/スキーマを渡した上書き処理
+    ファイルから読み込んだ場合と同じ結果になり、渡したオブジェクトは変更されないことを確認する
+    """
+    dist_path = Path("data", "invoice", "invoice.json")
+    with open(ivnoice_json_with_sample_info, encoding="utf-8") as f:
+        invoice_org_obj = json.load(f)
+    with open(ivnoice_schema_json_none_specificAttributes, encoding="utf-8") as f:
+        invoice_schema_obj = json.load(f)
+    expect_invoice_org_obj = json.loads(json.dumps(invoice_org_obj))
+
+    excel_invoice_file = ExcelInvoiceFile(Path(inputfile_multi_excelinvoice))
+    excel_invoice_file.overwrite(
+        Path("dummy", "invoice_org.json"),
+        dist_path,
+        Path("dummy", "invoice.schema.json"),
+        0,
+        invoice_org_obj=invoice_org_obj,
+        invoice_schema_obj=invoice_schema_obj,
+    )
+
+    with open(dist_path, encoding="utf-8") as f:
+        contents = json.load(f)
+
+    assert contents["custom"]["key1"] == "AAA"
+    assert contents["custom"]["key2"] == "CCC"
+    assert invoice_org_obj == expect_invoice_org_obj
+
+
+def test_excelinvoice_overwrite_all(inputfile_multi_excelinvoice, ivnoice_json_with_sample_info, ivnoice_schema_json_none_specificAttributes):
+    """全行の一括上書き処理
+    1行ずつoverwriteした結果と一致することを確認する
+    """
+    excel_invoice_file = ExcelInvoiceFile(Path(inputfile_multi_excelinvoice))
+    num_rows = len(excel_invoice_file.dfexcelinvoice)
+    dist_paths = [Path("data", "divided", f"{idx:04d}", "invoice.json") for idx in range(num_rows)]
+    for dist_path in dist_paths:
+        dist_path.parent.mkdir(parents=True, exist_ok=True)
+
+    invoice_objs = excel_invoice_file.overwrite_all(ivnoice_json_with_sample_info, ivnoice_schema_json_none_specificAttributes, dist_paths)
+
+    assert len(invoice_objs) == num_rows
+    for idx, (dist_path, invoice_obj) in enumerate(zip(dist_paths, invoice_objs)):
+        single_path = Path("data", "invoice", "invoice.json")
+        excel_invoice_file.overwrite(ivnoice_json_with_sample_info, single_path, ivnoice_schema_json_none_specificAttributes, idx)
+        with open(single_path, encoding="utf-8") as f:
+            expect_contents = json.load(f)
+        with open(dist_path, encoding="utf-8") as f:
+            contents = json.load(f)
+        assert contents == expect_contents
+        assert invoice_obj == expect_contents
+    assert invoice_objs[0]["custom"]["key1"] == "AAA"
+
+
+def test_excelinvoice_overwrite_all_casts_once_per_column(mocker, inputfile_multi_excelinvoice, ivnoice_json_with_sample_info, ivnoice_schema_json_none_specificAttributes):
+    """custom列の値は、列ごとに1回だけ全行分まとめて型変換される"""
+    excel_invoice_file = ExcelInvoiceFile(Path(inputfile_multi_excelinvoice))
+    custom_columns = [key for key in excel_invoice_file.dfexcelinvoice.columns if key.startswith("custom/")]
+    castval = mocker.spy(rde2util, "castval")
+    castvals = mocker.spy(rde2util, "castvals")
+
+    excel_invoice_file.overwrite_all(ivnoice_json_with_sample_info, ivnoice_schema_json_none_specificAttributes)
+
+    assert castval.call_count == 0
+    assert castvals.call_count == len(custom_columns)
+    assert all(len(call.args[0]) == len(excel_invoice_file.dfexcelinvoice) for call in castvals.call_args_list)
+
+
+def test_excelinvoice_overwrite_all_mismatched_dist_paths(inputfile_multi_excelinvoice, ivnoice_json_with_sample_info, ivnoice_schema_json_none_specificAttributes):
+    excel_invoice_file = ExcelInvoiceFile(Path(inputfile_multi_excelinvoice))
+    with pytest.raises(StructuredError) as e:
+        excel_invoice_file.overwrite_all(ivnoice_json_with_sample_info, ivnoice_schema_json_none_specificAttributes, [Path("data", "invoice", "invoice.json")] * 10)
+    assert "does not match the number of rows" in str(e.value)
+
+
 def test_read_invalid_excel_invoice_file():
     invoice_path = Path("dummy/file.xlsx")
     with pytest.raises(StructuredError) as e:
@@ -301,6 +380,51 @@ def test_update_description_with_features(
     assert result_contents["basic"]["description"] == expect_message
 
 
+def test_update_description_with_features_without_metadata_json(
+    rde_resource,
+    ivnoice_schema_json,
+    metadata_def_json_with_feature,
+    ivnoice_json_none_sample_info,
+    caplog,
+):
+    """テストケース: metadata.jsonがないデータタイルでは, エラーを記録せずにinvoice.jsonをそのままにする"""
+    before = Path(ivnoice_json_none_sample_info).read_text(encoding="utf-8")
+
+    with caplog.at_level(logging.DEBUG):
+        update_description_with_features(rde_resource, ivnoice_json_none_sample_info, metadata_def_json_with_feature)
+
+    assert [record for record in caplog.records if record.levelno >= logging.ERROR] == []
+    assert Path(ivnoice_json_none_sample_info).read_text(encoding="utf-8") == before
+
+
+def test_update_description_with_features_parsed_objects(
+    rde_resource,
+    ivnoice_schema_json,
+    metadata_def_json_with_feature,
+    ivnoice_json_none_sample_info,
+    metadata_json,
+):
+    """テストケース: 読み込み済みのスキーマ/metadata-defを渡した場合もdescriptionへの書き出しがパスするかテスト"""
+    expect_message = "desc1\n特徴量1:test-value1\n特徴量2(V):test-value2\n特徴量3(V):test-value3"
+    with open(ivnoice_schema_json, encoding="utf-8") as f:
+        invoice_schema_obj = json.load(f)
+    with open(metadata_def_json_with_feature, encoding="utf-8") as f:
+        metadata_def_obj = json.load(f)
+
+    update_description_with_features(
+        rde_resource,
+        ivnoice_json_none_sample_info,
+        Path("dummy", "metadata-def.json"),
+        invoice_schema_obj=invoice_schema_obj,
+        metadata_def_obj=metadata_def_obj,
+    )
+
+    with open(ivnoice_json_none_sample_info, encoding="utf-8") as f:
+        result_contents = json.load(f)
+
+    assert result_contents["basic"]["description"] == expect_message
+
+
 def test_update_description_with_features_missing_target_key(
     rde_resource,
     ivnoice_schema_json,
@@ -562,6 +686,18 @@ def test_apply_magic_variable_inputfile_check(ivnoice_json_magic_filename_variab
     assert result["basic"]["dataName"] == "dymmy_replace_filename.txt"
 
 
+def test_replace_magic_variable(ivnoice_json_magic_filename_variable):
+    """メモリ上のinvoiceの${filename}が置換できるかテスト"""
+    with open(ivnoice_json_magic_filename_variable, encoding="utf-8") as f:
+        invoice_obj = json.load(f)
+
+    result = replace_magic_variable(invoice_obj, "/test/dummy/dymmy_replace_filename.txt")
+
+    assert result["basic"]["dataName"] == "dymmy_replace_filename.txt"
+    assert invoice_obj["basic"]["dataName"] == "dymmy_replace_filename.txt"
+    assert replace_magic_variable({"basic": {"dataName": "fixed"}}, "dummy.txt") == {}
+
+
 class TestExcelinvoice:
     """Excelinvoiceクラスのテスト"""
 
@@ -779,3 +915,62 @@ def test_save_border_settings(template_config_mode_file, ivnoice_schema_json_wit
 
     if os.path.exists(test_path):
         os.remove(test_path)
+
+
+@pytest.fixture
+def excelinvoice_with_various_cells(tmp_path):
+    """数値/日付/NA文字列/エラー値/書式のみの空セルや無関係なシートを含むExcelInvoice"""
+    import datetime
+
+    from openpyxl import Workbook
+    from openpyxl.styles import Font
+
+    wb = Workbook()
+    ws_memo = wb.active
+    ws_memo.title = "memo"
+    for row in range(1, 200):
+        ws_memo.append([f"memo{row}", row, row * 0.5])
+
+    ws = wb.create_sheet("invoice_form")
+    ws.append(["invoiceList_format_id", "sample.xlsx"])
+    ws.append(["data_file_names", "basic", "custom", "custom", "custom"])
+    ws.append(["name", "dataName", "key1", "key2", "key3"])
+    ws.append(["ファイル名", "データ名", "キー1", "キー2", "キー3"])
+    ws.append(["sample1.txt", "data1", 1, 1.5, datetime.datetime(2024, 1, 2, 3, 4, 5)])
+    ws.append(["sample2.txt", "NA", 2.0, True, None])
+    ws.append(["sample3.txt", "", -3, "#N/A", "text"])
+    ws.cell(row=8, column=3).value = "#DIV/0!"
+    ws.cell(row=8, column=3).data_type = "e"
+    ws.cell(row=8, column=1).value = "sample4.txt"
+    for row in range(9, 60):
+        for col in range(1, 12):
+            ws.cell(row=row, column=col).font = Font(bold=True)
+
+    ws_general = wb.create_sheet("generalTerm")
+    ws_general.append(["term_id", "key_name"])
+    ws_general.append(["3adf9874-7bcb-e5f8-99cb-3d6fd9d7b55e", "sample.general.general-name"])
+    ws_specific = wb.create_sheet("specificTerm")
+    ws_specific.append(["sample_class_id", "term_id", "key_name"])
+    ws_specific.append(["01cb3c01-37a4-5a43-d8ca-f523ca99a75b", "dc1c9e8b-d2c7-4ad4-8c3f-c41a8a1c2b4e", "sample.specific.specific-name"])
+
+    path = tmp_path / "various_cells_excel_invoice.xlsx"
+    wb.save(path)
+    yield path
+
+
+def test_read_excelinvoice_sheets_same_as_read_excel(excelinvoice_with_various_cells):
+    """ストリーミング読み込みの結果がpd.read_excelと一致し、無関係なシートを読み込まないことを確認"""
+    expect_sheets = pd.read_excel(excelinvoice_with_various_cells, sheet_name=None, dtype=str, header=None, index_col=None)
+
+    sheets = read_excelinvoice_sheets(excelinvoice_with_various_cells)
+
+    assert list(sheets) == ["invoice_form", "generalTerm", "specificTerm"]
+    for sh_name, df in sheets.items():
+        assert_frame_equal(df, expect_sheets[sh_name])
+
+
+def test_read_excelinvoice_sheets_fixtures(inputfile_multi_excelinvoice, inputfile_single_excelinvoice):
+    for path in (inputfile_multi_excelinvoice, inputfile_single_excelinvoice):
+        expect_sheets = pd.read_excel(path, sheet_name=None, dtype=str, header=None, index_col=None)
+        for sh_name, df in read_excelinvoice_sheets(path).items():
+            assert_frame_equal(df, expect_sheets[sh_name])
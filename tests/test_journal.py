@@ -0,0 +1,121 @@
+from pathlib import Path
+
+import pytest
+
+from rdetoolkit.journal import RunJournal, clear_stale_outputs, fingerprint_directories, fingerprint_files
+from rdetoolkit.models.rde2types import TilePlan
+from rdetoolkit.models.result import WorkflowExecutionStatus
+
+
+def _status(run_id, status="success"):
+    return WorkflowExecutionStatus(run_id=run_id, title="test", status=status, mode="MultiDataTile", target=None)
+
+
+@pytest.fixture
+def tile_plan(tmp_path):
+    inputdata = tmp_path / "inputdata"
+    inputdata.mkdir()
+    raw_files_group = []
+    for name in ("a.txt", "b.txt"):
+        inputdata.joinpath(name).write_text(name, encoding="utf_8")
+        raw_files_group.append((inputdata / name,))
+    invoice_org = tmp_path / "invoice_org.json"
+    invoice_org.write_text("{}", encoding="utf_8")
+    plan = TilePlan(raw_files_group, invoice_org, tmp_path / "invoice.schema.json", base_dir=tmp_path / "data")
+    for resource_paths in plan:
+        resource_paths.raw.mkdir(parents=True)
+        resource_paths.raw.joinpath("out.txt").write_text("output", encoding="utf_8")
+    return raw_files_group, invoice_org, plan
+
+
+def test_fingerprint_files(tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_text("a", encoding="utf_8")
+    fingerprint = fingerprint_files([path])
+
+    assert fingerprint == fingerprint_files([path])
+    path.write_text("ab", encoding="utf_8")
+    assert fingerprint != fingerprint_files([path])
+    assert fingerprint_files([tmp_path / "missing"]) != fingerprint_files([])
+
+
+def test_fingerprint_directories_includes_nested_files(tmp_path):
+    nested = tmp_path / "inputdata" / "sub" / "deeper"
+    nested.mkdir(parents=True)
+    nested.joinpath("a.txt").write_text("a", encoding="utf_8")
+    fingerprint = fingerprint_directories([tmp_path / "inputdata", tmp_path / "missing"])
+
+    assert fingerprint == fingerprint_directories([tmp_path / "inputdata"])
+    nested.joinpath("a.txt").write_text("ab", encoding="utf_8")
+    assert fingerprint != fingerprint_directories([tmp_path / "inputdata"])
+    nested.joinpath("b.txt").write_text("b", encoding="utf_8")
+    assert fingerprint_directories([tmp_path / "inputdata"]) != fingerprint
+
+
+def test_clear_stale_outputs(tmp_path, tile_plan):
+    raw_files_group, _, plan = tile_plan
+    plan[1].raw.joinpath("nested").mkdir()
+    plan[1].raw.joinpath("nested", "partial.txt").write_text("partial", encoding="utf_8")
+    extracted = plan[1].raw / "extracted.txt"
+    extracted.write_text("raw", encoding="utf_8")
+    plan[1].temp.mkdir(parents=True, exist_ok=True)
+    plan[1].temp.joinpath("temp.txt").write_text("temp", encoding="utf_8")
+    plan = TilePlan([raw_files_group[0], (extracted,)], tmp_path / "invoice_org.json", tmp_path / "invoice.schema.json", base_dir=tmp_path / "data")
+
+    removed = clear_stale_outputs(plan, {0}, keep=[raw_files_group[0][0].parent])
+
+    assert sorted(removed) == sorted([plan[1].raw / "out.txt", plan[1].raw / "nested" / "partial.txt"])
+    assert plan[0].raw.joinpath("out.txt").exists()
+    assert extracted.exists()
+    assert plan[1].temp.joinpath("temp.txt").exists()
+
+
+def test_run_journal_round_trip(tmp_path, tile_plan):
+    raw_files_group, invoice_org, plan = tile_plan
+    journal = RunJournal(tmp_path / "logs" / "run_journal.ndjson")
+    journal.start("fp", raw_files_group, invoice_org, mode="MultiDataTile")
+    journal.record_tile(0, plan[0], _status("0"))
+    journal.record_tile(1, plan[1], _status("1", "failed"))
+
+    loaded = RunJournal(journal.path).read()
+    assert loaded.plan == journal.plan
+    assert list(loaded.tiles) == [0]
+    assert loaded.resumable_plan("fp", "MultiDataTile") == journal.plan
+    assert loaded.resumable_plan("other", "MultiDataTile") is None
+    assert loaded.resumable_plan("fp", None) is None
+    assert loaded.intact_statuses(plan) == {0: _status("0")}
+
+
+def test_run_journal_ignores_truncated_line(tmp_path, tile_plan):
+    raw_files_group, invoice_org, plan = tile_plan
+    journal = RunJournal(tmp_path / "run_journal.ndjson")
+    journal.start("fp", raw_files_group, invoice_org)
+    journal.record_tile(0, plan[0], _status("0"))
+    journal.record_tile(1, plan[1], _status("1"))
+    text = journal.path.read_text(encoding="utf_8")
+    journal.path.write_text(text[:-20], encoding="utf_8")
+
+    assert list(RunJournal(journal.path).read().tiles) == [0]
+
+
+def test_run_journal_intact_statuses_detects_changes(tmp_path, tile_plan):
+    raw_files_group, invoice_org, plan = tile_plan
+    journal = RunJournal(tmp_path / "run_journal.ndjson")
+    journal.start("fp", raw_files_group, invoice_org)
+    journal.record_tile(0, plan[0], _status("0"))
+    journal.record_tile(1, plan[1], _status("1"))
+
+    plan[0].raw.joinpath("out.txt").write_text("partial", encoding="utf_8")
+    raw_files_group[1][0].write_text("modified input", encoding="utf_8")
+
+    assert RunJournal(journal.path).read().intact_statuses(plan) == {}
+
+
+def test_run_journal_resumable_plan_requires_raw_files(tmp_path, tile_plan):
+    raw_files_group, invoice_org, _ = tile_plan
+    journal = RunJournal(tmp_path / "run_journal.ndjson")
+    journal.start("fp", raw_files_group, invoice_org)
+    Path(raw_files_group[0][0]).unlink()
+
+    assert RunJournal(journal.path).read().resumable_plan("fp") is None
+    assert RunJournal(tmp_path / "missing.ndjson").read().resumable_plan("fp") is None
@@ -3,7 +3,8 @@ import os
 import tempfile
 
 import pytest
-from rdetoolkit.rde2util import Meta, _split_value_unit, CharDecEncoding, read_from_json_file, write_to_json_file, castval, ValueCaster
+from rdetoolkit.models.rde2types import EncodingDetectionResult
+from rdetoolkit.rde2util import Meta, _split_value_unit, CharDecEncoding, read_from_json_file, write_to_json_file, castval, castvals, ValueCaster
 from rdetoolkit.exceptions import StructuredError
 
 
@@ -225,6 +226,64 @@ def test_detect_text_file_encoding_utf_8_sig(utf_8_sig_file):
     assert CharDecEncoding.detect_text_file_encoding(utf_8_sig_file) == "utf_8_sig"
 
 
+@pytest.mark.parametrize(
+    "encoding, expected",
+    [("utf_8_sig", "utf_8_sig"), ("utf_16", "utf_16"), ("utf_32", "utf_32")],
+)
+def test_detect_sampled_encoding_bom(tmp_path, encoding, expected):
+    path = tmp_path / "bom.csv"
+    path.write_bytes("テスト,1\n".encode(encoding) * 1000)
+
+    result = CharDecEncoding.detect_sampled_encoding(path, max_bytes=16)
+
+    assert result == EncodingDetectionResult(encoding=expected, confidence=1.0, source="bom")
+
+
+@pytest.mark.parametrize("encoding, expected", [("utf_8", "utf_8"), ("shift_jis", "cp932")])
+def test_detect_sampled_encoding_sample(tmp_path, encoding, expected):
+    path = tmp_path / "large.csv"
+    path.write_bytes("温度,圧力,試料名（テスト）,データ\n".encode(encoding) * 20000)
+
+    result = CharDecEncoding.detect_sampled_encoding(path, max_bytes=4096, windows=("head", "middle", "tail"))
+
+    assert result.encoding == expected
+    assert result.source == "sample"
+    assert result.confidence >= 0.8
+
+
+def test_detect_sampled_encoding_ascii_head(tmp_path):
+    """先頭のサンプルがASCIIのみの場合、最初の非ASCII文字を含む範囲から判定することを確認"""
+    path = tmp_path / "ascii_head.csv"
+    path.write_bytes(b"time,value\n" * 20000 + "温度,圧力,試料名（テスト）\n".encode("shift_jis") * 100)
+
+    result = CharDecEncoding.detect_sampled_encoding(path, max_bytes=4096)
+
+    assert result.encoding == "cp932"
+    assert result.source == "sample"
+
+
+def test_detect_sampled_encoding_ascii_only(tmp_path):
+    path = tmp_path / "ascii.csv"
+    path.write_bytes(b"time,value\n" * 20000)
+
+    result = CharDecEncoding.detect_sampled_encoding(path, max_bytes=4096)
+
+    assert result == EncodingDetectionResult(encoding="ascii", confidence=1.0, source="full")
+
+
+def test_detect_sampled_encoding_small_file(shift_jis_file):
+    result = CharDecEncoding.detect_sampled_encoding(shift_jis_file)
+
+    assert result.encoding == CharDecEncoding.detect_text_file_encoding(shift_jis_file)
+    assert result.source == "full"
+
+
+@pytest.mark.parametrize("kwargs", [{"max_bytes": 0}, {"windows": ()}, {"windows": ("head", "body")}])
+def test_detect_sampled_encoding_invalid_args(utf_8_file, kwargs):
+    with pytest.raises(ValueError):
+        CharDecEncoding.detect_sampled_encoding(utf_8_file, **kwargs)
+
+
 # read_invoice_json_fileのテスト
 def test_read_from_json_file_valid_json_file(ivnoice_json_none_sample_info):
     """version1.2.0で削除予定 """
@@ -312,6 +371,28 @@ def test_castval_invalid_last_statement():
     assert str(e.value) == "ERROR: failed to cast metaDef value"
 
 
+@pytest.mark.parametrize(
+    "values, fmt, outfmt, expected",
+    [
+        (["100", "200"], "integer", None, [100, 200]),
+        (["100", "100.1"], "number", None, [100, 100.1]),
+        (["2023/1/1", "2024/2/3"], "string", "date", ["2023-01-01", "2024-02-03"]),
+        ([], "boolean", None, []),
+    ],
+)
+def test_castvals(values, fmt, outfmt, expected):
+    assert castvals(values, fmt, outfmt) == expected
+
+
+def test_castvals_invalid():
+    with pytest.raises(StructuredError) as e:
+        castvals([], "num", None)
+    assert str(e.value) == "ERROR: unknown value type in metaDef"
+    with pytest.raises(StructuredError) as e:
+        castvals(["100", "sample"], "number", None)
+    assert str(e.value) == "ERROR: failed to cast metaDef value"
+
+
 def test_trycast():
     assert ValueCaster.trycast("123", int) == 123
     assert ValueCaster.trycast("123.456", float) == 123.456
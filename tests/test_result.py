@@ -1,4 +1,8 @@
-from rdetoolkit.models.result import WorkflowExecutionStatus, WorkflowResultManager
+import json
+
+import pytest
+
+from rdetoolkit.models.result import StageStatistics, WorkflowExecutionStatus, WorkflowResultManager
 
 
 def test_workflow_execution_status_creation():
@@ -97,3 +101,89 @@ def test_workflow_result_manager_to_json():
     assert json_str == expected_json
 
 
+
+
+def test_workflow_result_manager_streaming(tmp_path):
+    """ndjson_pathを指定した場合、実行結果はファイルへ追記され、メモリには件数のみ保持される"""
+    ndjson_path = tmp_path / "logs" / "workflow_results.ndjson"
+    manager = WorkflowResultManager(ndjson_path=ndjson_path)
+    manager.add(run_id="0", title="Test Workflow 0", status="success", mode="MultiDataTile", target="a.txt")
+    manager.add(run_id="1", title="Test Workflow 1", status="failed", mode="MultiDataTile", error_code=999, error_message="error", target="b.txt", stacktrace="Traceback")
+    manager.add_status(WorkflowExecutionStatus(run_id="2", title="Test Workflow 2", status="success", mode="MultiDataTile", target="c.txt"))
+
+    assert manager.statuses.statuses == []
+    assert len(ndjson_path.read_text(encoding="utf_8").splitlines()) == 3
+    assert len(manager) == 3
+    assert [status.run_id for status in manager] == ["0000", "0001", "0002"]
+    assert manager[1].stacktrace == "Traceback"
+    assert manager[-1].target == "c.txt"
+    summary = manager.summary()
+    assert summary.total == 3
+    assert summary.counts == {"success": 2, "failed": 1}
+    assert summary.statuses_file == str(ndjson_path)
+    assert json.loads(manager.to_json())["statuses"][1]["error_code"] == 999
+
+
+def test_workflow_result_manager_len_matches_iteration(tmp_path):
+    """len()は反復で得られる実行結果の件数と一致し、件数の合計はsummaryで得られる"""
+    manager = WorkflowResultManager()
+    manager.add(run_id="0", title="Test Workflow 0", status="success", mode="invoice")
+    manager.statuses.statuses.append(WorkflowExecutionStatus(run_id="1", title="Test Workflow 1", status="failed", mode="invoice", target=None))
+
+    assert len(manager) == len(list(manager)) == 2
+    assert manager.summary().total == 2
+    assert manager.summary().counts == {"success": 1, "failed": 1}
+
+    streaming = WorkflowResultManager(ndjson_path=tmp_path / "workflow_results.ndjson")
+    streaming.add(run_id="0", title="Test Workflow 0", status="success", mode="invoice")
+    streaming.add(run_id="1", title="Test Workflow 1", status="failed", mode="invoice")
+
+    assert streaming.statuses.statuses == []
+    assert len(streaming) == len(list(streaming)) == 2
+    assert streaming.summary().total == 2
+
+
+def test_workflow_result_manager_streaming_truncates(tmp_path):
+    ndjson_path = tmp_path / "workflow_results.ndjson"
+    ndjson_path.write_text('{"run_id": "0"}\n', encoding="utf_8")
+
+    manager = WorkflowResultManager(ndjson_path=ndjson_path)
+
+    assert list(manager) == []
+    with pytest.raises(IndexError):
+        manager[0]
+
+
+def test_workflow_result_manager_summary():
+    manager = WorkflowResultManager()
+    manager.add(run_id="1", title="Test Workflow 1", status="success", mode="invoice")
+
+    assert manager.summary().model_dump() == {"total": 1, "counts": {"success": 1}, "statuses_file": None}
+
+
+def test_stage_statistics_from_durations():
+    statistics = StageStatistics.from_durations([0.4, 0.1, 0.3, 0.2])
+
+    assert statistics.count == 4
+    assert statistics.sum == pytest.approx(1.0)
+    assert statistics.p50 == pytest.approx(0.25)
+    assert statistics.p95 == pytest.approx(0.385)
+    assert StageStatistics.from_durations([0.5]).p95 == 0.5
+
+
+def test_workflow_result_manager_stage_statistics(tmp_path):
+    """実行ステータスの処理時間はステージごとに集計され、summaryとto_jsonに含まれる"""
+    for manager in (WorkflowResultManager(), WorkflowResultManager(ndjson_path=tmp_path / "workflow_results.ndjson")):
+        manager.add_status(WorkflowExecutionStatus(run_id="0", title="t", status="success", mode="invoice", target=None, timings={"raw_copy": 0.1, "custom_function": 1.0}, bytes_copied=10))
+        manager.add_status(WorkflowExecutionStatus(run_id="1", title="t", status="failed", mode="invoice", target=None, timings={"raw_copy": 0.3}, bytes_copied=5))
+        manager.add_status(WorkflowExecutionStatus(run_id="2", title="t", status="cached", mode="invoice", target=None))
+
+        summary = manager.summary()
+        assert summary.bytes_copied == 15
+        assert summary.stages["raw_copy"].model_dump() == pytest.approx({"count": 2, "sum": 0.4, "p50": 0.2, "p95": 0.29})
+        assert summary.stages["custom_function"].count == 1
+        results = json.loads(manager.to_json())
+        assert results["stages"]["raw_copy"]["count"] == 2
+        assert results["bytes_copied"] == 15
+        assert results["statuses"][0]["timings"] == {"raw_copy": 0.1, "custom_function": 1.0}
+        assert "timings" not in results["statuses"][2]
@@ -62,7 +62,7 @@ def test_copy_images_to_thumbnail(dummy_out_dir_thumb, dummy_out_dir_main, dummy
     with open(dummy_out_dir_other.joinpath("dummy_other_img3.png"), "w") as f:
         f.write("dummy")
     # 関数を実行
-    copy_images_to_thumbnail(dummy_out_dir_thumb, dummy_out_dir_main)
+    assert copy_images_to_thumbnail(dummy_out_dir_thumb, dummy_out_dir_main) == len("dummy")
 
     assert len(list(dummy_out_dir_thumb.glob("*"))) == 1
 
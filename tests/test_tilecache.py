@@ -0,0 +1,106 @@
+import pytest
+
+from rdetoolkit.models.config import Config, SystemSettings
+from rdetoolkit.models.rde2types import TilePlan
+from rdetoolkit.models.result import WorkflowExecutionStatus
+from rdetoolkit.tilecache import TileCache, fingerprint_run, hash_files, hash_json
+
+
+def _status(run_id, status="success"):
+    return WorkflowExecutionStatus(run_id=run_id, title="test", status=status, mode="MultiDataTile", target=None)
+
+
+def _custom_dataset(srcpaths, resource_paths):
+    pass
+
+
+@pytest.fixture
+def tile_plan(tmp_path):
+    inputdata = tmp_path / "inputdata"
+    inputdata.mkdir()
+    raw_files_group = []
+    for name in ("a.txt", "b.txt"):
+        inputdata.joinpath(name).write_text(name, encoding="utf_8")
+        raw_files_group.append((inputdata / name,))
+    plan = TilePlan(raw_files_group, tmp_path / "invoice_org.json", tmp_path / "invoice.schema.json", base_dir=tmp_path / "data")
+    for resource_paths in plan:
+        resource_paths.raw.mkdir(parents=True)
+        resource_paths.raw.joinpath("out.txt").write_text("output", encoding="utf_8")
+    return plan
+
+
+def _run(cache, plan, statuses):
+    for idx, resource_paths in enumerate(plan):
+        if cache.lookup(idx, resource_paths, {"basic": {"dataName": str(idx)}}) is None:
+            cache.record(idx, resource_paths, statuses[idx])
+    cache.save()
+
+
+def test_hash_files_depends_on_names_and_contents(tmp_path):
+    a = tmp_path / "a.txt"
+    a.write_text("a", encoding="utf_8")
+    copied = tmp_path / "sub" / "a.txt"
+    copied.parent.mkdir()
+    copied.write_text("a", encoding="utf_8")
+    digest = hash_files([a])
+
+    assert digest == hash_files([copied])
+    copied.write_text("b", encoding="utf_8")
+    assert digest != hash_files([copied])
+    assert digest != hash_files([tmp_path / "missing.txt"])
+
+
+def test_hash_json_is_canonical():
+    assert hash_json({"a": 1, "b": [1, 2]}) == hash_json({"b": [1, 2], "a": 1})
+    assert hash_json({"a": 1}) != hash_json({"a": 2})
+
+
+def test_fingerprint_run():
+    config = Config(system=SystemSettings(extended_mode="MultiDataTile"))
+    fingerprint = fingerprint_run(config, invoice_schema={"a": 1}, metadata_def={}, custom_dataset_function=_custom_dataset)
+
+    execution_only = Config(system=SystemSettings(extended_mode="MultiDataTile", max_workers=4, tile_cache=True))
+    assert fingerprint == fingerprint_run(execution_only, invoice_schema={"a": 1}, metadata_def={}, custom_dataset_function=_custom_dataset)
+    versioned = Config(system=SystemSettings(extended_mode="MultiDataTile", tile_cache_version="2"))
+    assert fingerprint != fingerprint_run(versioned, invoice_schema={"a": 1}, metadata_def={}, custom_dataset_function=_custom_dataset)
+    assert fingerprint != fingerprint_run(config, invoice_schema={"a": 2}, metadata_def={}, custom_dataset_function=_custom_dataset)
+    assert fingerprint != fingerprint_run(config, invoice_schema={"a": 1}, metadata_def={}, custom_dataset_function=None)
+
+
+def test_tile_cache_skips_unchanged_tiles(tmp_path, tile_plan):
+    path = tmp_path / "logs" / "tile_cache.json"
+    _run(TileCache(path, "run").read(), tile_plan, [_status("0"), _status("1", "failed")])
+
+    cache = TileCache(path, "run").read()
+    assert list(cache.entries) == [0]
+    assert cache.lookup(0, tile_plan[0], {"basic": {"dataName": "0"}}) == _status("0").model_copy(update={"status": "cached"})
+    assert cache.lookup(1, tile_plan[1], {"basic": {"dataName": "1"}}) is None
+
+
+def test_tile_cache_detects_changes(tmp_path, tile_plan):
+    path = tmp_path / "tile_cache.json"
+    _run(TileCache(path, "run").read(), tile_plan, [_status("0"), _status("1")])
+
+    cache = TileCache(path, "run").read()
+    assert cache.lookup(0, tile_plan[0], {"basic": {"dataName": "modified"}}) is None
+    tile_plan[1].rawfiles[0].write_text("modified", encoding="utf_8")
+    assert cache.lookup(1, tile_plan[1], {"basic": {"dataName": "1"}}) is None
+
+    tile_plan[0].raw.joinpath("out.txt").write_text("partial", encoding="utf_8")
+    assert TileCache(path, "run").read().lookup(0, tile_plan[0], {"basic": {"dataName": "0"}}) is None
+    assert TileCache(path, "other run").read().entries == {}
+
+
+def test_tile_cache_keeps_cached_entries(tmp_path, tile_plan):
+    path = tmp_path / "tile_cache.json"
+    _run(TileCache(path, "run").read(), tile_plan, [_status("0"), _status("1")])
+    _run(TileCache(path, "run").read(), tile_plan, [_status("0", "failed"), _status("1", "failed")])
+
+    assert list(TileCache(path, "run").read().entries) == [0, 1]
+
+
+def test_tile_cache_ignores_invalid_file(tmp_path):
+    path = tmp_path / "tile_cache.json"
+    path.write_text("{invalid", encoding="utf_8")
+
+    assert TileCache(path, "run").read().entries == {}
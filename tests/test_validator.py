@@ -1,4 +1,5 @@
 import json
+import pickle
 import shutil
 from pathlib import Path
 
@@ -11,6 +12,7 @@ from rdetoolkit.exceptions import (
 from rdetoolkit.validation import (
     InvoiceValidator,
     MetadataValidator,
+    get_invoice_validator,
     invoice_validate,
     metadata_validate,
 )
@@ -190,6 +192,19 @@ def test_invoice_validate():
     invoice_validate(invoice_path, schema_path)
 
 
+def test_invoice_validate_with_invoice_obj():
+    """メモリ上のinvoiceを検証する場合、invoice.jsonが存在しなくてもよいことを確認"""
+    with open(Path(__file__).parent.joinpath("samplefile", "invoice.json"), encoding="utf-8") as f:
+        invoice_obj = json.load(f)
+    schema_path = Path(__file__).parent.joinpath("samplefile", "invoice.schema.json")
+    invoice_validate("dummy_invoice.json", schema_path, invoice_obj=invoice_obj)
+
+    with open(Path(__file__).parent.joinpath("samplefile", "invoice_invalid.json"), encoding="utf-8") as f:
+        invalid_invoice_obj = json.load(f)
+    with pytest.raises(InvoiceSchemaValidationError):
+        invoice_validate("dummy_invoice.json", schema_path, invoice_obj=invalid_invoice_obj)
+
+
 def test_invalid_invoice_validate():
     """input file: invoice_invalid.json
     "custom": {
@@ -216,6 +231,41 @@ def test_invalid_invoice_validate():
     assert expect_msg == str(e.value)
 
 
+def test_invalid_invoice_validate_fail_fast():
+    """fail_fast=Trueの場合、最初のエラーのみ報告されることを確認"""
+    invoice_path = Path(__file__).parent.joinpath("samplefile", "invoice_invalid.json")
+    schema_path = Path(__file__).parent.joinpath("samplefile", "invoice.schema.json")
+    with pytest.raises(InvoiceSchemaValidationError) as e:
+        invoice_validate(invoice_path, schema_path, fail_fast=True)
+    assert str(e.value).startswith("Error in validating invoice.json:\n1. Field: ")
+    assert "2. Field: " not in str(e.value)
+
+
+def test_get_invoice_validator_cache(tmp_path):
+    """同一のスキーマにはキャッシュされたバリデータが返され、スキーマが更新された場合は再構築されることを確認"""
+    schema_path = tmp_path.joinpath("invoice.schema.json")
+    shutil.copy(Path(__file__).parent.joinpath("samplefile", "invoice.schema.json"), schema_path)
+
+    validator = get_invoice_validator(schema_path)
+    assert get_invoice_validator(str(schema_path)) is validator
+
+    schema = json.loads(schema_path.read_text(encoding="utf-8"))
+    schema["description"] = "updated"
+    schema_path.write_text(json.dumps(schema), encoding="utf-8")
+    assert get_invoice_validator(schema_path) is not validator
+
+
+def test_invoice_validator_pickle():
+    """検証に使用した後でもInvoiceValidatorをpickleできることを確認"""
+    invoice_path = Path(__file__).parent.joinpath("samplefile", "invoice.json")
+    schema_path = Path(__file__).parent.joinpath("samplefile", "invoice.schema.json")
+    validator = InvoiceValidator(schema_path)
+    validator.validate(path=invoice_path)
+
+    restored = pickle.loads(pickle.dumps(validator))
+    assert restored.validate(path=invoice_path) == validator.validate(path=invoice_path)
+
+
 def test_invalid_basic_info_invoice_validate():
     expect_msg = "Error in validating system standard field.\nPlease correct the following fields in invoice.json\nField: basic.dataOwnerId\nType: pattern\nContext: '' does not match '^([0-9a-zA-Z]{56})$'\n"
     invoice_path = Path(__file__).parent.joinpath("samplefile", "invoice_invalid_none_basic.json")
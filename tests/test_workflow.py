@@ -1,3 +1,4 @@
+import asyncio
 import json
 from pathlib import Path
 import shutil
@@ -6,7 +7,7 @@ import pytest
 import yaml
 import toml
 
-from rdetoolkit.workflows import run
+from rdetoolkit.workflows import arun, run
 from rdetoolkit.models.config import Config, SystemSettings, MultiDataTileSettings
 
 
@@ -174,3 +175,294 @@ def test_run_empty_config(
 #     mock_multifile_mode_process.assert_called_once_with(srcpaths, resource_paths, custom_function)
 
 #     logger.warning.assert_called_once_with("Skipped exception: Exception raised")
+
+
+def _custom_dataset_raise_for_child1(srcpaths, resource_paths):
+    if resource_paths.rawfiles[0].name == "test_child1.txt":
+        raise ValueError("failed in worker process")
+
+
+def test_run_multidatatile_parallel(inputfile_multi, tasksupport, metadata_def_json_file, pre_schema_filepath, pre_invoice_filepath, metadata_json):
+    """max_workersを指定した場合、プロセスプールで実行され、タイル順に結果が返る"""
+    config = Config(
+        system=SystemSettings(extended_mode="MultiDataTile", save_raw=True, save_thumbnail_image=False, magic_variable=False, max_workers=2),
+        multidata_tile=MultiDataTileSettings(ignore_errors=True),
+    )
+    result = json.loads(run(custom_dataset_function=_custom_dataset_raise_for_child1, config=config))
+
+    statuses = result["statuses"]
+    assert [s["run_id"] for s in statuses] == ["0000", "0001"]
+    assert statuses[0]["status"] == "failed"
+    assert statuses[0]["target"].endswith("test_child1.txt")
+    assert "failed in worker process" in statuses[0]["error_message"]
+    assert statuses[1]["status"] == "success"
+    assert Path("data/divided/0001/raw/test_child2.txt").exists()
+
+
+def test_run_lazy_output_dirs(inputfile_multi, tasksupport, metadata_def_json_file, pre_schema_filepath, pre_invoice_filepath, metadata_json):
+    """lazy_output_dirs, prune_empty_output_dirsを指定した場合、出力フォルダはタイル処理時に作成され、空のフォルダは削除される"""
+    config = Config(
+        system=SystemSettings(
+            extended_mode="MultiDataTile",
+            save_raw=True,
+            save_thumbnail_image=False,
+            magic_variable=False,
+            lazy_output_dirs=True,
+            prune_empty_output_dirs=True,
+        ),
+    )
+    result = json.loads(run(config=config))
+
+    assert [s["status"] for s in result["statuses"]] == ["success", "success"]
+    assert Path("data/divided/0001/raw/test_child2.txt").exists()
+    assert Path("data/divided/0001/invoice/invoice.json").exists()
+    assert not Path("data/divided/0001/structured").exists()
+    assert not Path("data/other_image").exists()
+    assert Path("data/inputdata").is_dir()
+
+
+@pytest.mark.parametrize("max_workers, num_tiles, expected", [(1, 10, 1), (4, 10, 4), (4, 2, 2), (3, 0, 1)])
+def test_resolve_max_workers(max_workers, num_tiles, expected):
+    from rdetoolkit.workflows import _resolve_max_workers
+
+    assert _resolve_max_workers(max_workers, num_tiles) == expected
+
+
+def test_resolve_max_workers_auto(monkeypatch):
+    from rdetoolkit import workflows
+
+    monkeypatch.setattr(workflows, "_get_available_cpus", lambda: 3)
+    assert workflows._resolve_max_workers(0, 100) == 3
+
+
+@pytest.mark.parametrize("cpu_max, expected", [("max 100000\n", None), ("150000 100000\n", 2), ("100000 100000\n", 1)])
+def test_read_cgroup_v2_cpu_quota(tmp_path, monkeypatch, cpu_max, expected):
+    from rdetoolkit import workflows
+
+    cpu_max_path = tmp_path / "cpu.max"
+    cpu_max_path.write_text(cpu_max)
+    monkeypatch.setattr(workflows, "_CGROUP_V2_CPU_MAX", str(cpu_max_path))
+    monkeypatch.setattr(workflows, "_CGROUP_V1_CPU_QUOTA", str(tmp_path / "not_exist"))
+    assert workflows._read_cgroup_cpu_quota() == expected
+
+
+def test_read_cgroup_v1_cpu_quota(tmp_path, monkeypatch):
+    from rdetoolkit import workflows
+
+    (tmp_path / "cpu.cfs_quota_us").write_text("250000\n")
+    (tmp_path / "cpu.cfs_period_us").write_text("100000\n")
+    monkeypatch.setattr(workflows, "_CGROUP_V2_CPU_MAX", str(tmp_path / "not_exist"))
+    monkeypatch.setattr(workflows, "_CGROUP_V1_CPU_QUOTA", str(tmp_path / "cpu.cfs_quota_us"))
+    monkeypatch.setattr(workflows, "_CGROUP_V1_CPU_PERIOD", str(tmp_path / "cpu.cfs_period_us"))
+    assert workflows._read_cgroup_cpu_quota() == 3
+
+
+def test_build_run_context(tasksupport, metadata_def_json_file, pre_schema_filepath, pre_invoice_filepath):
+    import pickle
+
+    from rdetoolkit.validation import InvoiceValidator
+    from rdetoolkit.workflows import _build_run_context
+
+    config = Config()
+    context = _build_run_context(config, pre_invoice_filepath, pre_schema_filepath, metadata_def_json_file)
+
+    with open(pre_schema_filepath, encoding="utf-8") as f:
+        assert context.invoice_schema == json.load(f)
+    with open(pre_invoice_filepath, encoding="utf-8") as f:
+        assert context.invoice_org == json.load(f)
+    with open(metadata_def_json_file, encoding="utf-8") as f:
+        assert context.metadata_def == json.load(f)
+    assert context.config is config
+    assert isinstance(context.invoice_validator, InvoiceValidator)
+    assert pickle.loads(pickle.dumps(context)).invoice_schema == context.invoice_schema
+
+
+def test_build_run_context_missing_or_invalid_files(tmp_path):
+    from rdetoolkit.workflows import _build_run_context
+
+    invalid_schema = tmp_path / "invoice.schema.json"
+    invalid_schema.write_text("{invalid json", encoding="utf-8")
+    context = _build_run_context(Config(), tmp_path / "invoice_org.json", invalid_schema, tmp_path / "metadata-def.json")
+
+    assert context.invoice_schema is None
+    assert context.invoice_org is None
+    assert context.metadata_def is None
+    assert context.invoice_validator is None
+
+
+def test_run_stream_results(inputfile_multi, tasksupport, metadata_def_json_file, pre_schema_filepath, pre_invoice_filepath, metadata_json):
+    """stream_resultsを指定した場合、実行結果はNDJSONファイルへ出力され、集計結果が返る"""
+    config = Config(
+        system=SystemSettings(extended_mode="MultiDataTile", save_raw=True, save_thumbnail_image=False, magic_variable=False, stream_results=True),
+        multidata_tile=MultiDataTileSettings(ignore_errors=True),
+    )
+    result = json.loads(run(custom_dataset_function=_custom_dataset_raise_for_child1, config=config))
+
+    stages = result.pop("stages")
+    assert result == {"total": 2, "counts": {"failed": 1, "success": 1}, "statuses_file": "data/logs/workflow_results.ndjson", "bytes_copied": 0}
+    assert stages["custom_function"]["count"] == 2
+    lines = Path("data/logs/workflow_results.ndjson").read_text(encoding="utf_8").splitlines()
+    assert [json.loads(line)["status"] for line in lines] == ["failed", "success"]
+
+
+def _custom_dataset_record_calls(srcpaths, resource_paths):
+    with open("data/logs/calls.txt", "a", encoding="utf_8") as f:
+        f.write(f"{resource_paths.rawfiles[0].name}\n")
+
+
+def test_run_resume(inputfile_multi, tasksupport, metadata_def_json_file, pre_schema_filepath, pre_invoice_filepath, metadata_json):
+    """resume=Trueを指定した場合、ジャーナルに記録された完了済みのタイルはスキップされ、失敗したタイルのみ再実行される"""
+    config = Config(
+        system=SystemSettings(extended_mode="MultiDataTile", save_raw=True, save_thumbnail_image=False, magic_variable=False, run_journal=True),
+        multidata_tile=MultiDataTileSettings(ignore_errors=True),
+    )
+    run(custom_dataset_function=_custom_dataset_raise_for_child1, config=config)
+    lines = Path("data/logs/run_journal.ndjson").read_text(encoding="utf_8").splitlines()
+    assert [json.loads(line)["event"] for line in lines] == ["plan", "tile"]
+
+    result = json.loads(run(custom_dataset_function=_custom_dataset_record_calls, config=config, resume=True))
+
+    assert [status["status"] for status in result["statuses"]] == ["success", "success"]
+    assert Path("data/logs/calls.txt").read_text(encoding="utf_8").splitlines() == ["test_child1.txt"]
+    lines = Path("data/logs/run_journal.ndjson").read_text(encoding="utf_8").splitlines()
+    assert [json.loads(line)["event"] for line in lines] == ["plan", "tile", "tile"]
+
+
+def test_run_resume_reprocesses_modified_outputs(inputfile_multi, tasksupport, metadata_def_json_file, pre_schema_filepath, pre_invoice_filepath, metadata_json):
+    """出力ファイルが記録時から変更されたタイルは再実行される"""
+    config = Config(
+        system=SystemSettings(extended_mode="MultiDataTile", save_raw=True, save_thumbnail_image=False, magic_variable=False, run_journal=True),
+        multidata_tile=MultiDataTileSettings(ignore_errors=True),
+    )
+    run(config=config)
+    raw_files = sorted(Path("data").glob("**/raw/*"))
+    raw_files[0].write_text("partially written", encoding="utf_8")
+
+    run(custom_dataset_function=_custom_dataset_record_calls, config=config, resume=True)
+
+    assert Path("data/logs/calls.txt").read_text(encoding="utf_8").splitlines() == [raw_files[0].name]
+
+
+def test_run_without_journal(inputfile_multi, tasksupport, metadata_def_json_file, pre_schema_filepath, pre_invoice_filepath, metadata_json):
+    """run_journalもresumeも指定しない場合、ジャーナルは記録されない"""
+    config = Config(system=SystemSettings(extended_mode="MultiDataTile", save_raw=True, save_thumbnail_image=False, magic_variable=False))
+    run(config=config)
+
+    assert not Path("data/logs/run_journal.ndjson").exists()
+
+
+def test_run_resume_clears_stale_outputs(inputfile_multi, tasksupport, metadata_def_json_file, pre_schema_filepath, pre_invoice_filepath, metadata_json):
+    """再実行されるタイルの出力ディレクトリに残ったファイルは削除され、完了済みのタイルの出力は残る"""
+    config = Config(
+        system=SystemSettings(extended_mode="MultiDataTile", save_raw=True, save_thumbnail_image=False, magic_variable=False, run_journal=True),
+        multidata_tile=MultiDataTileSettings(ignore_errors=True),
+    )
+    run(custom_dataset_function=_custom_dataset_raise_for_child1, config=config)
+    stale = Path("data/structured/partial.csv")
+    stale.write_text("partial", encoding="utf_8")
+    completed = Path("data/divided/0001/structured/result.csv")
+    completed.write_text("result", encoding="utf_8")
+
+    run(custom_dataset_function=_custom_dataset_record_calls, config=config, resume=True)
+
+    assert Path("data/logs/calls.txt").read_text(encoding="utf_8").splitlines() == ["test_child1.txt"]
+    assert not stale.exists()
+    assert completed.exists()
+    assert Path("data/inputdata/test_child1.txt").exists()
+
+
+def test_run_resume_detects_nested_input_changes(inputfile_multi, tasksupport, metadata_def_json_file, pre_schema_filepath, pre_invoice_filepath, metadata_json):
+    """入力ディレクトリのサブフォルダ内のファイルが変更された場合、最初から処理される"""
+    config = Config(system=SystemSettings(extended_mode="MultiDataTile", save_raw=True, save_thumbnail_image=False, magic_variable=False))
+    nested = Path("data/tasksupport/nested")
+    nested.mkdir()
+    nested.joinpath("settings.txt").write_text("a", encoding="utf_8")
+    run(config=config, resume=True)
+    nested.joinpath("settings.txt").write_text("modified", encoding="utf_8")
+
+    run(custom_dataset_function=_custom_dataset_record_calls, config=config, resume=True)
+
+    assert Path("data/logs/calls.txt").read_text(encoding="utf_8").splitlines() == ["test_child1.txt", "test_child2.txt"]
+
+
+def test_run_tile_cache(inputfile_multi, tasksupport, metadata_def_json_file, pre_schema_filepath, pre_invoice_filepath, metadata_json):
+    """tile_cacheを指定した場合、前回の実行から変更のないタイルはスキップされ、cachedとして報告される"""
+    config = Config(system=SystemSettings(extended_mode="MultiDataTile", save_raw=True, save_thumbnail_image=False, magic_variable=False, tile_cache=True))
+    run(custom_dataset_function=_custom_dataset_record_calls, config=config)
+    assert Path("data/logs/calls.txt").read_text(encoding="utf_8").splitlines() == ["test_child1.txt", "test_child2.txt"]
+    Path("data/inputdata/test_child2.txt").write_text("modified", encoding="utf_8")
+
+    result = json.loads(run(custom_dataset_function=_custom_dataset_record_calls, config=config))
+
+    assert [status["status"] for status in result["statuses"]] == ["cached", "success"]
+    assert Path("data/logs/calls.txt").read_text(encoding="utf_8").splitlines() == ["test_child1.txt", "test_child2.txt", "test_child2.txt"]
+
+    versioned = Config(system=SystemSettings(extended_mode="MultiDataTile", save_raw=True, save_thumbnail_image=False, magic_variable=False, tile_cache=True, tile_cache_version="2"))
+    result = json.loads(run(custom_dataset_function=_custom_dataset_record_calls, config=versioned))
+    assert [status["status"] for status in result["statuses"]] == ["success", "success"]
+
+
+def test_run_stage_timings(inputfile_multi, tasksupport, metadata_def_json_file, pre_schema_filepath, pre_invoice_filepath, metadata_json):
+    """各タイルの処理ステージの所要時間が記録され、run()の戻り値でステージごとに集計される"""
+    config = Config(system=SystemSettings(extended_mode="MultiDataTile", save_raw=True, save_thumbnail_image=False, magic_variable=False))
+    result = json.loads(run(custom_dataset_function=_custom_dataset_record_calls, config=config))
+
+    assert all("custom_function" in status["timings"] for status in result["statuses"])
+    assert result["stages"]["custom_function"]["count"] == 2
+    assert result["stages"]["raw_copy"]["p95"] >= result["stages"]["raw_copy"]["p50"] >= 0
+    assert result["bytes_copied"] == 0
+
+
+def test_arun_coroutine_function(inputfile_multi, tasksupport, metadata_def_json_file, pre_schema_filepath, pre_invoice_filepath, metadata_json):
+    """arun()にコルーチン関数を渡した場合、concurrencyまでのタイルが同じイベントループ上で同時に処理される"""
+    config = Config(system=SystemSettings(extended_mode="MultiDataTile", save_raw=True, save_thumbnail_image=False, magic_variable=False))
+    started = []
+    both_started = asyncio.Event()
+
+    async def custom_dataset(srcpaths, resource_paths):
+        started.append(resource_paths.rawfiles[0].name)
+        if len(started) == 2:
+            both_started.set()
+        await asyncio.wait_for(both_started.wait(), timeout=10)
+        resource_paths.struct.joinpath("out.txt").write_text("done", encoding="utf_8")
+
+    result = json.loads(asyncio.run(arun(custom_dataset_function=custom_dataset, config=config, concurrency=2)))
+
+    assert [s["run_id"] for s in result["statuses"]] == ["0000", "0001"]
+    assert [s["status"] for s in result["statuses"]] == ["success", "success"]
+    assert sorted(started) == ["test_child1.txt", "test_child2.txt"]
+    assert Path("data/structured/out.txt").exists()
+    assert Path("data/divided/0001/structured/out.txt").exists()
+    assert Path("data/divided/0001/raw/test_child2.txt").exists()
+
+
+def test_arun_plain_function(inputfile_multi, tasksupport, metadata_def_json_file, pre_schema_filepath, pre_invoice_filepath, metadata_json):
+    """arun()に通常の関数を渡した場合も処理され、エラーはタイルごとに報告される"""
+    config = Config(
+        system=SystemSettings(extended_mode="MultiDataTile", save_raw=True, save_thumbnail_image=False, magic_variable=False),
+        multidata_tile=MultiDataTileSettings(ignore_errors=True),
+    )
+    result = json.loads(asyncio.run(arun(custom_dataset_function=_custom_dataset_raise_for_child1, config=config, concurrency=1)))
+
+    statuses = result["statuses"]
+    assert [s["status"] for s in statuses] == ["failed", "success"]
+    assert "failed in worker process" in statuses[0]["error_message"]
+    assert result["stages"]["custom_function"]["count"] == 2
+
+
+def test_arun_invalid_concurrency():
+    with pytest.raises(ValueError, match="concurrency must be 1 or more"):
+        asyncio.run(arun(concurrency=0))
+
+
+def test_arun_error_exits(inputfile_multi, tasksupport, metadata_def_json_file, pre_schema_filepath, pre_invoice_filepath, metadata_json):
+    """arun()でタイルの処理が例外を送出した場合、他のタイルの完了を待ってから終了する"""
+    config = Config(system=SystemSettings(extended_mode="MultiDataTile", save_raw=True, save_thumbnail_image=False, magic_variable=False))
+
+    async def custom_dataset(srcpaths, resource_paths):
+        if resource_paths.rawfiles[0].name == "test_child1.txt":
+            raise ValueError("failed in coroutine")
+        await asyncio.sleep(0.1)
+
+    with pytest.raises(SystemExit):
+        asyncio.run(arun(custom_dataset_function=custom_dataset, config=config, concurrency=2))